@@ -0,0 +1,147 @@
+"""
+Headless command-line build evaluator (the wotr-planner console script).
+- Takes build files and share codes and prints one derived sheet per build as JSON lines.
+- Game data is loaded once per invocation, so many builds share the startup cost.
+- Never imports PyQt6; the GUI is started with main.py.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from wotr_planner.models.data_packs import DataPacks, default_pack_dirs
+from wotr_planner.models.data_schemas import DataValidationError
+from wotr_planner.models.evaluator import evaluate_build, load_character
+from wotr_planner.models.serialization import BuildValidationError
+from wotr_planner.models.share_code import ShareCodeError
+
+def read_builds(sources, stdin=None):
+    """
+    Expand command-line sources into individual builds.
+    - An existing .jsonl file holds one serialized build per line.
+    - Any other existing file holds one serialized build or a JSON list of them.
+    - "-" reads stdin, one share code or serialized build per line.
+    - A missing path is reported as such: share codes are base64url, so an argument with a
+      path separator or a .json/.jsonl suffix cannot be one.
+    - Anything else is a share code.
+    Args:
+        sources (iterable): Command-line arguments.
+        stdin (file, optional): Stream read for "-". Defaults to sys.stdin.
+    Yields:
+        tuple: (source label, serialized build dict or share code str, or None if unreadable,
+            error message or None).
+    """
+    for source in sources:
+        if source == "-":
+            for number, line in enumerate(stdin or sys.stdin, 1):
+                line = line.strip()
+                if line:
+                    yield _parse_line(f"<stdin>:{number}", line)
+            continue
+        path = Path(source)
+        if not path.is_file():
+            if _looks_like_path(source):
+                yield source, None, f"No such file: {source}"
+            else:
+                yield source, source, None
+        elif path.suffix == ".jsonl":
+            with path.open(encoding="utf-8") as f:
+                for number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield _parse_line(f"{source}:{number}", line)
+        else:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                yield source, None, f"Could not read build file: {exc}"
+                continue
+            if isinstance(data, list):
+                for index, build in enumerate(data):
+                    yield f"{source}[{index}]", build, None
+            else:
+                yield source, data, None
+
+def _looks_like_path(source):
+    """
+    Check whether an argument is meant as a file path rather than a share code.
+    """
+    separators = {"/", os.sep, os.altsep} - {None}
+    return any(sep in source for sep in separators) or source.endswith((".json", ".jsonl"))
+
+def _parse_line(label, line):
+    """
+    Parse one line of builds: a JSON object or a share code.
+    Returns:
+        tuple: (label, build, error) as yielded by read_builds.
+    """
+    if not line.lstrip().startswith("{"):
+        return label, line.strip(), None
+    try:
+        return label, json.loads(line), None
+    except ValueError as exc:
+        return label, None, f"Invalid JSON: {exc}"
+
+def evaluate_source(build, catalog, trait_registry):
+    """
+    Evaluate one serialized build or share code.
+    Args:
+        build (dict | str): Serialized build or share code.
+        catalog (Catalog): Game data.
+        trait_registry (dict): Trait definitions by name.
+    Returns:
+        dict: The derived sheet (see evaluate_build).
+    Raises:
+        BuildValidationError: If a serialized build names unknown data.
+        ShareCodeError: If a share code is malformed.
+    """
+    return evaluate_build(load_character(build, catalog), catalog, trait_registry)
+
+def main(argv=None, stdout=None, stdin=None):
+    """
+    Evaluate builds and print one JSON sheet per line.
+    - Builds that cannot be loaded or evaluated print {"source": ..., "error": ...} and the
+      run continues.
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+        stdout (file, optional): Output stream. Defaults to sys.stdout.
+        stdin (file, optional): Stream read for "-". Defaults to sys.stdin.
+    Returns:
+        int: 0 if every build loaded, 1 if some did not, 2 if the game data could not be loaded.
+    """
+    parser = argparse.ArgumentParser(
+        prog="wotr-planner",
+        description="Evaluate builds and print their derived sheets as JSON lines.",
+    )
+    parser.add_argument("builds", nargs="+", help="build files (.json, .jsonl), share codes, or - for stdin")
+    parser.add_argument("--pack", action="append", dest="packs", metavar="DIR",
+                        help="data pack directory, lowest priority first (defaults to the installed packs)")
+    parser.add_argument("--no-packs", action="store_true", help="use only the bundled game data")
+    parser.add_argument("--indent", type=int, help="pretty-print each sheet with this indent")
+    args = parser.parse_args(argv)
+    out = stdout or sys.stdout
+
+    try:
+        packs = [] if args.no_packs else default_pack_dirs() if args.packs is None else args.packs
+        catalog = DataPacks(packs).catalog()
+    except (DataValidationError, OSError, ValueError) as exc:
+        print(f"Could not load game data: {exc}", file=sys.stderr)
+        return 2
+    trait_registry = catalog.trait_registry()
+
+    failed = False
+    for label, build, error in read_builds(args.builds, stdin):
+        if error is None:
+            try:
+                result = {"source": label, **evaluate_source(build, catalog, trait_registry)}
+            except (BuildValidationError, ShareCodeError) as exc:
+                error = str(exc)
+            except Exception as exc: # Keep evaluating the other builds
+                error = f"{type(exc).__name__}: {exc}"
+        if error is not None:
+            failed = True
+            result = {"source": label, "error": error}
+        out.write(json.dumps(result, indent=args.indent) + "\n")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Write-behind autosave of the character being edited.
+- The GUI thread only serializes a snapshot and puts it on a bounded queue.
+- A worker thread merges bursts of snapshots and writes them in one transaction.
+"""
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+import weakref
+from wotr_planner.db.database import connect
+
+AUTOSAVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS autosave (
+    slot TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL,
+    build TEXT NOT NULL
+)
+"""
+
+# Queue item that tells the worker to exit
+_STOP = object()
+# Running workers, flushed by the exit and crash hooks
+_active_workers = weakref.WeakSet()
+_hooks_installed = False
+# sys.excepthook replaced by _excepthook
+_previous_excepthook = None
+
+class AutosaveWorker:
+    """
+    Background writer for autosave snapshots.
+    - submit() never blocks: when the queue is full the oldest snapshot is dropped,
+      since only the latest state of a slot is worth saving.
+    - The worker owns its SQLite connection, so slow disks only stall the worker.
+    """
+    def __init__(self, path=None, max_pending=64):
+        """
+        Initialize and start an AutosaveWorker.
+        Args:
+            path (str | Path, optional): Database file. Defaults to default_db_path().
+            max_pending (int, optional): Maximum queued snapshots. Defaults to 64.
+        """
+        self.path = path
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.writes = 0 # Number of transactions committed
+        self.error = None # Last exception raised by the worker
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+        _active_workers.add(self)
+        install_exit_hooks()
+
+    def submit(self, build, slot="current"):
+        """
+        Queue a snapshot for saving without blocking.
+        Args:
+            build (dict): Serialized build (see models.serialization.character_to_dict).
+            slot (str, optional): Autosave slot name. Defaults to "current".
+        """
+        item = (slot, time.time(), json.dumps(build, separators=(",", ":")))
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except queue.Empty:
+                    pass
+
+    def flush(self):
+        """
+        Block until every queued snapshot has been written.
+        - Does nothing once the worker has stopped, since nothing would drain the queue.
+        """
+        if self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """
+        Flush pending snapshots and stop the worker thread.
+        """
+        if not self.thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        self.thread.join()
+
+    def _run(self):
+        """
+        Worker loop: wait for a snapshot, drain the burst behind it, write the latest per slot.
+        """
+        conn = connect(self.path)
+        conn.execute(AUTOSAVE_SCHEMA)
+        try:
+            stop = False
+            while not stop:
+                items = [self.queue.get()]
+                # Merge everything queued behind the first snapshot
+                while True:
+                    try:
+                        items.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                latest = {}
+                for item in items:
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        latest[item[0]] = item
+                try:
+                    if latest:
+                        with conn:
+                            conn.executemany(
+                                "INSERT OR REPLACE INTO autosave (slot, saved_at, build) VALUES (?, ?, ?)",
+                                latest.values()
+                            )
+                        self.writes += 1
+                except Exception as exc: # Keep the worker alive; report through self.error
+                    self.error = exc
+                finally:
+                    for _ in items:
+                        self.queue.task_done()
+        finally:
+            conn.close()
+
+def flush_all():
+    """
+    Write every snapshot queued on running autosave workers, leaving them running.
+    """
+    for worker in list(_active_workers):
+        worker.flush()
+
+def close_all():
+    """
+    Flush and stop every running autosave worker.
+    """
+    for worker in list(_active_workers):
+        worker.close()
+
+def install_exit_hooks():
+    """
+    Flush pending autosaves at interpreter exit and before an unhandled exception is reported.
+    - Without a custom excepthook PyQt aborts the process after an exception escapes a
+      slot, so the hook may be the last chance to write queued snapshots. With one
+      installed (this hook included) the application keeps running, so the hook only
+      flushes; workers are stopped at exit or by their owner.
+    - Installed once per process.
+    """
+    global _hooks_installed, _previous_excepthook
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+    atexit.register(close_all)
+    _previous_excepthook = sys.excepthook
+    sys.excepthook = _excepthook
+
+def _excepthook(*exc_info):
+    flush_all()
+    _previous_excepthook(*exc_info)
+
+def recover(path=None, slot="current"):
+    """
+    Read the last autosaved snapshot of a slot.
+    Args:
+        path (str | Path, optional): Database file. Defaults to default_db_path().
+        slot (str, optional): Autosave slot name. Defaults to "current".
+    Returns:
+        dict | None: The serialized build, or None if nothing was saved.
+    """
+    conn = connect(path)
+    try:
+        conn.execute(AUTOSAVE_SCHEMA)
+        row = conn.execute("SELECT build FROM autosave WHERE slot = ?", (slot,)).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row[0]) if row else None
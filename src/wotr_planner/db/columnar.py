@@ -0,0 +1,274 @@
+"""
+Append-only, memory-mapped columnar store for very large build libraries.
+- A store is a directory with one raw little-endian file per column plus meta.json.
+- Columns are read zero-copy with np.memmap, so filters touch only the columns they use
+  and never deserialize rows.
+- Rows are appended by writing every column file, then atomically replacing meta.json;
+  readers only see rows counted in meta.json, so a crashed append is invisible.
+- Requires NumPy (the "analysis" extra).
+"""
+import json
+import os
+from pathlib import Path
+import numpy as np
+from wotr_planner.models.build_matrix import BuildMatrix, BuildTables
+from wotr_planner.models.character import SKILLS, STATS
+from wotr_planner.models.progression import MAX_LEVEL
+
+# Version 2 added class_levels; version 3 added catalog fingerprints
+FORMAT_VERSION = 3
+# Kinds whose IDs the columns store
+STORED_KINDS = ("races", "heritages", "classes", "backgrounds", "feats")
+# Column name -> (dtype, per-row shape); the feat bitset width depends on the catalog
+COLUMNS = {
+    "source_id": ("<i8", ()),
+    "race": ("<i2", ()),
+    "heritage": ("<i2", ()),
+    "char_class": ("<i2", ()),
+    "background": ("<i2", ()),
+    "level": ("i1", ()),
+    "point_buy": ("i1", (len(STATS),)),
+    "skill_ranks": ("i1", (len(SKILLS),)),
+    "class_levels": ("<i2", (MAX_LEVEL,)),
+}
+
+class ColumnStoreError(ValueError):
+    """
+    Raised when a store is malformed or does not match the catalog.
+    """
+
+class ColumnStore:
+    """
+    Columnar build store over a directory of memory-mapped files.
+    - IDs are catalog IDs (-1 for none or unknown); feats are packed bitsets,
+      bit i (most significant first) set when the build has catalog feat i.
+    - source_id links a row back to its SQLite character ID, or 0.
+    - class_levels holds the class ID taken at each level of multiclass builds, and -1
+      throughout for single-class builds.
+    - meta.json keeps Catalog.fingerprint of every stored kind, so a store is not opened
+      with data whose IDs have moved (reordered or renamed records).
+    """
+    def __init__(self, path, catalog):
+        """
+        Open or create a ColumnStore.
+        Args:
+            path (str | Path): Store directory.
+            catalog (Catalog): Game data the stored IDs refer to.
+        Raises:
+            ColumnStoreError: If the store has another format, or was written with game
+                data whose IDs differ.
+        """
+        self.path = Path(path)
+        self.catalog = catalog
+        self.tables = None
+        self.maps = {}
+        feat_count = len(catalog.records("feats"))
+        fingerprints = {kind: catalog.fingerprint(kind) for kind in STORED_KINDS}
+        meta_file = self.path / "meta.json"
+        if meta_file.exists():
+            self.meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            if self.meta.get("version") != FORMAT_VERSION:
+                raise ColumnStoreError(f"Unsupported column store version: {self.meta.get('version')}")
+            if self.meta["feat_count"] != feat_count:
+                raise ColumnStoreError("Column store was written with a different feat list")
+            changed = [kind for kind in STORED_KINDS if self.meta["fingerprints"].get(kind) != fingerprints[kind]]
+            if changed:
+                raise ColumnStoreError(f"Column store was written with different game data: {', '.join(changed)}")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.meta = {"version": FORMAT_VERSION, "rows": 0, "feat_count": feat_count, "fingerprints": fingerprints}
+            self._write_meta()
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def reload(self):
+        """
+        Pick up rows appended by another writer since the store was opened.
+        """
+        self.meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.maps = {}
+
+    def layout(self):
+        """
+        Get the dtype and per-row shape of every column.
+        Returns:
+            dict: Column name -> (dtype, per-row shape).
+        """
+        return {**COLUMNS, "feats": ("u1", ((self.meta["feat_count"] + 7) // 8,))}
+
+    def _write_meta(self):
+        """
+        Atomically replace meta.json.
+        """
+        temp = self.path / "meta.json.tmp"
+        temp.write_text(json.dumps(self.meta), encoding="utf-8")
+        os.replace(temp, self.path / "meta.json")
+
+    def column(self, name):
+        """
+        Get a column as a read-only memory-mapped array.
+        Args:
+            name (str): Column name (see layout).
+        Returns:
+            np.ndarray: (rows,) or (rows, width) array backed by the column file.
+        """
+        if name not in self.maps:
+            dtype, row_shape = self.layout()[name]
+            shape = (len(self), *row_shape)
+            if len(self) == 0:
+                self.maps[name] = np.zeros(shape, dtype=dtype)
+            else:
+                self.maps[name] = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode="r", shape=shape)
+        return self.maps[name]
+
+    def append(self, matrix, source_ids=None):
+        """
+        Append builds to the store.
+        Args:
+            matrix (BuildMatrix): Builds to append, with IDs from this store's catalog.
+            source_ids (array-like, optional): SQLite character ID per build. Defaults to 0.
+        Returns:
+            int: The new row count.
+        """
+        count = len(matrix)
+        if count == 0:
+            return len(self)
+        if matrix.feats.shape[1] != self.meta["feat_count"]:
+            raise ColumnStoreError("Builds use a different feat list than the column store")
+        values = {
+            "source_id": np.zeros(count) if source_ids is None else source_ids,
+            "race": matrix.race,
+            "heritage": matrix.heritage,
+            "char_class": matrix.char_class,
+            "background": matrix.background,
+            "level": matrix.level,
+            "point_buy": matrix.point_buy,
+            "skill_ranks": matrix.skill_ranks,
+            "class_levels": matrix.class_levels,
+            "feats": np.packbits(matrix.feats, axis=1),
+        }
+        rows = len(self)
+        for name, (dtype, row_shape) in self.layout().items():
+            data = np.ascontiguousarray(values[name], dtype=dtype).reshape(count, *row_shape)
+            with open(self.path / f"{name}.bin", "r+b" if rows else "wb") as f:
+                # Drop bytes left behind by an append that never reached meta.json
+                f.truncate(rows * int(np.prod(row_shape)) * np.dtype(dtype).itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(data.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta["rows"] = rows + count
+        self._write_meta()
+        self.maps = {}
+        return len(self)
+
+    def append_repository(self, repository, batch_size=10000):
+        """
+        Copy every build of a SQLite library into the store.
+        - Builds are read in ID batches with BuildMatrix.from_repository, so memory stays bounded.
+        Args:
+            repository (CharacterRepository): Build library using the same catalog.
+            batch_size (int, optional): Builds per batch. Defaults to 10000.
+        Returns:
+            int: The new row count.
+        """
+        ids = []
+        for (char_id,) in repository.conn.execute("SELECT id FROM characters ORDER BY id"):
+            ids.append(char_id)
+            if len(ids) == batch_size:
+                self._append_ids(repository, ids)
+                ids = []
+        if ids:
+            self._append_ids(repository, ids)
+        return len(self)
+
+    def _append_ids(self, repository, ids):
+        """
+        Append one batch of saved builds.
+        Args:
+            repository (CharacterRepository): Build library.
+            ids (list): Character IDs in the batch.
+        """
+        self.append(BuildMatrix.from_repository(repository, ids, self.build_tables()), ids)
+
+    def build_tables(self):
+        """
+        Get the catalog lookup tables, built on first use.
+        Returns:
+            BuildTables: Tables for this store's catalog.
+        """
+        if self.tables is None:
+            self.tables = BuildTables(self.catalog)
+        return self.tables
+
+    def select(self, race=None, heritage=None, char_class=None, background=None,
+               min_level=None, max_level=None, feats=()):
+        """
+        Find rows matching every given filter, reading only the filtered columns.
+        Args:
+            race (str, optional): Race name.
+            heritage (str, optional): Heritage name; requires race.
+            char_class (str, optional): Class name.
+            background (str, optional): Background name.
+            min_level (int, optional): Lowest level.
+            max_level (int, optional): Highest level.
+            feats (iterable, optional): Feat names every row must have.
+        Returns:
+            np.ndarray: Matching row numbers in ascending order.
+        Raises:
+            ColumnStoreError: If a name is not in the catalog.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, kind, key in (
+            ("race", "races", race),
+            ("heritage", "heritages", (race, heritage) if heritage is not None else None),
+            ("char_class", "classes", char_class),
+            ("background", "backgrounds", background),
+        ):
+            if key is not None:
+                mask &= self.column(column) == self._require_id(kind, key)
+        if min_level is not None:
+            mask &= self.column("level") >= min_level
+        if max_level is not None:
+            mask &= self.column("level") <= max_level
+        packed = self.column("feats")
+        for name in feats:
+            feat_id = self._require_id("feats", name)
+            mask &= (packed[:, feat_id >> 3] >> (7 - (feat_id & 7))) & 1 == 1
+        return np.flatnonzero(mask)
+
+    def _require_id(self, kind, key):
+        """
+        Get a catalog ID, raising if it is unknown.
+        """
+        record_id = self.catalog.id_of(kind, key)
+        if record_id is None:
+            raise ColumnStoreError(f"Unknown {kind[:-1]}: {key[-1] if isinstance(key, tuple) else key}")
+        return record_id
+
+    def matrix(self, rows=None):
+        """
+        Get stored builds as a BuildMatrix for comparison and analysis.
+        - Without rows the matrix wraps the memory maps; only feats are unpacked.
+        Args:
+            rows (array-like, optional): Row numbers, e.g. from select(). Defaults to every row.
+        Returns:
+            BuildMatrix: The builds; selected rows are labelled by source ID.
+        """
+        pick = (lambda a: a) if rows is None else (lambda a: a[np.asarray(rows, dtype=np.intp)])
+        labels = None if rows is None else [f"#{i}" for i in pick(self.column("source_id")).tolist()]
+        feats = np.unpackbits(pick(self.column("feats")), axis=1, count=self.meta["feat_count"])
+        return BuildMatrix(
+            self.build_tables(),
+            pick(self.column("race")),
+            pick(self.column("heritage")),
+            pick(self.column("char_class")),
+            pick(self.column("background")),
+            pick(self.column("level")),
+            pick(self.column("point_buy")),
+            pick(self.column("skill_ranks")),
+            feats,
+            labels=labels,
+            class_levels=pick(self.column("class_levels")),
+        )
@@ -1,18 +1,461 @@
+import json
+import os
 import sqlite3
+from pathlib import Path
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character, STATS
+from wotr_planner.models.progression import ClassLevels
+from wotr_planner.models.serialization import class_level_names
+from wotr_planner.models.share_code import ShareCodeError, encode_build
 
-DB_FILE = "characters.db"
-
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS characters (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            race TEXT,
-            class TEXT,
-            level INTEGER
+# Default database location, overridable with the WOTR_PLANNER_DB environment variable
+DB_FILE = Path.home() / ".wotr_planner" / "characters.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    race TEXT,
+    class TEXT,
+    level INTEGER,
+    heritage TEXT,
+    background TEXT,
+    archetype TEXT,
+    pb_str INTEGER NOT NULL DEFAULT 10,
+    pb_dex INTEGER NOT NULL DEFAULT 10,
+    pb_con INTEGER NOT NULL DEFAULT 10,
+    pb_int INTEGER NOT NULL DEFAULT 10,
+    pb_wis INTEGER NOT NULL DEFAULT 10,
+    pb_cha INTEGER NOT NULL DEFAULT 10,
+    notes TEXT NOT NULL DEFAULT '',
+    build_code TEXT,
+    class_levels TEXT
+);
+CREATE TABLE IF NOT EXISTS character_feats (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    feat TEXT NOT NULL,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS character_skills (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    ranks INTEGER NOT NULL,
+    PRIMARY KEY (character_id, skill)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_characters_race_class_level ON characters (race, class, level);
+CREATE INDEX IF NOT EXISTS idx_characters_class_level ON characters (class, level);
+CREATE INDEX IF NOT EXISTS idx_characters_heritage ON characters (heritage, race);
+CREATE INDEX IF NOT EXISTS idx_characters_level ON characters (level);
+CREATE INDEX IF NOT EXISTS idx_character_feats_feat ON character_feats (feat, character_id);
+CREATE INDEX IF NOT EXISTS idx_characters_build_code ON characters (build_code);
+"""
+
+# Full-text index over build names and notes, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS characters_fts USING fts5(
+    name, notes, content='characters', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS characters_fts_insert AFTER INSERT ON characters BEGIN
+    INSERT INTO characters_fts (rowid, name, notes) VALUES (new.id, new.name, new.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS characters_fts_delete AFTER DELETE ON characters BEGIN
+    INSERT INTO characters_fts (characters_fts, rowid, name, notes)
+    VALUES ('delete', old.id, old.name, old.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS characters_fts_update AFTER UPDATE OF name, notes ON characters BEGIN
+    INSERT INTO characters_fts (characters_fts, rowid, name, notes)
+    VALUES ('delete', old.id, old.name, old.notes);
+    INSERT INTO characters_fts (rowid, name, notes) VALUES (new.id, new.name, new.notes);
+END;
+"""
+
+INSERT_CHARACTER = """
+INSERT INTO characters (
+    name, race, class, level, heritage, background, archetype,
+    pb_str, pb_dex, pb_con, pb_int, pb_wis, pb_cha, notes, build_code, class_levels
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_CHARACTERS = """
+SELECT id, name, race, class, level, heritage, background, archetype,
+       pb_str, pb_dex, pb_con, pb_int, pb_wis, pb_cha, notes, class_levels
+FROM characters
+"""
+
+def default_db_path() -> Path:
+    """
+    Get the database path used when none is given.
+    Returns:
+        Path: WOTR_PLANNER_DB if set, otherwise ~/.wotr_planner/characters.db.
+    """
+    return Path(os.environ.get("WOTR_PLANNER_DB", DB_FILE))
+
+def connect(path=None):
+    """
+    Open a connection configured for the planner.
+    - WAL journaling so readers don't block the writer.
+    - synchronous=NORMAL, which is durable enough with WAL and much faster.
+    Args:
+        path (str | Path, optional): Database file, or ":memory:". Defaults to default_db_path().
+    Returns:
+        sqlite3.Connection: The open connection with the schema created.
+    """
+    path = default_db_path() if path is None else path
+    if str(path) != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    migrate(conn)
+    conn.executescript(SCHEMA)
+    create_fts(conn)
+    return conn
+
+def has_fts(conn) -> bool:
+    """
+    Check whether the full-text index exists on a connection.
+    Args:
+        conn (sqlite3.Connection): Open connection.
+    Returns:
+        bool: True if characters_fts exists.
+    """
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'characters_fts'"
+    ).fetchone() is not None
+
+def create_fts(conn):
+    """
+    Create the FTS5 index over build names and notes.
+    - Existing rows are indexed when the table is first created.
+    - Silently skipped when SQLite was built without FTS5; text queries then fall back to LIKE.
+    Args:
+        conn (sqlite3.Connection): Open connection.
+    """
+    existed = has_fts(conn)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        return
+    if not existed:
+        with conn:
+            conn.execute("INSERT INTO characters_fts (characters_fts) VALUES ('rebuild')")
+
+def migrate(conn):
+    """
+    Add columns missing from databases created by older versions.
+    - The original characters table only had name, race, class and level.
+    Args:
+        conn (sqlite3.Connection): Open connection.
+    """
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(characters)")}
+    if not existing:
+        return # Fresh database, created by SCHEMA
+    added = {
+        "heritage": "TEXT",
+        "background": "TEXT",
+        "archetype": "TEXT",
+        **{f"pb_{stat.lower()}": "INTEGER NOT NULL DEFAULT 10" for stat in STATS},
+        "notes": "TEXT NOT NULL DEFAULT ''",
+        "build_code": "TEXT",
+        "class_levels": "TEXT",
+    }
+    with conn:
+        for column, decl in added.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE characters ADD COLUMN {column} {decl}")
+
+def _class_levels_column(character):
+    """
+    Get the class_levels column value of a character.
+    Args:
+        character (Character): Character to save.
+    Returns:
+        str | None: JSON list of the class name taken at each level, or None when
+            every level is in the character's class.
+    """
+    names = class_level_names(character)
+    return None if names is None else json.dumps(names)
+
+def init_db(path=None):
+    """
+    Create the database schema if it does not exist.
+    Args:
+        path (str | Path, optional): Database file. Defaults to default_db_path().
+    """
+    connect(path).close()
+
+class CharacterRepository:
+    """
+    Data access layer for saved characters.
+    - Holds one long-lived connection; statements are reused from sqlite3's cache.
+    - Bulk operations use executemany inside a single transaction.
+    - Names are resolved back to data records through the catalog on load.
+    """
+    def __init__(self, path=None, catalog=None, conn=None):
+        """
+        Initialize a CharacterRepository.
+        Args:
+            path (str | Path, optional): Database file. Defaults to default_db_path().
+            catalog (Catalog, optional): Game data for loading. Defaults to the bundled data.
+            conn (sqlite3.Connection, optional): Existing connection to reuse instead of path.
+        """
+        self.conn = conn or connect(path)
+        self.catalog = catalog or default_catalog()
+
+    def close(self):
+        """
+        Close the underlying connection.
+        """
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def save(self, character):
+        """
+        Save a single character as a new row.
+        Args:
+            character (Character): Character to save.
+        Returns:
+            int: The new character ID.
+        """
+        return self.save_many([character])[0]
+
+    def save_many(self, characters, dedupe=False):
+        """
+        Save characters as new rows in one transaction.
+        - Characters, feats and skills are each bulk inserted with executemany.
+        - SQLite assigns each ID (AUTOINCREMENT), so IDs of deleted rows are never reused
+          and concurrent writers cannot collide. AUTOINCREMENT IDs only grow and the
+          transaction holds the write lock, so the new rows are the highest len(rows) IDs.
+        - Each row stores the build's share code, which serves as a dedup key.
+        Args:
+            characters (iterable): Characters to save.
+            dedupe (bool, optional): Skip builds whose share code is already saved
+                (or repeats earlier in the batch) and return the existing ID. Defaults to False.
+        Returns:
+            list: Character IDs, in input order.
+        """
+        with self.conn:
+            # Per input: (existing ID, None) or (None, index of its new row)
+            refs, rows, new = [], [], []
+            known = {}
+            for character in characters:
+                code = self.build_code(character)
+                if dedupe and code is not None:
+                    if code not in known:
+                        existing = self.find_by_code(code)
+                        if existing is not None:
+                            known[code] = (existing, None)
+                    if code in known:
+                        refs.append(known[code])
+                        continue
+                    known[code] = (None, len(rows))
+                refs.append((None, len(rows)))
+                rows.append(self._character_row(character, code))
+                new.append(character)
+            self.conn.executemany(INSERT_CHARACTER, rows)
+            new_ids = [row[0] for row in self.conn.execute(
+                "SELECT id FROM characters ORDER BY id DESC LIMIT ?", (len(rows),)
+            )][::-1]
+            feat_rows, skill_rows = [], []
+            for char_id, character in zip(new_ids, new):
+                feat_rows.extend(
+                    (char_id, position, feat["name"]) for position, feat in enumerate(character.feats)
+                )
+                skill_rows.extend(
+                    (char_id, skill, ranks) for skill, ranks in character.skill_ranks.items() if ranks
+                )
+            self.conn.executemany(
+                "INSERT INTO character_feats (character_id, position, feat) VALUES (?, ?, ?)", feat_rows
+            )
+            self.conn.executemany(
+                "INSERT INTO character_skills (character_id, skill, ranks) VALUES (?, ?, ?)", skill_rows
+            )
+        return [existing if index is None else new_ids[index] for existing, index in refs]
+
+    def build_code(self, character):
+        """
+        Get the share code of a character's build.
+        Args:
+            character (Character): Character to encode.
+        Returns:
+            str | None: The share code, or None if the build uses data outside the catalog.
+        """
+        try:
+            return encode_build(character, self.catalog)
+        except ShareCodeError:
+            return None
+
+    def find_by_code(self, code):
+        """
+        Find a saved build by share code.
+        Args:
+            code (str): Share code.
+        Returns:
+            int | None: ID of the oldest matching build, or None.
+        """
+        row = self.conn.execute(
+            "SELECT MIN(id) FROM characters WHERE build_code = ?", (code,)
+        ).fetchone()
+        return row[0]
+
+    def delete(self, character_id):
+        """
+        Delete a saved character and its feats and skills.
+        Args:
+            character_id (int): ID of the character.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM characters WHERE id = ?", (character_id,))
+
+    def count(self) -> int:
+        """
+        Count saved characters.
+        Returns:
+            int: Number of rows in the characters table.
+        """
+        return self.conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+
+    def load(self, character_id):
+        """
+        Load a saved character.
+        Args:
+            character_id (int): ID of the character.
+        Returns:
+            Character | None: The character, or None if no such ID exists.
+        """
+        row = next(self.iter_characters(character_id, character_id), None)
+        return row[1] if row else None
+
+    def load_many(self, character_ids):
+        """
+        Load saved characters by ID, reading each table with one IN (...) query.
+        Args:
+            character_ids (list): Character IDs; keep batches within SQLite's variable limit.
+        Returns:
+            dict: Character ID -> Character, for the IDs that exist.
+        """
+        ids = list(character_ids)
+        if not ids:
+            return {}
+        marks = ", ".join("?" * len(ids))
+        characters = {
+            row[0]: self._character_from_row(row)
+            for row in self.conn.execute(SELECT_CHARACTERS + f"WHERE id IN ({marks})", ids)
+        }
+        feats = self.conn.execute(
+            f"SELECT character_id, feat FROM character_feats WHERE character_id IN ({marks}) "
+            "ORDER BY character_id, position", ids
+        )
+        for char_id, feat in feats:
+            characters[char_id].feats.append(self.catalog.get("feats", feat) or {"name": feat})
+        skills = self.conn.execute(
+            f"SELECT character_id, skill, ranks FROM character_skills WHERE character_id IN ({marks})", ids
+        )
+        for char_id, skill, ranks in skills:
+            characters[char_id].skill_ranks[skill] = ranks
+        for character in characters.values():
+            character.recalculate_stats()
+        return characters
+
+    def iter_characters(self, first_id=None, last_id=None):
+        """
+        Stream saved characters in ID order.
+        - Characters, feats and skills are read with three ordered cursors and merged,
+          so memory use does not grow with the number of rows.
+        Args:
+            first_id (int, optional): Lowest ID to include.
+            last_id (int, optional): Highest ID to include.
+        Yields:
+            tuple: (character ID, Character).
+        """
+        low = 0 if first_id is None else first_id
+        high = -1 if last_id is None else last_id
+        bounds = "WHERE {col} >= ? AND ({col} <= ? OR ? < 0)"
+        params = (low, high, high)
+        rows = self.conn.execute(SELECT_CHARACTERS + bounds.format(col="id") + " ORDER BY id", params)
+        feats = self.conn.execute(
+            "SELECT character_id, feat FROM character_feats "
+            + bounds.format(col="character_id") + " ORDER BY character_id, position", params
+        )
+        skills = self.conn.execute(
+            "SELECT character_id, skill, ranks FROM character_skills "
+            + bounds.format(col="character_id") + " ORDER BY character_id", params
+        )
+        feat_row = next(feats, None)
+        skill_row = next(skills, None)
+        for row in rows:
+            char_id = row[0]
+            character = self._character_from_row(row)
+            # Skip child rows of characters outside the stream (should not happen with FKs)
+            while feat_row and feat_row[0] < char_id:
+                feat_row = next(feats, None)
+            while feat_row and feat_row[0] == char_id:
+                character.feats.append(self.catalog.get("feats", feat_row[1]) or {"name": feat_row[1]})
+                feat_row = next(feats, None)
+            while skill_row and skill_row[0] < char_id:
+                skill_row = next(skills, None)
+            while skill_row and skill_row[0] == char_id:
+                character.skill_ranks[skill_row[1]] = skill_row[2]
+                skill_row = next(skills, None)
+            character.recalculate_stats()
+            yield char_id, character
+
+    @staticmethod
+    def _character_row(character, code=None):
+        """
+        Build the characters table row for a character.
+        Args:
+            character (Character): Character to save.
+            code (str, optional): Share code of the build.
+        Returns:
+            tuple: Values in INSERT_CHARACTER column order.
+        """
+        return (
+            character.name,
+            character.race.get("name"),
+            character.char_class.get("name"),
+            character.level,
+            character.heritage.get("name") if character.heritage else None,
+            character.background.get("name") if character.background else None,
+            getattr(character, "archetype", None),
+            *(character.point_buy_stats[stat] for stat in STATS),
+            getattr(character, "notes", ""),
+            code,
+            _class_levels_column(character),
+        )
+
+    def _character_from_row(self, row):
+        """
+        Build a Character from a characters table row.
+        - Records missing from the catalog are kept as {"name": ...} stubs.
+        Args:
+            row (tuple): Row in SELECT_CHARACTERS column order.
+        Returns:
+            Character: The character without feats or skill ranks.
+        """
+        _, name, race, char_class, level, heritage, background, archetype = row[:8]
+        character = Character(
+            char_class=self.catalog.get("classes", char_class) or {"name": char_class},
+            race=self.catalog.get("races", race) or {"name": race},
         )
-    ''')
-    conn.commit()
-    conn.close()
\ No newline at end of file
+        character.name = name or ""
+        character.level = level
+        if heritage:
+            character.heritage = self.catalog.heritage(race, heritage) or {"name": heritage, "race": race}
+        if background:
+            character.background = self.catalog.get("backgrounds", background) or {"name": background}
+        character.archetype = archetype
+        character.point_buy_stats = dict(zip(STATS, row[8:14]))
+        character.notes = row[14]
+        if row[15]:
+            character.class_levels = ClassLevels(
+                self.catalog.get("classes", name) or {"name": name} for name in json.loads(row[15])
+            )
+        return character
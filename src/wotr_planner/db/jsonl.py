@@ -0,0 +1,144 @@
+"""
+Streaming JSONL import/export of build libraries.
+- One serialized build (see models.serialization) per line.
+- Files are read and written line by line, so memory use is independent of file size.
+"""
+import json
+import os
+from contextlib import contextmanager
+from wotr_planner.models.serialization import BuildValidationError, character_from_dict, character_to_dict
+
+class ImportResult:
+    """
+    Summary of a JSONL import.
+    - Keeps at most max_errors error messages; error_count counts all of them.
+    """
+    def __init__(self, max_errors=100):
+        """
+        Initialize an empty ImportResult.
+        Args:
+            max_errors (int, optional): Maximum number of error messages kept. Defaults to 100.
+        """
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, line_number, message):
+        """
+        Record an invalid line.
+        Args:
+            line_number (int): 1-based line number in the source file.
+            message (str): Description of the problem.
+        """
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(f"line {line_number}: {message}")
+
+@contextmanager
+def _open(target, mode):
+    """
+    Open a path, or pass through an already open text file.
+    Args:
+        target (str | Path | file): Path or open file object.
+        mode (str): File mode used for paths.
+    Yields:
+        file: Open text file.
+    """
+    if not isinstance(target, (str, os.PathLike)):
+        yield target
+    else:
+        with open(target, mode, encoding="utf-8", newline="\n") as handle:
+            yield handle
+
+def export_jsonl(characters, target):
+    """
+    Write characters to a JSONL file one line at a time.
+    Args:
+        characters (iterable): Characters, or (ID, Character) pairs as yielded by
+            CharacterRepository.iter_characters.
+        target (str | Path | file): Output path or open text file.
+    Returns:
+        int: Number of builds written.
+    """
+    count = 0
+    with _open(target, "w") as out:
+        for character in characters:
+            if isinstance(character, tuple):
+                character = character[1]
+            out.write(json.dumps(character_to_dict(character), separators=(",", ":")))
+            out.write("\n")
+            count += 1
+    return count
+
+def iter_jsonl(source, catalog, result=None):
+    """
+    Stream characters from a JSONL file, validating each against the catalog.
+    - Blank lines are skipped.
+    - Invalid lines raise, unless a result is given to collect them instead.
+    Args:
+        source (str | Path | file): Input path or open text file.
+        catalog (Catalog): Game data used to resolve names.
+        result (ImportResult, optional): Collects errors instead of raising.
+    Yields:
+        tuple: (line number, Character).
+    Raises:
+        BuildValidationError: On an invalid line when no result is given.
+    """
+    with _open(source, "r") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, character_from_dict(json.loads(line), catalog)
+            except (json.JSONDecodeError, BuildValidationError) as exc:
+                if result is None:
+                    raise BuildValidationError(f"line {line_number}: {exc}") from exc
+                result.add_error(line_number, str(exc))
+
+class _LineReader:
+    """
+    Iterate UTF-8 lines of a binary file while tracking bytes consumed.
+    """
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for line in self.raw:
+            self.bytes_read += len(line)
+            yield line.decode("utf-8", errors="replace")
+
+def import_jsonl(source, repository, batch_size=1000, progress=None, max_errors=100):
+    """
+    Import builds from a JSONL file into the database in batches.
+    - Each batch is inserted with CharacterRepository.save_many (one transaction).
+    - Invalid lines are skipped and reported in the result.
+    Args:
+        source (str | Path): Input path.
+        repository (CharacterRepository): Destination repository; its catalog validates builds.
+        batch_size (int, optional): Builds per transaction. Defaults to 1000.
+        progress (callable, optional): Called as progress(bytes_read, total_bytes, imported)
+            after every batch.
+        max_errors (int, optional): Maximum number of error messages kept. Defaults to 100.
+    Returns:
+        ImportResult: Counts and error messages.
+    """
+    result = ImportResult(max_errors)
+    total = os.path.getsize(source)
+    with open(source, "rb") as raw:
+        # Text wrapper over a binary file so the byte position can be reported
+        handle = _LineReader(raw)
+        batch = []
+        for _, character in iter_jsonl(handle, repository.catalog, result):
+            batch.append(character)
+            if len(batch) >= batch_size:
+                result.imported += len(repository.save_many(batch))
+                batch = []
+                if progress:
+                    progress(handle.bytes_read, total, result.imported)
+        if batch:
+            result.imported += len(repository.save_many(batch))
+        if progress:
+            progress(handle.bytes_read, total, result.imported)
+    return result
@@ -0,0 +1,197 @@
+"""
+Query API over the saved build library.
+- Filters map onto the secondary indexes created in db/database.py.
+- Results stream from the SQLite cursor instead of being materialized.
+"""
+from itertools import islice
+from wotr_planner.db.database import has_fts
+
+# Columns returned by BuildQuery.rows()
+SUMMARY_COLUMNS = ("id", "name", "race", "heritage", "class", "level")
+# Builds loaded per batch by BuildQuery.characters; below SQLite's default variable limit
+LOAD_BATCH = 500
+
+class BuildQuery:
+    """
+    Composable query over saved builds.
+    - Each filter method returns the query so calls can be chained:
+      BuildQuery(conn).race("Aasimar").char_class("Wizard").min_level(8).with_feats("Spell Focus")
+    """
+    def __init__(self, conn):
+        """
+        Initialize an unfiltered BuildQuery.
+        Args:
+            conn (sqlite3.Connection): Connection to the build library.
+        """
+        self.conn = conn
+        self.conditions = []
+        self.params = []
+        self.order = "id"
+        self.limit_count = None
+
+    def _where(self, condition, *params):
+        """
+        Add a condition and its parameters.
+        Args:
+            condition (str): SQL condition with ? placeholders.
+            *params: Values bound to the placeholders.
+        Returns:
+            BuildQuery: This query.
+        """
+        self.conditions.append(condition)
+        self.params.extend(params)
+        return self
+
+    def race(self, name):
+        """
+        Filter by race name.
+        """
+        return self._where("race = ?", name)
+
+    def heritage(self, name):
+        """
+        Filter by heritage name.
+        """
+        return self._where("heritage = ?", name)
+
+    def char_class(self, name):
+        """
+        Filter by class name.
+        """
+        return self._where("class = ?", name)
+
+    def min_level(self, level):
+        """
+        Filter to builds at or above a level.
+        """
+        return self._where("level >= ?", level)
+
+    def max_level(self, level):
+        """
+        Filter to builds at or below a level.
+        """
+        return self._where("level <= ?", level)
+
+    def after(self, char_id):
+        """
+        Filter to builds with a greater ID, to page through results ordered by id.
+        """
+        return self._where("id > ?", char_id)
+
+    def with_feats(self, *names):
+        """
+        Filter to builds that have every given feat.
+        - Each feat is an indexed lookup in character_feats (feat, character_id).
+        """
+        for name in names:
+            self._where("id IN (SELECT character_id FROM character_feats WHERE feat = ?)", name)
+        return self
+
+    def text(self, match):
+        """
+        Full-text filter over build names and notes.
+        - Uses FTS5 MATCH syntax when the index is available, otherwise a substring search.
+        Args:
+            match (str): FTS5 query, e.g. "sword* NOT bow".
+        """
+        if has_fts(self.conn):
+            return self._where("id IN (SELECT rowid FROM characters_fts WHERE characters_fts MATCH ?)", match)
+        pattern = f"%{match}%"
+        return self._where("(name LIKE ? OR notes LIKE ?)", pattern, pattern)
+
+    def order_by(self, column, descending=False):
+        """
+        Set the result order.
+        Args:
+            column (str): One of SUMMARY_COLUMNS.
+            descending (bool, optional): Sort descending. Defaults to False.
+        Raises:
+            ValueError: If the column is not a summary column.
+        """
+        if column not in SUMMARY_COLUMNS:
+            raise ValueError(f"Cannot order by {column}")
+        self.order = f"{column} DESC" if descending else column
+        return self
+
+    def limit(self, count):
+        """
+        Limit the number of results.
+        """
+        self.limit_count = count
+        return self
+
+    def sql(self, columns=SUMMARY_COLUMNS):
+        """
+        Build the SQL statement for this query.
+        Args:
+            columns (tuple, optional): Columns to select. Defaults to SUMMARY_COLUMNS.
+        Returns:
+            tuple: (SQL string, parameter list).
+        """
+        sql = f"SELECT {', '.join(columns)} FROM characters"
+        if self.conditions:
+            sql += " WHERE " + " AND ".join(self.conditions)
+        sql += f" ORDER BY {self.order}"
+        params = list(self.params)
+        if self.limit_count is not None:
+            sql += " LIMIT ?"
+            params.append(self.limit_count)
+        return sql, params
+
+    def explain(self):
+        """
+        Get SQLite's query plan for this query.
+        Returns:
+            list: Plan detail strings, e.g. "SEARCH characters USING INDEX ...".
+        """
+        sql, params = self.sql()
+        return [row[3] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    def rows(self):
+        """
+        Stream matching builds as summary rows.
+        Yields:
+            tuple: Values in SUMMARY_COLUMNS order.
+        """
+        sql, params = self.sql()
+        yield from self.conn.execute(sql, params)
+
+    def ids(self):
+        """
+        Stream IDs of matching builds.
+        Yields:
+            int: Character ID.
+        """
+        sql, params = self.sql(("id",))
+        for (char_id,) in self.conn.execute(sql, params):
+            yield char_id
+
+    def count(self) -> int:
+        """
+        Count matching builds.
+        Returns:
+            int: Number of matches (ignores limit).
+        """
+        sql = "SELECT COUNT(*) FROM characters"
+        if self.conditions:
+            sql += " WHERE " + " AND ".join(self.conditions)
+        return self.conn.execute(sql, self.params).fetchone()[0]
+
+    def characters(self, repository):
+        """
+        Stream matching builds as Character objects.
+        - Builds are loaded LOAD_BATCH at a time with CharacterRepository.load_many, so each
+          batch costs three queries instead of three per build.
+        Args:
+            repository (CharacterRepository): Repository to load the builds from.
+        Yields:
+            tuple: (character ID, Character), in query order.
+        """
+        ids = self.ids()
+        while True:
+            batch = list(islice(ids, LOAD_BATCH))
+            if not batch:
+                return
+            characters = repository.load_many(batch)
+            for char_id in batch:
+                yield char_id, characters[char_id]
@@ -0,0 +1,271 @@
+"""
+Constraint-based build finder.
+- Answers questions such as "every race/heritage/class that can have Power Attack, Cleave
+  and Dodge at level 3 with Int >= 12".
+- Searches race -> heritage -> class and prunes with bounds before doing exact work:
+  - a race is skipped when no heritage's maximum achievable stats (MAX_SCORE plus racial
+    modifiers) reach a required stat;
+  - a heritage is skipped when no point buy within the budget meets every stat at once,
+    which rules out all of its classes;
+  - a class is skipped when it has fewer feat slots at the level than feats to take.
+- Surviving candidates are scheduled with the feat planner and confirmed with
+  Character.validate_feats, so matches follow the same rules as the planner UI.
+- Matches are streamed as they are found; a search can be cancelled from another thread
+  and stops by itself once its time budget is spent.
+"""
+import threading
+import time
+from wotr_planner.models.character import Character, STATS
+from wotr_planner.models.feat_planner import FeatPlanner, planner_for
+from wotr_planner.models.point_buy import MAX_SCORE, cheapest_point_buy
+from wotr_planner.models.progression import MAX_LEVEL
+
+class BuildMatch:
+    """
+    A race, heritage and class that satisfy the constraints, with a plan to get there.
+    """
+    def __init__(self, race, heritage, char_class, level, point_buy, plan, feats):
+        """
+        Initialize a BuildMatch.
+        Args:
+            race (dict): Race record.
+            heritage (dict | None): Heritage record.
+            char_class (dict): Class record.
+            level (int): Level the constraints apply at.
+            point_buy (dict): Point buy meeting every stat requirement.
+            plan (FeatPlan): Feat route; empty when no feats were asked for.
+            feats (list): Feat records of the plan's steps, in order.
+        """
+        self.race = race
+        self.heritage = heritage
+        self.char_class = char_class
+        self.level = level
+        self.point_buy = point_buy
+        self.plan = plan
+        self.feats = feats
+
+    def character(self):
+        """
+        Build the matching character, with its planned feats.
+        Returns:
+            Character: Character at the constraint level.
+        """
+        character = Character(char_class=self.char_class, race=self.race)
+        character.heritage = self.heritage
+        character.level = self.level
+        character.point_buy_stats.update(self.point_buy)
+        character.feats = list(self.feats)
+        character.recalculate_stats()
+        return character
+
+    def to_dict(self):
+        """
+        Get a JSON-safe summary of the match.
+        Returns:
+            dict: race, heritage, class, level, point_buy and feat steps.
+        """
+        return {
+            "race": self.race.get("name"),
+            "heritage": self.heritage.get("name") if self.heritage else None,
+            "class": self.char_class.get("name"),
+            "level": self.level,
+            "point_buy": dict(self.point_buy),
+            "steps": [{"level": level, "feat": name} for level, name in self.plan.steps],
+        }
+
+class BuildSearch:
+    """
+    A cancellable, time-limited search for builds meeting feat and stat constraints.
+    - Iterate over the search (or call results()) to stream BuildMatch objects.
+    - status is "pending", "running", "complete", "cancelled" or "timeout". A search whose
+      iteration is abandoned before the end (the generator is closed) is "cancelled".
+    - counts records how many nodes were visited and pruned at each depth.
+    """
+    def __init__(self, catalog, feats=(), level=1, min_stats=None, races=None, classes=None, time_budget=None):
+        """
+        Initialize a BuildSearch.
+        Args:
+            catalog (Catalog): Game data.
+            feats (iterable, optional): Feat names every build must have by the level.
+            level (int, optional): Character level. Defaults to 1.
+            min_stats (dict, optional): Lowest final ability score by stat.
+            races (iterable, optional): Race names to search. Defaults to every race.
+            classes (iterable, optional): Class names to search. Defaults to every class.
+            time_budget (float, optional): Seconds before the search stops. Defaults to no limit.
+        Raises:
+            ValueError: If the level, a stat, a feat or a race/class name is invalid, or the
+                feats' prerequisites form a cycle.
+        """
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Invalid level: {level}")
+        self.catalog = catalog
+        self.feats = tuple(dict.fromkeys(feats))
+        self.level = level
+        self.min_stats = dict(min_stats or {})
+        for stat in self.min_stats:
+            if stat not in STATS:
+                raise ValueError(f"Unknown stat: {stat}")
+        self.races = self._select("races", races)
+        self.classes = self._select("classes", classes)
+        self.time_budget = time_budget
+        # Feat and stat requirements do not depend on the build, so resolve them once
+        probe = FeatPlanner(catalog, {"name": ""}, char_class={"name": ""}, trait_registry={})
+        self.needed = set()
+        for feat in self.feats:
+            self.needed |= probe.closure(feat)
+        self.required = dict(self.min_stats)
+        self.level_needed = 1
+        for feat in self.needed:
+            feat_level, stats = probe.requirements[feat]
+            self.level_needed = max(self.level_needed, feat_level)
+            for stat, value in stats.items():
+                if stat in STATS:
+                    self.required[stat] = max(self.required.get(stat, value), value)
+        self.status = "pending"
+        self.counts = dict.fromkeys(
+            ("races", "races_pruned", "heritages", "heritages_pruned", "classes", "classes_pruned", "matches"), 0
+        )
+        self._cancelled = threading.Event()
+
+    def _select(self, kind, names):
+        if names is None:
+            return list(self.catalog.records(kind))
+        records = []
+        for name in names:
+            record = self.catalog.get(kind, name)
+            if record is None:
+                raise ValueError(f"Unknown {kind[:-1]}: {name}")
+            records.append(record)
+        return records
+
+    def cancel(self):
+        """
+        Ask a running search to stop; safe to call from another thread.
+        """
+        self._cancelled.set()
+
+    def __iter__(self):
+        return self.results()
+
+    def results(self):
+        """
+        Run the search, yielding matches as they are found.
+        Yields:
+            BuildMatch: Each race, heritage and class meeting the constraints.
+        """
+        self.status = "running"
+        try:
+            yield from self._search()
+        finally:
+            # Left early: the consumer stopped iterating, or an error was raised
+            if self.status == "running":
+                self.status = "cancelled"
+
+    def _search(self):
+        """
+        Visit races, heritages and classes, pruning where possible; sets status when done.
+        """
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        if self.level_needed > self.level:
+            self.status = "complete"
+            return
+        required = self.required
+        trait_registry = self.catalog.trait_registry()
+
+        heritages = {}
+        for heritage in self.catalog.records("heritages"):
+            heritages.setdefault(heritage.get("race"), []).append(heritage)
+
+        for race in self.races:
+            if self._stopped(deadline):
+                return
+            self.counts["races"] += 1
+            lineages = heritages.get(race["name"]) or [None]
+            if not any(self._reachable(race, heritage, required) for heritage in lineages):
+                self.counts["races_pruned"] += 1
+                continue
+            for heritage in lineages:
+                if self._stopped(deadline):
+                    return
+                self.counts["heritages"] += 1
+                point_buy = self._point_buy(race, heritage, required)
+                if point_buy is None:
+                    self.counts["heritages_pruned"] += 1
+                    continue
+                for char_class in self.classes:
+                    if self._stopped(deadline):
+                        return
+                    self.counts["classes"] += 1
+                    match = self._match(race, heritage, char_class, point_buy, trait_registry)
+                    if match is None:
+                        self.counts["classes_pruned"] += 1
+                        continue
+                    self.counts["matches"] += 1
+                    yield match
+        self.status = "complete"
+
+    def _stopped(self, deadline):
+        """
+        Check for cancellation or an exhausted time budget, updating status.
+        """
+        if self._cancelled.is_set():
+            self.status = "cancelled"
+        elif deadline is not None and time.monotonic() > deadline:
+            self.status = "timeout"
+        else:
+            return False
+        return True
+
+    @staticmethod
+    def _racial(race, heritage):
+        character = Character(char_class={"name": ""}, race=race)
+        character.heritage = heritage
+        return character.racial_modifiers()
+
+    def _reachable(self, race, heritage, required):
+        """
+        Upper bound: every required stat is at most the highest score the lineage can reach.
+        """
+        racial = self._racial(race, heritage)
+        return all(value <= MAX_SCORE + racial.get(stat, 0) for stat, value in required.items())
+
+    def _point_buy(self, race, heritage, required):
+        """
+        Cheapest point buy meeting every required final stat, or None.
+        """
+        racial = self._racial(race, heritage)
+        return cheapest_point_buy({stat: value - racial.get(stat, 0) for stat, value in required.items()})
+
+    def _match(self, race, heritage, char_class, point_buy, trait_registry):
+        """
+        Plan and verify the feats for one build, or None if they cannot all be taken.
+        """
+        planner = planner_for(self.catalog, race, heritage, char_class)
+        # Bound: not enough slots by the level for the feats that are not innate
+        if planner.slots[self.level] < len(self.needed - planner.innate):
+            return None
+        plan = planner.plan(self.feats, max_level=self.level)
+        if not plan.feasible:
+            return None
+        feats = [planner.feats[name] for _, name in plan.steps]
+        match = BuildMatch(race, heritage, char_class, self.level, point_buy, plan, feats)
+        # Confirm with the Character rules: no planned feat may be dropped
+        character = match.character()
+        character.recalculate_traits(trait_registry)
+        if character.validate_feats(self.catalog.records("feats")):
+            return None
+        return match
+
+def find_builds(catalog, feats=(), level=1, min_stats=None, **options):
+    """
+    Stream every race/heritage/class combination meeting feat and stat constraints.
+    Args:
+        catalog (Catalog): Game data.
+        feats (iterable, optional): Feat names every build must have by the level.
+        level (int, optional): Character level. Defaults to 1.
+        min_stats (dict, optional): Lowest final ability score by stat.
+        **options: races, classes and time_budget (see BuildSearch).
+    Returns:
+        BuildSearch: The search; iterate over it to get BuildMatch objects.
+    """
+    return BuildSearch(catalog, feats, level, min_stats, **options)
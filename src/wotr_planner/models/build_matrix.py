@@ -0,0 +1,487 @@
+"""
+Vectorized derived attributes for many builds at once.
+- Builds are held as NumPy arrays of catalog IDs, point buy, skill ranks and feat flags.
+- Catalog records are turned into lookup tables once, so a derived attribute is a few
+  array operations over every build instead of one Character per build.
+- Derived groups are computed on first access and cached.
+- Requires NumPy (the "analysis" extra).
+"""
+import json
+import numpy as np
+from wotr_planner.models.character import Character, SKILLS, STATS
+from wotr_planner.models.combat import COMBAT_STATS, SAVE_ABILITIES, trait_save_bonuses
+from wotr_planner.models.progression import MAX_LEVEL, SAVES, ClassLevels, class_progression
+from wotr_planner.models.serialization import class_level_names
+
+# Derived attribute groups in display order
+GROUPS = ("final_stats", "effective_skills", "feat_slots", "trait_bonuses", "combat")
+# Trait bonus dicts that become one column per key
+TRAIT_BONUS_DICTS = (
+    ("saves", "Save"),
+    ("ab", "Attack"),
+    ("dodge_ac", "Dodge AC"),
+    ("resistances", "Resist"),
+    ("spell_dc", "Spell DC"),
+)
+# Scalar trait bonuses and their column labels
+TRAIT_BONUS_SCALARS = (
+    ("natural_ac", "Natural AC"),
+    ("cmb", "CMB"),
+    ("cmd", "CMD"),
+    ("skill_points_bonus", "Skill Points"),
+)
+
+def _levels_table(records):
+    """
+    Count bonus feats gained by each level.
+    Args:
+        records (list): Class or race records with optional "bonus_feats" levels.
+    Returns:
+        np.ndarray: (len(records) + 1, MAX_LEVEL + 1) counts; the last row is all zero.
+    """
+    table = np.zeros((len(records) + 1, MAX_LEVEL + 1), dtype=np.int16)
+    levels = np.arange(MAX_LEVEL + 1)
+    for i, record in enumerate(records):
+        for lvl in record.get("bonus_feats", []):
+            table[i] += levels >= lvl
+    return table
+
+def _modifier_table(records, field, keys):
+    """
+    Turn a dict field of each record into a matrix.
+    - Keys outside `keys` are ignored, matching Character's recalculation.
+    Args:
+        records (list): Data records.
+        field (str): Name of the dict field, e.g. "modifiers".
+        keys (tuple): Column keys.
+    Returns:
+        np.ndarray: (len(records) + 1, len(keys)) values; the last row is all zero.
+    """
+    table = np.zeros((len(records) + 1, len(keys)), dtype=np.int16)
+    columns = {key: i for i, key in enumerate(keys)}
+    for i, record in enumerate(records):
+        for key, value in (record.get(field) or {}).items():
+            if key in columns:
+                table[i, columns[key]] += value
+    return table
+
+def _id_or_none(catalog, kind, key):
+    """
+    Get a catalog ID, or -1 for a key missing from the catalog.
+    """
+    record_id = catalog.id_of(kind, key)
+    return -1 if record_id is None else record_id
+
+class BuildTables:
+    """
+    Lookup tables derived from a catalog, shared by every BuildMatrix over it.
+    - Every table has a trailing all-zero row, so ID -1 (none or unknown) indexes "no bonus".
+    - Race and heritage traits are resolved per lineage: row r is race r without heritage,
+      row len(races) + h is heritage h of its race.
+    """
+    def __init__(self, catalog, trait_registry=None):
+        """
+        Initialize BuildTables.
+        Args:
+            catalog (Catalog): Game data the build IDs refer to.
+            trait_registry (dict, optional): Trait definitions by name. Defaults to the catalog's traits.
+        """
+        self.catalog = catalog
+        races = catalog.records("races")
+        heritages = catalog.records("heritages")
+        classes = catalog.records("classes")
+        feats = catalog.records("feats")
+        trait_registry = catalog.trait_registry() if trait_registry is None else trait_registry
+
+        self.race_count = len(races)
+        self.race_mods = _modifier_table(races, "modifiers", STATS)
+        self.heritage_mods = _modifier_table(heritages, "modifiers", STATS)
+        # Heritage modifiers replace race modifiers only when the heritage has any
+        self.heritage_has_mods = np.array([bool(h.get("modifiers")) for h in heritages] + [False])
+        self.feat_stat_mods = _modifier_table(feats, "modifiers", STATS)
+        self.feat_skill_mods = _modifier_table(feats, "skill_modifiers", SKILLS)
+        self.background_skill_mods = _modifier_table(catalog.records("backgrounds"), "skill_modifiers", SKILLS)
+        self.class_intervals = np.array([c.get("bonus_feat_interval") or 0 for c in classes] + [0])
+        self.class_bonus_feats = _levels_table(classes)
+        # Class progressions by level: BAB, the three saves, hit points without Con
+        self.class_combat = np.zeros((len(classes) + 1, MAX_LEVEL + 1, 2 + len(SAVES)), dtype=np.int16)
+        for i, char_class in enumerate(classes):
+            progression = class_progression(char_class)
+            self.class_combat[i, :, 0] = progression.bab
+            for j, save in enumerate(SAVES):
+                self.class_combat[i, :, 1 + j] = progression.saves[save]
+            self.class_combat[i, :, -1] = progression.hp
+        self.race_bonus_feats = _levels_table(races)
+
+        # Resolve trait bonuses once per lineage with the scalar code path
+        lineages = [(race, None) for race in races]
+        for heritage in heritages:
+            race = catalog.get("races", heritage.get("race")) or {"name": heritage.get("race")}
+            lineages.append((race, heritage))
+        bonuses = []
+        for race, heritage in lineages:
+            character = Character(char_class={"name": ""}, race=race)
+            character.heritage = heritage
+            character.recalculate_traits(trait_registry)
+            bonuses.append(character.trait_bonuses)
+
+        self.trait_columns = []
+        keys = []
+        for field, label in TRAIT_BONUS_DICTS:
+            for key in sorted({k for b in bonuses for k in b[field]}):
+                keys.append((field, key))
+                self.trait_columns.append(f"{label} ({key})")
+        for field, label in TRAIT_BONUS_SCALARS:
+            keys.append((field, None))
+            self.trait_columns.append(label)
+        self.trait_bonuses = np.zeros((len(lineages) + 1, len(keys)), dtype=np.int16)
+        for row, bonus in enumerate(bonuses):
+            for col, (field, key) in enumerate(keys):
+                self.trait_bonuses[row, col] = bonus[field] if key is None else bonus[field].get(key, 0)
+        self.trait_skills = np.zeros((len(lineages) + 1, len(SKILLS)), dtype=np.int16)
+        for row, bonus in enumerate(bonuses):
+            for col, skill in enumerate(SKILLS):
+                self.trait_skills[row, col] = bonus["skills"].get(skill, 0)
+        # Unconditional combat trait bonuses: the three saves, untyped AC, natural AC, CMB, CMD
+        self.trait_combat = np.zeros((len(lineages) + 1, len(SAVES) + 4), dtype=np.int16)
+        for row, bonus in enumerate(bonuses):
+            saves, _ = trait_save_bonuses(bonus)
+            self.trait_combat[row] = [saves[save] for save in SAVES] + [
+                bonus["ac"], bonus["natural_ac"], bonus["cmb"], bonus["cmd"]
+            ]
+
+    def columns(self, group):
+        """
+        Get the column labels of a derived group.
+        Args:
+            group (str): One of GROUPS.
+        Returns:
+            list: Column labels.
+        Raises:
+            ValueError: If the group is unknown.
+        """
+        if group == "final_stats":
+            return list(STATS)
+        if group == "effective_skills":
+            return list(SKILLS)
+        if group == "feat_slots":
+            return ["Feat Slots"]
+        if group == "trait_bonuses":
+            return list(self.trait_columns)
+        if group == "combat":
+            return list(COMBAT_STATS)
+        raise ValueError(f"Unknown derived group: {group}")
+
+class BuildMatrix:
+    """
+    Derived attributes of many builds, computed column-wise.
+    - values(group) returns an (N, columns) integer array, computed on first use.
+    - differences(group, reference) compares every build against one of them.
+    """
+    def __init__(self, tables, race, heritage, char_class, background, level,
+                 point_buy, skill_ranks, feats, labels=None, class_levels=None):
+        """
+        Initialize a BuildMatrix.
+        - ID arrays use -1 for "none" (heritage, background) or data missing from the catalog.
+        - Integer arrays are used as given (no copy), so memory-mapped columns stay zero-copy.
+        Args:
+            tables (BuildTables): Lookup tables for the catalog the IDs refer to.
+            race, heritage, char_class, background, level (array-like): (N,) integers.
+            point_buy (array-like): (N, len(STATS)) point buy scores.
+            skill_ranks (array-like): (N, len(SKILLS)) skill ranks.
+            feats (array-like): (N, feat count) booleans, True where the build has the feat.
+            labels (list, optional): Display name per build. Defaults to "Build 1", ...
+            class_levels (array-like, optional): (N, MAX_LEVEL) class ID taken at each
+                character level of multiclass builds; rows of -1 are single-class builds.
+                Defaults to every build being single-class.
+        """
+        self.tables = tables
+        self.race = np.asarray(race)
+        self.heritage = np.asarray(heritage)
+        self.char_class = np.asarray(char_class)
+        self.background = np.asarray(background)
+        self.level = np.asarray(level)
+        self.point_buy = np.asarray(point_buy).reshape(len(self.race), len(STATS))
+        self.skill_ranks = np.asarray(skill_ranks).reshape(len(self.race), len(SKILLS))
+        self.feats = np.asarray(feats, dtype=bool).reshape(len(self.race), -1)
+        self.labels = None if labels is None else list(labels)
+        if class_levels is None:
+            class_levels = np.full((len(self.race), MAX_LEVEL), -1, dtype=np.int16)
+        self.class_levels = np.asarray(class_levels).reshape(len(self.race), MAX_LEVEL)
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.race)
+
+    def label(self, row):
+        """
+        Get the display name of a build.
+        Args:
+            row (int): Build row.
+        Returns:
+            str: The build's label, or "Build <row + 1>" when unlabelled.
+        """
+        return self.labels[row] if self.labels is not None else f"Build {row + 1}"
+
+    @classmethod
+    def from_characters(cls, characters, catalog, tables=None):
+        """
+        Build a matrix from Character objects.
+        Args:
+            characters (iterable): Characters to compare.
+            catalog (Catalog): Game data the characters use.
+            tables (BuildTables, optional): Precomputed tables. Defaults to new tables for catalog.
+        Returns:
+            BuildMatrix: The matrix, labelled by character name.
+        """
+        characters = list(characters)
+        columns = {"race": [], "heritage": [], "char_class": [], "background": []}
+        feats = np.zeros((len(characters), len(catalog.records("feats"))), dtype=bool)
+        class_levels = np.full((len(characters), MAX_LEVEL), -1, dtype=np.int16)
+        for i, character in enumerate(characters):
+            names = class_level_names(character)
+            if names is not None:
+                class_levels[i, :len(names)] = [_id_or_none(catalog, "classes", name) for name in names[:MAX_LEVEL]]
+            race_name = character.race.get("name")
+            heritage = (race_name, character.heritage["name"]) if character.heritage else None
+            background = character.background["name"] if character.background else None
+            for name, kind, key in (
+                ("race", "races", race_name),
+                ("heritage", "heritages", heritage),
+                ("char_class", "classes", character.char_class.get("name")),
+                ("background", "backgrounds", background),
+            ):
+                record_id = catalog.id_of(kind, key) if key is not None else None
+                columns[name].append(-1 if record_id is None else record_id)
+            for feat in character.feats:
+                feat_id = catalog.id_of("feats", feat["name"])
+                if feat_id is not None:
+                    feats[i, feat_id] = True
+        return cls(
+            tables or BuildTables(catalog),
+            level=[c.level for c in characters],
+            point_buy=[[c.point_buy_stats[s] for s in STATS] for c in characters],
+            skill_ranks=[[c.skill_ranks.get(s, 0) for s in SKILLS] for c in characters],
+            feats=feats,
+            labels=[c.name or f"Build {i + 1}" for i, c in enumerate(characters)],
+            class_levels=class_levels,
+            **columns,
+        )
+
+    @classmethod
+    def from_repository(cls, repository, ids, tables=None):
+        """
+        Build a matrix straight from saved rows, without creating Character objects.
+        - Reads characters, feats and skills with one query each per chunk of IDs.
+        Args:
+            repository (CharacterRepository): Build library.
+            ids (list): Character IDs in display order; unknown IDs are skipped.
+            tables (BuildTables, optional): Precomputed tables. Defaults to new tables
+                for the repository's catalog.
+        Returns:
+            BuildMatrix: The matrix, labelled by build name.
+        """
+        catalog = repository.catalog
+        position = {}
+        for char_id in ids:
+            position.setdefault(char_id, len(position))
+        count = len(position)
+        race, heritage, char_class, background, level = (np.full(count, -1, dtype=np.int32) for _ in range(5))
+        point_buy = np.full((count, len(STATS)), 10, dtype=np.int16)
+        skill_ranks = np.zeros((count, len(SKILLS)), dtype=np.int16)
+        feats = np.zeros((count, len(catalog.records("feats"))), dtype=bool)
+        class_levels = np.full((count, MAX_LEVEL), -1, dtype=np.int16)
+        labels = [""] * count
+        found = np.zeros(count, dtype=bool)
+        skill_ids = {skill: i for i, skill in enumerate(SKILLS)}
+
+        def id_or_none(kind, key):
+            return _id_or_none(catalog, kind, key)
+
+        def rows(sql, chunk):
+            marks = ", ".join("?" * len(chunk))
+            return repository.conn.execute(sql.format(marks=marks), chunk)
+
+        keys = list(position)
+        for start in range(0, count, 500):
+            chunk = keys[start:start + 500]
+            for row in rows(
+                "SELECT id, name, race, heritage, class, background, level, "
+                "pb_str, pb_dex, pb_con, pb_int, pb_wis, pb_cha, class_levels "
+                "FROM characters WHERE id IN ({marks})", chunk
+            ):
+                i = position[row[0]]
+                found[i] = True
+                labels[i] = row[1] or f"#{row[0]}"
+                race[i] = id_or_none("races", row[2])
+                heritage[i] = id_or_none("heritages", (row[2], row[3])) if row[3] else -1
+                char_class[i] = id_or_none("classes", row[4])
+                background[i] = id_or_none("backgrounds", row[5]) if row[5] else -1
+                level[i] = row[6]
+                point_buy[i] = row[7:13]
+                if row[13]:
+                    names = json.loads(row[13])[:MAX_LEVEL]
+                    class_levels[i, :len(names)] = [id_or_none("classes", name) for name in names]
+            for char_id, feat in rows(
+                "SELECT character_id, feat FROM character_feats WHERE character_id IN ({marks})", chunk
+            ):
+                feat_id = catalog.id_of("feats", feat)
+                if feat_id is not None:
+                    feats[position[char_id], feat_id] = True
+            for char_id, skill, ranks in rows(
+                "SELECT character_id, skill, ranks FROM character_skills WHERE character_id IN ({marks})", chunk
+            ):
+                if skill in skill_ids:
+                    skill_ranks[position[char_id], skill_ids[skill]] = ranks
+
+        return cls(
+            tables or BuildTables(catalog),
+            race[found], heritage[found], char_class[found], background[found], level[found],
+            point_buy[found], skill_ranks[found], feats[found],
+            labels=[label for label, ok in zip(labels, found) if ok],
+            class_levels=class_levels[found],
+        )
+
+    def lineage(self):
+        """
+        Get each build's row in the lineage trait tables.
+        Returns:
+            np.ndarray: (N,) lineage rows; -1 for unknown races.
+        """
+        return np.where(
+            self.heritage >= 0,
+            self.tables.race_count + self.heritage,
+            np.where(self.race >= 0, self.race, -1),
+        )
+
+    def columns(self, group):
+        """
+        Get the column labels of a derived group.
+        Args:
+            group (str): One of GROUPS.
+        Returns:
+            list: Column labels.
+        """
+        return self.tables.columns(group)
+
+    def values(self, group):
+        """
+        Get a derived group for every build, computing it on first use.
+        Args:
+            group (str): One of GROUPS.
+        Returns:
+            np.ndarray: (N, len(columns(group))) values.
+        Raises:
+            ValueError: If the group is unknown.
+        """
+        if group not in self.cache:
+            if group not in GROUPS:
+                raise ValueError(f"Unknown derived group: {group}")
+            self.cache[group] = getattr(self, f"_compute_{group}")()
+        return self.cache[group]
+
+    def differences(self, group, reference=0):
+        """
+        Get a derived group relative to one build.
+        Args:
+            group (str): One of GROUPS.
+            reference (int, optional): Row of the build to compare against. Defaults to 0.
+        Returns:
+            np.ndarray: values(group) minus the reference build's values.
+        """
+        values = self.values(group)
+        return values - values[reference]
+
+    def _compute_final_stats(self):
+        """
+        Point buy plus heritage (or race) and feat modifiers.
+        """
+        tables = self.tables
+        racial = np.where(
+            tables.heritage_has_mods[self.heritage][:, None],
+            tables.heritage_mods[self.heritage],
+            tables.race_mods[self.race],
+        )
+        return self.point_buy + racial + self.feats @ tables.feat_stat_mods[:-1]
+
+    def _compute_effective_skills(self):
+        """
+        Skill ranks plus feat, background and trait bonuses.
+        """
+        tables = self.tables
+        return (
+            self.skill_ranks
+            + self.feats @ tables.feat_skill_mods[:-1]
+            + tables.background_skill_mods[self.background]
+            + tables.trait_skills[self.lineage()]
+        )
+
+    def class_totals(self):
+        """
+        Get the class totals of every build at its level.
+        - Single-class builds index the class tables; the few multiclass builds are summed
+          through ClassLevels one row at a time.
+        Returns:
+            np.ndarray: (N, 3 + len(SAVES)) class bonus feats, BAB, saves and hit points
+                without Constitution, in that order.
+        """
+        if "class_totals" not in self.cache:
+            tables = self.tables
+            level = np.clip(self.level, 0, MAX_LEVEL)
+            interval = tables.class_intervals[self.char_class]
+            bonus_feats = (
+                np.where(interval > 0, level // np.maximum(interval, 1), 0)
+                + tables.class_bonus_feats[self.char_class, level]
+            )
+            totals = np.concatenate([bonus_feats[:, None], tables.class_combat[self.char_class, level]], axis=1)
+            classes = tables.catalog.records("classes")
+            fields = ("bonus_feats", "bab", *SAVES, "hp")
+            for row in np.flatnonzero((self.class_levels >= 0).any(axis=1)):
+                reached = int(level[row])
+                levels = ClassLevels(
+                    classes[i] if i >= 0 else {"name": None} for i in self.class_levels[row, :reached].tolist()
+                )
+                totals[row] = [levels.total(field, reached) for field in fields]
+            self.cache["class_totals"] = totals
+        return self.cache["class_totals"]
+
+    def _compute_feat_slots(self):
+        """
+        Feat slots from level, class bonus feats and race bonus feats.
+        """
+        level = np.clip(self.level, 0, MAX_LEVEL)
+        slots = (
+            (level + 1) // 2
+            + self.class_totals()[:, 0]
+            + self.tables.race_bonus_feats[self.race, level]
+        )
+        return slots[:, None]
+
+    def _compute_trait_bonuses(self):
+        """
+        Numeric race and heritage trait bonuses.
+        """
+        return self.tables.trait_bonuses[self.lineage()]
+
+    def _compute_combat(self):
+        """
+        BAB, saves, hit points, AC, CMB and CMD from class tables, ability modifiers and traits.
+        """
+        tables = self.tables
+        level = np.clip(self.level, 0, MAX_LEVEL)
+        mods = (self.values("final_stats") - 10) // 2
+        stat = {name: mods[:, i] for i, name in enumerate(STATS)}
+        progression = self.class_totals()[:, 1:]
+        traits = tables.trait_combat[self.lineage()]
+        bab = progression[:, 0]
+        ac_bonus, natural, cmb, cmd = (traits[:, len(SAVES) + i] for i in range(4))
+        columns = [bab]
+        for j, save in enumerate(SAVES):
+            columns.append(progression[:, 1 + j] + stat[SAVE_ABILITIES[save]] + traits[:, j])
+        columns.append(np.maximum(progression[:, -1] + stat["Con"] * level, level))
+        columns.append(10 + stat["Dex"] + natural + ac_bonus)
+        columns.append(10 + stat["Dex"] + ac_bonus)
+        columns.append(10 + natural + ac_bonus)
+        columns.append(bab + stat["Str"] + cmb)
+        columns.append(10 + bab + stat["Str"] + stat["Dex"] + cmd)
+        return np.stack(columns, axis=1)
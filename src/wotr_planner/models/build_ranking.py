@@ -0,0 +1,526 @@
+"""
+Top-K build ranking by a user-defined score.
+- A score is a weighted sum of derived values, written like "Str mod + Con mod + AC +
+  skill points" (see Score.parse and SCORE_TERMS).
+- The search space is the build finder's: every race/heritage/class meeting its feat and
+  stat constraints, each with the point buy that scores highest within the budget.
+- Once the race, heritage, class and feats are fixed every score term depends on a single
+  final ability score, so the best point buy is a small knapsack over per-stat score tables.
+- Branches are visited best upper bound first. A bound takes, for each stat, the class's
+  best score over the final values the lineage can reach, ignoring the budget, plus every
+  trait bonus that can raise the score. Once the bounded heap holds K builds, branches
+  whose bound is below the K-th best score are skipped.
+- With several workers the branches are dealt across a process pool attached to the game
+  data in shared memory, and workers share the best K-th score found so far, so each
+  prunes with the best known threshold.
+- The top K are re-evaluated with the headless evaluator and carry its full sheet.
+"""
+import heapq
+import math
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from wotr_planner.models.build_finder import BuildMatch, BuildSearch
+from wotr_planner.models.character import Character, STATS
+from wotr_planner.models.combat import COMBAT_STATS, ability_modifier, combat_stats, trait_save_bonuses
+from wotr_planner.models.evaluator import evaluate_build
+from wotr_planner.models.point_buy import MAX_SCORE, MIN_SCORE, POINT_BUY_BUDGET, point_cost
+from wotr_planner.models.shared_catalog import SharedCatalog
+
+# Derived values a score can use
+SCORE_TERMS = STATS + tuple(f"{stat} mod" for stat in STATS) + COMBAT_STATS + ("skill points", "feat slots")
+# Lower-cased term name -> term name
+_TERM_NAMES = {term.lower(): term for term in SCORE_TERMS}
+# Scores closer than this are treated as equal when pruning
+_TOLERANCE = 1e-9
+
+def term_values(character):
+    """
+    Get every score term of a character.
+    - Uses the character's current final stats and trait bonuses (see recalculate_stats
+      and recalculate_traits).
+    Args:
+        character (Character): Character to evaluate.
+    Returns:
+        dict: Value for every SCORE_TERMS name.
+    """
+    values = dict(character.stats)
+    for stat in STATS:
+        values[f"{stat} mod"] = ability_modifier(character.stats[stat])
+    values.update(combat_stats(character.progression(), character.level, character.stats, character.trait_bonuses))
+    values["skill points"] = character.skill_point_budget()
+    values["feat slots"] = character.total_feat_slots()
+    return values
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+class Score:
+    """
+    A weighted sum of score terms plus a constant.
+    """
+    def __init__(self, weights, constant=0):
+        """
+        Initialize a Score.
+        Args:
+            weights (dict): Term name (any case) -> weight.
+            constant (float, optional): Added to every score. Defaults to 0.
+        Raises:
+            ValueError: If a term is unknown or there are no terms.
+        """
+        self.weights = {}
+        for name, weight in weights.items():
+            term = _TERM_NAMES.get(" ".join(name.split()).lower())
+            if term is None:
+                raise ValueError(f"Unknown score term: {name}")
+            self.weights[term] = self.weights.get(term, 0) + weight
+        if not self.weights:
+            raise ValueError("A score needs at least one term")
+        self.constant = constant
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Parse a score such as "Str mod + Con mod + 2 * AC - 0.5 * HP".
+        - Terms are joined by + and -, and may be multiplied by numbers; a minus sign
+          inside a name (e.g. "Flat-Footed AC") is not an operator.
+        Args:
+            text (str): Score expression.
+        Returns:
+            Score: The parsed score.
+        Raises:
+            ValueError: If the expression is malformed or names an unknown term.
+        """
+        weights = {}
+        constant = 0
+        sign = None
+        for part in re.split(r"(\+|(?:^|(?<=\s))-)", text):
+            if part in ("+", "-"):
+                sign = (sign or 1) * (-1 if part == "-" else 1)
+                continue
+            part = part.strip()
+            if not part:
+                continue
+            weight = 1 if sign is None else sign
+            name = None
+            for factor in part.split("*"):
+                factor = factor.strip()
+                try:
+                    weight *= _number(factor)
+                except ValueError:
+                    if name is not None or not factor:
+                        raise ValueError(f"Invalid score term: {part}") from None
+                    name = factor
+            if name is None:
+                constant += weight
+            else:
+                weights[name] = weights.get(name, 0) + weight
+            sign = None
+        if sign is not None:
+            raise ValueError(f"Score ends with an operator: {text}")
+        return cls(weights, constant)
+
+    def __call__(self, values):
+        """
+        Score a set of term values.
+        Args:
+            values (dict): Term values (see term_values).
+        Returns:
+            float: The score.
+        """
+        return self.constant + sum(weight * values[term] for term, weight in self.weights.items())
+
+    def breakdown(self, values):
+        """
+        Get each term's share of a score.
+        Args:
+            values (dict): Term values (see term_values).
+        Returns:
+            dict: Term -> {"value", "weight", "points"}, plus "constant" when not 0.
+        """
+        shares = {
+            term: {"value": values[term], "weight": weight, "points": weight * values[term]}
+            for term, weight in self.weights.items()
+        }
+        if self.constant:
+            shares["constant"] = {"value": 1, "weight": self.constant, "points": self.constant}
+        return shares
+
+    def __str__(self):
+        text = " ".join(f"{'-' if w < 0 else '+'} {'' if abs(w) == 1 else f'{abs(w)} * '}{t}" for t, w in self.weights.items())
+        if self.constant:
+            text += f" {'-' if self.constant < 0 else '+'} {abs(self.constant)}"
+        return text[2:] if text.startswith("+ ") else text
+
+def best_point_buy(gains, minimums=None, budget=POINT_BUY_BUDGET):
+    """
+    Find the point buy with the highest total gain within the budget.
+    - Ties go to the buy that moves the fewest points away from 10.
+    Args:
+        gains (dict): Stat -> {point buy score -> gain}; stats without a table gain nothing.
+        minimums (dict, optional): Lowest point buy score by stat.
+        budget (int, optional): Points available. Defaults to POINT_BUY_BUDGET.
+    Returns:
+        tuple | None: (total gain, point buy for every stat), or None if no buy fits.
+    """
+    minimums = minimums or {}
+    # Points spent -> ((gain, -distance from 10), scores so far)
+    states = {0: ((0, 0), ())}
+    for i, stat in enumerate(STATS):
+        table = gains.get(stat, {})
+        floor = max(MIN_SCORE, minimums.get(stat, MIN_SCORE))
+        # Budget left after the remaining stats take their cheapest scores
+        limit = budget - sum(point_cost(max(MIN_SCORE, minimums.get(s, MIN_SCORE))) for s in STATS[i + 1:])
+        following = {}
+        for spent, ((gain, distance), scores) in states.items():
+            for score in range(floor, MAX_SCORE + 1):
+                total = spent + point_cost(score)
+                if total > limit:
+                    break
+                value = (gain + table.get(score, 0), distance - abs(score - 10))
+                if total not in following or value > following[total][0]:
+                    following[total] = (value, scores + (score,))
+        states = following
+    fitting = [(value, -spent, scores) for spent, (value, scores) in states.items() if spent <= budget]
+    if not fitting:
+        return None
+    (gain, _), _, scores = max(fitting)
+    return gain, dict(zip(STATS, scores))
+
+class RankedBuild:
+    """
+    A build in the top K, with its score breakdown and evaluated sheet.
+    """
+    def __init__(self, score, breakdown, match, sheet):
+        """
+        Initialize a RankedBuild.
+        Args:
+            score (float): The build's score.
+            breakdown (dict): Score.breakdown of the build.
+            match (BuildMatch): Race, heritage, class, point buy and feat plan.
+            sheet (dict): evaluate_build sheet of the build.
+        """
+        self.score = score
+        self.breakdown = breakdown
+        self.match = match
+        self.sheet = sheet
+
+    def to_dict(self):
+        """
+        Get a JSON-safe copy of the ranked build.
+        Returns:
+            dict: score, breakdown, the BuildMatch summary, the serialized build and sheet.
+        """
+        return {
+            "score": self.score,
+            "breakdown": self.breakdown,
+            **self.match.to_dict(),
+            "build": self.sheet["build"],
+            "sheet": self.sheet,
+        }
+
+class BuildRanking:
+    """
+    Branch-and-bound search for the K builds with the highest score.
+    - Call run() to get the ranked builds; counts records branches solved and pruned.
+    """
+    def __init__(self, catalog, score, k=10, feats=(), level=1, min_stats=None, races=None, classes=None, workers=1):
+        """
+        Initialize a BuildRanking.
+        Args:
+            catalog (Catalog): Game data.
+            score (Score | str | dict): Score, score expression or term weights.
+            k (int, optional): Number of builds to return. Defaults to 10.
+            feats (iterable, optional): Feat names every build must have by the level.
+            level (int, optional): Character level. Defaults to 1.
+            min_stats (dict, optional): Lowest final ability score by stat.
+            races (iterable, optional): Race names to search. Defaults to every race.
+            classes (iterable, optional): Class names to search. Defaults to every class.
+            workers (int, optional): Processes to solve branches in; None uses the CPU count.
+                Defaults to 1, which solves in this process.
+        Raises:
+            ValueError: If the score, k or any BuildSearch constraint is invalid.
+        """
+        if isinstance(score, str):
+            score = Score.parse(score)
+        elif isinstance(score, dict):
+            score = Score(score)
+        if k < 1:
+            raise ValueError(f"Invalid number of builds: {k}")
+        self.catalog = catalog
+        self.score = score
+        self.k = k
+        self.search = BuildSearch(catalog, feats, level, min_stats, races, classes)
+        self.workers = workers or os.cpu_count() or 1
+        self.counts = dict.fromkeys(("branches", "infeasible", "pruned", "solved"), 0)
+
+    def run(self):
+        """
+        Rank the builds.
+        Returns:
+            list: Up to k RankedBuild objects, highest score first.
+        """
+        branches = self.branches()
+        self.counts["branches"] = len(branches)
+        if self.workers > 1 and len(branches) > 1:
+            found = self._solve_parallel(branches)
+        else:
+            found = self._solve(branches)
+        found.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [self._ranked(*entry) for entry in found[:self.k]]
+
+    def branches(self):
+        """
+        Get every race/heritage/class with an upper bound on its score, best first.
+        Returns:
+            list: (bound, index, race name, heritage name or None, class name) tuples.
+        """
+        search = self.search
+        if search.level_needed > search.level:
+            return []
+        trait_registry = self.catalog.trait_registry()
+        heritages = {}
+        for heritage in self.catalog.records("heritages"):
+            heritages.setdefault(heritage.get("race"), []).append(heritage)
+        # Stat changes the needed feats can add on top of the lineage
+        feat_shifts = {stat: [0, 0] for stat in STATS}
+        for name in search.needed:
+            for stat, bonus in self.catalog.get("feats", name).get("modifiers", {}).items():
+                if stat in feat_shifts:
+                    feat_shifts[stat][bonus > 0] += bonus
+        tables = {char_class["name"]: self._class_table(char_class) for char_class in search.classes}
+
+        branches = []
+        for race in search.races:
+            for heritage in heritages.get(race["name"]) or [None]:
+                if search._point_buy(race, heritage, search.required) is None:
+                    self.counts["infeasible"] += len(search.classes)
+                    continue
+                racial = search._racial(race, heritage)
+                # Lowest point buy score per stat; racial modifiers only shift required minimums
+                lows = {
+                    stat: max(MIN_SCORE, search.required[stat] - racial.get(stat, 0)) if stat in search.required else MIN_SCORE
+                    for stat in STATS
+                }
+                bonus = self._trait_bound(race, heritage, trait_registry)
+                for char_class in search.classes:
+                    base, gain = tables[char_class["name"]]
+                    bound = base + bonus
+                    for stat in STATS:
+                        low, high = feat_shifts[stat]
+                        bound += max(
+                            gain(stat, score + racial.get(stat, 0) + shift)
+                            for score in range(lows[stat], MAX_SCORE + 1)
+                            for shift in range(low, high + 1)
+                        )
+                    branches.append((
+                        bound, len(branches), race["name"],
+                        heritage["name"] if heritage else None, char_class["name"],
+                    ))
+        branches.sort(key=lambda branch: (-branch[0], branch[1]))
+        return branches
+
+    def _class_table(self, char_class):
+        """
+        Score a class with no race, traits or feats.
+        Returns:
+            tuple: (score with every stat at 10, gain(stat, final score) over that score).
+        """
+        character = Character(char_class=char_class, race={"name": ""})
+        character.level = self.search.level
+        base = self.score(term_values(character))
+        cache = {}
+
+        def gain(stat, value):
+            if (stat, value) not in cache:
+                character.stats[stat] = value
+                cache[stat, value] = self.score(term_values(character)) - base
+                character.stats[stat] = 10
+            return cache[stat, value]
+        return base, gain
+
+    def _trait_bound(self, race, heritage, trait_registry):
+        """
+        Upper bound on what a lineage's traits, skill point and bonus feat slots add to a score.
+        - Bonuses are added to their terms; skill points are clamped to at least 1 per level,
+          so a bonus can raise them by at most its own size.
+        """
+        character = Character(char_class={"name": ""}, race=race)
+        character.heritage = heritage
+        character.level = self.search.level
+        character.recalculate_traits(trait_registry)
+        bonuses = character.trait_bonuses
+        neutral = Character(char_class={"name": ""}, race={"name": ""})
+        neutral.level = self.search.level
+        ac = bonuses.get("ac", 0)
+        natural = bonuses.get("natural_ac", 0)
+        changes, _ = trait_save_bonuses(bonuses)
+        changes.update({
+            "AC": ac + natural,
+            "Touch AC": ac,
+            "Flat-Footed AC": ac + natural,
+            "CMB": bonuses.get("cmb", 0),
+            "CMD": bonuses.get("cmd", 0),
+            "skill points": self.search.level * (race.get("skill_points_bonus", 0) + bonuses.get("skill_points_bonus", 0)),
+            "feat slots": character.total_feat_slots() - neutral.total_feat_slots(),
+        })
+        return sum(max(0, self.score.weights.get(term, 0) * change) for term, change in changes.items())
+
+    def _solve(self, branches, threshold=None):
+        """
+        Solve branches in bound order, keeping the best k in a bounded heap.
+        Args:
+            branches (list): Branches from branches(), best bound first.
+            threshold (multiprocessing.Value, optional): K-th best score shared with other workers.
+        Returns:
+            list: (score, index, race name, heritage name, class name, point buy) of the best k.
+        """
+        trait_registry = self.catalog.trait_registry()
+        # Min-heap of (score, -index, entry): the root is the worst build kept
+        heap = []
+        for position, (bound, index, race_name, heritage_name, class_name) in enumerate(branches):
+            floor = heap[0][0] if len(heap) == self.k else -math.inf
+            if threshold is not None:
+                floor = max(floor, threshold.value)
+            # Bounds are in descending order, so no later branch can do better
+            if bound + _TOLERANCE < floor:
+                self.counts["pruned"] += len(branches) - position
+                break
+            race = self.catalog.get("races", race_name)
+            heritage = self.catalog.heritage(race_name, heritage_name) if heritage_name else None
+            char_class = self.catalog.get("classes", class_name)
+            solved = self._best_build(race, heritage, char_class, trait_registry)
+            if solved is None:
+                self.counts["infeasible"] += 1
+                continue
+            self.counts["solved"] += 1
+            score, point_buy = solved
+            item = (score, -index, (score, index, race_name, heritage_name, class_name, point_buy))
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            if threshold is not None and len(heap) == self.k:
+                with threshold.get_lock():
+                    threshold.value = max(threshold.value, heap[0][0])
+        return [entry for _, _, entry in heap]
+
+    def _best_build(self, race, heritage, char_class, trait_registry):
+        """
+        Find the best point buy for one race, heritage and class.
+        Returns:
+            tuple | None: (score, point buy), or None if the feats or stats cannot be met.
+        """
+        search = self.search
+        point_buy = search._point_buy(race, heritage, search.required)
+        if point_buy is None:
+            return None
+        match = search._match(race, heritage, char_class, point_buy, trait_registry)
+        if match is None:
+            return None
+        character = match.character()
+        character.recalculate_traits(trait_registry)
+        stats = dict(character.stats)
+        base = self.score(term_values(character))
+        racial = search._racial(race, heritage)
+        gains = {}
+        for stat in STATS:
+            # Final score = point buy score + (racial and feat modifiers)
+            offset = stats[stat] - point_buy[stat]
+            gains[stat] = {}
+            for score in range(MIN_SCORE, MAX_SCORE + 1):
+                character.stats[stat] = score + offset
+                gains[stat][score] = self.score(term_values(character)) - base
+            character.stats[stat] = stats[stat]
+        minimums = {stat: value - racial.get(stat, 0) for stat, value in search.required.items()}
+        _, best = best_point_buy(gains, minimums)
+        # Score the chosen buy directly rather than trusting the sum of per-stat gains
+        character.point_buy_stats.update(best)
+        character.recalculate_stats()
+        return self.score(term_values(character)), best
+
+    def _solve_parallel(self, branches):
+        """
+        Solve branches across a process pool, dealing them round-robin so every worker
+        starts with high bounds.
+        """
+        context = multiprocessing.get_context("spawn")
+        threshold = context.Value("d", -math.inf)
+        workers = min(self.workers, len(branches))
+        options = (self.score, self.k, self.search.feats, self.search.level, self.search.min_stats)
+        # Workers attach to the game data instead of each receiving a pickled copy
+        shared = self.catalog if isinstance(self.catalog, SharedCatalog) else SharedCatalog.create(self.catalog)
+        try:
+            with ProcessPoolExecutor(
+                workers, mp_context=context, initializer=_init_worker, initargs=(shared, threshold),
+            ) as pool:
+                futures = [pool.submit(_solve_chunk, options, branches[i::workers]) for i in range(workers)]
+                found = []
+                for future in futures:
+                    entries, counts = future.result()
+                    found.extend(entries)
+                    for key in ("infeasible", "pruned", "solved"):
+                        self.counts[key] += counts[key]
+        finally:
+            if shared is not self.catalog:
+                shared.close()
+                shared.unlink()
+        return found
+
+    def _ranked(self, score, index, race_name, heritage_name, class_name, point_buy):
+        """
+        Evaluate a solved branch into a RankedBuild.
+        """
+        search = self.search
+        trait_registry = self.catalog.trait_registry()
+        race = self.catalog.get("races", race_name)
+        heritage = self.catalog.heritage(race_name, heritage_name) if heritage_name else None
+        char_class = self.catalog.get("classes", class_name)
+        planned = search._match(race, heritage, char_class, point_buy, trait_registry)
+        match = BuildMatch(race, heritage, char_class, search.level, point_buy, planned.plan, planned.feats)
+        character = match.character()
+        sheet = evaluate_build(character, self.catalog, trait_registry)
+        breakdown = self.score.breakdown(term_values(character))
+        return RankedBuild(self.score(term_values(character)), breakdown, match, sheet)
+
+# Game data and shared K-th best score of a pool worker, set by _init_worker
+_worker_data = None
+
+def _init_worker(catalog, threshold):
+    """
+    Keep the game data and shared threshold in a pool worker.
+    Args:
+        catalog (SharedCatalog): Shared game data.
+        threshold (multiprocessing.Value): K-th best score found by any worker.
+    """
+    global _worker_data
+    _worker_data = (catalog, threshold)
+
+def _solve_chunk(options, branches):
+    """
+    Solve a chunk of branches in a pool worker.
+    Args:
+        options (tuple): (score, k, feats, level, min_stats) of the ranking.
+        branches (list): Branches, best bound first.
+    Returns:
+        tuple: (best k entries of the chunk, counts).
+    """
+    catalog, threshold = _worker_data
+    score, k, feats, level, min_stats = options
+    ranking = BuildRanking(catalog, score, k, feats, level, min_stats)
+    return ranking._solve(branches, threshold), ranking.counts
+
+def rank_builds(catalog, score, k=10, **options):
+    """
+    Get the K builds with the highest score.
+    Args:
+        catalog (Catalog): Game data.
+        score (Score | str | dict): Score, score expression such as "Str mod + AC", or term weights.
+        k (int, optional): Number of builds. Defaults to 10.
+        **options: feats, level, min_stats, races, classes and workers (see BuildRanking).
+    Returns:
+        list: RankedBuild objects, highest score first.
+    """
+    return BuildRanking(catalog, score, k, **options).run()
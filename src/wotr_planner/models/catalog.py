@@ -0,0 +1,167 @@
+import json
+import zlib
+from functools import lru_cache
+from wotr_planner.models import json_loader
+from wotr_planner.models.data_schemas import validate_data
+
+# Data kinds and the loader for each JSON file
+LOADERS = {
+    "classes": json_loader.load_classes,
+    "races": json_loader.load_races,
+    "heritages": json_loader.load_heritages,
+    "backgrounds": json_loader.load_backgrounds,
+    "feats": json_loader.load_feats,
+    "skills": json_loader.load_skills,
+    "traits": json_loader.load_traits,
+}
+
+def record_key(kind, record):
+    """
+    Get the lookup key of a data record.
+    - Heritage names repeat across races ("Basic"), so heritages are keyed by (race, name).
+    Args:
+        kind (str): Data kind, e.g. "feats".
+        record (dict): Record from that kind's JSON file.
+    Returns:
+        str | tuple: The record's key.
+    """
+    if kind == "heritages":
+        return (record.get("race"), record["name"])
+    return record["name"]
+
+class Catalog:
+    """
+    In-memory game data with name indexes.
+    - Each record's integer ID is its position in its data file.
+    - Indexes are built once per kind and rebuilt only for the kind that changes.
+    """
+    def __init__(self, data):
+        """
+        Initialize a Catalog.
+        Args:
+            data (dict): Data kind -> list of records.
+        """
+        self.data = {}
+        self.indexes = {}
+        # Kind -> fingerprint, dropped when the kind's records are replaced
+        self.fingerprints = {}
+        for kind, records in data.items():
+            self.set_records(kind, records)
+
+    @classmethod
+    def load(cls, validate=True):
+        """
+        Load every bundled data file into a new Catalog.
+        Args:
+            validate (bool, optional): Check every record against its schema. Defaults to True.
+        Returns:
+            Catalog: The loaded catalog.
+        Raises:
+            DataValidationError: If validation is on and a record does not match its schema.
+        """
+        data = {kind: loader() for kind, loader in LOADERS.items()}
+        if validate:
+            validate_data(data)
+        return cls(data)
+
+    def set_records(self, kind, records):
+        """
+        Replace the records of one kind and rebuild its index.
+        Args:
+            kind (str): Data kind.
+            records (list): New records.
+        """
+        self.data[kind] = records
+        self.indexes[kind] = {record_key(kind, r): i for i, r in enumerate(records)}
+        self.fingerprints.pop(kind, None)
+
+    def records(self, kind):
+        """
+        Get all records of a kind.
+        Args:
+            kind (str): Data kind.
+        Returns:
+            list: Records in ID order.
+        """
+        return self.data.get(kind, [])
+
+    def id_of(self, kind, key):
+        """
+        Get the integer ID of a record.
+        Args:
+            kind (str): Data kind.
+            key (str | tuple): Record key (see record_key).
+        Returns:
+            int | None: The record's ID, or None if unknown.
+        """
+        return self.indexes.get(kind, {}).get(key)
+
+    def get(self, kind, key):
+        """
+        Get a record by key.
+        Args:
+            kind (str): Data kind.
+            key (str | tuple): Record key (see record_key).
+        Returns:
+            dict | None: The record, or None if unknown.
+        """
+        record_id = self.id_of(kind, key)
+        return None if record_id is None else self.data[kind][record_id]
+
+    def by_id(self, kind, record_id):
+        """
+        Get a record by integer ID.
+        Args:
+            kind (str): Data kind.
+            record_id (int): Record ID.
+        Returns:
+            dict: The record.
+        """
+        return self.data[kind][record_id]
+
+    def heritage(self, race_name, heritage_name):
+        """
+        Get a heritage of a race by name.
+        Args:
+            race_name (str): Name of the heritage's race.
+            heritage_name (str): Name of the heritage.
+        Returns:
+            dict | None: The heritage, or None if unknown.
+        """
+        return self.get("heritages", (race_name, heritage_name))
+
+    def fingerprint(self, kind):
+        """
+        Get a checksum of a kind's record keys in ID order.
+        - Anything that stores record IDs can keep it to detect data whose IDs have moved.
+        - Class archetype names are included, since archetypes are referred to by position.
+        - Cached until set_records replaces the kind.
+        Args:
+            kind (str): Data kind.
+        Returns:
+            int: CRC-32 of the ordered keys.
+        """
+        value = self.fingerprints.get(kind)
+        if value is None:
+            keys = [record_key(kind, r) for r in self.records(kind)]
+            if kind == "classes":
+                keys = [[key, [a.get("name") for a in r.get("archetypes", [])]] for key, r in zip(keys, self.records(kind))]
+            value = self.fingerprints[kind] = zlib.crc32(json.dumps(keys, separators=(",", ":")).encode())
+        return value
+
+    def trait_registry(self):
+        """
+        Get trait definitions keyed by name, as used by Character.recalculate_traits.
+        Returns:
+            dict: Trait name -> trait definition.
+        """
+        return {t["name"]: t for t in self.records("traits")}
+
+@lru_cache(maxsize=1)
+def default_catalog():
+    """
+    Get the shared catalog of bundled game data, loaded on first use.
+    Returns:
+        Catalog: The shared catalog.
+    """
+    return Catalog.load()
@@ -1,4 +1,23 @@
+from wotr_planner.models.feat import FeatSet, names_mask
 from wotr_planner.models.json_loader import load_classes, load_races
+from wotr_planner.models.progression import ClassLevels, class_progression
+
+# Ability scores in display order
+STATS = ("Str", "Dex", "Con", "Int", "Wis", "Cha")
+# Skills in display order
+SKILLS = (
+    "Athletics",
+    "Mobility",
+    "Trickery",
+    "Stealth",
+    "Knowledge(Arcana)",
+    "Knowledge(World)",
+    "Lore(Nature)",
+    "Lore(Religion)",
+    "Perception",
+    "Persuasion",
+    "Use Magic Device"
+)
 
 class Character:
     """
@@ -13,17 +32,21 @@ class Character:
             char_class (dict, optional): Character class data. Defaults to None.
             race (dict, optional): Character race data. Defaults to None.
         """
-        # Loads json definitions
-        classes = load_classes()
-        races = load_races()
         self.name = ""
-        # Default to Human Fighter if none provided
-        self.race = race or next(r for r in races if r["name"] == "Human")
-        self.char_class = char_class or next(c for c in classes if c["name"] == "Fighter")
+        self.notes = ""
+        # Default to Human Fighter if none provided (json definitions are only loaded then)
+        self.race = race or next(r for r in load_races() if r["name"] == "Human")
+        self.char_class = char_class or next(c for c in load_classes() if c["name"] == "Fighter")
+        # Class taken at each level (ClassLevels), or None when every level is in char_class
+        self.class_levels = None
+        # (char_class, ClassProgression) of the last single-class lookup
+        self._progression = (None, None)
+        self.archetype = None
         self.heritage = None
         self.background = None
         self.level = 1
-        self.feats = []
+        # Chosen feats as interned IDs; assigning any iterable of feat dicts to feats converts it
+        self._feats = FeatSet()
         self.traits = []
         self.trait_bonuses = {
             "saves": {},
@@ -43,53 +66,101 @@ class Character:
             "innate_feats": []
         }
         # Initialize stats
-        self.point_buy_stats = {
-            "Str":10,
-            "Dex":10, 
-            "Con":10, 
-            "Int":10, 
-            "Wis":10, 
-            "Cha":10
-        }
+        self.point_buy_stats = {stat: 10 for stat in STATS}
         # Copy of base stats for reference
         self.base_stats = self.point_buy_stats.copy()
         # Current stats including racial/heritage modifiers
         self.stats = self.point_buy_stats.copy()
 
         # Initialize skills
-        self.skill_ranks = {
-            "Athletics": 0,
-            "Mobility": 0,
-            "Trickery": 0,
-            "Stealth": 0,
-            "Knowledge(Arcana)": 0,
-            "Knowledge(World)": 0,
-            "Lore(Nature)": 0,
-            "Lore(Religion)": 0,
-            "Perception": 0,
-            "Persuasion": 0,
-            "Use Magic Device": 0
-        }
+        self.skill_ranks = {skill: 0 for skill in SKILLS}
         # Current effective skills including modifiers
         self.skills = self.skill_ranks.copy()
 
-    def level_up(self):
+    @property
+    def feats(self):
+        """
+        Chosen feats, in order.
+        Returns:
+            FeatSet: Interned feat IDs and their definitions.
+        """
+        return self._feats
+
+    @feats.setter
+    def feats(self, feats):
+        self._feats = feats if isinstance(feats, FeatSet) else FeatSet(feats)
+
+    def level_up(self, char_class=None):
         """
         Increase character level by 1.
+        Args:
+            char_class (dict, optional): Class taken at the new level. Defaults to char_class.
         """
         self.level += 1
+        if char_class is not None and char_class is not self.char_class:
+            self.set_level_class(self.level, char_class)
+
+    def progression(self, level=None):
+        """
+        Get the class tables for the character's levels.
+        - Single-class characters share their class's cached ClassProgression.
+        - Multiclass levels not recorded yet are filled with char_class.
+        Args:
+            level (int, optional): Highest level needed. Defaults to the character's level.
+        Returns:
+            ClassProgression | ClassLevels: Tables with total() and skill_budget().
+        """
+        if self.class_levels is None:
+            char_class, table = self._progression
+            if char_class is not self.char_class:
+                table = class_progression(self.char_class)
+                self._progression = (self.char_class, table)
+            return table
+        level = self.level if level is None else level
+        while len(self.class_levels) < level:
+            self.class_levels.append(self.char_class)
+        return self.class_levels
+
+    def set_level_class(self, level, char_class):
+        """
+        Take a class at one character level, switching to per-level classes.
+        - Only that level and the ones after it are recomputed.
+        Args:
+            level (int): Character level, from 1.
+            char_class (dict): Class record.
+        """
+        if self.class_levels is None:
+            self.class_levels = ClassLevels([self.char_class] * max(self.level, level))
+        self.progression(level).set_class(level, char_class)
+
+    def class_skills(self):
+        """
+        Get the class skills of every class taken up to the current level.
+        Returns:
+            frozenset: Skill names.
+        """
+        progression = self.progression()
+        if self.class_levels is None:
+            return progression.class_skills
+        return progression.class_skills[min(self.level, len(progression))]
     
     def available_feats(self, all_feats):
         """
         Get list of feats available for selection based on current character state.
-        - Considers level, stats, and already selected feats.
+        - Considers level, stats, and already selected and innate feats.
         Args:
-            all_feats: List of all possible feat definitions.
+            all_feats: List of all possible feat definitions, or shared records with a
+                prerequisite table (see SharedRecords).
         Returns:
             List of available feat definitions.
         """
+        prerequisites = getattr(all_feats, "prerequisites", None)
+        if prerequisites is not None:
+            # Shared game data checks its prerequisite table without decoding every feat
+            return prerequisites.available(self)
         feats_list = []
-        chosen_feat_names = [f["name"] for f in self.feats]
+        chosen = self.feats
+        innate = self.innate_feat_bits()
         for feat in all_feats:
             # Level requirement
             feat_level = feat.get("prerequisite_level", 1) <= self.level
@@ -98,13 +169,11 @@ class Character:
                 self.stats.get(stat, 0) >= val
                 for stat, val in feat.get("prerequisite_stats", {}).items()
             )
-            # Feat prerequisites
-            required_feats = feat.get("prerequisite_feats", [])
-            feat_feats = all(req in chosen_feat_names for req in required_feats)
+            # Feat prerequisites, as one bitset test
+            feat_feats = chosen.meets(feat, innate)
 
             if feat_level and feat_stats and feat_feats:
                 feats_list.append(feat)
-                print("APPEND HIT")
 
         return feats_list
     
@@ -115,11 +184,107 @@ class Character:
             int: Number of skill points gained per level.
         """
         base = self.char_class.get("skill_points", 0)
+        return max(1, base + self.skill_points_modifier())
+
+    def skill_points_modifier(self) -> int:
+        """
+        Calculate skill points added at every level regardless of class.
+        Returns:
+            int: Intelligence modifier plus race and heritage bonuses.
+        """
         int_mod = (self.stats["Int"] - 10) // 2
         race_mod = self.race.get("skill_points_bonus", 0)
         heritage_mod = self.trait_bonuses.get("skill_points_bonus", 0)
-        return max(1, base + int_mod + race_mod + heritage_mod)
+        return int_mod + race_mod + heritage_mod
+
+    def skill_point_budget(self) -> int:
+        """
+        Calculate the total skill ranks gained over every level.
+        - Each level gains its class's points plus the modifier, and at least 1.
+        Returns:
+            int: Total skill points.
+        """
+        return self.progression().skill_budget(self.level, self.skill_points_modifier())
     
+    def racial_modifiers(self) -> dict:
+        """
+        Get the ability score modifiers granted by heritage or race.
+        - Heritage modifiers replace race modifiers when present.
+        Returns:
+            dict: Ability score modifiers by stat name.
+        """
+        if self.heritage and self.heritage.get("modifiers"):
+            return self.heritage["modifiers"]
+        if self.race and self.race.get("modifiers"):
+            return self.race["modifiers"]
+        return {} # No modifiers
+
+    def recalculate_stats(self, feats=None):
+        """
+        Recalculate final ability scores from point buy, racial/heritage and feat modifiers.
+        Args:
+            feats (list, optional): Feats affecting ability scores. Defaults to self.feats.
+        Returns:
+            dict: The character's final stats.
+        """
+        feats = self.feats if feats is None else feats
+        # Reset stats to point buy values
+        self.stats = self.point_buy_stats.copy()
+
+        # Apply racial/heritage modifiers
+        for stat, bonus in self.racial_modifiers().items():
+            if stat in self.stats:
+                self.stats[stat] += bonus
+
+        # Apply feat modifiers
+        for feat in feats:
+            for stat, bonus in feat.get("modifiers", {}).items():
+                if stat in self.stats:
+                    self.stats[stat] += bonus
+        return self.stats
+
+    def recalculate_skills(self):
+        """
+        Recalculate effective skill values from ranks, feats, background and traits.
+        Returns:
+            dict: The character's effective skills.
+        """
+        # Reset effective skills to current ranks
+        self.skills = self.skill_ranks.copy()
+        # Apply feat modifiers
+        for feat in self.feats:
+            for skill, bonus in feat.get("skill_modifiers", {}).items():
+                self.skills[skill] = self.skills.get(skill, 0) + bonus
+
+        # Apply background skill modifiers
+        if self.background:
+            for skill, bonus in self.background.get("skill_modifiers", {}).items():
+                self.skills[skill] = self.skills.get(skill, 0) + bonus
+
+        # Apply trait skill bonuses
+        for skill, bonus in self.trait_bonuses["skills"].items():
+            self.skills[skill] = self.skills.get(skill, 0) + bonus
+        return self.skills
+
+    def innate_feat_bits(self):
+        """
+        Get the bitset of feats granted by traits (see recalculate_traits).
+        - Innate feats satisfy prerequisites like chosen ones, without using a slot.
+        Returns:
+            int: Bitset of the innate feats' interned IDs.
+        """
+        return names_mask(self.trait_bonuses["innate_feats"])
+
+    def meets_feat_prerequisites(self, feat):
+        """
+        Check that every prerequisite feat of a feat is chosen or innate.
+        Args:
+            feat (dict): Feat definition.
+        Returns:
+            bool: True if no prerequisite feat is missing.
+        """
+        return self.feats.meets(feat, self.innate_feat_bits())
+
     def remove_feat(self, feat_name: str):
         """
         Remove a feat from the character by name.
@@ -128,14 +293,12 @@ class Character:
         Returns:
             bool: True if a feat was removed, False otherwise.
         """
-        before =  len(self.feats)
-        self.feats = [f for f in self.feats if f["name"] != feat_name]
-        return len(self.feats) < before
+        return self.feats.discard(feat_name)
     
     def validate_feats(self, all_feats):
         """
         Validate current feats against prerequisites and slot limits.
-        - Removes feats that no longer meet prerequisites.
+        - Removes feats that no longer meet prerequisites; innate feats count as taken.
         - Trim feats to fit within available feat slots.
         Args:
             all_feats: List of all possible feat definitions.
@@ -143,41 +306,34 @@ class Character:
             set: Names of removed feats.
         """
         removed = set()
+        feats = self.feats
+        innate = self.innate_feat_bits()
+        definitions = feats.definitions(all_feats)
         changed = True
         while changed:
             changed = False
-            for feat in list(self.feats):
-                full_def = next((f  for f in all_feats if f["name"] == feat["name"]), None)
+            for feat in list(feats):
+                full_def = definitions.get(feat["name"])
                 if not full_def:
                     continue
 
-                # Check level prerequisite
-                if self.level < full_def.get("prerequisite_level", 1):
-                    self.feats = [f for f in self.feats if f["name"] != feat["name"]]
+                # Check level and feat prerequisites, the latter as one bitset test
+                failed = self.level < full_def.get("prerequisite_level", 1) or not feats.meets(full_def, innate)
+                # Check stat prerequisites
+                if not failed:
+                    for stat, value in full_def.get("prerequisite_stats", {}).items():
+                        if self.stats.get(stat, 0) < value:
+                            failed = True
+                            break
+                if failed:
+                    feats.discard(feat["name"])
                     removed.add(feat["name"])
                     changed = True
-                    continue
-
-                # Check stat prerequisites
-                for stat, value in full_def.get("prerequisite_stats", {}).items():
-                    if self.stats.get(stat, 0) < value:
-                        self.feats = [f for f in self.feats if f["name"] != feat["name"]]
-                        removed.add(feat["name"])
-                        changed = True
-                        break
-
-                # Check feat prerequisites
-                for prereq in full_def.get("prerequisite_feats", []):
-                    if prereq not in [f["name"] for f in self.feats]:
-                        self.feats = [f for f in self.feats if f["name"] != feat["name"]]
-                        removed.add(feat["name"])
-                        changed = True
-                        break
 
         # Enforce maximum feat slots
         max_slots = self.total_feat_slots()
         if len(self.feats) > max_slots:
-            self.feats = self.feats[:max_slots]
+            del self.feats[max_slots:]
             removed.update(f["name"] for f in self.feats[max_slots:])
 
         return removed
@@ -191,15 +347,12 @@ class Character:
         slots = 0
         # Feats every odd level
         slots += (self.level + 1) // 2
-        # Class bonus feats
-        bonus_interval = self.char_class.get("bonus_feat_interval")
-        if bonus_interval:
-            slots += self.level // bonus_interval
-
-        # Additional class bonus feats
-        for lvl in self.char_class.get("bonus_feats", []):
-            if self.level >= lvl:
-                slots += 1
+        # Class bonus feats (bonus_feat_interval and bonus_feats) of every class taken
+        char_class, table = self._progression
+        if self.class_levels is not None or char_class is not self.char_class:
+            table = self.progression()
+        bonus_feats = table.bonus_feats
+        slots += bonus_feats[self.level] if self.level < len(bonus_feats) else bonus_feats[-1]
         
         # Race bonus feats
         for lvl in self.race.get("bonus_feats", []):
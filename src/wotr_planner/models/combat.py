@@ -0,0 +1,115 @@
+"""
+Combat statistics from class progression tables.
+- BAB, saves and hit points come from the cached per-class tables (or a multiclass
+  character's running totals), so a sheet for any level is a table lookup.
+- Ability modifiers and trait bonuses (saves, natural AC, CMB, CMD) are added on top.
+- Conditional bonuses (saves against a school, dodge AC against a creature type) are
+  listed separately instead of being folded into the totals.
+- BuildMatrix uses the same tables to compute the "combat" group for many builds at once.
+"""
+from wotr_planner.models.progression import MAX_LEVEL, SAVES
+
+# Ability that modifies each saving throw
+SAVE_ABILITIES = {"Fortitude": "Con", "Reflex": "Dex", "Will": "Wis"}
+# Combat statistics in display order
+COMBAT_STATS = ("BAB", "Fortitude", "Reflex", "Will", "HP", "AC", "Touch AC", "Flat-Footed AC", "CMB", "CMD")
+
+def ability_modifier(score):
+    """
+    Get the modifier of an ability score.
+    Args:
+        score (int): Ability score.
+    Returns:
+        int: (score - 10) // 2.
+    """
+    return (score - 10) // 2
+
+def trait_save_bonuses(trait_bonuses):
+    """
+    Split trait save bonuses into unconditional and conditional ones.
+    - Keys naming a saving throw (in any case, e.g. "will") apply to that save.
+    - Other keys (schools, effects such as "Fear") only apply situationally.
+    Args:
+        trait_bonuses (dict): Character.trait_bonuses.
+    Returns:
+        tuple: (save -> bonus, condition -> bonus).
+    """
+    saves = dict.fromkeys(SAVES, 0)
+    conditional = {}
+    names = {save.lower(): save for save in SAVES}
+    for key, bonus in trait_bonuses.get("saves", {}).items():
+        save = names.get(key.lower())
+        if save:
+            saves[save] += bonus
+        else:
+            conditional[key] = conditional.get(key, 0) + bonus
+    return saves, conditional
+
+def combat_stats(progression, level, stats, trait_bonuses):
+    """
+    Compute combat statistics from class tables.
+    - Levels above MAX_LEVEL use the level 20 row; hit points gain at least 1 per level.
+    Args:
+        progression (ClassProgression | ClassLevels): Single-class or multiclass tables.
+        level (int): Character level.
+        stats (dict): Final ability scores.
+        trait_bonuses (dict): Character.trait_bonuses.
+    Returns:
+        dict: Value for every COMBAT_STATS name.
+    """
+    level = max(0, min(level, MAX_LEVEL))
+    mods = {stat: ability_modifier(score) for stat, score in stats.items()}
+    save_bonuses, _ = trait_save_bonuses(trait_bonuses)
+    bab = progression.total("bab", level)
+    dex = mods.get("Dex", 0)
+    strength = mods.get("Str", 0)
+    # "ac" is an untyped bonus; natural armor does not apply to touch attacks
+    ac_bonus = trait_bonuses.get("ac", 0)
+    natural = trait_bonuses.get("natural_ac", 0)
+    sheet = {"BAB": bab}
+    for save in SAVES:
+        sheet[save] = progression.total(save, level) + mods.get(SAVE_ABILITIES[save], 0) + save_bonuses[save]
+    sheet["HP"] = max(progression.total("hp", level) + mods.get("Con", 0) * level, level)
+    sheet["AC"] = 10 + dex + natural + ac_bonus
+    sheet["Touch AC"] = 10 + dex + ac_bonus
+    sheet["Flat-Footed AC"] = 10 + natural + ac_bonus
+    sheet["CMB"] = bab + strength + trait_bonuses.get("cmb", 0)
+    sheet["CMD"] = 10 + bab + strength + dex + trait_bonuses.get("cmd", 0)
+    return sheet
+
+def combat_sheet(character, level=None):
+    """
+    Compute a character's combat statistics.
+    - Uses the character's current final stats and trait bonuses (see recalculate_stats
+      and recalculate_traits).
+    Args:
+        character (Character): Character to evaluate.
+        level (int, optional): Level to evaluate at. Defaults to the character's level.
+    Returns:
+        dict: COMBAT_STATS values plus "conditional" with situational save, dodge AC and
+            attack bonuses.
+    """
+    level = character.level if level is None else level
+    sheet = combat_stats(character.progression(), level, character.stats, character.trait_bonuses)
+    _, conditional_saves = trait_save_bonuses(character.trait_bonuses)
+    sheet["conditional"] = {
+        "saves": conditional_saves,
+        "dodge_ac": dict(character.trait_bonuses.get("dodge_ac", {})),
+        "attack": dict(character.trait_bonuses.get("ab", {})),
+    }
+    return sheet
+
+def level_progression(character, max_level=MAX_LEVEL):
+    """
+    Compute combat statistics for every level with the character's current choices.
+    Args:
+        character (Character): Character to evaluate.
+        max_level (int, optional): Last level. Defaults to MAX_LEVEL.
+    Returns:
+        list: One COMBAT_STATS dict per level, starting at level 1.
+    """
+    progression = character.progression(max_level)
+    return [
+        combat_stats(progression, level, character.stats, character.trait_bonuses)
+        for level in range(1, max_level + 1)
+    ]
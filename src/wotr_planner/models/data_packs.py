@@ -0,0 +1,215 @@
+"""
+Layered data packs on top of the bundled data files.
+- A pack is a directory holding any of the data files (feats.json, heritages.json, ...).
+- Layers are merged in order by record key (name; race and name for heritages):
+  - a record with a new key is appended;
+  - a record with an existing key replaces it in place;
+  - {"name": ..., "_merge": true, ...} updates only the given fields;
+  - {"name": ..., "_remove": true} deletes the record.
+- Parsed files are cached with their modification time, so a reload re-reads only the
+  changed file, re-merges only its kind and rebuilds only that kind's catalog index.
+"""
+import json
+import os
+from pathlib import Path
+from wotr_planner.models.catalog import LOADERS, Catalog, record_key
+from wotr_planner.models.data_schemas import DataError, DataValidationError, validator
+
+# Bundled data files, the bottom layer
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+# Default pack location, overridable with the WOTR_PLANNER_PACKS environment variable
+PACKS_DIR = Path.home() / ".wotr_planner" / "packs"
+# Control fields of pack records, stripped from merged records
+CONTROL_FIELDS = ("_merge", "_remove")
+
+def default_pack_dirs():
+    """
+    Get the data pack directories used when none are given.
+    Returns:
+        list: Paths from WOTR_PLANNER_PACKS (os.pathsep separated) if set, otherwise
+            the subdirectories of ~/.wotr_planner/packs in name order.
+    """
+    configured = os.environ.get("WOTR_PLANNER_PACKS")
+    if configured is not None:
+        return [Path(p) for p in configured.split(os.pathsep) if p]
+    if not PACKS_DIR.is_dir():
+        return []
+    return sorted(p for p in PACKS_DIR.iterdir() if p.is_dir())
+
+def merge_layers(kind, layers):
+    """
+    Merge the records of one kind across layers.
+    Args:
+        kind (str): Data kind.
+        layers (iterable): (source name, records) pairs, bottom layer first.
+    Returns:
+        tuple: (merged records, list of DataError).
+    """
+    check = validator(kind) or (lambda record: None)
+    merged = {}
+    errors = []
+    for source, records in layers:
+        if not isinstance(records, list):
+            errors.append(DataError(source, 0, (), f"expected a list of records, got {type(records).__name__}"))
+            continue
+        for index, record in enumerate(records):
+            if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+                errors.append(DataError(source, index, (), "record needs a string 'name'"))
+                continue
+            key = record_key(kind, record)
+            if record.get("_remove"):
+                if merged.pop(key, None) is None:
+                    errors.append(DataError(source, index, (), f"cannot remove unknown record {record['name']!r}"))
+                continue
+            fields = {k: v for k, v in record.items() if k not in CONTROL_FIELDS}
+            if record.get("_merge"):
+                if key not in merged:
+                    errors.append(DataError(source, index, (), f"cannot merge into unknown record {record['name']!r}"))
+                    continue
+                fields = {**merged[key], **fields}
+            found = check(fields)
+            if found:
+                errors.extend(DataError(source, index, path, message) for path, message in found)
+                continue
+            merged[key] = fields
+    return list(merged.values()), errors
+
+class DataPacks:
+    """
+    The bundled data plus an ordered list of data packs.
+    """
+    def __init__(self, pack_dirs=(), base_dir=None):
+        """
+        Initialize DataPacks.
+        Args:
+            pack_dirs (iterable, optional): Pack directories, lowest priority first. Defaults to none.
+            base_dir (str | Path, optional): Bottom layer. Defaults to the bundled data directory.
+        """
+        self.layers = [Path(base_dir or DATA_DIR), *(Path(p) for p in pack_dirs)]
+        # File path -> ((mtime_ns, size), records)
+        self.files = {}
+
+    @staticmethod
+    def _stat(path):
+        """
+        Get a file's change signature.
+        Returns:
+            tuple | None: (mtime_ns, size), or None if the file does not exist.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self, path):
+        """
+        Get the records of a data file, parsing it only if it changed.
+        Args:
+            path (Path): Data file.
+        Returns:
+            list: Records, or an empty list if the file does not exist.
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        signature = self._stat(path)
+        cached = self.files.get(path)
+        if cached is None or cached[0] != signature:
+            if signature is None:
+                records = []
+            else:
+                with path.open(encoding="utf-8") as f:
+                    records = json.load(f)
+            self.files[path] = cached = (signature, records)
+        return cached[1]
+
+    def merged(self, kind):
+        """
+        Merge one kind across all layers.
+        Args:
+            kind (str): Data kind.
+        Returns:
+            list: Merged records.
+        Raises:
+            DataValidationError: If a record is invalid or a control record has no target.
+            json.JSONDecodeError: If a data file is not valid JSON.
+        """
+        layers = [(str(layer / f"{kind}.json"), self._read(layer / f"{kind}.json")) for layer in self.layers]
+        records, errors = merge_layers(kind, layers)
+        if errors:
+            raise DataValidationError(errors)
+        return records
+
+    def catalog(self):
+        """
+        Build a catalog of the merged data.
+        Returns:
+            Catalog: The merged catalog.
+        """
+        return Catalog({kind: self.merged(kind) for kind in LOADERS})
+
+    def kind_of(self, path):
+        """
+        Get the data kind of a file in one of the layers.
+        Args:
+            path (str | Path): File path.
+        Returns:
+            str | None: The kind, or None if the file is not a data file of a layer.
+        """
+        path = Path(path)
+        kind = path.stem
+        if path.suffix == ".json" and kind in LOADERS and path.parent in self.layers:
+            return kind
+        return None
+
+    def changed_files(self):
+        """
+        Find data files created, edited or deleted since they were last read.
+        Returns:
+            list: Paths of changed files.
+        """
+        changed = []
+        for layer in self.layers:
+            for kind in LOADERS:
+                path = layer / f"{kind}.json"
+                cached = self.files.get(path)
+                if cached is not None and cached[0] != self._stat(path):
+                    changed.append(path)
+        return changed
+
+    def reload(self, catalog, paths=None):
+        """
+        Re-read changed files and update only the affected kinds of a catalog.
+        - On an error the catalog keeps its previous records for that kind.
+        Args:
+            catalog (Catalog): Catalog built from these packs.
+            paths (iterable, optional): Changed files. Defaults to changed_files().
+        Returns:
+            list: Kinds whose records were replaced.
+        Raises:
+            DataValidationError: If a changed file has invalid records.
+            json.JSONDecodeError: If a changed file is not valid JSON.
+        """
+        paths = self.changed_files() if paths is None else paths
+        kinds = []
+        for path in paths:
+            kind = self.kind_of(path)
+            if kind is not None and kind not in kinds:
+                kinds.append(kind)
+        for kind in kinds:
+            catalog.set_records(kind, self.merged(kind))
+        return kinds
+
+    def watch_paths(self):
+        """
+        Get the paths to watch for changes.
+        - Directories catch files being created or replaced by atomic saves.
+        Returns:
+            list: Existing layer directories and data files, as strings.
+        """
+        paths = []
+        for layer in self.layers:
+            if layer.is_dir():
+                paths.append(str(layer))
+                paths.extend(str(layer / f"{kind}.json") for kind in LOADERS if (layer / f"{kind}.json").exists())
+        return paths
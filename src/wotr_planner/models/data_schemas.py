@@ -0,0 +1,436 @@
+"""
+JSON schemas of the data files, compiled into plain validator functions.
+- compile_schema turns a schema into nested closures once; validating a record is then
+  a single pass of dict/list walks with no schema interpretation.
+- Supports the JSON Schema subset the data schemas use; other keywords are rejected
+  at compile time rather than silently ignored.
+"""
+import re
+from wotr_planner.models.character import STATS
+from wotr_planner.models.feat_schema import feat_schema
+
+# Keywords that document a schema but do not constrain values
+ANNOTATIONS = {"$schema", "title", "description", "default", "examples"}
+
+_integer = {"type": "integer"}
+_strings = {"type": "array", "items": {"type": "string"}}
+_integers = {"type": "array", "items": {"type": "integer"}}
+_bonuses = {"type": "object", "additionalProperties": {"type": "number"}}
+_stat_modifiers = {
+    "type": "object",
+    "patternProperties": {f"^({'|'.join(STATS)})$": {"type": "integer"}},
+    "additionalProperties": False
+}
+_progression = {"enum": ["High", "Average", "Low"]}
+
+class_schema = {
+    "type": "object",
+    "required": ["name", "base_hp", "skill_points"],
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "base_hp": {"type": "integer", "minimum": 1},
+        "hp_per_level": {"type": "integer", "minimum": 0},
+        "skill_points": {"type": "integer", "minimum": 0},
+        "bonus_feat_interval": {"type": "integer", "minimum": 0},
+        "bonus_feats": _integers,
+        "base_attack_bonus": _progression,
+        "saving_throws": {"type": "object", "additionalProperties": _progression},
+        "class_skills": _strings,
+        "proficiencies": _strings,
+        "class_feats": {
+            "type": "array",
+            "items": {"type": "object", "additionalProperties": {"type": "integer", "minimum": 1}}
+        },
+        "archetypes": {
+            "type": "array",
+            "items": {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+        },
+    },
+    "additionalProperties": True
+}
+
+race_schema = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "skill_points_bonus": _integer,
+        "bonus_feats": _integers,
+        "modifiers": _stat_modifiers,
+        "traits": _strings,
+    },
+    "additionalProperties": True
+}
+
+# Bonuses granted by traits, and directly by heritages
+_trait_bonus_properties = {
+    "skill_points_bonus": _integer,
+    "save_bonuses": _bonuses,
+    "attack_bonuses": _bonuses,
+    "skill_bonuses": _bonuses,
+    "dodge_ac_bonuses": _bonuses,
+    "resistances": _bonuses,
+    "spell_dc_bonuses": _bonuses,
+    "natural_ac_bonuses": _integer,
+    "combat_maneuver_bonuses": _integer,
+    "combat_maneuver_defenses": _integer,
+    "damage_reduction": {"type": "array"},
+    "natural_attacks": {"type": "array"},
+}
+
+heritage_schema = {
+    "type": "object",
+    "required": ["name", "race"],
+    "properties": {
+        "name": {"type": "string"},
+        "race": {"type": "string"},
+        "description": {"type": "string"},
+        "modifiers": _stat_modifiers,
+        "traits": _strings,
+        "traits_removed": _strings,
+        **_trait_bonus_properties,
+    },
+    "additionalProperties": True
+}
+
+trait_schema = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        **_trait_bonus_properties,
+        "innate_abilities": {"type": "array"},
+        "innate_feats": _strings,
+    },
+    "additionalProperties": True
+}
+
+background_schema = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "skill_modifiers": {"type": "object", "additionalProperties": {"type": "integer"}},
+    },
+    "additionalProperties": True
+}
+
+skill_schema = {
+    "type": "object",
+    "required": ["name", "key_ability"],
+    "properties": {
+        "name": {"type": "string"},
+        "key_ability": {"enum": list(STATS)},
+    },
+    "additionalProperties": True
+}
+
+# Data kind -> schema of one record
+SCHEMAS = {
+    "classes": class_schema,
+    "races": race_schema,
+    "heritages": heritage_schema,
+    "backgrounds": background_schema,
+    "feats": feat_schema,
+    "skills": skill_schema,
+    "traits": trait_schema,
+}
+
+# JSON Schema type name -> exact Python types produced by json.load (bool is not a number)
+_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+_NUMBERS = frozenset(_TYPES["number"])
+
+def _whole_float(value, types):
+    """
+    Check for a float such as 1.0 where an integer is expected; JSON writers may emit
+    either for a whole number, and JSON Schema counts both as integers.
+    - Validation converts such values to int in place, so code using the records only
+      ever sees the integers the schema promises.
+    """
+    return type(value) is float and int in types and value.is_integer()
+
+class DataError:
+    """
+    A single schema violation in a data file.
+    """
+    def __init__(self, source, index, path, message):
+        """
+        Initialize a DataError.
+        Args:
+            source (str): Data file name, e.g. "feats.json".
+            index (int): Position of the record in the file.
+            path (tuple): Keys and indexes from the record to the bad value.
+            message (str): What is wrong.
+        """
+        self.source = source
+        self.index = index
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        location = "".join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in self.path)
+        return f"{self.source}[{self.index}]{location}: {self.message}"
+
+    def __repr__(self):
+        return f"DataError({str(self)!r})"
+
+class DataValidationError(ValueError):
+    """
+    Raised when data files do not match their schemas.
+    - errors lists every violation found, not just the first.
+    """
+    def __init__(self, errors):
+        self.errors = list(errors)
+        shown = "\n".join(str(e) for e in self.errors[:20])
+        more = f"\n... and {len(self.errors) - 20} more" if len(self.errors) > 20 else ""
+        super().__init__(f"{len(self.errors)} data error(s):\n{shown}{more}")
+
+def compile_schema(schema):
+    """
+    Compile a schema into a validator function.
+    - Keyword lookups, regexes and sub-validators are resolved here, once.
+    - Values are checked by exact type, which is correct for json.load output and
+      much cheaper than isinstance chains. Whole-number floats also pass as integers and
+      are replaced with ints in their containing object or array.
+    - Error paths are only built for invalid values, so valid data allocates nothing.
+    Args:
+        schema (dict): JSON schema.
+    Returns:
+        callable: check(value) returning None when valid, otherwise a list of
+            (path, message) with the path relative to value. Its integral attribute is
+            True when the schema only allows integers.
+    Raises:
+        ValueError: If the schema uses an unsupported keyword.
+    """
+    unsupported = set(schema) - ANNOTATIONS - {
+        "type", "required", "properties", "patternProperties", "additionalProperties",
+        "items", "minimum", "maximum", "enum",
+    }
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords: {', '.join(sorted(unsupported))}")
+
+    names = _type_names(schema)
+    types = frozenset(t for name in names for t in _TYPES[name]) if names else None
+    expected = " or ".join(names)
+    enum = list(schema["enum"]) if "enum" in schema else None
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+
+    is_object = bool({"required", "properties", "patternProperties", "additionalProperties"} & set(schema))
+    required = list(schema.get("required", []))
+    properties = {key: compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    patterns = [(re.compile(p), compile_schema(sub)) for p, sub in schema.get("patternProperties", {}).items()]
+    additional = schema.get("additionalProperties", True)
+    additional = additional if isinstance(additional, bool) else compile_schema(additional)
+
+    items = schema.get("items")
+    check_item = compile_schema(items) if items is not None else None
+    # Arrays of a plain type ({"type": "string"}) are checked without calling a sub-validator
+    item_types = _plain_types(items)
+    # Properties of a plain type are checked inline; the rest call their sub-validator
+    plain_properties = {
+        key: (_plain_types(sub), " or ".join(_type_names(sub)))
+        for key, sub in schema.get("properties", {}).items() if _plain_types(sub) is not None
+    }
+    # Without patterns or closed objects, undeclared fields need no checks at all
+    declared_only = not patterns and additional is True
+
+    def check_object(value):
+        errors = None
+        for key in required:
+            if key not in value:
+                errors = (errors or []) + [((), f"missing required field '{key}'")]
+        if declared_only:
+            for key, item in value.items():
+                plain = plain_properties.get(key)
+                if plain is not None:
+                    if type(item) not in plain[0]:
+                        if _whole_float(item, plain[0]):
+                            value[key] = int(item)
+                        else:
+                            errors = (errors or []) + [((key,), f"expected {plain[1]}, got {type(item).__name__}")]
+                    continue
+                sub = properties.get(key)
+                if sub is not None:
+                    found = sub(item)
+                    if found:
+                        errors = (errors or []) + [((key,) + path, message) for path, message in found]
+                    elif type(item) is float and sub.integral:
+                        value[key] = int(item)
+            return errors
+        for key, item in value.items():
+            found = None
+            sub = properties.get(key)
+            whole = False
+            if sub is not None:
+                found = sub(item)
+                whole = sub.integral
+            matched = sub is not None
+            for pattern, sub in patterns:
+                if pattern.search(key):
+                    matched = True
+                    found = (found or []) + (sub(item) or [])
+                    whole = whole or sub.integral
+            if not matched:
+                if additional is False:
+                    errors = (errors or []) + [((), f"unexpected field '{key}'")]
+                elif additional is not True:
+                    found = additional(item)
+                    whole = additional.integral
+            if not found and whole and type(item) is float:
+                value[key] = int(item)
+            if found:
+                errors = (errors or []) + [((key,) + path, message) for path, message in found]
+        return errors
+
+    def check_array(value):
+        if item_types is not None:
+            for item in value:
+                if type(item) not in item_types:
+                    break
+            else:
+                return None
+        errors = None
+        for i, item in enumerate(value):
+            found = check_item(item)
+            if found:
+                errors = (errors or []) + [((i,) + path, message) for path, message in found]
+            elif type(item) is float and check_item.integral:
+                value[i] = int(item)
+        return errors
+
+    def check_type(value):
+        return [((), f"expected {expected}, got {type(value).__name__}")]
+
+    # Containers replace whole floats that pass a validator with this set by int
+    integral = types == {int}
+
+    # Specialized validators for the common shapes: plain value, object, array
+    simple = enum is None and minimum is None and maximum is None
+    if simple and types is not None and not is_object and check_item is None:
+        def check(value):
+            if type(value) not in types and not _whole_float(value, types):
+                return check_type(value)
+        check.integral = integral
+        return check
+    if simple and types == {dict} and is_object:
+        def check(value):
+            if type(value) is not dict:
+                return check_type(value)
+            return check_object(value)
+        check.integral = False
+        return check
+    if simple and types == {list} and not is_object and check_item is not None:
+        def check(value):
+            if type(value) is not list:
+                return check_type(value)
+            return check_array(value)
+        check.integral = False
+        return check
+
+    def check(value):
+        if types is not None and type(value) not in types and not _whole_float(value, types):
+            return check_type(value)
+        errors = None
+        if enum is not None and value not in enum:
+            errors = [((), f"{value!r} is not one of {enum}")]
+        if type(value) in _NUMBERS:
+            if minimum is not None and value < minimum:
+                errors = (errors or []) + [((), f"{value} is below minimum {minimum}")]
+            if maximum is not None and value > maximum:
+                errors = (errors or []) + [((), f"{value} is above maximum {maximum}")]
+        if is_object and type(value) is dict:
+            found = check_object(value)
+            if found:
+                errors = (errors or []) + found
+        elif check_item is not None and type(value) is list:
+            found = check_array(value)
+            if found:
+                errors = (errors or []) + found
+        return errors
+    check.integral = integral
+    return check
+
+def _type_names(schema):
+    """
+    Get the type names a schema allows.
+    """
+    names = schema.get("type", [])
+    return [names] if isinstance(names, str) else names
+
+def _plain_types(schema):
+    """
+    Get the allowed Python types of a schema that only constrains the type.
+    Args:
+        schema (dict | None): JSON schema.
+    Returns:
+        frozenset | None: Exact Python types, or None if the schema has other keywords.
+    """
+    if schema is None or set(schema) - ANNOTATIONS != {"type"}:
+        return None
+    return frozenset(t for name in _type_names(schema) for t in _TYPES[name])
+
+# Data kind -> compiled record validator, built on first use
+_validators = {}
+
+def validator(kind):
+    """
+    Get the compiled validator of a data kind.
+    Args:
+        kind (str): Data kind, e.g. "feats".
+    Returns:
+        callable | None: The validator, or None if the kind has no schema.
+    """
+    if kind not in _validators and kind in SCHEMAS:
+        _validators[kind] = compile_schema(SCHEMAS[kind])
+    return _validators.get(kind)
+
+def validation_errors(kind, records, source=None):
+    """
+    Validate the records of one data file.
+    Args:
+        kind (str): Data kind.
+        records (list): Records loaded from the file.
+        source (str, optional): File name used in errors. Defaults to "<kind>.json".
+    Returns:
+        list: DataError for each violation; empty when the data is valid.
+    """
+    source = source or f"{kind}.json"
+    if not isinstance(records, list):
+        return [DataError(source, 0, (), f"expected a list of records, got {type(records).__name__}")]
+    check = validator(kind)
+    if check is None:
+        return []
+    errors = []
+    for index, record in enumerate(records):
+        found = check(record)
+        if found:
+            errors.extend(DataError(source, index, path, message) for path, message in found)
+    return errors
+
+def validate_data(data, sources=None):
+    """
+    Validate every data kind and raise once with all violations.
+    Args:
+        data (dict): Data kind -> list of records.
+        sources (dict, optional): Data kind -> file name for error messages.
+    Raises:
+        DataValidationError: If any record does not match its schema.
+    """
+    errors = []
+    for kind, records in data.items():
+        errors.extend(validation_errors(kind, records, (sources or {}).get(kind)))
+    if errors:
+        raise DataValidationError(errors)
@@ -0,0 +1,352 @@
+"""
+Dependency graph of derived character attributes.
+- Inputs are raw character choices (race, point buy, feats, ...).
+- Nodes are derived values with explicit inputs and a compute function.
+- A change recomputes only downstream nodes, in topological order.
+- Nodes never change inputs. Constraints (e.g. dropping feats whose prerequisites are no
+  longer met) run after the nodes they read and report which inputs they changed; those
+  inputs are then invalidated like any other change, so every node ends up consistent.
+- An update is therefore a sequence of passes: every node is computed at most once per
+  pass, and only an update in which a constraint corrects something takes more than one.
+  Corrections feed back into what the constraints read (removing a feat changes the
+  final stats other feats require), so they cannot be folded into a single pass.
+"""
+from wotr_planner.models.combat import combat_sheet
+from wotr_planner.models.skill_allocation import reduce_overflow, skill_point_budget
+
+# Raw character attributes that feed the graph
+CHARACTER_INPUTS = (
+    "point_buy",
+    "race",
+    "heritage",
+    "background",
+    "char_class",
+    "class_levels",
+    "level",
+    "feats",
+    "skill_ranks",
+)
+
+class DerivedNode:
+    """
+    A derived attribute in a DerivedGraph.
+    - Stores its input names, compute function and last computed value.
+    """
+    def __init__(self, name, inputs, compute):
+        """
+        Initialize a DerivedNode.
+        Args:
+            name (str): Unique node name.
+            inputs (tuple): Names of inputs or other nodes this node reads.
+            compute (callable): Zero-argument function returning the node's value.
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+        self.value = None
+
+class Constraint:
+    """
+    A correction of raw inputs in a DerivedGraph.
+    - Stores its input names, the inputs it may change, its apply function and what it
+      changed during the last update.
+    """
+    def __init__(self, name, inputs, writes, apply):
+        """
+        Initialize a Constraint.
+        Args:
+            name (str): Unique constraint name.
+            inputs (tuple): Names of inputs or nodes the constraint reads.
+            writes (tuple): Names of raw inputs the constraint may change.
+            apply (callable): Zero-argument function that corrects the inputs and returns
+                a set of what it changed, empty if nothing.
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.writes = tuple(writes)
+        self.apply = apply
+        self.value = set()
+
+class DerivedGraph:
+    """
+    Declarative graph of derived attributes.
+    - Keeps a cached topological order of nodes.
+    - Records why each node was recomputed during the last update, across all its passes.
+    """
+    # Update passes allowed before constraints are assumed to never settle
+    MAX_PASSES = 20
+
+    def __init__(self, inputs=()):
+        """
+        Initialize an empty DerivedGraph.
+        Args:
+            inputs (iterable, optional): Names of raw inputs. Defaults to none.
+        """
+        self.inputs = set(inputs)
+        self.nodes = {}
+        self.dependents = {name: [] for name in self.inputs}
+        self.order = []
+        # Constraint name -> Constraint, in the order they run
+        self.constraints = {}
+        # Node name -> names of changed inputs/nodes that triggered a recompute in any pass
+        self.last_update = {}
+        # Passes the last update took; more than 1 when constraints corrected inputs
+        self.last_passes = 0
+        # Node name -> times it was computed during the last update
+        self.compute_counts = {}
+
+    def add_input(self, name):
+        """
+        Register a raw input.
+        Args:
+            name (str): Input name.
+        """
+        self.inputs.add(name)
+        self.dependents.setdefault(name, [])
+
+    def add_node(self, name, inputs, compute):
+        """
+        Register a derived node.
+        - All inputs must already be registered inputs or nodes, which keeps the graph acyclic.
+        Args:
+            name (str): Unique node name.
+            inputs (iterable): Names of inputs or nodes this node reads.
+            compute (callable): Zero-argument function returning the node's value.
+        Returns:
+            DerivedNode: The registered node.
+        Raises:
+            ValueError: If the name is taken or an input is unknown.
+        """
+        if name in self.nodes or name in self.inputs:
+            raise ValueError(f"Duplicate graph node: {name}")
+        node = DerivedNode(name, inputs, compute)
+        for dep in node.inputs:
+            if dep not in self.dependents:
+                raise ValueError(f"Unknown input '{dep}' for node '{name}'")
+            self.dependents[dep].append(name)
+        self.nodes[name] = node
+        self.dependents[name] = []
+        # Inputs are registered before the node, so insertion order is topological
+        self.order.append(name)
+        return node
+
+    def add_constraint(self, name, inputs, writes, apply):
+        """
+        Register a constraint on raw inputs.
+        Args:
+            name (str): Unique constraint name.
+            inputs (iterable): Names of inputs or nodes the constraint reads.
+            writes (iterable): Names of raw inputs the constraint may change.
+            apply (callable): Zero-argument function that corrects the inputs and returns a
+                set of what it changed, empty if nothing.
+        Returns:
+            Constraint: The registered constraint.
+        Raises:
+            ValueError: If the name is taken, an input is unknown or a write is not a raw input.
+        """
+        if name in self.constraints or name in self.dependents:
+            raise ValueError(f"Duplicate graph constraint: {name}")
+        constraint = Constraint(name, inputs, writes, apply)
+        for dep in constraint.inputs:
+            if dep not in self.dependents:
+                raise ValueError(f"Unknown input '{dep}' for constraint '{name}'")
+        for dep in constraint.writes:
+            if dep not in self.inputs:
+                raise ValueError(f"Constraint '{name}' can only change raw inputs, not '{dep}'")
+        self.constraints[name] = constraint
+        return constraint
+
+    def downstream(self, changed):
+        """
+        Get all nodes affected by a set of changed inputs or nodes.
+        Args:
+            changed (iterable): Names of changed inputs or nodes.
+        Returns:
+            list: Affected node names in topological order.
+        """
+        affected = set()
+        stack = list(changed)
+        while stack:
+            for dep in self.dependents.get(stack.pop(), []):
+                if dep not in affected:
+                    affected.add(dep)
+                    stack.append(dep)
+        return [name for name in self.order if name in affected]
+
+    def update(self, *changed):
+        """
+        Recompute the nodes downstream of the changed inputs, then apply constraints.
+        - Each affected node is computed once per pass, after all of its inputs.
+        - Constraints reading anything recomputed in a pass run after it, in registration
+          order. The first one that changes inputs ends the pass, and the inputs it changed
+          start the next one, so later constraints never read stale nodes.
+        - last_update, compute_counts and last_passes describe every pass of the update.
+        Args:
+            *changed (str): Names of changed inputs or nodes.
+        Returns:
+            list: Names of recomputed nodes in topological order.
+        Raises:
+            ValueError: If a name is not part of the graph.
+            RuntimeError: If constraints keep changing inputs for MAX_PASSES passes.
+        """
+        for name in changed:
+            if name not in self.dependents:
+                raise ValueError(f"Unknown graph input: {name}")
+        self.last_update = {}
+        self.compute_counts = {}
+        self.last_passes = 0
+        for constraint in self.constraints.values():
+            constraint.value = set()
+        while changed:
+            self.last_passes += 1
+            if self.last_passes > self.MAX_PASSES:
+                raise RuntimeError(f"Graph constraints did not settle after {self.MAX_PASSES} passes")
+            dirty = set(changed)
+            for name in self.downstream(changed):
+                node = self.nodes[name]
+                triggers = self.last_update.setdefault(name, [])
+                triggers.extend(dep for dep in node.inputs if dep in dirty and dep not in triggers)
+                node.value = node.compute()
+                dirty.add(name)
+                self.compute_counts[name] = self.compute_counts.get(name, 0) + 1
+            changed = ()
+            for constraint in self.constraints.values():
+                if dirty.isdisjoint(constraint.inputs):
+                    continue
+                corrected = constraint.apply()
+                if corrected:
+                    constraint.value |= corrected
+                    changed = constraint.writes
+                    break
+        return [name for name in self.order if name in self.compute_counts]
+
+    def evaluate(self):
+        """
+        Recompute every node from scratch.
+        Returns:
+            list: Names of all nodes in topological order.
+        """
+        return self.update(*self.inputs)
+
+    def value(self, name):
+        """
+        Get the last computed value of a node, or what a constraint changed in the last update.
+        Args:
+            name (str): Node or constraint name.
+        Returns:
+            The node's value (None if it was never computed), or the constraint's set of changes.
+        """
+        if name in self.constraints:
+            return self.constraints[name].value
+        return self.nodes[name].value
+
+    def explain(self, name):
+        """
+        Describe why a node was recomputed in the last update.
+        - Follows triggers back to the raw inputs that changed, including inputs corrected
+          by constraints in later passes.
+        Args:
+            name (str): Node name.
+        Returns:
+            list: Trigger chains, e.g. [["race", "final_stats", "skill_pool"]].
+        """
+        if name not in self.last_update:
+            return []
+        chains = []
+        for trigger in self.last_update[name]:
+            if trigger in self.nodes:
+                chains.extend(chain + [name] for chain in self.explain(trigger))
+            else:
+                chains.append([trigger, name])
+        return chains
+
+    def describe(self):
+        """
+        Get the graph structure.
+        Returns:
+            dict: Node name -> list of input names, in topological order.
+        """
+        return {name: list(self.nodes[name].inputs) for name in self.order}
+
+def build_character_graph(character, all_feats, trait_registry):
+    """
+    Build the derived-attribute graph for a character.
+    - final_stats: point buy plus racial/heritage and feat modifiers.
+    - trait_bonuses: bonuses from race and heritage traits.
+    - feat_slots: total feat slots for level, class and race.
+    - feat_availability: selectable feats, and the chosen feats the last update removed.
+    - skill_pool: unspent skill points.
+    - feat_prerequisites (constraint): removes chosen feats whose prerequisites or slots
+      are no longer met.
+    - skill_budget (constraint): trims ranks that overflow the skill point budget.
+    - effective_skills: ranks plus feat, background and trait bonuses.
+    - combat: BAB, saves, hit points, AC, CMB and CMD from the class tables.
+    Args:
+        character (Character): Character the nodes read and update.
+        all_feats (list): All feat definitions.
+        trait_registry (dict): Trait definitions by name.
+    Returns:
+        DerivedGraph: Graph whose node values mirror the character's derived state.
+    """
+    graph = DerivedGraph(CHARACTER_INPUTS)
+
+    def feat_availability():
+        # Removals invalidate "feats", so this reruns after feat_prerequisites changes anything
+        return {"removed": set(graph.value("feat_prerequisites")), "available": character.available_feats(all_feats)}
+
+    def skill_pool():
+        return skill_point_budget(character) - sum(character.skill_ranks.values())
+
+    def feat_prerequisites():
+        return character.validate_feats(all_feats)
+
+    def skill_budget():
+        allowed = skill_point_budget(character)
+        if sum(character.skill_ranks.values()) <= allowed:
+            return set()
+        ranks = reduce_overflow(character.skill_ranks, list(character.skill_ranks), allowed)
+        trimmed = {skill for skill, value in character.skill_ranks.items() if ranks.get(skill, 0) != value}
+        character.skill_ranks = ranks
+        return trimmed
+
+    def recalculate_traits():
+        character.recalculate_traits(trait_registry)
+        return character.trait_bonuses
+
+    graph.add_node(
+        "final_stats",
+        ("point_buy", "race", "heritage", "feats"),
+        character.recalculate_stats
+    )
+    graph.add_node("trait_bonuses", ("race", "heritage"), recalculate_traits)
+    graph.add_node("feat_slots", ("level", "char_class", "class_levels", "race"), character.total_feat_slots)
+    graph.add_node(
+        "feat_availability",
+        ("final_stats", "level", "feats", "feat_slots"),
+        feat_availability
+    )
+    graph.add_node(
+        "skill_pool",
+        ("final_stats", "trait_bonuses", "level", "char_class", "class_levels", "race", "skill_ranks"),
+        skill_pool
+    )
+    graph.add_node(
+        "effective_skills",
+        ("skill_ranks", "skill_pool", "feat_availability", "background", "trait_bonuses"),
+        character.recalculate_skills
+    )
+    graph.add_node(
+        "combat",
+        ("final_stats", "trait_bonuses", "level", "char_class", "class_levels"),
+        lambda: combat_sheet(character)
+    )
+    graph.add_constraint(
+        "feat_prerequisites", ("final_stats", "level", "feats", "feat_slots"), ("feats",), feat_prerequisites
+    )
+    graph.add_constraint(
+        "skill_budget",
+        ("final_stats", "trait_bonuses", "level", "char_class", "class_levels", "race", "skill_ranks"),
+        ("skill_ranks",),
+        skill_budget
+    )
+    return graph
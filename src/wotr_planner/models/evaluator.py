@@ -0,0 +1,73 @@
+"""
+Headless evaluation of builds into a full derived sheet.
+- Uses the same derived-attribute graph as the UI, so results match what the planner shows.
+- Never imports Qt; used by the command-line tool and other non-UI callers.
+"""
+from wotr_planner.models.derived_graph import build_character_graph
+from wotr_planner.models.point_buy import POINT_BUY_BUDGET, points_spent
+from wotr_planner.models.serialization import character_from_dict, character_to_dict
+from wotr_planner.models.share_code import decode_build
+from wotr_planner.models.skill_allocation import skill_point_budget
+
+def load_character(build, catalog):
+    """
+    Load a character from a serialized build or a share code.
+    Args:
+        build (dict | str): Serialized build (see character_to_dict) or share code.
+        catalog (Catalog): Game data.
+    Returns:
+        Character: The loaded character.
+    Raises:
+        BuildValidationError: If a serialized build is malformed or names unknown data.
+        ShareCodeError: If a share code is malformed.
+    """
+    if isinstance(build, str):
+        return decode_build(build, catalog)
+    return character_from_dict(build, catalog)
+
+def evaluate_build(character, catalog, trait_registry=None):
+    """
+    Evaluate every derived attribute of a character.
+    - Feats that fail their prerequisites or exceed the feat slots are removed, and skill
+      ranks over budget are trimmed, as in the planner; each change is listed in errors.
+    - A point buy over POINT_BUY_BUDGET and a skill with more ranks than the character
+      level are listed in errors too, but left as they are.
+    Args:
+        character (Character): Character to evaluate; updated in place.
+        catalog (Catalog): Game data.
+        trait_registry (dict, optional): Trait definitions by name. Defaults to catalog.trait_registry().
+    Returns:
+        dict: JSON-safe sheet with build, stats, trait_bonuses, effective_skills,
+            unspent_skill_points, available_feats, feat_slots, combat and errors.
+    """
+    registry = catalog.trait_registry() if trait_registry is None else trait_registry
+    chosen = character.feats.names()
+    spent = sum(character.skill_ranks.values())
+    over_cap = {skill: ranks for skill, ranks in character.skill_ranks.items() if ranks > character.level}
+    graph = build_character_graph(character, catalog.records("feats"), registry)
+    graph.evaluate()
+
+    errors = []
+    point_buy = points_spent(character.point_buy_stats)
+    if point_buy > POINT_BUY_BUDGET:
+        errors.append(f"Point buy overspent: {point_buy} spent of {POINT_BUY_BUDGET} available")
+    for name in chosen:
+        if name not in character.feats:
+            errors.append(f"Feat removed: {name} (prerequisites or feat slots not met)")
+    for skill, ranks in over_cap.items():
+        errors.append(f"Skill ranks over cap: {skill} has {ranks}, at most {character.level} allowed")
+    budget = skill_point_budget(character)
+    if spent > budget:
+        errors.append(f"Skill ranks trimmed: {spent} spent of {budget} available")
+
+    return {
+        "build": character_to_dict(character),
+        "stats": dict(graph.value("final_stats")),
+        "trait_bonuses": graph.value("trait_bonuses"),
+        "effective_skills": dict(graph.value("effective_skills")),
+        "unspent_skill_points": graph.value("skill_pool"),
+        "available_feats": [feat["name"] for feat in graph.value("feat_availability")["available"]],
+        "feat_slots": graph.value("feat_slots"),
+        "combat": graph.value("combat"),
+        "errors": errors,
+    }
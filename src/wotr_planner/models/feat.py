@@ -0,0 +1,251 @@
+"""
+Interned feat references.
+- Feat names are interned to small integer IDs on first use (see feat_id). IDs are never
+  reused within a process, so any set of feats is also an int bitset; they are not stable
+  across processes, so a pickled FeatSet carries its definitions instead.
+- FeatSet holds Character.feats: an insertion-ordered set of feat IDs, its bitset, and the
+  definition each feat was added with. It still reads like the list of feat dicts it
+  replaced (iteration, indexing, append, comparison with lists).
+- Membership by name and prerequisite checks are bit tests; each distinct
+  prerequisite_feats list is compiled once into a mask.
+"""
+from collections.abc import MutableSequence
+
+# Feat name -> interned ID, and ID -> name
+_ids = {}
+_names = []
+# Tuple of prerequisite feat names -> bitset of their IDs
+_masks = {}
+
+def feat_id(name):
+    """
+    Get the interned ID of a feat name, assigning the next ID to a new name.
+    Args:
+        name (str): Feat name.
+    Returns:
+        int: The feat's ID.
+    """
+    interned = _ids.get(name)
+    if interned is None:
+        interned = _ids[name] = len(_names)
+        _names.append(name)
+    return interned
+
+def feat_name(interned):
+    """
+    Get the name of an interned feat ID.
+    Args:
+        interned (int): Feat ID from feat_id.
+    Returns:
+        str: The feat name.
+    """
+    return _names[interned]
+
+def required_mask(feat):
+    """
+    Get the bitset of a feat's prerequisite feats.
+    Args:
+        feat (dict): Feat definition.
+    Returns:
+        int: Bit feat_id(name) set for every name in prerequisite_feats.
+    """
+    key = tuple(feat.get("prerequisite_feats", ()))
+    mask = _masks.get(key)
+    if mask is None:
+        mask = 0
+        for name in key:
+            mask |= 1 << feat_id(name)
+        _masks[key] = mask
+    return mask
+
+def names_mask(names):
+    """
+    Get the bitset of feat names.
+    Args:
+        names (iterable): Feat names.
+    Returns:
+        int: Bit feat_id(name) set for every name.
+    """
+    mask = 0
+    for name in names:
+        mask |= 1 << feat_id(name)
+    return mask
+
+def _name_of(item):
+    return item.get("name") if isinstance(item, dict) else item
+
+class FeatSet(MutableSequence):
+    """
+    Insertion-ordered set of feats, stored as interned IDs plus a bitset.
+    - Adding a feat whose name is already present does nothing.
+    - "name" in feats and feat_dict in feats both test the name's bit.
+    - Compares equal to another FeatSet with the same feat names in the same order, and to
+      a list of the same feat definitions.
+    """
+    __slots__ = ("_order", "_feats", "bits")
+
+    def __init__(self, feats=()):
+        """
+        Initialize a FeatSet.
+        Args:
+            feats (iterable, optional): Feat definitions, in order. Defaults to none.
+        """
+        # Feat IDs in the order they were added
+        self._order = []
+        # Feat ID -> definition it was added with
+        self._feats = {}
+        # Bit feat_id(name) is set for every feat in the set
+        self.bits = 0
+        for feat in feats:
+            self.append(feat)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return map(self._feats.__getitem__, self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._feats[interned] for interned in self._order[index]]
+        return self._feats[self._order[index]]
+
+    def __setitem__(self, index, feat):
+        feats = list(self)
+        feats[index] = feat
+        self._replace(feats)
+
+    def __delitem__(self, index):
+        feats = list(self)
+        del feats[index]
+        self._replace(feats)
+
+    def _replace(self, feats):
+        self._order = []
+        self._feats = {}
+        self.bits = 0
+        for feat in feats:
+            self.append(feat)
+
+    def insert(self, index, feat):
+        """
+        Add a feat at a position, unless a feat of that name is already present.
+        Args:
+            index (int): Position, as for list.insert.
+            feat (dict): Feat definition.
+        """
+        interned = feat_id(feat["name"])
+        if not self.bits >> interned & 1:
+            self._order.insert(index, interned)
+            self._feats[interned] = feat
+            self.bits |= 1 << interned
+
+    def append(self, feat):
+        """
+        Add a feat at the end, unless a feat of that name is already present.
+        Args:
+            feat (dict): Feat definition.
+        """
+        interned = feat_id(feat["name"])
+        if not self.bits >> interned & 1:
+            self._order.append(interned)
+            self._feats[interned] = feat
+            self.bits |= 1 << interned
+
+    def reverse(self):
+        self._order.reverse()
+
+    def __contains__(self, item):
+        interned = _ids.get(_name_of(item))
+        return interned is not None and bool(self.bits >> interned & 1)
+
+    def discard(self, name):
+        """
+        Remove a feat by name if present.
+        Args:
+            name (str): Feat name.
+        Returns:
+            bool: True if a feat was removed.
+        """
+        interned = _ids.get(name)
+        if interned is None or not self.bits >> interned & 1:
+            return False
+        self._order.remove(interned)
+        del self._feats[interned]
+        self.bits &= ~(1 << interned)
+        return True
+
+    def meets(self, feat, also=0):
+        """
+        Check that every prerequisite feat of a feat is in the set.
+        Args:
+            feat (dict): Feat definition.
+            also (int, optional): Bitset of other feats that count, e.g. innate feats (see
+                names_mask). Defaults to none.
+        Returns:
+            bool: True if no prerequisite feat is missing.
+        """
+        return not required_mask(feat) & ~(self.bits | also)
+
+    def definitions(self, all_feats):
+        """
+        Find the definitions of the feats in the set, stopping once every one is found.
+        Args:
+            all_feats (iterable): Feat definitions to search, or records with a find(name)
+                lookup such as SharedRecords.
+        Returns:
+            dict: Feat name -> definition, for the names in both.
+        """
+        found = {}
+        count = len(self._order)
+        if not count:
+            return found
+        find = getattr(all_feats, "find", None)
+        if find is not None:
+            # Indexed records (shared game data) are looked up by name instead of scanned
+            for name in self.names():
+                feat = find(name)
+                if feat is not None:
+                    found[name] = feat
+            return found
+        bits = self.bits
+        ids = _ids
+        for feat in all_feats:
+            interned = ids.get(feat["name"])
+            if interned is not None and bits >> interned & 1:
+                found[feat["name"]] = feat
+                if len(found) == count:
+                    break
+        return found
+
+    def ids(self):
+        """
+        Get the interned feat IDs in order.
+        Returns:
+            tuple: Feat IDs.
+        """
+        return tuple(self._order)
+
+    def names(self):
+        """
+        Get the feat names in order.
+        Returns:
+            list: Feat names.
+        """
+        return [_names[interned] for interned in self._order]
+
+    def __eq__(self, other):
+        if isinstance(other, FeatSet):
+            return self.bits == other.bits and self._order == other._order
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # IDs are only meaningful in this process, so send the definitions
+        return (FeatSet, (list(self),))
+
+    def __repr__(self):
+        return f"FeatSet({self.names()!r})"
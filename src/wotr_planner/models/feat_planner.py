@@ -0,0 +1,266 @@
+"""
+Feat path planner: an early level and the cheapest point buy for one or more target feats.
+- Prerequisite feats are all required, so the feats a target needs are the closure of its
+  prerequisite_feats; feats already owned or granted by traits (innate_feats) cost no slot.
+- Stat prerequisites of the whole closure, and of feats already owned, must be met by one
+  point buy (plus racial or heritage modifiers) within the point buy budget.
+- Feats are scheduled level by level into the slots from total_feat_slots, longest
+  remaining prerequisite chain first, and the plan's level is the earliest possible.
+  Unused slots carry over and a prerequisite may be taken at the same level as the feat
+  that needs it, so only a feat's own prerequisite_level and those of its prerequisites
+  limit when it can be taken. Any schedule can be reordered, by swapping the levels of a
+  feat and a prerequisite taken later, without moving its last level, so filling every
+  slot whenever some feat is available finishes as early as any schedule can.
+- Closures, stat requirements, feat slots and finished plans are memoized per
+  (race, heritage, class) planner, and planners are shared through planner_for() for as
+  long as their catalog is alive.
+"""
+import weakref
+from wotr_planner.models.character import Character, STATS
+from wotr_planner.models.point_buy import cheapest_point_buy, points_spent
+from wotr_planner.models.progression import MAX_LEVEL
+
+# Catalog -> {(race, heritage, class names) -> FeatPlanner}; dropped with the catalog
+_planners = weakref.WeakKeyDictionary()
+
+class FeatPlan:
+    """
+    Route to a set of target feats.
+    - steps lists (level, feat name) in the order the feats are taken.
+    - An impossible plan has a reason and no steps.
+    """
+    def __init__(self, targets, level=None, steps=(), point_buy=None, reason=None):
+        """
+        Initialize a FeatPlan.
+        Args:
+            targets (tuple): Target feat names.
+            level (int, optional): Level at which every target is taken.
+            steps (iterable, optional): (level, feat name) pairs in order.
+            point_buy (dict, optional): Cheapest point buy meeting every stat prerequisite.
+            reason (str, optional): Why the targets cannot be reached.
+        """
+        self.targets = tuple(targets)
+        self.level = level
+        self.steps = list(steps)
+        self.point_buy = point_buy
+        self.reason = reason
+
+    @property
+    def feasible(self):
+        return self.reason is None
+
+    @property
+    def slots_used(self):
+        return len(self.steps)
+
+    def to_dict(self):
+        """
+        Get a JSON-safe copy of the plan.
+        Returns:
+            dict: targets, feasible, level, slots_used, steps, point_buy, points_spent and reason.
+        """
+        return {
+            "targets": list(self.targets),
+            "feasible": self.feasible,
+            "level": self.level,
+            "slots_used": self.slots_used,
+            "steps": [{"level": level, "feat": name} for level, name in self.steps],
+            "point_buy": self.point_buy,
+            "points_spent": points_spent(self.point_buy) if self.point_buy else None,
+            "reason": self.reason,
+        }
+
+class FeatPlanner:
+    """
+    Plans feat routes for one race, heritage and class, as described in the module
+    docstring.
+    - Reuse one planner (see planner_for) so memoized subgoals are shared across queries.
+    """
+    def __init__(self, catalog, race, heritage=None, char_class=None, trait_registry=None):
+        """
+        Initialize a FeatPlanner.
+        Args:
+            catalog (Catalog): Game data.
+            race (dict): Race record.
+            heritage (dict, optional): Heritage record.
+            char_class (dict, optional): Class record. Defaults to Character's default class.
+            trait_registry (dict, optional): Trait definitions by name. Defaults to the catalog's traits.
+        """
+        self.feat_records = catalog.records("feats")
+        self.feats = {feat["name"]: feat for feat in self.feat_records}
+        self.source = (race, heritage, char_class)
+        character = Character(char_class=char_class, race=race)
+        character.heritage = heritage
+        character.recalculate_traits(catalog.trait_registry() if trait_registry is None else trait_registry)
+        self.racial = character.racial_modifiers()
+        self.innate = frozenset(character.trait_bonuses["innate_feats"])
+        # Feat slots by level, index 0 unused
+        self.slots = [0]
+        for level in range(1, MAX_LEVEL + 1):
+            character.level = level
+            self.slots.append(character.total_feat_slots())
+        # Feat name -> prerequisite closure, including the feat
+        self.closures = {}
+        # Feat name -> (highest prerequisite_level, lowest final stats) over its closure
+        self.requirements = {}
+        # (targets, owned) -> FeatPlan
+        self.plans = {}
+
+    def closure(self, name):
+        """
+        Get a feat and every feat it requires, directly or indirectly.
+        Args:
+            name (str): Feat name.
+        Returns:
+            frozenset: Feat names.
+        Raises:
+            ValueError: If a required feat is unknown or prerequisites form a cycle.
+        """
+        if name in self.closures:
+            return self.closures[name]
+        active = set()
+        stack = [(name, False)]
+        while stack:
+            feat, expanded = stack.pop()
+            if feat in self.closures:
+                continue
+            if feat not in self.feats:
+                raise ValueError(f"Unknown feat: {feat}")
+            prerequisites = self.feats[feat].get("prerequisite_feats", [])
+            if expanded:
+                active.discard(feat)
+                closure = {feat}
+                level = self.feats[feat].get("prerequisite_level", 1)
+                stats = dict(self.feats[feat].get("prerequisite_stats", {}))
+                for req in prerequisites:
+                    closure |= self.closures[req]
+                    req_level, req_stats = self.requirements[req]
+                    level = max(level, req_level)
+                    for stat, value in req_stats.items():
+                        stats[stat] = max(stats.get(stat, value), value)
+                self.closures[feat] = frozenset(closure)
+                self.requirements[feat] = (level, stats)
+                continue
+            if feat in active:
+                raise ValueError(f"Prerequisite cycle through feat: {feat}")
+            active.add(feat)
+            stack.append((feat, True))
+            stack.extend((req, False) for req in prerequisites if req not in self.closures)
+        return self.closures[name]
+
+    def plan(self, targets, owned=(), max_level=MAX_LEVEL):
+        """
+        Plan an early route to one or more feats.
+        Args:
+            targets (str | iterable): Target feat name or names.
+            owned (iterable, optional): Names of feats already taken; they keep their slots.
+            max_level (int, optional): Highest level considered. Defaults to MAX_LEVEL.
+        Returns:
+            FeatPlan: The plan, or an impossible plan with a reason.
+        """
+        targets = (targets,) if isinstance(targets, str) else tuple(dict.fromkeys(targets))
+        owned = frozenset(owned)
+        key = (targets, owned, max_level)
+        if key not in self.plans:
+            self.plans[key] = self._plan(targets, owned, max_level)
+        return self.plans[key]
+
+    def _plan(self, targets, owned, max_level):
+        try:
+            needed = set()
+            for target in targets:
+                needed |= self.closure(target)
+        except ValueError as exc:
+            return FeatPlan(targets, reason=str(exc))
+
+        # Stat prerequisites of every needed feat and every owned feat, so none is lost
+        minimums = {}
+        kept = set()
+        for feat in owned:
+            if feat in self.feats:
+                try:
+                    kept |= self.closure(feat)
+                except ValueError:
+                    pass
+        for feat in needed | kept:
+            for stat, value in self.requirements[feat][1].items():
+                minimums[stat] = max(minimums.get(stat, value), value)
+        point_buy = cheapest_point_buy({
+            stat: value - self.racial.get(stat, 0) for stat, value in minimums.items() if stat in STATS
+        })
+        if point_buy is None:
+            wanted = ", ".join(f"{stat} {value}" for stat, value in sorted(minimums.items()))
+            return FeatPlan(targets, reason=f"No point buy reaches {wanted}")
+
+        remaining = needed - owned - self.innate
+        done = needed - remaining
+        # Longest chain of remaining feats that depend on each feat
+        height = dict.fromkeys(remaining, 0)
+        for feat in sorted(remaining, key=lambda f: len(self.closures[f]), reverse=True):
+            for req in self.feats[feat].get("prerequisite_feats", []):
+                if req in height:
+                    height[req] = max(height[req], height[feat] + 1)
+
+        steps = []
+        used = len(owned - self.innate)
+        level = max([1] + [self.requirements[t][0] for t in targets])
+        for current in range(1, max_level + 1):
+            if not remaining:
+                break
+            while used < self.slots[current]:
+                ready = [
+                    feat for feat in remaining
+                    if self.feats[feat].get("prerequisite_level", 1) <= current
+                    and all(req in done for req in self.feats[feat].get("prerequisite_feats", []))
+                ]
+                if not ready:
+                    break
+                feat = max(ready, key=lambda f: (height[f], -self.feats[f].get("prerequisite_level", 1), f))
+                remaining.discard(feat)
+                done.add(feat)
+                steps.append((current, feat))
+                used += 1
+                level = max(level, current)
+        if remaining:
+            missing = ", ".join(sorted(remaining))
+            return FeatPlan(targets, point_buy=point_buy, reason=f"Feat slots or levels run out before: {missing} (level {max_level})")
+        return FeatPlan(targets, level, steps, point_buy)
+
+def planner_for(catalog, race, heritage=None, char_class=None):
+    """
+    Get the shared planner for a race, heritage and class.
+    - A planner is rebuilt when the catalog's feats or the given records are replaced.
+    - Planners are held only while their catalog is alive.
+    Args:
+        catalog (Catalog): Game data.
+        race (dict): Race record.
+        heritage (dict, optional): Heritage record.
+        char_class (dict, optional): Class record.
+    Returns:
+        FeatPlanner: The planner.
+    """
+    key = (
+        race.get("name"),
+        heritage.get("name") if heritage else None,
+        char_class.get("name") if char_class else None,
+    )
+    planners = _planners.setdefault(catalog, {})
+    planner = planners.get(key)
+    if (planner is None or planner.feat_records is not catalog.records("feats")
+            or any(a is not b for a, b in zip(planner.source, (race, heritage, char_class)))):
+        planner = planners[key] = FeatPlanner(catalog, race, heritage, char_class)
+    return planner
+
+def plan_feats(character, targets, catalog, max_level=MAX_LEVEL):
+    """
+    Plan the route to feats for a character, keeping the feats it already has.
+    Args:
+        character (Character): Character whose race, heritage, class and feats are used.
+        targets (str | iterable): Target feat name or names.
+        catalog (Catalog): Game data.
+        max_level (int, optional): Highest level considered. Defaults to MAX_LEVEL.
+    Returns:
+        FeatPlan: The plan.
+    """
+    planner = planner_for(catalog, character.race, character.heritage, character.char_class)
+    return planner.plan(targets, character.feats.names(), max_level)
@@ -0,0 +1,191 @@
+"""
+Cross-reference integrity checks for game data.
+- Name indexes are built once; each reference is then a single set lookup, so the
+  whole check is linear in the size of the data.
+- Feat prerequisite cycles are found with an iterative depth-first search.
+- Run as a command-line tool: python -m wotr_planner.models.integrity [PACK_DIR ...]
+"""
+import argparse
+import json
+import sys
+from wotr_planner.models.catalog import LOADERS
+
+class IntegrityIssue:
+    """
+    A reference that does not resolve, or another structural problem in the data.
+    """
+    def __init__(self, kind, index, name, field, message):
+        """
+        Initialize an IntegrityIssue.
+        Args:
+            kind (str): Data kind of the offending record, e.g. "heritages".
+            index (int): Position of the record in the merged data.
+            name (str): Name of the record.
+            field (str): Field holding the bad reference.
+            message (str): What is wrong.
+        """
+        self.kind = kind
+        self.index = index
+        self.name = name
+        self.field = field
+        self.message = message
+
+    def __str__(self):
+        return f"{self.kind}[{self.index}] {self.name!r} {self.field}: {self.message}"
+
+    def __repr__(self):
+        return f"IntegrityIssue({str(self)!r})"
+
+    def to_dict(self):
+        """
+        Get the issue as a JSON-safe dict.
+        Returns:
+            dict: kind, index, name, field and message.
+        """
+        return {"kind": self.kind, "index": self.index, "name": self.name, "field": self.field, "message": self.message}
+
+def _names(records):
+    """
+    Index record names and find duplicates.
+    Args:
+        records (list): Data records.
+    Returns:
+        tuple: (set of names, list of (index, name) for repeated names).
+    """
+    names = set()
+    duplicates = []
+    for index, record in enumerate(records):
+        name = record.get("name")
+        if name in names:
+            duplicates.append((index, name))
+        names.add(name)
+    return names, duplicates
+
+def feat_cycles(feats):
+    """
+    Find cycles in the feat prerequisite graph.
+    - Iterative three-colour depth-first search, linear in feats plus prerequisites.
+    - Prerequisites naming unknown feats are ignored here (see check_integrity).
+    Args:
+        feats (list): Feat records.
+    Returns:
+        list: Each cycle as a list of feat names, starting and ending with the same feat.
+    """
+    graph = {f["name"]: f.get("prerequisite_feats", []) for f in feats}
+    state = dict.fromkeys(graph, 0) # 0 unvisited, 1 on the DFS path, 2 done
+    cycles = []
+    for root in graph:
+        if state[root]:
+            continue
+        state[root] = 1
+        path = [root]
+        stack = [iter(graph[root])]
+        while stack:
+            prereq = next(stack[-1], None)
+            if prereq is None:
+                state[path.pop()] = 2
+                stack.pop()
+            elif prereq not in state:
+                continue
+            elif state[prereq] == 1:
+                cycles.append(path[path.index(prereq):] + [prereq])
+            elif state[prereq] == 0:
+                state[prereq] = 1
+                path.append(prereq)
+                stack.append(iter(graph[prereq]))
+    return cycles
+
+def check_integrity(data):
+    """
+    Check that every cross-reference in the game data resolves.
+    - Feats: prerequisite_feats name feats, and prerequisites have no cycles.
+    - Heritages: race names a race.
+    - Races and heritages: traits and traits_removed name traits.
+    - Classes: class_feats name feats and class_skills name skills.
+    - Every kind: names are unique (heritages per race).
+    Args:
+        data (dict | Catalog): Data kind -> list of records, or a Catalog.
+    Returns:
+        list: IntegrityIssue for each problem, in data order.
+    """
+    records = data.records if hasattr(data, "records") else lambda kind: data.get(kind, [])
+    feats, races = records("feats"), records("races")
+    issues = []
+    names = {}
+    for kind in ("feats", "races", "traits", "skills", "classes", "backgrounds"):
+        names[kind], duplicates = _names(records(kind))
+        for index, name in duplicates:
+            issues.append(IntegrityIssue(kind, index, name, "name", "duplicate name"))
+
+    def missing(kind, index, record, field, refs, known, what):
+        for ref in refs:
+            if ref not in known:
+                issues.append(IntegrityIssue(kind, index, record.get("name"), field, f"unknown {what} {ref!r}"))
+
+    for index, feat in enumerate(feats):
+        missing("feats", index, feat, "prerequisite_feats", feat.get("prerequisite_feats", []), names["feats"], "feat")
+    feat_index = {feat.get("name"): index for index, feat in enumerate(feats)}
+    for cycle in feat_cycles(feats):
+        start = cycle[0]
+        issues.append(IntegrityIssue(
+            "feats", feat_index[start], start, "prerequisite_feats", f"prerequisite cycle {' -> '.join(cycle)}"
+        ))
+
+    for index, race in enumerate(races):
+        missing("races", index, race, "traits", race.get("traits", []), names["traits"], "trait")
+
+    heritage_keys = set()
+    for index, heritage in enumerate(records("heritages")):
+        key = (heritage.get("race"), heritage.get("name"))
+        if key in heritage_keys:
+            issues.append(IntegrityIssue("heritages", index, heritage.get("name"), "name", "duplicate name for race"))
+        heritage_keys.add(key)
+        missing("heritages", index, heritage, "race", [heritage.get("race")], names["races"], "race")
+        for field in ("traits", "traits_removed"):
+            missing("heritages", index, heritage, field, heritage.get(field, []), names["traits"], "trait")
+
+    for index, cls in enumerate(records("classes")):
+        class_feats = [name for level_feats in cls.get("class_feats", []) for name in level_feats]
+        missing("classes", index, cls, "class_feats", class_feats, names["feats"], "feat")
+        missing("classes", index, cls, "class_skills", cls.get("class_skills", []), names["skills"], "skill")
+
+    order = {kind: i for i, kind in enumerate(LOADERS)}
+    issues.sort(key=lambda issue: (order.get(issue.kind, len(order)), issue.index))
+    return issues
+
+def main(argv=None):
+    """
+    Check the bundled data overlaid with data packs and print every issue.
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+    Returns:
+        int: 0 if the data is consistent, 1 if issues were found, 2 if the data could not be loaded.
+    """
+    # Imported here so the library call does not depend on the pack loader
+    from wotr_planner.models.data_packs import DataPacks
+    from wotr_planner.models.data_schemas import DataValidationError
+
+    parser = argparse.ArgumentParser(
+        prog="python -m wotr_planner.models.integrity",
+        description="Check that every cross-reference in the game data resolves.",
+    )
+    parser.add_argument("packs", nargs="*", help="data pack directories, lowest priority first")
+    parser.add_argument("--base", help="base data directory (defaults to the bundled data)")
+    parser.add_argument("--json", action="store_true", help="print issues as JSON lines")
+    args = parser.parse_args(argv)
+
+    packs = DataPacks(args.packs, base_dir=args.base)
+    try:
+        data = {kind: packs.merged(kind) for kind in LOADERS}
+    except (DataValidationError, json.JSONDecodeError, OSError) as exc:
+        print(f"Could not load data: {exc}", file=sys.stderr)
+        return 2
+    issues = check_integrity(data)
+    for issue in issues:
+        print(json.dumps(issue.to_dict()) if args.json else issue)
+    if not args.json:
+        print(f"{len(issues)} issue(s) found", file=sys.stderr)
+    return 1 if issues else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Ability score point buy rules.
+- Shared by StatsTab and headless tooling such as the feat planner.
+"""
+from wotr_planner.models.character import STATS
+
+# Points available to spend on ability scores
+POINT_BUY_BUDGET = 25
+# Lowest and highest point buy score, before racial modifiers
+MIN_SCORE = 7
+MAX_SCORE = 18
+# Point buy score -> cost; 10 is free and lower scores refund points
+POINT_COSTS = {7: -4, 8: -2, 9: -1, 10: 0, 11: 1, 12: 2, 13: 3, 14: 5, 15: 7, 16: 10, 17: 13, 18: 17}
+
+def point_cost(value) -> int:
+    """
+    Calculate the point cost for a given ability score value.
+    Args:
+        value (int): Ability score value.
+    Returns:
+        int: Point cost associated with the ability score value; 0 outside the table.
+    """
+    return POINT_COSTS.get(value, 0)
+
+def points_spent(point_buy_stats) -> int:
+    """
+    Calculate the total points spent on ability scores.
+    Args:
+        point_buy_stats (dict): Point buy score by stat.
+    Returns:
+        int: Total points spent.
+    """
+    return sum(point_cost(value) for value in point_buy_stats.values())
+
+def cheapest_point_buy(minimums, budget=POINT_BUY_BUDGET):
+    """
+    Find the cheapest point buy that reaches minimum scores.
+    - Stats without a minimum stay at 10; if that is over budget they are lowered one
+      point at a time, from the last stat in STATS, until the buy fits.
+    Args:
+        minimums (dict): Lowest point buy score needed by stat.
+        budget (int, optional): Points available. Defaults to POINT_BUY_BUDGET.
+    Returns:
+        dict | None: Point buy score for every stat, or None if no buy fits.
+    """
+    scores = {stat: max(10, minimums.get(stat, MIN_SCORE)) for stat in STATS}
+    if any(score > MAX_SCORE for score in scores.values()):
+        return None
+    spent = points_spent(scores)
+    for stat in reversed(STATS):
+        floor = max(MIN_SCORE, minimums.get(stat, MIN_SCORE))
+        while spent > budget and scores[stat] > floor:
+            spent -= point_cost(scores[stat]) - point_cost(scores[stat] - 1)
+            scores[stat] -= 1
+    return scores if spent <= budget else None
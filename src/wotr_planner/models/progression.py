@@ -0,0 +1,304 @@
+"""
+Per-class level tables and multiclass running totals.
+- ClassProgression tabulates one class for class levels 0-20 (BAB, saves, hit points,
+  skill points, bonus feats, class skills); tables are built once per class and cached.
+- ClassLevels records the class taken at each character level and keeps prefix sums of
+  the per-level increments, so any total at any level is a list lookup.
+- Changing the class at one level recomputes only that level and the ones after it.
+"""
+# Highest level covered by the tables
+MAX_LEVEL = 20
+# Saving throws in display order
+SAVES = ("Fortitude", "Reflex", "Will")
+
+# Progression name -> value at a class level
+BAB_PROGRESSIONS = {
+    "High": lambda level: level,
+    "Average": lambda level: level * 3 // 4,
+    "Low": lambda level: level // 2,
+}
+SAVE_PROGRESSIONS = {
+    "High": lambda level: 2 + level // 2 if level else 0,
+    # Not used by the base classes; halfway between High and Low
+    "Average": lambda level: 1 + level * 5 // 12 if level else 0,
+    "Low": lambda level: level // 3,
+}
+# Totals kept by ClassLevels, each a ClassProgression list attribute
+# ("saves" is expanded to one total per save)
+TOTALS = ("bab", "hp", "skill_points", "bonus_feats") + SAVES
+
+# Progression key -> ClassProgression
+_progressions = {}
+
+def _progression(table, name, label):
+    if name not in table:
+        raise ValueError(f"Unknown {label} progression: {name}")
+    return table[name]
+
+class ClassProgression:
+    """
+    Cumulative values of one class for class levels 0..MAX_LEVEL.
+    - bab, hp, skill_points, bonus_feats and saves[save] are lists indexed by class level;
+      index 0 is all zero.
+    - hp excludes the Constitution modifier: base_hp at level 1, hp_per_level after that.
+    - skill_points counts the class's points only; Intelligence and racial bonuses are
+      added per level by the caller.
+    """
+    def __init__(self, char_class):
+        """
+        Tabulate a class's progressions.
+        Args:
+            char_class (dict): Class record.
+        Raises:
+            ValueError: If a progression name is unknown.
+        """
+        self.name = char_class.get("name", "")
+        levels = range(MAX_LEVEL + 1)
+        bab = _progression(BAB_PROGRESSIONS, char_class.get("base_attack_bonus", "Low"), "base attack bonus")
+        self.bab = [bab(level) for level in levels]
+        self.saves = {}
+        throws = char_class.get("saving_throws", {})
+        for save in SAVES:
+            progression = _progression(SAVE_PROGRESSIONS, throws.get(save, "Low"), f"{save} save")
+            self.saves[save] = [progression(level) for level in levels]
+        self.base_hp = char_class.get("base_hp", 0)
+        self.hp_per_level = char_class.get("hp_per_level", 0)
+        self.hp = [0] + [self.base_hp + (level - 1) * self.hp_per_level for level in levels[1:]]
+        self.points_per_level = char_class.get("skill_points", 0)
+        self.skill_points = [level * self.points_per_level for level in levels]
+        interval = char_class.get("bonus_feat_interval")
+        extra = char_class.get("bonus_feats") or []
+        self.bonus_feats = [
+            (level // interval if interval else 0) + sum(1 for lvl in extra if level >= lvl)
+            for level in levels
+        ]
+        self.class_skills = frozenset(char_class.get("class_skills") or ()) - {""}
+
+    def total(self, field, level):
+        """
+        Get a cumulative value at a class level.
+        Args:
+            field (str): One of TOTALS.
+            level (int): Class level; levels above MAX_LEVEL use the last row.
+        Returns:
+            int: The value.
+        """
+        level = max(0, min(level, MAX_LEVEL))
+        if field in self.saves:
+            return self.saves[field][level]
+        return getattr(self, field)[level]
+
+    def skill_budget(self, level, bonus):
+        """
+        Get the skill points gained over the first class levels.
+        Args:
+            level (int): Character level.
+            bonus (int): Points added every level (Intelligence, race, heritage).
+        Returns:
+            int: At least 1 point per level.
+        """
+        return level * max(1, self.points_per_level + bonus)
+
+def class_progression(char_class):
+    """
+    Get the cached progression tables of a class.
+    - Tables are keyed by the fields they read, so edited or reloaded classes get fresh tables.
+    Args:
+        char_class (dict): Class record.
+    Returns:
+        ClassProgression: The class's tables.
+    """
+    throws = char_class.get("saving_throws", {})
+    key = (
+        char_class.get("name"),
+        char_class.get("base_attack_bonus"),
+        tuple(throws.get(save) for save in SAVES),
+        char_class.get("base_hp"),
+        char_class.get("hp_per_level"),
+        char_class.get("skill_points"),
+        char_class.get("bonus_feat_interval"),
+        tuple(char_class.get("bonus_feats") or ()),
+        tuple(char_class.get("class_skills") or ()),
+    )
+    progression = _progressions.get(key)
+    if progression is None:
+        progression = _progressions[key] = ClassProgression(char_class)
+    return progression
+
+class ClassLevels:
+    """
+    The class taken at each character level, with prefix sums of every total.
+    - Exposes the same bab, hp, saves[save], skill_points and bonus_feats lists as
+      ClassProgression, indexed by character level instead of class level.
+    - Classes are told apart by name; a class's increments come from its own table at
+      the class level reached, so BAB and saves stack across classes.
+    - A class first taken after character level 1 gains hp_per_level, not base_hp.
+    """
+    def __init__(self, classes=()):
+        """
+        Initialize ClassLevels.
+        Args:
+            classes (iterable, optional): Class record for each character level, from level 1.
+        """
+        self.classes = []
+        # Class name -> class level, after each character level
+        self.counts = []
+        self.bab = [0]
+        self.hp = [0]
+        self.skill_points = [0]
+        self.bonus_feats = [0]
+        self.saves = {save: [0] for save in SAVES}
+        # Union of class skills after each character level
+        self.class_skills = [frozenset()]
+        # Smallest class skill points per level up to each character level
+        self.min_points = [None]
+        for char_class in classes:
+            self.append(char_class)
+
+    def __len__(self):
+        return len(self.classes)
+
+    def class_at(self, level):
+        """
+        Get the class taken at a character level.
+        Args:
+            level (int): Character level, from 1.
+        Returns:
+            dict: Class record.
+        """
+        return self.classes[level - 1]
+
+    def class_level(self, level, name=None):
+        """
+        Get the level reached in a class by a character level.
+        Args:
+            level (int): Character level.
+            name (str, optional): Class name. Defaults to the class taken at that level.
+        Returns:
+            int: Class level, 0 if the class was not taken yet.
+        """
+        if level <= 0:
+            return 0
+        name = self.classes[level - 1].get("name") if name is None else name
+        return self.counts[level - 1].get(name, 0)
+
+    def class_names(self, level=None):
+        """
+        Get the class levels reached by a character level.
+        Args:
+            level (int, optional): Character level. Defaults to the highest level.
+        Returns:
+            dict: Class name -> class level, in the order classes were first taken.
+        """
+        level = len(self.classes) if level is None else min(level, len(self.classes))
+        return dict(self.counts[level - 1]) if level > 0 else {}
+
+    def append(self, char_class):
+        """
+        Take a class at the next character level.
+        Args:
+            char_class (dict): Class record.
+        """
+        self.classes.append(char_class)
+        self._recompute(len(self.classes) - 1)
+
+    def truncate(self, level):
+        """
+        Drop every character level above a level.
+        Args:
+            level (int): Highest level kept.
+        """
+        level = max(0, level)
+        del self.classes[level:]
+        self._drop_totals(level)
+
+    def _drop_totals(self, level):
+        """
+        Drop the running totals above a level, keeping the classes.
+        """
+        del self.counts[level:]
+        for totals in (self.bab, self.hp, self.skill_points, self.bonus_feats,
+                       self.class_skills, self.min_points, *self.saves.values()):
+            del totals[level + 1:]
+
+    def set_class(self, level, char_class):
+        """
+        Change the class taken at a character level.
+        - Totals below the level are kept; the level and the ones after it are recomputed.
+        Args:
+            level (int): Character level, from 1.
+            char_class (dict): Class record.
+        Returns:
+            int: Number of levels recomputed.
+        Raises:
+            IndexError: If the level has not been taken.
+        """
+        if not 1 <= level <= len(self.classes):
+            raise IndexError(f"Character level {level} not taken")
+        self.classes[level - 1] = char_class
+        return self._recompute(level - 1)
+
+    def _recompute(self, start):
+        """
+        Recompute totals from a 0-based level index to the end.
+        Returns:
+            int: Number of levels recomputed.
+        """
+        self._drop_totals(start)
+        counts = dict(self.counts[start - 1]) if start else {}
+        for index in range(start, len(self.classes)):
+            char_class = self.classes[index]
+            table = class_progression(char_class)
+            name = char_class.get("name")
+            level = counts.get(name, 0) + 1
+            counts[name] = level
+            self.counts.append(dict(counts))
+            before, after = min(level - 1, MAX_LEVEL), min(level, MAX_LEVEL)
+            self.bab.append(self.bab[-1] + table.bab[after] - table.bab[before])
+            for save in SAVES:
+                gain = table.saves[save][after] - table.saves[save][before]
+                self.saves[save].append(self.saves[save][-1] + gain)
+            if level == 1 and index:
+                hp = table.hp_per_level
+            else:
+                hp = table.hp[after] - table.hp[before]
+            self.hp.append(self.hp[-1] + hp)
+            self.skill_points.append(self.skill_points[-1] + table.points_per_level)
+            self.bonus_feats.append(self.bonus_feats[-1] + table.bonus_feats[after] - table.bonus_feats[before])
+            self.class_skills.append(self.class_skills[-1] | table.class_skills)
+            previous = self.min_points[-1]
+            points = table.points_per_level
+            self.min_points.append(points if previous is None else min(previous, points))
+        return len(self.classes) - start
+
+    def total(self, field, level):
+        """
+        Get a running total at a character level.
+        Args:
+            field (str): One of TOTALS.
+            level (int): Character level; levels past the last taken use the last row.
+        Returns:
+            int: The value.
+        """
+        level = max(0, min(level, len(self.classes)))
+        if field in self.saves:
+            return self.saves[field][level]
+        return getattr(self, field)[level]
+
+    def skill_budget(self, level, bonus):
+        """
+        Get the skill points gained over the first character levels.
+        - Each level gains its class's points plus the bonus, and at least 1; the sum is
+          read from the prefix sums unless some level is raised to the minimum.
+        Args:
+            level (int): Character level.
+            bonus (int): Points added every level (Intelligence, race, heritage).
+        Returns:
+            int: Total skill points.
+        """
+        level = max(0, min(level, len(self.classes)))
+        if not level:
+            return 0
+        if self.min_points[level] + bonus >= 1:
+            return self.skill_points[level] + level * bonus
+        return sum(max(1, class_progression(c).points_per_level + bonus) for c in self.classes[:level])
@@ -0,0 +1,151 @@
+from wotr_planner.models.character import Character, STATS
+from wotr_planner.models.point_buy import MAX_SCORE, MIN_SCORE
+from wotr_planner.models.progression import MAX_LEVEL, ClassLevels
+
+class BuildValidationError(ValueError):
+    """
+    Raised when a serialized build references data missing from the catalog.
+    """
+
+def character_to_dict(character):
+    """
+    Convert a character to a plain dict of names and numbers.
+    - Data records are referenced by name, so the result is small and JSON-safe.
+    - Zero skill ranks are omitted.
+    - Multiclass characters add "class_levels", the class name taken at each level.
+    Args:
+        character (Character): Character to convert.
+    Returns:
+        dict: Serialized build.
+    """
+    data = {
+        "name": character.name,
+        "race": character.race.get("name"),
+        "heritage": character.heritage.get("name") if character.heritage else None,
+        "class": character.char_class.get("name"),
+        "archetype": getattr(character, "archetype", None),
+        "background": character.background.get("name") if character.background else None,
+        "level": character.level,
+        "point_buy": {stat: character.point_buy_stats[stat] for stat in STATS},
+        "feats": character.feats.names(),
+        "skill_ranks": {skill: ranks for skill, ranks in character.skill_ranks.items() if ranks},
+        "notes": getattr(character, "notes", ""),
+    }
+    class_levels = class_level_names(character)
+    if class_levels is not None:
+        data["class_levels"] = class_levels
+    return data
+
+def class_level_names(character):
+    """
+    Get the class taken at each level of a multiclass character.
+    Args:
+        character (Character): Character to inspect.
+    Returns:
+        list | None: Class names from level 1 to the character's level, or None when
+            every level is in char_class.
+    """
+    if getattr(character, "class_levels", None) is None:
+        return None
+    return [c.get("name") for c in character.progression().classes[:character.level]]
+
+def _require(catalog, kind, key, label):
+    """
+    Look up a catalog record, raising if it is missing.
+    Args:
+        catalog (Catalog): Game data.
+        kind (str): Data kind.
+        key (str | tuple): Record key.
+        label (str): Field name used in the error message.
+    Returns:
+        dict: The record.
+    Raises:
+        BuildValidationError: If the record does not exist.
+    """
+    record = catalog.get(kind, key) if isinstance(key, (str, tuple)) else None
+    if record is None:
+        raise BuildValidationError(f"Unknown {label}: {key[-1] if isinstance(key, tuple) else key}")
+    return record
+
+def _is_int(value):
+    # bool is an int subclass, but true is not a level or a score
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _text(data, field):
+    """
+    Get an optional string field.
+    Args:
+        data (dict): Serialized build.
+        field (str): Field name.
+    Returns:
+        str | None: The value, or None if it is missing or null.
+    Raises:
+        BuildValidationError: If the value is not a string.
+    """
+    value = data.get(field)
+    if value is not None and not isinstance(value, str):
+        raise BuildValidationError(f"Invalid {field}: expected a string")
+    return value
+
+def character_from_dict(data, catalog):
+    """
+    Build a character from a serialized build, validating every reference.
+    - Names must be strings, the level an integer from 1 to MAX_LEVEL, point buy scores
+      integers from MIN_SCORE to MAX_SCORE and skill ranks integers from 0 to the level.
+    Args:
+        data (dict): Serialized build, as produced by character_to_dict.
+        catalog (Catalog): Game data used to resolve names.
+    Returns:
+        Character: The character with final stats calculated.
+    Raises:
+        BuildValidationError: If a field is malformed or names unknown data.
+    """
+    if not isinstance(data, dict):
+        raise BuildValidationError("Build must be a JSON object")
+    race = _require(catalog, "races", _text(data, "race"), "race")
+    character = Character(
+        char_class=_require(catalog, "classes", _text(data, "class"), "class"),
+        race=race,
+    )
+    character.name = _text(data, "name") or ""
+    character.notes = _text(data, "notes") or ""
+    character.archetype = _text(data, "archetype")
+    heritage = _text(data, "heritage")
+    if heritage:
+        character.heritage = _require(catalog, "heritages", (race["name"], heritage), "heritage")
+    background = _text(data, "background")
+    if background:
+        character.background = _require(catalog, "backgrounds", background, "background")
+
+    level = data.get("level", 1)
+    if not _is_int(level) or not 1 <= level <= MAX_LEVEL:
+        raise BuildValidationError(f"Invalid level: {level}")
+    character.level = level
+
+    for field, expected in (("point_buy", dict), ("skill_ranks", dict), ("feats", list), ("class_levels", list)):
+        if not isinstance(data.get(field, expected()), expected):
+            raise BuildValidationError(f"Invalid {field}: expected {expected.__name__}")
+    for field in ("feats", "class_levels"):
+        if not all(isinstance(name, str) for name in data.get(field) or []):
+            raise BuildValidationError(f"Invalid {field}: expected names")
+
+    for stat, value in data.get("point_buy", {}).items():
+        if stat not in character.point_buy_stats or not _is_int(value) or not MIN_SCORE <= value <= MAX_SCORE:
+            raise BuildValidationError(f"Invalid point buy entry: {stat}={value}")
+        character.point_buy_stats[stat] = value
+
+    known_skills = catalog.indexes.get("skills")
+    for skill, ranks in data.get("skill_ranks", {}).items():
+        if (known_skills is not None and skill not in known_skills) or not _is_int(ranks) or not 0 <= ranks <= level:
+            raise BuildValidationError(f"Invalid skill rank entry: {skill}={ranks}")
+        character.skill_ranks[skill] = ranks
+
+    class_levels = data.get("class_levels")
+    if class_levels is not None:
+        if len(class_levels) != level:
+            raise BuildValidationError(f"Invalid class_levels: expected {level} entries")
+        character.class_levels = ClassLevels(_require(catalog, "classes", name, "class") for name in class_levels)
+
+    character.feats = [_require(catalog, "feats", name, "feat") for name in data.get("feats", [])]
+    character.recalculate_stats()
+    return character
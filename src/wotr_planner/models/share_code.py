@@ -0,0 +1,251 @@
+"""
+Compact build share codes.
+- A build is bit-packed using catalog IDs and wrapped in unpadded base64url.
+- Codes are canonical (feats are stored as a set), so equal builds get equal codes.
+- Codes carry a fingerprint of the catalog's ordered keys, so a code is rejected by data
+  whose IDs differ (another data pack, an edited or reloaded file) instead of decoding
+  to the wrong records.
+
+Version 3 layout, most significant bits first:
+    version 8 | catalog fingerprint 32
+    race 8 | heritage+1 8 | class 8 | archetype+1 6 | background+1 8 | level-1 5
+    multiclass 1 | if multiclass: class taken at each level, level x 8
+    point buy 6 x 4 (score - 7) | skill ranks len(SKILLS) x 5
+    feat count 10 | feat bitset (feat count bits, bit i = catalog feat ID i)
+Earlier versions had no fingerprint and are no longer accepted.
+The field widths limit the catalogs a code can describe (see CATALOG_LIMITS); larger
+catalogs are rejected with a ShareCodeError rather than producing a code that cannot
+be read back.
+"""
+import base64
+import struct
+import zlib
+from wotr_planner.models.character import Character, SKILLS, STATS
+from wotr_planner.models.progression import ClassLevels
+from wotr_planner.models.serialization import class_level_names
+
+VERSION = 3
+# Kinds whose IDs appear in a code
+ENCODED_KINDS = ("races", "heritages", "classes", "backgrounds", "feats")
+# Kind -> most records its ID field can address (8-bit IDs, 8-bit IDs+1, 10-bit feat count)
+CATALOG_LIMITS = {"races": 256, "heritages": 255, "classes": 256, "backgrounds": 255, "feats": 1023}
+
+class ShareCodeError(ValueError):
+    """
+    Raised when a build cannot be encoded or a code cannot be decoded.
+    """
+
+class _BitWriter:
+    """
+    Accumulate fixed-width unsigned fields into a single integer.
+    """
+    def __init__(self):
+        self.value = 0
+        self.bits = 0
+
+    def write(self, value, width, field):
+        if not 0 <= value < (1 << width):
+            raise ShareCodeError(f"{field} value {value} does not fit in {width} bits")
+        self.value = (self.value << width) | value
+        self.bits += width
+
+    def to_bytes(self):
+        padding = -self.bits % 8
+        return (self.value << padding).to_bytes((self.bits + padding) // 8, "big")
+
+class _BitReader:
+    """
+    Read fixed-width unsigned fields from bytes, most significant bits first.
+    """
+    def __init__(self, data):
+        self.value = int.from_bytes(data, "big")
+        self.remaining = len(data) * 8
+
+    def read(self, width):
+        if width > self.remaining:
+            raise ShareCodeError("Share code is truncated")
+        self.remaining -= width
+        return (self.value >> self.remaining) & ((1 << width) - 1)
+
+def _optional_id(catalog, kind, key, field):
+    """
+    Get a catalog ID plus one, or 0 for no record.
+    """
+    if key is None:
+        return 0
+    record_id = catalog.id_of(kind, key)
+    if record_id is None:
+        raise ShareCodeError(f"Unknown {field}: {key[-1] if isinstance(key, tuple) else key}")
+    return record_id + 1
+
+def _check_catalog_size(catalog):
+    """
+    Check that every encoded kind fits its ID field.
+    Raises:
+        ShareCodeError: If a kind has more records than CATALOG_LIMITS allows.
+    """
+    for kind, limit in CATALOG_LIMITS.items():
+        count = len(catalog.records(kind))
+        if count > limit:
+            raise ShareCodeError(f"Share codes support at most {limit} {kind}; the game data has {count}")
+
+def catalog_fingerprint(catalog):
+    """
+    Get the fingerprint of the catalog IDs a code refers to.
+    Args:
+        catalog (Catalog): Game data.
+    Returns:
+        int: 32-bit checksum of the encoded kinds' fingerprints.
+    """
+    return zlib.crc32(struct.pack(f"<{len(ENCODED_KINDS)}I", *map(catalog.fingerprint, ENCODED_KINDS)))
+
+def encode_build(character, catalog):
+    """
+    Encode a character's build as a share code.
+    - Name and notes are not part of the build.
+    Args:
+        character (Character): Character to encode.
+        catalog (Catalog): Game data providing stable IDs.
+    Returns:
+        str: The share code.
+    Raises:
+        ShareCodeError: If the build references data missing from the catalog
+            or a value is out of range.
+    """
+    _check_catalog_size(catalog)
+    race_name = character.race.get("name")
+    writer = _BitWriter()
+    writer.write(VERSION, 8, "version")
+    writer.write(catalog_fingerprint(catalog), 32, "fingerprint")
+    writer.write(_optional_id(catalog, "races", race_name, "race") - 1, 8, "race")
+    heritage_key = (race_name, character.heritage["name"]) if character.heritage else None
+    writer.write(_optional_id(catalog, "heritages", heritage_key, "heritage"), 8, "heritage")
+    class_name = character.char_class.get("name")
+    writer.write(_optional_id(catalog, "classes", class_name, "class") - 1, 8, "class")
+
+    archetype = getattr(character, "archetype", None)
+    archetypes = [a["name"] for a in catalog.get("classes", class_name).get("archetypes", [])]
+    if archetype is not None and archetype not in archetypes:
+        raise ShareCodeError(f"Unknown archetype: {archetype}")
+    writer.write(archetypes.index(archetype) + 1 if archetype else 0, 6, "archetype")
+
+    background = character.background["name"] if character.background else None
+    writer.write(_optional_id(catalog, "backgrounds", background, "background"), 8, "background")
+    if not 1 <= character.level <= 20:
+        raise ShareCodeError(f"Level {character.level} is outside 1-20")
+    writer.write(character.level - 1, 5, "level")
+    # Per-level classes are only written when some level differs from the class, so a
+    # single-class build gets the same code however it was created
+    class_levels = class_level_names(character)
+    if class_levels is not None and any(name != class_name for name in class_levels):
+        writer.write(1, 1, "multiclass")
+        for name in class_levels:
+            writer.write(_optional_id(catalog, "classes", name, "class") - 1, 8, "class")
+    else:
+        writer.write(0, 1, "multiclass")
+    for stat in STATS:
+        if not 7 <= character.point_buy_stats[stat] <= 18:
+            raise ShareCodeError(f"Point buy {stat} {character.point_buy_stats[stat]} is outside 7-18")
+        writer.write(character.point_buy_stats[stat] - 7, 4, stat)
+    for skill in SKILLS:
+        ranks = character.skill_ranks.get(skill, 0)
+        if ranks > character.level:
+            raise ShareCodeError(f"Skill {skill} has {ranks} ranks, more than the level {character.level}")
+        writer.write(ranks, 5, skill)
+
+    feat_count = len(catalog.records("feats"))
+    bitset = 0
+    for feat in character.feats:
+        feat_id = catalog.id_of("feats", feat["name"])
+        if feat_id is None:
+            raise ShareCodeError(f"Unknown feat: {feat['name']}")
+        bitset |= 1 << feat_id
+    writer.write(feat_count, 10, "feat count")
+    writer.write(bitset, feat_count, "feats")
+    return base64.urlsafe_b64encode(writer.to_bytes()).rstrip(b"=").decode("ascii")
+
+def decode_build(code, catalog):
+    """
+    Decode a share code into a character.
+    Args:
+        code (str): Share code produced by encode_build.
+        catalog (Catalog): The same game data the code was encoded with.
+    Returns:
+        Character: The decoded character with final stats calculated.
+    Raises:
+        ShareCodeError: If the code is malformed, from another version, holds a value
+            encode_build would reject or does not match the catalog.
+    """
+    try:
+        data = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    except (ValueError, TypeError) as exc:
+        raise ShareCodeError("Share code is not valid base64url") from exc
+    reader = _BitReader(data)
+    version = reader.read(8)
+    if version != VERSION:
+        raise ShareCodeError(f"Unsupported share code version: {version}")
+    _check_catalog_size(catalog)
+    if reader.read(32) != catalog_fingerprint(catalog):
+        raise ShareCodeError("Share code was made with different game data")
+
+    def lookup(kind, record_id, field):
+        records = catalog.records(kind)
+        if record_id >= len(records):
+            raise ShareCodeError(f"Unknown {field} ID: {record_id}")
+        return records[record_id]
+
+    race = lookup("races", reader.read(8), "race")
+    heritage_id = reader.read(8)
+    char_class = lookup("classes", reader.read(8), "class")
+    character = Character(char_class=char_class, race=race)
+    if heritage_id:
+        character.heritage = lookup("heritages", heritage_id - 1, "heritage")
+        if character.heritage.get("race") != race["name"]:
+            raise ShareCodeError(f"Heritage {character.heritage['name']} does not belong to {race['name']}")
+    archetype_id = reader.read(6)
+    if archetype_id:
+        character.archetype = lookup_archetype(char_class, archetype_id - 1)
+    background_id = reader.read(8)
+    if background_id:
+        character.background = lookup("backgrounds", background_id - 1, "background")
+    character.level = reader.read(5) + 1
+    if character.level > 20:
+        raise ShareCodeError(f"Level {character.level} is outside 1-20")
+    if reader.read(1):
+        character.class_levels = ClassLevels(
+            lookup("classes", reader.read(8), "class") for _ in range(character.level)
+        )
+    for stat in STATS:
+        character.point_buy_stats[stat] = reader.read(4) + 7
+        if character.point_buy_stats[stat] > 18:
+            raise ShareCodeError(f"Point buy {stat} {character.point_buy_stats[stat]} is outside 7-18")
+    for skill in SKILLS:
+        character.skill_ranks[skill] = reader.read(5)
+        if character.skill_ranks[skill] > character.level:
+            raise ShareCodeError(f"Skill {skill} has {character.skill_ranks[skill]} ranks, more than the level {character.level}")
+
+    feat_count = reader.read(10)
+    if feat_count != len(catalog.records("feats")):
+        raise ShareCodeError("Share code was made with a different feat list")
+    bitset = reader.read(feat_count)
+    character.feats = [
+        catalog.by_id("feats", feat_id) for feat_id in range(feat_count) if bitset >> feat_id & 1
+    ]
+    character.recalculate_stats()
+    return character
+
+def lookup_archetype(char_class, archetype_id):
+    """
+    Get an archetype name of a class by index.
+    Args:
+        char_class (dict): Class record.
+        archetype_id (int): Index into the class's archetypes.
+    Returns:
+        str: The archetype name.
+    Raises:
+        ShareCodeError: If the index is out of range.
+    """
+    archetypes = char_class.get("archetypes", [])
+    if archetype_id >= len(archetypes):
+        raise ShareCodeError(f"Unknown archetype ID: {archetype_id}")
+    return archetypes[archetype_id]["name"]
@@ -0,0 +1,371 @@
+"""
+Game data in shared memory for process pool workers.
+- SharedCatalog.create packs every record as compact JSON into one
+  multiprocessing.shared_memory block, with per-kind offset tables and open-addressing
+  hash tables over the record keys (CRC-32 of the key, so every process agrees).
+- Workers attach by name: attaching maps the block read-only and parses only a small
+  header, so startup cost and memory do not grow with the catalog. Records are decoded
+  on first access and kept in a cache of at most CACHE_SIZE records per kind.
+- The structures every evaluation touches stay in the block as fixed-width arrays read
+  through memoryviews: the feat prerequisite table (level, stat minimums and prerequisite
+  feat IDs per feat) for availability scans, and the key hash tables for the trait
+  registry and chosen feat lookups. An evaluation decodes only the race, class, traits
+  and feats it uses or returns, so a worker does not build a copy of the catalog.
+- A SharedCatalog pickles as its block name, so it can be passed straight to a pool
+  initializer. Attach only from processes started by the creator's multiprocessing, which
+  share its resource tracker; the creator closes and unlinks the block when done.
+"""
+import json
+import struct
+import zlib
+from collections.abc import Mapping, Sequence
+from multiprocessing import shared_memory
+from wotr_planner.models.catalog import Catalog, record_key
+from wotr_planner.models.character import STATS
+
+# Block signature and layout version
+MAGIC = b"WOTRCAT2"
+# Decoded records kept per kind; the oldest is dropped beyond this
+CACHE_SIZE = 1024
+# Signature, then the length of the JSON header that follows it
+_PREFIX = struct.Struct("<8sQ")
+_OFFSET = struct.Struct("<Q")
+_SLOT = struct.Struct("<q")
+# Hash slot with no record
+_EMPTY = -1
+# Prerequisite table padding, and the ID of a prerequisite feat missing from the catalog
+_NO_FEAT = -1
+_MISSING_FEAT = -2
+# Prerequisite level of a feat that can never be taken
+_UNREACHABLE = 2 ** 31 - 1
+
+def _encode(value):
+    return json.dumps(value, separators=(",", ":")).encode()
+
+def _key_hash(key):
+    """
+    Hash a record key the same way in every process.
+    """
+    return zlib.crc32(_encode(list(key) if isinstance(key, tuple) else key))
+
+def _align(size):
+    return -(-size // 8) * 8
+
+def _pack_kind(kind, records, start):
+    """
+    Pack one kind's records into offset table, JSON data and hash slots.
+    Args:
+        kind (str): Data kind.
+        records (list): Records in ID order.
+        start (int): Block position of the section.
+    Returns:
+        tuple: (header entry, section bytes).
+    """
+    encoded = [_encode(record) for record in records]
+    slot_count = 2 * len(records) + 1
+    slots = [_EMPTY] * slot_count
+    for record_id, record in enumerate(records):
+        slot = _key_hash(record_key(kind, record)) % slot_count
+        while slots[slot] != _EMPTY:
+            slot = (slot + 1) % slot_count
+        slots[slot] = record_id
+
+    section = bytearray()
+    position = 0
+    for data in encoded:
+        section += _OFFSET.pack(position)
+        position += len(data)
+    section += _OFFSET.pack(position)
+    slots_at = len(section)
+    for record_id in slots:
+        section += _SLOT.pack(record_id)
+    data_at = len(section)
+    for data in encoded:
+        section += data
+    section += bytes(_align(len(section)) - len(section))
+    entry = {"count": len(records), "offsets": start, "slots": start + slots_at, "slot_count": slot_count, "data": start + data_at}
+    return entry, bytes(section)
+
+def _pack_feat_table(catalog, start):
+    """
+    Pack the feat prerequisite table: one row of int32 per feat.
+    - Row: prerequisite level, minimum score per STATS entry (0 if none), then the catalog
+      IDs of its prerequisite feats, padded with _NO_FEAT to the longest list.
+    Args:
+        catalog (Catalog): Game data.
+        start (int): Block position of the section.
+    Returns:
+        tuple: (header entry, section bytes).
+    """
+    feats = catalog.records("feats")
+    width = max((len(feat.get("prerequisite_feats", ())) for feat in feats), default=0)
+    values = []
+    for feat in feats:
+        level = feat.get("prerequisite_level", 1)
+        minimums = feat.get("prerequisite_stats", {})
+        if any(stat not in STATS and value > 0 for stat, value in minimums.items()):
+            level = _UNREACHABLE # A score characters do not have
+        values.append(level)
+        values.extend(minimums.get(stat, 0) for stat in STATS)
+        required = [catalog.id_of("feats", name) for name in feat.get("prerequisite_feats", ())]
+        values.extend(_MISSING_FEAT if record_id is None else record_id for record_id in required)
+        values.extend([_NO_FEAT] * (width - len(required)))
+    section = struct.pack(f"<{len(values)}i", *values)
+    section += bytes(_align(len(section)) - len(section))
+    return {"at": start, "count": len(feats), "width": 1 + len(STATS) + width}, section
+
+class FeatPrerequisites:
+    """
+    Availability checks over the feat prerequisite table in a shared block.
+    """
+    def __init__(self, records, entry):
+        self._records = records
+        self._entry = entry
+
+    def available(self, character):
+        """
+        Get the feats a character may select, as Character.available_feats does.
+        - Scans the table; only the feats returned are decoded.
+        Args:
+            character (Character): Character to check.
+        Returns:
+            list: Available feat definitions, in catalog order.
+        """
+        entry = self._entry
+        width = entry["width"]
+        count = entry["count"]
+        table = self._records._catalog._buffer[entry["at"]:entry["at"] + 4 * width * count].cast("i")
+        level = character.level
+        scores = [character.stats.get(stat, 0) for stat in STATS]
+        index = self._records._catalog.indexes["feats"]
+        # Innate feats satisfy prerequisites like chosen ones
+        chosen = {index.get(name) for name in character.feats.names() + character.trait_bonuses["innate_feats"]}
+        available = []
+        for record_id in range(count):
+            row = table[record_id * width:(record_id + 1) * width]
+            if row[0] > level:
+                continue
+            if any(score < minimum for score, minimum in zip(scores, row[1:1 + len(STATS)])):
+                continue
+            if any(required != _NO_FEAT and required not in chosen for required in row[1 + len(STATS):]):
+                continue
+            available.append(self._records[record_id])
+        return available
+
+class SharedRecords(Sequence):
+    """
+    Records of one kind, decoded from the shared block on first access.
+    """
+    def __init__(self, catalog, kind, entry):
+        self._catalog = catalog
+        self._kind = kind
+        self._entry = entry
+        # Record ID -> decoded record, oldest first, so repeated lookups return the same dict
+        self._cache = {}
+        # Set on the feats kind of a SharedCatalog
+        self.prerequisites = None
+
+    def __len__(self):
+        return self._entry["count"]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{self._kind} record ID out of range: {index}")
+        record = self._cache.get(index)
+        if record is None:
+            buffer = self._catalog._buffer
+            at = self._entry["offsets"] + index * _OFFSET.size
+            (start,), (end,) = _OFFSET.unpack_from(buffer, at), _OFFSET.unpack_from(buffer, at + _OFFSET.size)
+            data = self._entry["data"]
+            if len(self._cache) >= CACHE_SIZE:
+                del self._cache[next(iter(self._cache))]
+            record = self._cache[index] = json.loads(bytes(buffer[data + start:data + end]))
+        return record
+
+    def find(self, key):
+        """
+        Look up a record by key through the shared hash table, without scanning.
+        Args:
+            key: Record key (see record_key).
+        Returns:
+            dict | None: The record, or None if no record has the key.
+        """
+        record_id = self._catalog.indexes[self._kind].get(key)
+        return None if record_id is None else self[record_id]
+
+class SharedIndex(Mapping):
+    """
+    Record key -> record ID of one kind, looked up in the shared hash table.
+    """
+    def __init__(self, records, kind, entry):
+        self._records = records
+        self._kind = kind
+        self._entry = entry
+
+    def __getitem__(self, key):
+        entry = self._entry
+        buffer = self._records._catalog._buffer
+        slot_count = entry["slot_count"]
+        slot = _key_hash(key) % slot_count
+        while True:
+            (record_id,) = _SLOT.unpack_from(buffer, entry["slots"] + slot * _SLOT.size)
+            if record_id == _EMPTY:
+                raise KeyError(key)
+            if record_key(self._kind, self._records[record_id]) == key:
+                return record_id
+            slot = (slot + 1) % slot_count
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self):
+        return (record_key(self._kind, record) for record in self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+class SharedRegistry(Mapping):
+    """
+    Record name -> record of one kind, e.g. the trait registry, decoding only what is read.
+    """
+    def __init__(self, records):
+        self._records = records
+
+    def __getitem__(self, name):
+        record = self._records.find(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __iter__(self):
+        return (record["name"] for record in self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+class SharedCatalog(Catalog):
+    """
+    Read-only Catalog backed by a shared memory block.
+    - Offers the Catalog lookups (records, get, id_of, by_id, heritage, trait_registry).
+    """
+    def __init__(self, name):
+        """
+        Attach to a shared catalog block.
+        Args:
+            name (str): Shared memory block name (see create).
+        Raises:
+            FileNotFoundError: If no block has the name.
+            ValueError: If the block does not hold a catalog.
+        """
+        self._memory = shared_memory.SharedMemory(name)
+        self._buffer = self._memory.buf.toreadonly()
+        magic, length = _PREFIX.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Shared memory block {name} does not hold a catalog")
+        header = json.loads(bytes(self._buffer[_PREFIX.size:_PREFIX.size + length]))
+        self.data = {}
+        self.indexes = {}
+        # Computed by the creator, so attaching never decodes every record to get them
+        self.fingerprints = {kind: entry["fingerprint"] for kind, entry in header["kinds"].items()}
+        for kind, entry in header["kinds"].items():
+            self.data[kind] = SharedRecords(self, kind, entry)
+            self.indexes[kind] = SharedIndex(self.data[kind], kind, entry)
+        if "feats" in self.data:
+            self.data["feats"].prerequisites = FeatPrerequisites(self.data["feats"], header["feat_table"])
+
+    @classmethod
+    def create(cls, catalog, name=None):
+        """
+        Copy a catalog into a new shared memory block.
+        Args:
+            catalog (Catalog): Game data to share.
+            name (str, optional): Block name. Defaults to a generated unique name.
+        Returns:
+            SharedCatalog: The owning catalog; close() and unlink() it when workers are done.
+        """
+        kinds = {}
+        sections = []
+        # Sections start after the header, whose size depends on their positions, so lay
+        # them out relative to 0 first and shift once the header size is known
+        position = 0
+        for kind, records in catalog.data.items():
+            entry, section = _pack_kind(kind, records, position)
+            entry["fingerprint"] = catalog.fingerprint(kind)
+            kinds[kind] = entry
+            sections.append(section)
+            position += len(section)
+        feat_table, section = _pack_feat_table(catalog, position)
+        sections.append(section)
+        position += len(section)
+        header = _encode({"kinds": kinds, "feat_table": feat_table})
+        # Each position grows by at most 20 digits when shifted
+        start = _align(_PREFIX.size + len(header) + 20 * (3 * len(kinds) + 1))
+        for entry in kinds.values():
+            for field in ("offsets", "slots", "data"):
+                entry[field] += start
+        feat_table["at"] += start
+        header = _encode({"kinds": kinds, "feat_table": feat_table})
+
+        memory = shared_memory.SharedMemory(name, create=True, size=max(1, start + position))
+        _PREFIX.pack_into(memory.buf, 0, MAGIC, len(header))
+        memory.buf[_PREFIX.size:_PREFIX.size + len(header)] = header
+        memory.buf[start:start + position] = b"".join(sections)
+        shared = cls(memory.name)
+        memory.close()
+        return shared
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def size(self):
+        return self._memory.size
+
+    def __reduce__(self):
+        # Other processes attach to the block instead of receiving a copy of the data
+        return (SharedCatalog, (self.name,))
+
+    def trait_registry(self):
+        """
+        Get trait definitions keyed by name, decoding each trait when it is first read.
+        Returns:
+            SharedRegistry: Trait name -> trait definition.
+        """
+        return SharedRegistry(self.data["traits"]) if "traits" in self.data else {}
+
+    def set_records(self, kind, records):
+        """
+        Refuse to change shared game data.
+        Raises:
+            TypeError: Always; shared catalogs are read-only.
+        """
+        raise TypeError("Shared catalogs are read-only")
+
+    def close(self):
+        """
+        Detach from the block; records already decoded stay usable.
+        """
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+            self._memory.close()
+
+    def unlink(self):
+        """
+        Free the block once every process has detached; only the creator should call this.
+        """
+        self._memory.unlink()
+
+    def __del__(self):
+        if getattr(self, "_buffer", None) is not None:
+            self.close()
@@ -0,0 +1,84 @@
+"""
+Skill rank allocation helpers.
+- Pure functions shared by SkillsTab and headless/batch tooling.
+"""
+
+def skill_point_budget(character) -> int:
+    """
+    Calculate the total number of skill ranks a character may spend.
+    Args:
+        character (Character): Character to evaluate.
+    Returns:
+        int: Skill points gained over every level (see Character.skill_point_budget).
+    """
+    return character.skill_point_budget()
+
+def reduce_overflow(skill_ranks, order, allowed):
+    """
+    Trim skill ranks so their total does not exceed the allowed budget.
+    - Ranks are removed from the end of `order` first (lowest priority).
+    - Each skill is cut in a single step, so the cost is O(skills), not O(ranks).
+    Args:
+        skill_ranks (dict): Current skill ranks by skill name.
+        order (list): Skill names from highest to lowest priority.
+        allowed (int): Maximum number of ranks that may be spent.
+    Returns:
+        dict: New skill ranks (the input dict is not modified).
+    """
+    ranks = dict(skill_ranks)
+    overflow = sum(ranks.values()) - allowed
+    for skill in reversed(order):
+        if overflow <= 0:
+            break
+        cut = min(ranks.get(skill, 0), overflow)
+        if cut:
+            ranks[skill] -= cut
+            overflow -= cut
+    return ranks
+
+def allocate_skill_ranks(priorities, skills, pool, max_rank):
+    """
+    Distribute a pool of skill ranks according to a priority list.
+    - Skills are maxed out in priority order until the pool runs out.
+    - Skills not named in the priority list receive no ranks.
+    Args:
+        priorities (list): Skill names from highest to lowest priority.
+        skills (list): All skill names that should appear in the result.
+        pool (int): Total number of ranks available.
+        max_rank (int): Maximum ranks per skill (the character level).
+    Returns:
+        dict: Skill ranks for every skill in `skills`.
+    Raises:
+        ValueError: If a priority names an unknown skill or is listed twice.
+    """
+    ranks = {skill: 0 for skill in skills}
+    remaining = max(0, pool)
+    seen = set()
+    for skill in priorities:
+        if skill not in ranks:
+            raise ValueError(f"Unknown skill in priority list: {skill}")
+        if skill in seen:
+            raise ValueError(f"Skill listed twice in priority list: {skill}")
+        seen.add(skill)
+        ranks[skill] = min(max_rank, remaining)
+        remaining -= ranks[skill]
+    return ranks
+
+def solve_skill_ranks(character, priorities):
+    """
+    Re-allocate a character's skill ranks from a priority list.
+    - Uses the pool from skill_point_budget and the per-level rank cap.
+    - Updates character.skill_ranks in place; effective skills are left to the caller.
+    Args:
+        character (Character): Character whose ranks are replaced.
+        priorities (list): Skill names from highest to lowest priority.
+    Returns:
+        dict: The new skill ranks.
+    """
+    character.skill_ranks = allocate_skill_ranks(
+        priorities,
+        list(character.skill_ranks),
+        skill_point_budget(character),
+        character.level
+    )
+    return character.skill_ranks
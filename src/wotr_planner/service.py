@@ -0,0 +1,510 @@
+"""
+Local JSON-RPC 2.0 evaluation service on asyncio.
+- Newline-delimited JSON over TCP, bound to a loopback address only.
+- Game data and its indexes are loaded once and stay resident.
+- Each request runs as its own task, so a client may pipeline requests on one connection;
+  responses are written as they complete and matched by id.
+- Nothing slow runs on the event loop: evaluations go to a process pool whose workers
+  attach to the game data in shared memory instead of loading their own copy, large
+  batches split across its workers, and library searches run on one database thread that
+  owns its SQLite connection.
+- Methods: evaluate, validate, available_feats, search, evaluate_batch, stats.
+- Run with: python -m wotr_planner.service [--port PORT]
+"""
+import argparse
+import asyncio
+import inspect
+import ipaddress
+import json
+import multiprocessing
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from wotr_planner.models.data_packs import DataPacks, default_pack_dirs
+from wotr_planner.models.evaluator import evaluate_build, load_character
+from wotr_planner.models.serialization import BuildValidationError
+from wotr_planner.models.shared_catalog import SharedCatalog
+from wotr_planner.models.share_code import ShareCodeError
+
+DEFAULT_PORT = 8765
+# Longest accepted request line, in bytes
+MAX_LINE = 16 * 1024 * 1024
+# Requests of one connection processed at the same time; further lines wait
+MAX_IN_FLIGHT = 64
+# Batches at or below this size go to one pool worker instead of being split
+BATCH_INLINE = 32
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+INVALID_BUILD = -32000
+
+class RpcError(Exception):
+    """
+    Raised by a method to return a JSON-RPC error response.
+    """
+    def __init__(self, code, message):
+        """
+        Initialize an RpcError.
+        Args:
+            code (int): JSON-RPC error code.
+            message (str): Error message.
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class LatencyStats:
+    """
+    Latency of one method: running totals plus a window of recent samples for percentiles.
+    """
+    def __init__(self, window=1000):
+        """
+        Initialize empty LatencyStats.
+        Args:
+            window (int, optional): Recent samples kept for percentiles. Defaults to 1000.
+        """
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds, failed=False):
+        """
+        Record one call.
+        Args:
+            seconds (float): Wall time of the call.
+            failed (bool, optional): Whether the call returned an error. Defaults to False.
+        """
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self):
+        """
+        Get the statistics in milliseconds.
+        Returns:
+            dict: count, errors, mean_ms, p50_ms, p95_ms and max_ms.
+        """
+        recent = sorted(self.recent)
+
+        def percentile(p):
+            return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000 if recent else 0.0
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": self.max * 1000,
+        }
+
+def evaluate_many(builds, catalog, trait_registry):
+    """
+    Evaluate builds, turning load failures into error entries.
+    Args:
+        builds (list): Serialized builds or share codes.
+        catalog (Catalog): Game data.
+        trait_registry (dict): Trait definitions by name.
+    Returns:
+        list: Sheet per build, or {"error": message} for builds that could not be loaded.
+    """
+    results = []
+    for build in builds:
+        try:
+            results.append(evaluate_build(load_character(build, catalog), catalog, trait_registry))
+        except (BuildValidationError, ShareCodeError) as exc:
+            results.append({"error": str(exc)})
+    return results
+
+# Game data of a pool worker, attached once by _init_worker
+_worker_data = None
+
+def _init_worker(catalog):
+    """
+    Attach to the server's shared game data in a pool worker.
+    Args:
+        catalog (SharedCatalog): Shared game data; only its block name is sent to the worker.
+    """
+    global _worker_data
+    _worker_data = (catalog, catalog.trait_registry())
+
+def _evaluate_chunk(builds):
+    """
+    Evaluate a chunk of a batch in a pool worker.
+    """
+    return evaluate_many(builds, *_worker_data)
+
+class EvaluationService:
+    """
+    JSON-RPC methods over resident game data, and the asyncio server that exposes them.
+    """
+    def __init__(self, pack_dirs=None, db_path=None, workers=None):
+        """
+        Initialize the EvaluationService and load the game data.
+        Args:
+            pack_dirs (list, optional): Data pack directories. Defaults to default_pack_dirs().
+            db_path (str | Path, optional): Build library database for search, opened on
+                first search. Defaults to default_db_path().
+            workers (int, optional): Process pool size. Defaults to the CPU count.
+        """
+        self.pack_dirs = [str(p) for p in (default_pack_dirs() if pack_dirs is None else pack_dirs)]
+        self.catalog = DataPacks(self.pack_dirs).catalog()
+        self.db_path = db_path
+        self.workers = workers or multiprocessing.cpu_count()
+        self.pool = None
+        # Game data shared with the pool workers, created with the pool
+        self.shared = None
+        # Single thread that owns the search connection; SQLite connections stay on one thread
+        self.database = ThreadPoolExecutor(1, thread_name_prefix="wotr-service-db")
+        # Search connection, only touched on the database thread
+        self.search_conn = None
+        self.server = None
+        # Handler task -> writer of each open connection
+        self.connections = {}
+        self.latency = {}
+        self.methods = {
+            "evaluate": self.evaluate,
+            "validate": self.validate,
+            "available_feats": self.available_feats,
+            "search": self.search,
+            "evaluate_batch": self.evaluate_batch,
+            "stats": self.stats,
+        }
+
+    def _process_pool(self):
+        """
+        Get the process pool, starting it and sharing the game data on first use.
+        """
+        if self.pool is None:
+            self.shared = SharedCatalog.create(self.catalog)
+            # Spawned workers do not inherit the running event loop
+            self.pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(self.shared,),
+            )
+        return self.pool
+
+    async def evaluate(self, build):
+        """
+        Evaluate one build in a pool worker.
+        Args:
+            build (dict | str): Serialized build or share code.
+        Returns:
+            dict: The derived sheet (see evaluate_build).
+        """
+        if not isinstance(build, (dict, str)):
+            raise RpcError(INVALID_PARAMS, "build must be a serialized build object or a share code")
+        loop = asyncio.get_running_loop()
+        [sheet] = await loop.run_in_executor(self._process_pool(), _evaluate_chunk, [build])
+        if "error" in sheet:
+            raise RpcError(INVALID_BUILD, sheet["error"])
+        return sheet
+
+    async def validate(self, build):
+        """
+        Check a build without failing on invalid input.
+        Args:
+            build (dict | str): Serialized build or share code.
+        Returns:
+            dict: {"valid": bool, "errors": [message, ...]}.
+        """
+        try:
+            sheet = await self.evaluate(build)
+        except RpcError as exc:
+            if exc.code != INVALID_BUILD:
+                raise
+            return {"valid": False, "errors": [exc.message]}
+        return {"valid": not sheet["errors"], "errors": sheet["errors"]}
+
+    async def available_feats(self, build):
+        """
+        List the feats a build can select.
+        Args:
+            build (dict | str): Serialized build or share code.
+        Returns:
+            list: Feat names.
+        """
+        return (await self.evaluate(build))["available_feats"]
+
+    async def search(self, race=None, heritage=None, char_class=None, min_level=None, max_level=None,
+                     feats=(), text=None, limit=100):
+        """
+        Search the saved build library.
+        Args:
+            race, heritage, char_class (str, optional): Exact name filters.
+            min_level, max_level (int, optional): Level range.
+            feats (list, optional): Feats every build must have.
+            text (str, optional): Full-text query over names and notes.
+            limit (int, optional): Maximum results. Defaults to 100.
+        Returns:
+            list: Summary dicts (see db.queries.SUMMARY_COLUMNS).
+        """
+        filters = {
+            "race": race, "heritage": heritage, "char_class": char_class,
+            "min_level": min_level, "max_level": max_level, "text": text,
+        }
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.database, self._search_rows, filters, feats, limit)
+        except sqlite3.OperationalError as exc:
+            raise RpcError(INVALID_PARAMS, f"Invalid search: {exc}") from exc
+
+    def _search_rows(self, filters, feats, limit):
+        """
+        Run a library search; only called on the database thread.
+        Args:
+            filters (dict): BuildQuery method name -> value, skipped when None.
+            feats (list): Feats every build must have.
+            limit (int): Maximum results.
+        Returns:
+            list: Summary dicts.
+        """
+        # Imported here so the service starts without touching the database
+        from wotr_planner.db.database import connect
+        from wotr_planner.db.queries import SUMMARY_COLUMNS, BuildQuery
+
+        if self.search_conn is None:
+            self.search_conn = connect(self.db_path)
+        query = BuildQuery(self.search_conn)
+        for method, value in filters.items():
+            if value is not None:
+                getattr(query, method)(value)
+        query.with_feats(*feats).limit(limit)
+        return [dict(zip(SUMMARY_COLUMNS, row)) for row in query.rows()]
+
+    def _close_search(self):
+        if self.search_conn is not None:
+            self.search_conn.close()
+            self.search_conn = None
+
+    async def evaluate_batch(self, builds):
+        """
+        Evaluate many builds in the process pool, splitting large batches across its workers.
+        Args:
+            builds (list): Serialized builds or share codes.
+        Returns:
+            list: Sheet per build, or {"error": message} for builds that could not be loaded.
+        """
+        if not isinstance(builds, list):
+            raise RpcError(INVALID_PARAMS, "builds must be a list")
+        pool = self._process_pool()
+        size = len(builds) if len(builds) <= BATCH_INLINE else -(-len(builds) // self.workers)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _evaluate_chunk, builds[i:i + size])
+            for i in range(0, len(builds), size)
+        ))
+        return [result for chunk in chunks for result in chunk]
+
+    async def stats(self):
+        """
+        Report per-method latency.
+        Returns:
+            dict: Method name -> LatencyStats.summary().
+        """
+        return {method: stats.summary() for method, stats in sorted(self.latency.items())}
+
+    async def call(self, request):
+        """
+        Handle one decoded JSON-RPC request.
+        Args:
+            request: Decoded request object.
+        Returns:
+            dict | None: The response, or None for a notification.
+        """
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+                or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            response = _error(request_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+        else:
+            params = request.get("params", {})
+            start = time.perf_counter()
+            try:
+                if isinstance(params, list):
+                    bound = _bind(method, params, {})
+                elif isinstance(params, dict):
+                    bound = _bind(method, [], params)
+                else:
+                    raise RpcError(INVALID_PARAMS, "params must be an array or object")
+                result = await method(*bound.args, **bound.kwargs)
+                response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+            except RpcError as exc:
+                response = _error(request_id, exc.code, exc.message)
+            except Exception as exc: # Keep serving other requests
+                response = _error(request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+            self.latency.setdefault(request["method"], LatencyStats()).add(
+                time.perf_counter() - start, "error" in response
+            )
+        return None if "id" not in request else response
+
+    async def handle_line(self, line):
+        """
+        Handle one request line, which may hold a single request or a batch.
+        Args:
+            line (bytes | str): JSON text.
+        Returns:
+            str | None: Response line, or None if nothing is to be sent.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps(_error(None, PARSE_ERROR, "Parse error"))
+        if isinstance(request, list):
+            if not request:
+                return json.dumps(_error(None, INVALID_REQUEST, "Empty batch"))
+            responses = [r for r in await asyncio.gather(*map(self.call, request)) if r is not None]
+            return json.dumps(responses) if responses else None
+        response = await self.call(request)
+        return None if response is None else json.dumps(response)
+
+    async def serve_client(self, reader, writer):
+        """
+        Serve one connection until the client closes it.
+        - Lines are dispatched as they arrive, without waiting for earlier responses.
+        """
+        self.connections[asyncio.current_task()] = writer
+        slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        tasks = set()
+
+        async def respond(line):
+            try:
+                response = await self.handle_line(line)
+                if response is not None:
+                    writer.write(response.encode("utf-8") + b"\n")
+                    await writer.drain()
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # Line longer than MAX_LINE
+                    writer.write(json.dumps(_error(None, PARSE_ERROR, "Request too large")).encode("utf-8") + b"\n")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """
+        Start listening.
+        Args:
+            host (str, optional): Loopback address to bind. Defaults to 127.0.0.1.
+            port (int, optional): TCP port; 0 picks a free one. Defaults to DEFAULT_PORT.
+        Returns:
+            asyncio.Server: The listening server.
+        Raises:
+            ValueError: If host is not a loopback address.
+        """
+        if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"Refusing to listen on non-loopback address {host}")
+        self.server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+        return self.server
+
+    def port(self):
+        """
+        Get the port the server listens on.
+        """
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Stop listening, close open connections and the search connection, and shut down the process pool.
+        - Closing a connection ends its handler's read loop; responses still in flight are dropped.
+        """
+        if self.server is not None:
+            self.server.close()
+            handlers = list(self.connections)
+            for writer in self.connections.values():
+                writer.transport.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+            self.shared.close()
+            self.shared.unlink()
+            self.shared = None
+        await asyncio.get_running_loop().run_in_executor(self.database, self._close_search)
+
+def _bind(method, args, kwargs):
+    """
+    Bind request params to a method's signature.
+    Raises:
+        RpcError: If the params do not fit the signature.
+    """
+    try:
+        return inspect.signature(method).bind(*args, **kwargs)
+    except TypeError as exc:
+        raise RpcError(INVALID_PARAMS, f"Invalid params: {exc}") from exc
+
+def _error(request_id, code, message):
+    """
+    Build a JSON-RPC error response.
+    """
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+async def serve(host, port, pack_dirs=None, workers=None):
+    """
+    Run the service until cancelled.
+    """
+    service = EvaluationService(pack_dirs, workers=workers)
+    server = await service.start(host, port)
+    print(f"Listening on {host}:{service.port()}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    """
+    Start the evaluation service from the command line.
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m wotr_planner.service",
+        description="Serve build evaluations over local JSON-RPC.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--pack", action="append", dest="packs", metavar="DIR", help="data pack directory")
+    parser.add_argument("--workers", type=int, help="process pool size for batches")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.packs, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
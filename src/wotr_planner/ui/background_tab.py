@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox
 from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_backgrounds
+from wotr_planner.models.catalog import default_catalog
 
 class BackgroundTab(QWidget):
     """
@@ -10,11 +10,14 @@ class BackgroundTab(QWidget):
     # Signal emitted when background changes
     background_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         """
         Initialize the BackgroundTab UI.
-        - Loads backgrounds from JSON.
+        - Shows the backgrounds of the validated game data catalog.
         - Sets up UI elements for background selection.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         """
         # Initialize parent QWidget
         super().__init__()
@@ -22,8 +25,8 @@ class BackgroundTab(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # Load backgrounds from JSON
-        self.backgrounds = load_backgrounds()
+        # Records of the validated catalog
+        self.backgrounds = list((catalog or default_catalog()).records("backgrounds"))
 
         # UI elements for background selection
         layout.addWidget(QLabel("Select Background:"))
@@ -54,4 +57,35 @@ class BackgroundTab(QWidget):
         selected_background = self.backgrounds[index]
         self.character.background = selected_background
         # Emit signal indicating background change
-        self.background_changed.emit()
\ No newline at end of file
+        self.background_changed.emit()
+
+    def select_background(self, background):
+        """
+        Show a background as selected without emitting background_changed.
+        Args:
+            background (dict): Background to select; matched by name.
+        """
+        idx = next(
+            (i for i, b in enumerate(self.backgrounds) if b["name"] == background.get("name")),
+            None
+        )
+        if idx is None:
+            return
+        self.background_combo.blockSignals(True)
+        self.background_combo.setCurrentIndex(idx)
+        self.background_combo.blockSignals(False)
+
+    def set_backgrounds(self, backgrounds):
+        """
+        Replace the background list, keeping the character's background selected,
+        without emitting background_changed.
+        Args:
+            backgrounds (list): New background records.
+        """
+        self.backgrounds = backgrounds
+        self.background_combo.blockSignals(True)
+        self.background_combo.clear()
+        self.background_combo.addItems([bg["name"] for bg in self.backgrounds])
+        self.background_combo.blockSignals(False)
+        if self.character.background:
+            self.select_background(self.character.background)
@@ -1,6 +1,10 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QTextEdit
-from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_classes
+from PyQt6.QtCore import Qt, pyqtSignal
+from wotr_planner.models.catalog import default_catalog
+
+# Item data roles holding integer IDs (indexes into ClassTab.classes)
+CLASS_ID_ROLE = Qt.ItemDataRole.UserRole
+ARCHETYPE_ID_ROLE = Qt.ItemDataRole.UserRole + 1
 
 class ClassTab(QWidget):
     """
@@ -10,11 +14,14 @@ class ClassTab(QWidget):
     # Signal emitted when class or archetype changes
     class_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         """
         Initialize the ClassTab UI.
-        - Loads classes from JSON.
+        - Shows the classes of the validated game data catalog.
         - Sets up UI elements for class and archetype selection.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         """
         # Initialize parent QWidget
         super().__init__()
@@ -22,8 +29,8 @@ class ClassTab(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # Load classes from JSON
-        self.classes = load_classes()
+        # Records of the validated catalog
+        self.classes = list((catalog or default_catalog()).records("classes"))
 
         # UI elements for class selection
         layout.addWidget(QLabel("Select Class:"))
@@ -38,30 +45,53 @@ class ClassTab(QWidget):
 
         # Populate class tree
         self.populate_classes()
-        # Connect signal for item selection
+        # Connect signals for item selection and lazy archetype population
         self.class_tree.itemClicked.connect(self.on_item_selected)
+        self.class_tree.itemExpanded.connect(self.populate_archetypes)
 
     def populate_classes(self):
         """
-        Populate the class tree with classes and their archetypes.
-        - Each class is a parent item.
-        - Each archetype is a child item under its class.
+        Populate the class tree with one top-level item per class.
+        - Items store the class ID (index into self.classes), not the class data.
+        - Archetype children are created on first expansion, see populate_archetypes.
         """
         self.class_tree.clear()
-        for cls in self.classes:
+        items = []
+        for class_id, cls in enumerate(self.classes):
             # Create parent item for class
             parent_item = QTreeWidgetItem([cls["name"]])
-            parent_item.setData(0, 1, cls) # Store class data
-            self.class_tree.addTopLevelItem(parent_item)
+            parent_item.setData(0, CLASS_ID_ROLE, class_id)
+            if cls.get("archetypes"):
+                # Show the expand arrow before any children exist
+                parent_item.setChildIndicatorPolicy(
+                    QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator
+                )
+            items.append(parent_item)
+        self.class_tree.addTopLevelItems(items)
 
-            # Add archetypes as child items
-            for arch in cls.get("archetypes", []):
-                child_item = QTreeWidgetItem([arch["name"]])
-                child_item.setData(0, 1, arch) # Store archetype data
-                parent_item.addChild(child_item)
+    def populate_archetypes(self, parent_item):
+        """
+        Create archetype child items for a class item the first time it is expanded.
+        - Does nothing for archetype items or classes that were already populated.
+        Args:
+            parent_item (QTreeWidgetItem): The class item being expanded.
+        """
+        if parent_item.parent() is not None or parent_item.childCount():
+            return
 
-        # Collapse all items initially
-        self.class_tree.collapseAll()
+        class_id = parent_item.data(0, CLASS_ID_ROLE)
+        archetypes = self.classes[class_id].get("archetypes", [])
+        children = []
+        for arch_id, arch in enumerate(archetypes):
+            child_item = QTreeWidgetItem([arch["name"]])
+            child_item.setData(0, CLASS_ID_ROLE, class_id)
+            child_item.setData(0, ARCHETYPE_ID_ROLE, arch_id)
+            children.append(child_item)
+        parent_item.addChildren(children)
+        # Drop the forced indicator once real children exist (or none do)
+        parent_item.setChildIndicatorPolicy(
+            QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless
+        )
 
     def on_item_selected(self, item, column):
         """
@@ -74,22 +104,32 @@ class ClassTab(QWidget):
             item (QTreeWidgetItem): The selected item.
             column (int): The column index (Always 0 in this single-column tree).
         """
-        parent = item.parent()
-        if parent is None:
+        cls = self.classes[item.data(0, CLASS_ID_ROLE)] # Resolve class data by ID
+        if item.parent() is None:
             # Selected item is a class
             self.class_tree.collapseAll()
             item.setExpanded(True)
-            cls = item.data(0, 1) # Get class data
             self.character.char_class = cls
             self.character.archetype = None
             self.description_box.setPlainText(cls.get("description", "No description available."))
         else:
             # Selected item is an archetype
-            arch = item.data(0, 1) # Get archetype data
-            base_cls = parent.data(0, 1) # Get parent class data
-            self.character.char_class = base_cls
+            arch = cls["archetypes"][item.data(0, ARCHETYPE_ID_ROLE)] # Resolve archetype data by ID
+            self.character.char_class = cls
             self.character.archetype = arch["name"]
             self.description_box.setPlainText(arch.get("description", "No description available."))
 
         # Emit signal indicating class/archetype change
-        self.class_changed.emit()
\ No newline at end of file
+        self.class_changed.emit()
+
+    def show_selection(self):
+        """
+        Show the character's class or archetype description without emitting class_changed.
+        """
+        cls = self.character.char_class
+        text = cls.get("description", "No description available.")
+        archetype = getattr(self.character, "archetype", None)
+        for arch in cls.get("archetypes", []):
+            if arch["name"] == archetype:
+                text = arch.get("description", "No description available.")
+        self.description_box.setPlainText(text)
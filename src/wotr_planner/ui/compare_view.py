@@ -0,0 +1,225 @@
+from PyQt6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QComboBox, QDialog, QHBoxLayout, QLabel, QListView,
+    QSplitter, QTableView, QVBoxLayout, QWidget
+)
+from wotr_planner.db.queries import BuildQuery
+from wotr_planner.models.build_matrix import GROUPS, BuildMatrix, BuildTables
+
+# Character ID stored on each saved build list item
+BUILD_ID_ROLE = Qt.ItemDataRole.UserRole
+# Saved builds read from the database each time the list needs more
+PAGE_SIZE = 200
+# Milliseconds the selection must stay unchanged before the comparison is rebuilt
+COMPARE_DELAY_MS = 150
+
+class SavedBuildsModel(QAbstractListModel):
+    """
+    List model of saved builds, read one page at a time as the view scrolls.
+    - Pages are keyset queries (id greater than the last one read), so each costs the same
+      however far down the list it is.
+    """
+    def __init__(self, conn, parent=None):
+        """
+        Initialize the SavedBuildsModel; no rows are read until the view asks for them.
+        Args:
+            conn (sqlite3.Connection): Connection to the build library.
+            parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.conn = conn
+        # Summary rows read so far, in id order
+        self.builds = []
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.builds)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        query = BuildQuery(self.conn).limit(PAGE_SIZE)
+        if self.builds:
+            query.after(self.builds[-1][0])
+        page = list(query.rows())
+        self.exhausted = len(page) < PAGE_SIZE
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.builds), len(self.builds) + len(page) - 1)
+            self.builds.extend(page)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        char_id, name, race, heritage, char_class, level = self.builds[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{name or f'#{char_id}'} ({race} {char_class} {level})"
+        if role == BUILD_ID_ROLE:
+            return char_id
+        return None
+
+class BuildComparisonModel(QAbstractTableModel):
+    """
+    Table model comparing derived attributes of many builds.
+    - One row per build, one column per derived attribute.
+    - A column group is computed for every build the first time one of its cells is shown
+      (see BuildMatrix.values), so hidden groups cost nothing.
+    - With a reference build set, cells show the difference from that build.
+    """
+    def __init__(self, matrix=None, parent=None):
+        """
+        Initialize the BuildComparisonModel.
+        Args:
+            matrix (BuildMatrix, optional): Builds to compare. Defaults to none.
+            parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.matrix = None
+        self.column_groups = []
+        self.reference = None
+        if matrix is not None:
+            self.set_matrix(matrix)
+
+    def set_matrix(self, matrix):
+        """
+        Replace the compared builds.
+        Args:
+            matrix (BuildMatrix | None): Builds to compare.
+        """
+        self.beginResetModel()
+        self.matrix = matrix
+        self.reference = None
+        # Column -> (group, index within group); labels need no computation
+        self.column_groups = [] if matrix is None else [
+            (group, i) for group in GROUPS for i in range(len(matrix.columns(group)))
+        ]
+        self.endResetModel()
+
+    def set_reference(self, row):
+        """
+        Show differences from one build, or absolute values.
+        Args:
+            row (int | None): Row of the reference build, or None for absolute values.
+        """
+        self.reference = row
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1)
+            )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if self.matrix is None or parent.isValid() else len(self.matrix)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.column_groups)
+
+    def value(self, row, column):
+        """
+        Get the absolute value of a cell.
+        Args:
+            row (int): Build row.
+            column (int): Attribute column.
+        Returns:
+            int: The derived value.
+        """
+        group, i = self.column_groups[column]
+        return int(self.matrix.values(group)[row, i])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.value(row, column)
+            if self.reference is None or row == self.reference:
+                return str(value)
+            return f"{value - self.value(self.reference, column):+d}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return str(self.value(row, column))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or self.matrix is None:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            group, i = self.column_groups[section]
+            return self.matrix.columns(group)[i]
+        return self.matrix.label(section)
+
+class CompareBuildsDialog(QDialog):
+    """
+    Dialog to pick saved builds and compare them side by side.
+    - The saved build list is paged in from the database as it scrolls.
+    - Selected builds are read in bulk from the repository into a BuildMatrix once the
+      selection has settled for COMPARE_DELAY_MS, not on every selection change.
+    """
+    def __init__(self, repository, parent=None):
+        """
+        Initialize the CompareBuildsDialog UI.
+        Args:
+            repository (CharacterRepository): Build library to compare from.
+            parent (QWidget, optional): Parent widget.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Compare Saved Builds")
+        self.resize(900, 500)
+        self.repository = repository
+        # Catalog tables are shared by every comparison made in this dialog
+        self.tables = BuildTables(repository.catalog)
+        layout = QHBoxLayout()
+        self.setLayout(layout)
+        splitter = QSplitter()
+        layout.addWidget(splitter)
+
+        # Saved builds to choose from
+        self.builds = SavedBuildsModel(repository.conn, self)
+        self.build_list = QListView()
+        self.build_list.setModel(self.builds)
+        self.build_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.compare_timer = QTimer(self)
+        self.compare_timer.setSingleShot(True)
+        self.compare_timer.setInterval(COMPARE_DELAY_MS)
+        self.compare_timer.timeout.connect(self.compare_selected)
+        # Restarting the timer on each change coalesces a burst of changes into one comparison
+        self.build_list.selectionModel().selectionChanged.connect(self.compare_timer.start)
+        self.builds.fetchMore() # First page; the view asks for the rest as it scrolls
+        splitter.addWidget(self.build_list)
+
+        # Comparison table and reference build selector
+        right = QWidget()
+        right_layout = QVBoxLayout()
+        right.setLayout(right_layout)
+        right_layout.addWidget(QLabel("Compare to:"))
+        self.reference_combo = QComboBox()
+        self.reference_combo.currentIndexChanged.connect(self.on_reference_changed)
+        right_layout.addWidget(self.reference_combo)
+        self.model = BuildComparisonModel()
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        right_layout.addWidget(self.table)
+        splitter.addWidget(right)
+
+    def compare_selected(self):
+        """
+        Rebuild the comparison from the selected builds.
+        """
+        ids = [index.data(BUILD_ID_ROLE) for index in self.build_list.selectionModel().selectedRows()]
+        self.model.set_matrix(BuildMatrix.from_repository(self.repository, sorted(ids), self.tables))
+        self.reference_combo.blockSignals(True)
+        self.reference_combo.clear()
+        self.reference_combo.addItem("(absolute values)")
+        self.reference_combo.addItems([self.model.matrix.label(i) for i in range(len(self.model.matrix))])
+        self.reference_combo.blockSignals(False)
+
+    def on_reference_changed(self, index):
+        """
+        Show differences from the chosen build.
+        Args:
+            index (int): Combo box index; 0 means absolute values.
+        """
+        self.model.set_reference(index - 1 if index > 0 else None)
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QListWidget, QPushButton, QTextEdit
 from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_feats
+from wotr_planner.models.catalog import default_catalog
 
 class FeatsTab(QWidget):
     """
@@ -10,11 +10,14 @@ class FeatsTab(QWidget):
     # Signal emitted when feats change
     feats_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         """
         Initialize the FeatsTab UI.
-        - Loads feats from JSON.
+        - Shows the feats of the validated game data catalog.
         - Sets up UI elements for feat selection and management.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         """
         # Initialize parent QWidget
         super().__init__()
@@ -22,8 +25,8 @@ class FeatsTab(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # Load feats from JSON
-        self.feats = load_feats()
+        # A copy: the derived graph holds this list and reloads update it in place
+        self.feats = list((catalog or default_catalog()).records("feats"))
 
         # UI elements for feat selection and management
         layout.addWidget(QLabel("Select Feat:"))
@@ -85,13 +88,16 @@ class FeatsTab(QWidget):
         else:
             self.description_box.clear()
 
-    def update_feats(self):
+    def update_feats(self, available=None):
         """
         Update the available feats in the combo box based on character state.
          - Considers level, stats, and already selected feats.
+        Args:
+            available (list, optional): Precomputed available feats. Computed if omitted.
         """
         self.feat_combo.clear()
-        available = self.character.available_feats(self.feats)
+        if available is None:
+            available = self.character.available_feats(self.feats)
         
         if available:
             # Populate combo box with available feats
@@ -117,10 +123,8 @@ class FeatsTab(QWidget):
             return
 
         # Check prerequisites
-        for prereq in chosen_feat.get("prerequisite_feats", []):
-            # Prerequisite feat not met
-            if prereq not in [f["name"] for f in self.character.feats]:
-                return
+        if not self.character.meets_feat_prerequisites(chosen_feat):
+            return
         
         # Check stat prerequisites
         for stat, value in chosen_feat.get("prerequisite_stats", {}).items():
@@ -133,7 +137,7 @@ class FeatsTab(QWidget):
             return
         
         # Add feat if not already selected
-        if chosen_feat["name"] not in [f["name"] for f in self.character.feats]:
+        if chosen_feat["name"] not in self.character.feats:
             self.character.feats.append(chosen_feat)
             # Update UI and emit change signal
             self.update_feats()
@@ -165,4 +169,4 @@ class FeatsTab(QWidget):
         """
         self.selected_list.clear()
         # Populate list with selected feats
-        self.selected_list.addItems([f["name"] for f in self.character.feats])
\ No newline at end of file
+        self.selected_list.addItems(self.character.feats.names())
\ No newline at end of file
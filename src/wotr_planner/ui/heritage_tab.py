@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QTextEdit
 from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_heritages
+from wotr_planner.models.catalog import default_catalog
 
 class HeritageTab(QWidget):
     """
@@ -10,11 +10,14 @@ class HeritageTab(QWidget):
     # Signal emitted when heritage changes
     heritage_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         """
         Initialize the HeritageTab UI.
-        - Loads heritages from JSON.
+        - Shows the heritages of the validated game data catalog.
         - Sets up UI elements for heritage selection.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         """
         # Initialize parent QWidget
         super().__init__()
@@ -22,8 +25,8 @@ class HeritageTab(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # Load heritages from JSON
-        self.heritages = load_heritages()
+        # Records of the validated catalog
+        self.heritages = list((catalog or default_catalog()).records("heritages"))
         # Filter heritages based on race
         self.filtered_heritages = []
 
@@ -72,13 +75,15 @@ class HeritageTab(QWidget):
         # Emit signal indicating heritage change
         self.heritage_changed.emit()
 
-    def refresh_heritage_options(self):
+    def refresh_heritage_options(self, emit=True):
         """
         Refresh the list of heritage options based on the character's race.
         - Filters heritages to match the selected race.
         - Updates the combo box with the filtered heritages.
         - Sets the character's heritage to the first available option.
         - Emits heritage_changed signal.
+        Args:
+            emit (bool, optional): Whether to emit heritage_changed. Defaults to True.
         """
         race_name = self.character.race["name"]
         self.filtered_heritages = [
@@ -96,7 +101,8 @@ class HeritageTab(QWidget):
             self.heritage_combo.setCurrentIndex(0)
             self.character.heritage = self.filtered_heritages[0]
             self.update_description(0)
-            self.heritage_changed.emit()
+            if emit:
+                self.heritage_changed.emit()
 
     def update_description(self, index):
         """
@@ -112,4 +118,21 @@ class HeritageTab(QWidget):
         heritage = self.filtered_heritages[index]
         desc = heritage.get("description", "No description available.")
         self.description_box.setPlainText(desc)
-        
\ No newline at end of file
+
+    def select_heritage(self, heritage):
+        """
+        Show a heritage of the current race as selected without emitting heritage_changed.
+        Args:
+            heritage (dict): Heritage to select; matched by name among filtered heritages.
+        """
+        idx = next(
+            (i for i, h in enumerate(self.filtered_heritages) if h["name"] == heritage.get("name")),
+            None
+        )
+        if idx is None:
+            return
+        self.heritage_combo.blockSignals(True)
+        self.heritage_combo.setCurrentIndex(idx)
+        self.heritage_combo.blockSignals(False)
+        self.character.heritage = self.filtered_heritages[idx]
+        self.update_description(idx)
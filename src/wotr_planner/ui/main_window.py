@@ -1,3 +1,6 @@
+import json
+import os
+from PyQt6.QtCore import QFileSystemWatcher, Qt
 from PyQt6.QtWidgets import QMainWindow, QTabWidget
 from wotr_planner.ui.classes_tab import ClassTab
 from wotr_planner.ui.races_tab import RaceTab
@@ -6,8 +9,27 @@ from wotr_planner.ui.skills_tab import SkillsTab
 from wotr_planner.ui.feats_tab import FeatsTab
 from wotr_planner.ui.background_tab import BackgroundTab
 from wotr_planner.ui.heritage_tab import HeritageTab
+from wotr_planner.db.autosave import AutosaveWorker, recover
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.models.catalog import Catalog
 from wotr_planner.models.character import Character
-from wotr_planner.models.json_loader import load_traits
+from wotr_planner.models.data_packs import DataPacks, default_pack_dirs
+from wotr_planner.models.data_schemas import DataValidationError
+from wotr_planner.models.derived_graph import build_character_graph
+from wotr_planner.models.progression import ClassLevels
+from wotr_planner.models.serialization import BuildValidationError, character_from_dict, character_to_dict
+
+# Handlers timed by the developer-mode profiler
+PROFILED_HANDLERS = (
+    "on_class_changed",
+    "on_race_changed",
+    "on_background_changed",
+    "on_heritage_changed",
+    "on_stats_changed",
+    "on_feats_changed",
+    "on_skills_changed",
+    "reload_data",
+)
 
 class MainWindow(QMainWindow):
     """
@@ -15,37 +37,73 @@ class MainWindow(QMainWindow):
     - Initializes character model and connects tab signals for updates.
     - Manages overall character data and interactions between tabs.
     """
-    def __init__(self):
+    def __init__(self, autosave=True, developer=None):
         """
         Initialize the MainWindow UI.
         - Sets up tabs for class, race, heritage, background, stats, skills, and feats.
         - Connects signals to handle updates across tabs.
+        - Restores the last autosaved character and autosaves every change.
+        - In developer mode, profiles every signal handler in a dockable panel.
+        Args:
+            autosave (bool, optional): Enable session restore and autosave. Defaults to True.
+            developer (bool, optional): Enable developer mode. Defaults to the WOTR_PLANNER_DEV
+                environment variable being set to a non-empty value other than 0.
         """
         # Initialize parent QMainWindow
         super().__init__()
         self.setWindowTitle("PFWotR Character Planner")
         self.resize(800, 600)
 
+        # Game data: bundled files overlaid with data packs
+        self.data_packs = DataPacks(default_pack_dirs())
+        try:
+            self.catalog = self.data_packs.catalog()
+        except (DataValidationError, json.JSONDecodeError) as exc:
+            # Fall back to the bundled data rather than refusing to start
+            self.statusBar().showMessage(f"Data packs not loaded: {exc}")
+            self.data_packs = DataPacks()
+            self.catalog = Catalog.load(validate=False)
+
         # Initialize character model
         self.character = Character()
 
-        self.trait_registry = {t["name"]: t for t in load_traits()}
+        self.trait_registry = self.catalog.trait_registry()
 
         # Set up tab widget
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
         # Initialize tabs
-        self.classes_tab = ClassTab(self.character)
-        self.races_tab = RaceTab(self.character)
-        self.heritage_tab = HeritageTab(self.character)
+        self.classes_tab = ClassTab(self.character, self.catalog)
+        self.races_tab = RaceTab(self.character, self.catalog)
+        self.heritage_tab = HeritageTab(self.character, self.catalog)
         self.heritage_tab.refresh_heritage_options()
-        self.background_tab = BackgroundTab(self.character)
+        self.background_tab = BackgroundTab(self.character, self.catalog)
         self.stats_tab = StatsTab(self.character)
-        self.skills_tab = SkillsTab(self.character)
-        self.feats_tab = FeatsTab(self.character)
+        self.skills_tab = SkillsTab(self.character, self.catalog)
+        self.feats_tab = FeatsTab(self.character, self.catalog)
+        if len(self.data_packs.layers) > 1:
+            # The default character's race and class come from the bundled files
+            for kind in self.catalog.data:
+                self.apply_data(kind)
 
-        self.character.recalculate_traits(self.trait_registry)
+        # Build derived-attribute graph and compute initial state
+        self.derived = build_character_graph(self.character, self.feats_tab.feats, self.trait_registry)
+        # UI refresh for each derived node, run when that node is recomputed
+        self.derived_views = {
+            "final_stats": self.stats_tab.refresh_stat_widgets,
+            "feat_availability": self.refresh_feat_views,
+            "skill_pool": self.refresh_skill_pool_views,
+            "effective_skills": self.skills_tab.refresh_effective_labels,
+        }
+        self.refresh_derived(*self.derived.inputs)
+
+        # Developer mode: wrap handlers before they are connected
+        if developer is None:
+            developer = os.environ.get("WOTR_PLANNER_DEV", "") not in ("", "0")
+        self.profiler = None
+        if developer:
+            self.enable_profiler()
 
         # Connect signals for inter-tab updates
         self.classes_tab.class_changed.connect(self.on_class_changed)
@@ -54,6 +112,7 @@ class MainWindow(QMainWindow):
         self.heritage_tab.heritage_changed.connect(self.on_heritage_changed)
         self.stats_tab.stats_changed.connect(self.on_stats_changed)
         self.feats_tab.feats_changed.connect(self.on_feats_changed)
+        self.skills_tab.skills_changed.connect(self.on_skills_changed)
 
         # Add tabs to the tab widget
         self.tabs.addTab(self.classes_tab, "Class")
@@ -64,88 +123,281 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.skills_tab, "Skills")
         self.tabs.addTab(self.feats_tab, "Feats")
 
+        # Reload data files as they are edited
+        self.data_watcher = QFileSystemWatcher(self)
+        self.data_watcher.addPaths(self.data_packs.watch_paths())
+        self.data_watcher.fileChanged.connect(self.reload_data)
+        self.data_watcher.directoryChanged.connect(self.reload_data)
+
+        # Library menu
+        library_menu = self.menuBar().addMenu("Library")
+        library_menu.addAction("Compare Saved Builds...", self.open_comparison)
+        if self.profiler:
+            developer_menu = self.menuBar().addMenu("Developer")
+            developer_menu.addAction(self.profiler_dock.toggleViewAction())
+
+        # Restore last session and autosave changes on a background thread
+        self.autosave = None
+        if autosave:
+            self.restore_autosave()
+            self.autosave = AutosaveWorker()
+            # Connected after the on_*_changed handlers so snapshots include derived updates
+            for signal in (
+                self.feats_tab.feats_changed,
+                self.stats_tab.stats_changed,
+                self.races_tab.race_changed,
+                self.classes_tab.class_changed,
+                self.heritage_tab.heritage_changed,
+                self.background_tab.background_changed,
+                self.skills_tab.skills_changed,
+            ):
+                signal.connect(self.queue_autosave)
+
+    def enable_profiler(self):
+        """
+        Profile the signal handlers and show the results in a dock.
+        - Must run before the handlers are connected, since connections hold the original methods.
+        """
+        # Imported on demand so normal sessions do not start tracemalloc
+        from wotr_planner.ui.profiler_dock import HandlerProfiler, ProfilerDock
+        self.profiler = HandlerProfiler(parent=self)
+        for name in PROFILED_HANDLERS:
+            setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+        self.profiler_dock = ProfilerDock(self.profiler, self)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.profiler_dock)
+
+    def queue_autosave(self):
+        """
+        Queue a snapshot of the character for the autosave worker.
+        - Only serializes the character; the write happens off the GUI thread.
+        """
+        if self.autosave:
+            self.autosave.submit(character_to_dict(self.character))
+
+    def restore_autosave(self):
+        """
+        Load the last autosaved character, if any.
+        - Snapshots that no longer match the game data are ignored.
+        Returns:
+            bool: True if a character was restored.
+        """
+        snapshot = recover()
+        if not snapshot:
+            return False
+        try:
+            character = character_from_dict(snapshot, self.catalog)
+        except BuildValidationError:
+            return False
+        self.apply_character(character)
+        return True
+
+    def apply_character(self, character):
+        """
+        Replace the edited character's choices and refresh every tab.
+        - The tabs share self.character, so its attributes are copied over in place.
+        Args:
+            character (Character): Character to show.
+        """
+        for attr in (
+            "name", "notes", "race", "heritage", "char_class", "class_levels", "archetype",
+            "background", "level", "point_buy_stats", "feats", "skill_ranks",
+        ):
+            setattr(self.character, attr, getattr(character, attr))
+        heritage = self.character.heritage
+
+        self.races_tab.select_race(self.character.race)
+        self.heritage_tab.refresh_heritage_options(emit=False)
+        if heritage:
+            self.heritage_tab.select_heritage(heritage)
+        if self.character.background:
+            self.background_tab.select_background(self.character.background)
+        self.classes_tab.show_selection()
+        self.skills_tab.apply_level_up(self.character.level)
+        self.refresh_derived(*self.derived.inputs)
+
+    def open_comparison(self):
+        """
+        Open the saved build comparison dialog.
+        - Imported on demand because the comparison needs the optional NumPy dependency.
+        """
+        from wotr_planner.ui.compare_view import CompareBuildsDialog
+        self.comparison = CompareBuildsDialog(CharacterRepository(catalog=self.catalog), self)
+        self.comparison.finished.connect(self.comparison.repository.close)
+        self.comparison.show()
+
+    def reload_data(self, path=None):
+        """
+        Reload edited data files and re-validate the character incrementally.
+        - Only changed files are re-read, only their kinds re-indexed, and only derived
+          attributes downstream of those kinds recomputed.
+        - Invalid edits are reported in the status bar and leave the current data in place.
+        Args:
+            path (str, optional): Path reported by the file watcher (unused; all changes are polled).
+        Returns:
+            list: Kinds that were reloaded.
+        """
+        try:
+            kinds = self.data_packs.reload(self.catalog)
+        except (DataValidationError, json.JSONDecodeError) as exc:
+            self.statusBar().showMessage(f"Data not reloaded: {exc}")
+            return []
+        # Atomic saves replace the file, which drops it from the watcher
+        missing = set(self.data_packs.watch_paths()) - set(self.data_watcher.files()) - set(self.data_watcher.directories())
+        if missing:
+            self.data_watcher.addPaths(sorted(missing))
+        changed = []
+        for kind in kinds:
+            changed.extend(i for i in self.apply_data(kind) if i not in changed)
+        if changed:
+            self.refresh_derived(*changed)
+        if kinds:
+            self.statusBar().showMessage(f"Reloaded {', '.join(kinds)}", 3000)
+        return kinds
+
+    def apply_data(self, kind):
+        """
+        Show the catalog's records of one kind in the tabs and re-resolve the character's choices.
+        - Records are matched by name; a removed race or class falls back to the first one.
+        Args:
+            kind (str): Data kind that changed.
+        Returns:
+            tuple: Derived graph inputs affected by the change (see CHARACTER_INPUTS).
+        """
+        catalog = self.catalog
+        records = catalog.records(kind)
+        character = self.character
+        if kind == "feats":
+            # The derived graph holds this list, so it is updated in place
+            self.feats_tab.feats[:] = records
+            character.feats = [
+                catalog.get("feats", f["name"]) for f in character.feats if catalog.get("feats", f["name"])
+            ]
+            return ("feats",)
+        if kind == "traits":
+            self.trait_registry.clear()
+            self.trait_registry.update(catalog.trait_registry())
+            return ("race", "heritage")
+        if kind in ("races", "heritages"):
+            heritage = character.heritage
+            if kind == "races":
+                character.race = catalog.get("races", character.race.get("name")) or records[0]
+                self.races_tab.set_races(records)
+            else:
+                self.heritage_tab.heritages = records
+            self.heritage_tab.refresh_heritage_options(emit=False)
+            if heritage:
+                self.heritage_tab.select_heritage(heritage)
+            return ("race", "heritage")
+        if kind == "classes":
+            character.char_class = catalog.get("classes", character.char_class.get("name")) or records[0]
+            if character.class_levels is not None:
+                character.class_levels = ClassLevels(
+                    catalog.get("classes", c.get("name")) or character.char_class
+                    for c in character.class_levels.classes
+                )
+            self.classes_tab.classes = records
+            self.classes_tab.populate_classes()
+            self.classes_tab.show_selection()
+            return ("char_class", "class_levels")
+        if kind == "backgrounds":
+            if character.background:
+                character.background = catalog.get("backgrounds", character.background["name"])
+            self.background_tab.set_backgrounds(records)
+            return ("background",)
+        if kind == "skills":
+            self.skills_tab.skills = records
+        return ()
+
+    def closeEvent(self, event):
+        """
+        Flush pending autosaves and stop profiling before the window closes.
+        Args:
+            event (QCloseEvent): The close event.
+        """
+        if self.autosave:
+            self.autosave.close()
+        if self.profiler:
+            self.profiler.close()
+        super().closeEvent(event)
+
+    def refresh_derived(self, *changed):
+        """
+        Recompute derived attributes downstream of the changed inputs and refresh their views.
+        - Each derived node and its view is updated at most once.
+        Args:
+            *changed (str): Names of changed character inputs (see CHARACTER_INPUTS).
+        Returns:
+            list: Names of recomputed derived nodes.
+        """
+        recomputed = self.derived.update(*changed)
+        for name in recomputed:
+            view = self.derived_views.get(name)
+            if view:
+                view()
+        return recomputed
+
+    def refresh_feat_views(self):
+        """
+        Refresh feat combo box and selected list from the feat_availability node.
+        """
+        self.feats_tab.update_feats(self.derived.value("feat_availability")["available"])
+        self.feats_tab.refresh_selected_feats()
+
+    def refresh_skill_pool_views(self):
+        """
+        Refresh skill spin boxes and remaining points from the skill_pool node.
+        """
+        self.skills_tab.refresh_skill_widgets()
+        self.skills_tab.update_skill_points()
+
     def on_race_changed(self):
         """
         Update character and UI when race changes.
-        - Applies race bonuses and updates related tabs.
-        - Recalculates skills based on new race.
-        - Updates skill points display.
+        - Resets heritage to the first option for the new race.
+        - Recomputes stats, traits, feats and skills downstream of race and heritage.
         """
-        self.character.stats = self.character.point_buy_stats.copy()
         self.character.heritage = None
-        self.stats_tab.apply_race_bonuses(self.character.race)
-        self.character.recalculate_traits(self.trait_registry)
-        self.heritage_tab.refresh_heritage_options()
-        self.character.validate_feats(self.feats_tab.feats)        
-        self.feats_tab.update_feats()
-        self.feats_tab.refresh_selected_feats()
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
+        self.heritage_tab.refresh_heritage_options(emit=False)
+        self.refresh_derived("race", "heritage")
 
     def on_class_changed(self):
         """
         Update character and UI when class changes.
-        - Validates feats and updates related tabs.
-        - Recalculates skills based on new class.
-        - Updates skill points display.
-        """
-        self.character.validate_feats(self.feats_tab.feats)
-        self.feats_tab.update_feats()
-        self.feats_tab.refresh_selected_feats()         
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
+        - Recomputes feat slots, feats and skills downstream of class.
+        """
+        self.refresh_derived("char_class")
 
     def on_feats_changed(self):
         """
         Update character and UI when feats change.
-        - Recalculates stats and skills based on selected feats.
-        - Updates skill points display.
+        - Recomputes stats and skills downstream of selected feats.
         """
-        self.stats_tab.recalculate_modifiers(self.character.feats)
-        self.character.recalculate_traits(self.trait_registry)
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
+        self.refresh_derived("feats")
 
     def on_background_changed(self):
         """
         Update character and UI when background changes.
-        - Recalculates skills based on new background.
-        - Updates skill points display.
+        - Recomputes effective skills.
         """
-        self.feats_tab.update_feats()
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
+        self.refresh_derived("background")
 
     def on_heritage_changed(self):
         """
         Update character and UI when heritage changes.
-        - Applies heritage modifiers and updates related tabs.
-        - Recalculates skills based on new heritage.
-        - Updates skill points display.
-        """
-        self.stats_tab.apply_heritage_modifiers(self.character.heritage)
-        self.character.validate_feats(self.feats_tab.feats)
-        self.character.recalculate_traits(self.trait_registry)
-        self.feats_tab.update_feats()
-        self.feats_tab.refresh_selected_feats()
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
+        - Recomputes stats, traits, feats and skills downstream of heritage.
+        """
+        self.refresh_derived("heritage")
 
     def on_stats_changed(self):
         """
         Update character and UI when stats change.
-        - Validates feats and updates related tabs.
-        - Recalculates skills based on new stats.
-        - Updates skill points display.
+        - Recomputes feats and skills downstream of point buy stats.
         """
-        self.character.validate_feats(self.feats_tab.feats)
-        self.feats_tab.update_feats()
-        self.feats_tab.refresh_selected_feats()
-        self.skills_tab.recalculate_effective_skills()
-        self.skills_tab.enforce_skill_point_limit()
-        self.skills_tab.update_skill_points()
\ No newline at end of file
+        self.refresh_derived("point_buy")
+
+    def on_skills_changed(self):
+        """
+        Update character and UI when skill ranks change.
+        - Recomputes the skill pool and effective skills.
+        """
+        self.refresh_derived("skill_ranks")
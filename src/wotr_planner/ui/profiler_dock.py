@@ -0,0 +1,251 @@
+"""
+Developer-mode profiler for MainWindow signal handlers.
+- Each wrapped handler call records wall time, CPU time, the net change in allocated
+  Python memory blocks (sys.getallocatedblocks; blocks freed during the call offset the
+  ones allocated, so this is not an allocation count), peak traced bytes (tracemalloc) and
+  widgets created and destroyed.
+- Widgets scheduled with deleteLater are flushed when the outermost handler call ends, so
+  they are attributed to the top-level handler that dropped them.
+- Records are kept in a rolling window, shown in a dockable table and exportable as CSV.
+"""
+import csv
+import functools
+import sys
+import time
+import tracemalloc
+from collections import deque
+from PyQt6 import sip
+from PyQt6.QtCore import QAbstractTableModel, QCoreApplication, QEvent, QModelIndex, QObject, QSortFilterProxyModel, Qt, pyqtSignal
+from PyQt6.QtWidgets import (
+    QApplication, QDockWidget, QFileDialog, QHBoxLayout, QPushButton, QTableView, QVBoxLayout, QWidget
+)
+
+# Column header -> record field
+COLUMNS = (
+    ("Handler", "handler"),
+    ("Depth", "depth"),
+    ("Wall ms", "wall_ms"),
+    ("CPU ms", "cpu_ms"),
+    ("Net blocks", "net_blocks"),
+    ("Peak KiB", "peak_kib"),
+    ("Widgets +", "widgets_created"),
+    ("Widgets -", "widgets_destroyed"),
+)
+
+def _widget_addresses():
+    """
+    Get the C++ addresses of all live widgets, which stay stable while a widget exists.
+    """
+    return {sip.unwrapinstance(w) for w in QApplication.allWidgets()}
+
+class HandlerProfiler(QObject):
+    """
+    Records the cost of every call to wrapped handlers.
+    - Nested calls (a handler whose signals trigger another handler) are recorded too;
+      depth tells them apart and the outer record includes the inner cost.
+    - Pending deletes are only flushed around the outermost call: flushing inside a nested
+      call would delete widgets the outer handler still expects to be alive.
+    """
+    # Emitted with each new record (dict of COLUMNS fields)
+    recorded = pyqtSignal(dict)
+
+    def __init__(self, max_records=500, parent=None):
+        """
+        Initialize the HandlerProfiler and start tracemalloc if it is not running.
+        Args:
+            max_records (int, optional): Size of the rolling window. Defaults to 500.
+            parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.records = deque(maxlen=max_records)
+        self.depth = 0
+        self.owns_tracing = not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start()
+
+    def close(self):
+        """
+        Stop tracemalloc if this profiler started it.
+        """
+        if self.owns_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.owns_tracing = False
+
+    def wrap(self, name, handler):
+        """
+        Wrap a handler so each call is recorded.
+        Args:
+            name (str): Name shown in the table.
+            handler (callable): Handler to wrap.
+        Returns:
+            callable: The recording wrapper.
+        """
+        @functools.wraps(handler)
+        def profiled(*args, **kwargs):
+            outermost = self.depth == 0
+            if outermost:
+                # Deletes pending from earlier work must not count against this call
+                QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+            before_widgets = _widget_addresses()
+            if outermost:
+                tracemalloc.reset_peak()
+            start_traced = tracemalloc.get_traced_memory()[0]
+            start_blocks = sys.getallocatedblocks()
+            start_cpu = time.thread_time()
+            start_wall = time.perf_counter()
+            self.depth += 1
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                if outermost:
+                    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+                wall = time.perf_counter() - start_wall
+                cpu = time.thread_time() - start_cpu
+                blocks = sys.getallocatedblocks() - start_blocks
+                peak = tracemalloc.get_traced_memory()[1] - start_traced
+                after_widgets = _widget_addresses()
+                self.add({
+                    "handler": name,
+                    "depth": self.depth,
+                    "wall_ms": wall * 1000,
+                    "cpu_ms": cpu * 1000,
+                    "net_blocks": blocks,
+                    "peak_kib": max(peak, 0) / 1024,
+                    "widgets_created": len(after_widgets - before_widgets),
+                    "widgets_destroyed": len(before_widgets - after_widgets),
+                })
+        return profiled
+
+    def add(self, record):
+        """
+        Store a record and announce it.
+        Args:
+            record (dict): Values for every COLUMNS field.
+        """
+        self.records.append(record)
+        self.recorded.emit(record)
+
+    def export_csv(self, path):
+        """
+        Write the current records to a CSV file.
+        Args:
+            path (str | Path): Output file.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([field for _, field in COLUMNS])
+            for record in self.records:
+                writer.writerow([record[field] for _, field in COLUMNS])
+
+class ProfileTableModel(QAbstractTableModel):
+    """
+    Table model over a profiler's rolling records, newest last.
+    """
+    def __init__(self, profiler, parent=None):
+        """
+        Initialize the ProfileTableModel.
+        Args:
+            profiler (HandlerProfiler): Source of records.
+            parent (QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.profiler = profiler
+        self.rows = list(profiler.records)
+        profiler.recorded.connect(self.append)
+
+    def append(self, record):
+        """
+        Add a record, dropping the oldest one once the window is full.
+        Args:
+            record (dict): New record.
+        """
+        if len(self.rows) >= self.profiler.records.maxlen:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            del self.rows[0]
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+        self.rows.append(record)
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        Drop every record.
+        """
+        self.beginResetModel()
+        self.profiler.records.clear()
+        self.rows = []
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self.rows[index.row()][COLUMNS[index.column()][1]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{value:.2f}" if isinstance(value, float) else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            # Raw value, used for sorting
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column():
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+class ProfilerDock(QDockWidget):
+    """
+    Dockable debug panel showing handler profiles.
+    - Columns sort by raw value, so the costliest interactions can be brought to the top.
+    """
+    def __init__(self, profiler, parent=None):
+        """
+        Initialize the ProfilerDock UI.
+        Args:
+            profiler (HandlerProfiler): Profiler to show.
+            parent (QWidget, optional): Parent widget.
+        """
+        super().__init__("Handler Profiler", parent)
+        self.setObjectName("handler_profiler")
+        self.profiler = profiler
+        self.model = ProfileTableModel(profiler, self)
+        proxy = QSortFilterProxyModel(self)
+        proxy.setSourceModel(self.model)
+        proxy.setSortRole(Qt.ItemDataRole.UserRole)
+
+        body = QWidget()
+        layout = QVBoxLayout()
+        body.setLayout(layout)
+        self.table = QTableView()
+        self.table.setModel(proxy)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table)
+        buttons = QHBoxLayout()
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.model.clear)
+        buttons.addWidget(self.clear_button)
+        self.export_button = QPushButton("Export CSV...")
+        self.export_button.clicked.connect(self.export)
+        buttons.addWidget(self.export_button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+        self.setWidget(body)
+
+    def export(self):
+        """
+        Ask for a file name and export the records as CSV.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Export Handler Profile", "handler_profile.csv", "CSV files (*.csv)")
+        if path:
+            self.profiler.export_csv(path)
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QTextEdit
 from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_races
+from wotr_planner.models.catalog import default_catalog
 
 class RaceTab(QWidget):
     """
@@ -10,11 +10,14 @@ class RaceTab(QWidget):
     # Signal emitted when race changes
     race_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         """
         Initialize the RaceTab UI.
-        - Loads races from JSON.
+        - Shows the races of the validated game data catalog.
         - Sets up UI elements for race selection.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         """
         # Initialize parent QWidget
         super().__init__()
@@ -22,8 +25,8 @@ class RaceTab(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # Load races from JSON
-        self.races = load_races()
+        # Records of the validated catalog
+        self.races = list((catalog or default_catalog()).records("races"))
 
         # UI elements for race selection
         layout.addWidget(QLabel("Select Race:"))
@@ -73,4 +76,31 @@ class RaceTab(QWidget):
         """
         race = self.races[index]
         desc = race.get("description", "No description available.")
-        self.description_box.setPlainText(desc)
\ No newline at end of file
+        self.description_box.setPlainText(desc)
+
+    def select_race(self, race):
+        """
+        Show a race as selected without emitting race_changed.
+        Args:
+            race (dict): Race to select; matched by name.
+        """
+        idx = next((i for i, r in enumerate(self.races) if r["name"] == race.get("name")), None)
+        if idx is None:
+            return
+        self.race_combo.blockSignals(True)
+        self.race_combo.setCurrentIndex(idx)
+        self.race_combo.blockSignals(False)
+        self.update_description(idx)
+
+    def set_races(self, races):
+        """
+        Replace the race list, keeping the character's race selected, without emitting race_changed.
+        Args:
+            races (list): New race records.
+        """
+        self.races = races
+        self.race_combo.blockSignals(True)
+        self.race_combo.clear()
+        self.race_combo.addItems([race["name"] for race in self.races])
+        self.race_combo.blockSignals(False)
+        self.select_race(self.character.race)
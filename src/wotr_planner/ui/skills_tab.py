@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSpinBox, QGroupBox, QGridLayout
 from PyQt6.QtCore import pyqtSignal
-from wotr_planner.models.json_loader import load_skills
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.skill_allocation import reduce_overflow, skill_point_budget, solve_skill_ranks
 
 class SkillsTab(QWidget):
     """
@@ -10,11 +11,14 @@ class SkillsTab(QWidget):
     # Signal emitted when skills change
     skills_changed = pyqtSignal()
 
-    def __init__(self, character):
+    def __init__(self, character, catalog=None):
         '''
         Initialize the SkillsTab UI.
-        - Loads skills from JSON.
+        - Shows the skills of the validated game data catalog.
         - Sets up UI elements for skill selection.
+        Args:
+            character (Character): Character being edited.
+            catalog (Catalog, optional): Game data. Defaults to the bundled data.
         '''
         # Initialize parent QWidget
         super().__init__()
@@ -27,7 +31,7 @@ class SkillsTab(QWidget):
         layout.addWidget(self.points_label)
         # Update skill points display
         self.update_skill_points()
-        self.skills = load_skills()
+        self.skills = list((catalog or default_catalog()).records("skills"))
 
         # Skills group box and layout
         skills_group = QGroupBox("Skills")
@@ -133,31 +137,20 @@ class SkillsTab(QWidget):
             int: Remaining skill points.
         """
         # Calculate remaining skill points
-        return self.character.level * self.character.skill_points_per_level() - sum(self.character.skill_ranks.values())
+        return skill_point_budget(self.character) - sum(self.character.skill_ranks.values())
 
     def recalculate_effective_skills(self):
         """
         Recalculate effective skill values based on ranks, feats, and background.
         - Updates the character's effective skills and UI labels accordingly.
         """
-        # Reset effective skills to current ranks
-        self.character.skills = self.character.skill_ranks.copy()
-        # Apply feat modifiers
-        for feat in self.character.feats:
-            for skill, bonus in feat.get("skill_modifiers", {}).items():
-                # Update effective skill value
-                self.character.skills[skill] = self.character.skills.get(skill, 0) + bonus
-
-        # Apply background skill modifiers
-        if self.character.background:
-            for skill, bonus in self.character.background.get("skill_modifiers", {}).items():
-                # Update effective skill value
-                self.character.skills[skill] = self.character.skills.get(skill, 0) + bonus
-
-        for skill_name, bonus in self.character.trait_bonuses["skills"].items():
-            self.character.skills[skill_name] = self.character.skills.get(skill_name, 0) + bonus
+        self.character.recalculate_skills()
+        self.refresh_effective_labels()
 
-        # Update UI labels for effective skills
+    def refresh_effective_labels(self):
+        """
+        Update the effective skill labels from the character's effective skills.
+        """
         for skill, label in self.effective_labels.items():
             label.setText(str(self.character.skills.get(skill, 0)))
 
@@ -179,29 +172,45 @@ class SkillsTab(QWidget):
         """
         Enforce skill point allocation limit based on character level.
          - Reduces skill ranks if they exceed available skill points.
+         - The excess is removed in closed form, lowest priority skills first.
         """
         # Calculate allowed and spent skill points
-        allowed = self.character.level * self.character.skill_points_per_level()
+        allowed = skill_point_budget(self.character)
         spent = sum(self.character.skill_ranks.values())
         # No adjustment needed if within limit
         if spent <= allowed:
             return
         
         # Reduce skill ranks starting from lowest priority skills
-        skills_sorted = list(reversed(self.skill_widgets.keys()))
+        self.character.skill_ranks = reduce_overflow(
+            self.character.skill_ranks, list(self.skill_widgets), allowed
+        )
 
-        # Iterate through skills and reduce ranks as needed
-        for skill in skills_sorted:
-            while spent > allowed and self.character.skill_ranks[skill] > 0:
-                self.character.skill_ranks[skill] -= 1
-                spent -= 1
+        # Update UI, recalculate effective skills and update skill points
+        self.refresh_skill_widgets()
+        self.recalculate_effective_skills()
+        self.update_skill_points()
+
+    def apply_skill_priorities(self, priorities):
+        """
+        Redistribute skill ranks according to a priority list.
+         - Fills skills in order up to the per-level cap until the pool is spent.
+         - Emits skills_changed signal.
+        Args:
+            priorities (list): Skill names from highest to lowest priority.
+        """
+        solve_skill_ranks(self.character, priorities)
+        self.refresh_skill_widgets()
+        self.recalculate_effective_skills()
+        self.update_skill_points()
+        self.skills_changed.emit()
 
-        # Update UI spin boxes to reflect adjusted skill ranks
+    def refresh_skill_widgets(self):
+        """
+        Update skill spin boxes to reflect the character's skill ranks.
+         - Signals are blocked so no per-box update runs.
+        """
         for skill, spin in self.skill_widgets.items():
             spin.blockSignals(True)
-            spin.setValue(self.character.skill_ranks[skill])
+            spin.setValue(self.character.skill_ranks.get(skill, 0))
             spin.blockSignals(False)
-
-        # Recalculate effective skills and update skill points
-        self.recalculate_effective_skills()
-        self.update_skill_points()
\ No newline at end of file
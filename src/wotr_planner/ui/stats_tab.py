@@ -1,5 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QSpinBox, QGroupBox, QGridLayout
 from PyQt6.QtCore import pyqtSignal
+from wotr_planner.models.point_buy import MAX_SCORE, MIN_SCORE, POINT_BUY_BUDGET, point_cost, points_spent
 
 class StatsTab(QWidget):
     """
@@ -51,7 +52,7 @@ class StatsTab(QWidget):
             spin = QSpinBox()
             # Set spin box range and initial value considering racial modifiers
             racial_mod = self.character.race.get("modifiers", {}).get(stat, 0) if self.character.race  else 0
-            spin.setRange(7 + racial_mod, 18 + racial_mod)
+            spin.setRange(MIN_SCORE + racial_mod, MAX_SCORE + racial_mod)
             spin.setValue(self.character.point_buy_stats[stat] + racial_mod)
             # Connect signal for stat value change
             spin.valueChanged.connect(lambda value, s=stat: self.update_stat(s, value))
@@ -68,7 +69,7 @@ class StatsTab(QWidget):
         """
         Update character ability score based on selection.
         - Sets the character's ability score to the selected one.
-        - Ensures total points spent do not exceed 25.
+        - Ensures total points spent do not exceed the point buy budget.
         - Emits a signal indicating the stats have changed.
         Args:
             stat_name (str): Name of the ability score being updated.
@@ -92,8 +93,8 @@ class StatsTab(QWidget):
         # Update character's point buy stats
         self.character.point_buy_stats[stat_name] = base_value
 
-        # Check if total points spent exceed 25
-        if self.total_points_spent() > 25:
+        # Check if total points spent exceed the budget
+        if self.total_points_spent() > POINT_BUY_BUDGET:
             # Revert to old value if exceeded
             self.character.point_buy_stats[stat_name] = old_value
             # Revert spin box to old value with racial modifiers
@@ -115,50 +116,22 @@ class StatsTab(QWidget):
         Returns:
             int: Point cost associated with the ability score value.
         """
-        # Costs for scores below 10
-        if value < 10:
-            if value == 9:
-                return -1
-            elif value == 8:
-                return -2
-            elif value == 7:
-                return -4
-
-        # Costs for scores 11 and above
-        if value == 11:
-            return 1
-        elif value == 12:
-            return 2
-        elif value == 13:
-            return 3
-        elif value == 14:
-            return 5
-        elif value == 15:
-            return 7
-        elif value == 16:
-            return 10
-        elif value == 17:
-            return 13
-        elif value == 18:
-            return 17
-
-        # Default cost
-        return 0
-    
+        return point_cost(value)
+
     def total_points_spent(self) -> int:
         """
         Calculate the total points spent on ability scores.
         Returns:
             int: Total points spent.
         """
-        return sum(self.point_cost(val) for val in self.character.point_buy_stats.values())
+        return points_spent(self.character.point_buy_stats)
     
     def update_points_label(self):
         """
         Update the points label to show remaining points.
         """
         spent = self.total_points_spent()
-        remaining = 25 - spent
+        remaining = POINT_BUY_BUDGET - spent
         self.points_label.setText(f"Points {remaining}")
 
     def apply_race_bonuses(self, race):
@@ -180,10 +153,30 @@ class StatsTab(QWidget):
         self.character.heritage = heritage
         self.recalculate_modifiers(self.character.feats)
 
+    def refresh_stat_widgets(self):
+        """
+        Update spin boxes and the points label from the character's point buy stats.
+        - Spin box ranges and values include the racial/heritage modifier.
+        - Does not emit stats_changed.
+        """
+        racial_mods = self.character.racial_modifiers()
+        for stat, spin in self.stat_widgets.items():
+            racial_mod = racial_mods.get(stat, 0)
+            # Update spin box value
+            spin.blockSignals(True)
+            # Set the range and value of the spin box based on racial modifiers
+            spin.setRange(MIN_SCORE + racial_mod, MAX_SCORE + racial_mod)
+            # Set value to current stat plus racial modifier
+            spin.setValue(self.character.point_buy_stats[stat] + racial_mod)
+            spin.blockSignals(False)
+        self.update_points_label()
+
     def recalculate_modifiers(self, feats):
         """
         Recalculate ability score modifiers based on racial/heritage and feat modifiers.
-        - Updates the character's stats and UI elements accordingly.
+        - Updates the character's stats and UI elements accordingly, unless stats_changed
+          is connected: the receiver (MainWindow's derived graph) then recomputes the
+          stats and refreshes the widgets, so they are not computed twice.
         - Emits stats_changed signal.
         - Prevents recursive updates using a flag.
         Args:
@@ -195,48 +188,12 @@ class StatsTab(QWidget):
         
         self._updating_stats = True
         try:
-            # Reset stats to point buy values
-            self.character.stats = self.character.point_buy_stats.copy()
-
-            # Apply racial/heritage modifiers
-            if self.character.heritage and self.character.heritage.get("modifiers"):
-                mods_source = self.character.heritage["modifiers"]
-            elif self.character.race and self.character.race.get("modifiers"):
-                mods_source = self.character.race["modifiers"]
-            else:
-                mods_source = {} # No modifiers
-            
-            for stat, bonus in mods_source.items():
-                if stat in self.character.stats:
-                    self.character.stats[stat] += bonus
-
-            # Apply feat modifiers
-            for feat in feats:
-                for stat, bonus in feat.get("modifiers", {}).items():
-                    if stat in self.character.stats:
-                        self.character.stats[stat] += bonus
-
-            print("final stats:", self.character.stats)
-            # Update UI elements to reflect new stats
-            for stat, spin in self.stat_widgets.items():
-                # Determine racial/heritage modifier
-                if self.character.heritage and self.character.heritage.get("modifiers"):
-                    racial_mod = self.character.heritage["modifiers"].get(stat, 0)
-                elif self.character.race and self.character.race.get("modifiers"):
-                    racial_mod = self.character.race["modifiers"].get(stat, 0)
-                else:
-                    racial_mod = 0 # No modifier
-
-                # Update spin box value
-                spin.blockSignals(True)
-                # Set the range and value of the spin box based on racial modifiers
-                spin.setRange(7 + racial_mod, 18 + racial_mod)
-                # Set value to current stat plus racial modifier
-                spin.setValue(self.character.point_buy_stats[stat] + racial_mod)
-                spin.blockSignals(False)
-
-            # Update points label and emit stats changed signal
-            self.update_points_label()
+            if not self.receivers(self.stats_changed):
+                # Recalculate final stats and update UI elements
+                self.character.recalculate_stats(feats)
+                self.refresh_stat_widgets()
+
+            # Emit stats changed signal
             self.stats_changed.emit()
 
         # Ensure flag is reset after update
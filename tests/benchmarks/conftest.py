@@ -0,0 +1,163 @@
+"""
+Benchmark regression checks on top of pytest-benchmark.
+- Run with: pytest tests/benchmarks --no-cov
+- Each benchmark's minimum round time is divided by the time of a fixed calibration workload
+  measured just before and after it, and that ratio is compared with baselines.json; a
+  benchmark whose ratio grew by more than --regression-threshold percent fails. Dividing by
+  the calibration cancels out how fast the machine happens to be running at the time.
+- Rounds are batched to at least MIN_ROUND_TIME (see test_hot_paths.py), so timer
+  resolution does not dominate sub-microsecond benchmarks.
+- Baselines only apply on the kind of machine (platform, architecture and Python minor
+  version) that recorded them. Record them with --update-baselines, then run a few more
+  sessions with --widen-baselines: ratios still vary by up to about 1.5x between
+  processes, so each baseline keeps the largest ratio seen and the threshold is measured
+  from the top of that spread.
+- Benchmarks without an applicable baseline still run, and are listed at the end of the
+  session as not checked; with --require-baselines (for CI) they fail instead.
+- pytest-benchmark's own --benchmark-compare-fail compares raw times, which vary too much
+  between runs on a shared machine to gate on; these ratios are what make the check usable.
+- Benchmarks are kept out of the default test paths; without pytest-benchmark they are skipped.
+"""
+import json
+import os
+import platform
+import timeit
+from pathlib import Path
+import pytest
+
+# Benchmarks must not open windows; set before pytest-qt creates the QApplication
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BASELINE_FILE = Path(__file__).with_name("baselines.json")
+# Allowed slowdown in percent, overridable with WOTR_BENCHMARK_THRESHOLD
+DEFAULT_THRESHOLD = 25.0
+def machine_id():
+    """
+    Describe the machine and interpreter that baselines are valid for.
+    """
+    major, minor, _ = platform.python_version_tuple()
+    return f"{platform.system()}-{platform.machine()}-{platform.python_implementation()}-{major}.{minor}"
+
+def _calibration_workload():
+    """
+    Fixed mix of the dict, string and arithmetic work the hot paths do.
+    """
+    table = {f"Feat {i}": i for i in range(200)}
+    total = 0
+    for name, value in table.items():
+        if value % 3 and name in table:
+            total += len(name) * value
+    return total
+
+def calibration_time():
+    """
+    Measure the calibration workload.
+    Returns:
+        float: Minimum seconds per call over many repeats.
+    """
+    return min(timeit.repeat(_calibration_workload, number=20, repeat=50)) / 20
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark regressions")
+    group.addoption("--baseline-file", type=Path, default=BASELINE_FILE,
+                    help="JSON file holding benchmark baselines")
+    group.addoption("--regression-threshold", type=float,
+                    default=float(os.environ.get("WOTR_BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD)),
+                    help="percent slowdown over the baseline that fails a benchmark")
+    group.addoption("--update-baselines", action="store_true",
+                    help="write this run's results to the baseline file instead of comparing")
+    group.addoption("--widen-baselines", action="store_true",
+                    help="like --update-baselines, but keep the larger of each stored and new result")
+    group.addoption("--require-baselines", action="store_true",
+                    help="fail benchmarks that have no baseline for this machine instead of listing them")
+
+def pytest_configure(config):
+    path = config.getoption("baseline_file", BASELINE_FILE)
+    config.benchmark_baselines = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    config.benchmark_results = {}
+    # Node IDs of benchmarks that ran without an applicable baseline
+    config.benchmark_unchecked = []
+
+def pytest_collection_modifyitems(config, items):
+    try:
+        import pytest_benchmark # noqa: F401
+    except ImportError:
+        skip = pytest.mark.skip(reason="pytest-benchmark is not installed")
+        for item in items:
+            item.add_marker(skip)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    if "benchmark" not in getattr(item, "fixturenames", ()):
+        yield
+        return
+    before = calibration_time()
+    yield
+    item.benchmark_calibration = (before + calibration_time()) / 2
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    fixture = getattr(item, "funcargs", {}).get("benchmark")
+    if call.when != "call" or not report.passed or fixture is None or fixture.stats is None:
+        return
+    config = item.config
+    ratio = fixture.stats.stats.min / item.benchmark_calibration
+    config.benchmark_results[item.nodeid] = ratio
+    baselines = config.benchmark_baselines
+    if _updating(config):
+        return
+    baseline = baselines.get("benchmarks", {}).get(item.nodeid)
+    if baseline is None or baselines.get("machine") != machine_id():
+        if config.getoption("require_baselines", False):
+            report.outcome = "failed"
+            report.longrepr = f"{item.nodeid} has no baseline for {machine_id()}; record one with --update-baselines"
+        else:
+            config.benchmark_unchecked.append(item.nodeid)
+        return
+    threshold = config.getoption("regression_threshold", DEFAULT_THRESHOLD)
+    slowdown = (ratio / baseline - 1) * 100
+    if slowdown > threshold:
+        report.outcome = "failed"
+        report.longrepr = (
+            f"{item.nodeid} regressed: {ratio:.3f} x calibration vs baseline {baseline:.3f} "
+            f"({slowdown:+.0f}%, threshold {threshold:g}%)"
+        )
+
+def pytest_report_header(config):
+    baselines = config.benchmark_baselines
+    if baselines and baselines.get("machine") != machine_id():
+        return f"benchmark baselines were recorded on {baselines.get('machine')}, not {machine_id()}; regression checks skipped"
+
+@pytest.hookimpl(trylast=True) # After pytest-benchmark's table, so it is not scrolled away
+def pytest_terminal_summary(terminalreporter, config):
+    unchecked = getattr(config, "benchmark_unchecked", [])
+    if unchecked:
+        terminalreporter.write_sep("=", f"{len(unchecked)} benchmark(s) not checked for regressions", yellow=True)
+        terminalreporter.write_line(
+            f"No baseline for {machine_id()}; record one with --update-baselines, "
+            "or pass --require-baselines to fail instead."
+        )
+        for nodeid in unchecked:
+            terminalreporter.write_line(f"  {nodeid}")
+
+def _updating(config):
+    return config.getoption("update_baselines", False) or config.getoption("widen_baselines", False)
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not _updating(config) or not config.benchmark_results:
+        return
+    baselines = config.benchmark_baselines
+    if baselines.get("machine") != machine_id():
+        # Ratios from another machine cannot be mixed with this one's
+        baselines["benchmarks"] = {}
+    baselines["machine"] = machine_id()
+    stored = baselines.get("benchmarks", {})
+    results = config.benchmark_results
+    if config.getoption("widen_baselines", False):
+        results = {nodeid: max(ratio, stored.get(nodeid, 0)) for nodeid, ratio in results.items()}
+    baselines["benchmarks"] = dict(sorted({**stored, **results}.items()))
+    path = config.getoption("baseline_file", BASELINE_FILE)
+    path.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
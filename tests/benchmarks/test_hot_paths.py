@@ -0,0 +1,144 @@
+import pytest
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.ui.main_window import MainWindow
+from wotr_planner.ui.skills_tab import SkillsTab
+from wotr_planner.ui.stats_tab import StatsTab
+
+# Synthetic catalog size used to magnify per-feat costs
+LARGE_FEAT_COUNT = 2000
+# Shortest benchmark round in seconds; faster calls are repeated within a round
+MIN_ROUND_TIME = 0.0002
+
+# Batch fast calls into rounds of at least MIN_ROUND_TIME, with enough rounds for a stable minimum
+pytestmark = pytest.mark.benchmark(min_time=MIN_ROUND_TIME, min_rounds=50, max_time=0.5, warmup=True)
+
+def large_feats():
+    """
+    Build a feat list with prerequisite chains, as in a large modded pack.
+    """
+    feats = []
+    for i in range(LARGE_FEAT_COUNT):
+        feats.append({
+            "name": f"Feat {i}",
+            "prerequisite_level": 1 + i % 10,
+            "prerequisite_stats": {"Str": 10 + i % 5},
+            "prerequisite_feats": [f"Feat {i - 1}"] if i % 4 else [],
+        })
+    return feats
+
+@pytest.fixture
+def character():
+    """
+    Fixture to create a level 10 Aasimar Fighter with a heritage and every bundled feat it qualifies for.
+    """
+    catalog = default_catalog()
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Aasimar"))
+    character.heritage = next(h for h in catalog.records("heritages") if h["race"] == "Aasimar")
+    character.level = 10
+    character.point_buy_stats.update(Str=16, Dex=14)
+    character.recalculate_stats()
+    character.feats = character.available_feats(catalog.records("feats"))
+    return character
+
+@pytest.fixture
+def window(qtbot, monkeypatch):
+    """
+    Fixture to create a MainWindow over the bundled data, without autosave.
+    Args:
+        qtbot: pytest-qt fixture for handling Qt widgets.
+        monkeypatch: pytest fixture to hide installed data packs.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    window = MainWindow(autosave=False)
+    qtbot.addWidget(window)
+    return window
+
+def test_character_init(benchmark):
+    """
+    Benchmark creating a character with explicit race and class.
+    """
+    catalog = default_catalog()
+    race, char_class = catalog.get("races", "Elf"), catalog.get("classes", "Fighter")
+    benchmark(Character, char_class=char_class, race=race)
+
+def test_character_init_defaults(benchmark):
+    """
+    Benchmark creating a character with the default race and class.
+    """
+    benchmark(Character)
+
+def test_available_feats(benchmark, character):
+    """
+    Benchmark listing selectable feats from the bundled data.
+    """
+    benchmark(character.available_feats, default_catalog().records("feats"))
+
+def test_available_feats_large(benchmark, character):
+    """
+    Benchmark listing selectable feats from a large feat list.
+    """
+    benchmark(character.available_feats, large_feats())
+
+def test_validate_feats(benchmark, character):
+    """
+    Benchmark validating feats that all meet their prerequisites.
+    """
+    all_feats = default_catalog().records("feats")
+    removed = benchmark(character.validate_feats, all_feats)
+    assert removed == set()
+
+def test_validate_feats_large(benchmark, character):
+    """
+    Benchmark validating a long prerequisite chain from a large feat list.
+    """
+    all_feats = large_feats()
+    character.level = 20
+    character.point_buy_stats["Str"] = 18
+    character.recalculate_stats()
+    character.feats = all_feats[:24]
+    character.char_class = dict(character.char_class, bonus_feat_interval=1)
+    removed = benchmark(character.validate_feats, all_feats)
+    assert removed == set()
+
+def test_recalculate_traits(benchmark, character):
+    """
+    Benchmark collecting race and heritage trait bonuses.
+    """
+    benchmark(character.recalculate_traits, default_catalog().trait_registry())
+
+def test_total_feat_slots(benchmark, character):
+    """
+    Benchmark counting feat slots.
+    """
+    benchmark(character.total_feat_slots)
+
+def test_stats_tab_recalculate_modifiers(benchmark, qtbot, character):
+    """
+    Benchmark recalculating stats and refreshing the stats tab.
+    """
+    tab = StatsTab(character)
+    qtbot.addWidget(tab)
+    benchmark(tab.recalculate_modifiers, character.feats)
+
+def test_skills_tab_recalculate_effective_skills(benchmark, qtbot, character):
+    """
+    Benchmark recalculating effective skills and refreshing the skills tab.
+    """
+    tab = SkillsTab(character)
+    qtbot.addWidget(tab)
+    benchmark(tab.recalculate_effective_skills)
+
+@pytest.mark.parametrize("handler", [
+    "on_race_changed",
+    "on_class_changed",
+    "on_feats_changed",
+    "on_background_changed",
+    "on_heritage_changed",
+    "on_stats_changed",
+])
+def test_main_window_handlers(benchmark, window, handler):
+    """
+    Benchmark each MainWindow change handler with Qt offscreen.
+    """
+    benchmark(getattr(window, handler))
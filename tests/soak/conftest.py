@@ -0,0 +1,9 @@
+"""
+Soak tests: long randomized MainWindow sessions checked for leaks (see harness.py).
+- Run with: pytest tests/soak --no-cov
+- Kept out of the default test paths; WOTR_SOAK_ITERATIONS sets the session length.
+"""
+import os
+
+# Soak sessions must not open windows; set before pytest-qt creates the QApplication
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
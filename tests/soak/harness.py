@@ -0,0 +1,255 @@
+"""
+Memory-leak soak harness for long MainWindow sessions.
+- Drives a MainWindow offscreen through a seeded, randomized sequence of user interactions
+  (race, heritage, class, background, ability score, skill and feat changes).
+- Every sample_every iterations it flushes deferred deletes, collects garbage, then records
+  traced Python memory and live Qt object counts.
+- After a warmup, a least-squares slope over the samples tells whether memory keeps growing.
+- Run directly for a long session: python tests/soak/harness.py --iterations 20000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+def _pick_combo(combo, rng):
+    if combo.count():
+        combo.setCurrentIndex(rng.randrange(combo.count()))
+
+def change_race(window, rng):
+    _pick_combo(window.races_tab.race_combo, rng)
+
+def change_heritage(window, rng):
+    _pick_combo(window.heritage_tab.heritage_combo, rng)
+
+def change_background(window, rng):
+    _pick_combo(window.background_tab.background_combo, rng)
+
+def change_class(window, rng):
+    tree = window.classes_tab.class_tree
+    item = tree.topLevelItem(rng.randrange(tree.topLevelItemCount()))
+    # Expanding creates archetype items; pick one half of the time
+    item.setExpanded(True)
+    if item.childCount() and rng.random() < 0.5:
+        item = item.child(rng.randrange(item.childCount()))
+    tree.itemClicked.emit(item, 0)
+
+def change_stat(window, rng):
+    spin = rng.choice(list(window.stats_tab.stat_widgets.values()))
+    spin.setValue(rng.randint(spin.minimum(), spin.maximum()))
+
+def change_skill(window, rng):
+    spin = rng.choice(list(window.skills_tab.skill_widgets.values()))
+    spin.setValue(rng.randint(spin.minimum(), min(spin.maximum(), spin.minimum() + 5)))
+
+def add_feat(window, rng):
+    tab = window.feats_tab
+    _pick_combo(tab.feat_combo, rng)
+    tab.add_button.click()
+
+def remove_feat(window, rng):
+    tab = window.feats_tab
+    if tab.selected_list.count():
+        tab.selected_list.setCurrentRow(rng.randrange(tab.selected_list.count()))
+        tab.remove_button.click()
+
+# Interaction name -> (function(window, rng), relative weight)
+ACTIONS = {
+    "race": (change_race, 3),
+    "heritage": (change_heritage, 3),
+    "class": (change_class, 3),
+    "background": (change_background, 1),
+    "stat": (change_stat, 2),
+    "skill": (change_skill, 2),
+    "add_feat": (add_feat, 1),
+    "remove_feat": (remove_feat, 1),
+}
+
+def qt_object_counts(window):
+    """
+    Count live Qt objects.
+    Returns:
+        tuple: (QApplication widgets, QObject descendants of the window).
+    """
+    return len(QApplication.allWidgets()), len(window.findChildren(QObject))
+
+def settle():
+    """
+    Run pending deferred deletes and collect garbage so samples only hold retained memory.
+    """
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    QCoreApplication.processEvents()
+    gc.collect()
+
+def slope(points):
+    """
+    Least-squares slope of (x, y) points.
+    Returns:
+        float: Change in y per unit of x, or 0.0 for fewer than two points.
+    """
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x if var_x else 0.0
+
+class SoakReport:
+    """
+    Samples of a soak run and the verdict on retained growth.
+    """
+    def __init__(self, iterations, warmup, samples, action_counts, top_sites):
+        """
+        Initialize a SoakReport.
+        Args:
+            iterations (int): Interactions performed.
+            warmup (int): Iterations excluded from the growth check.
+            samples (list): (iteration, traced bytes, app widgets, window QObjects) tuples.
+            action_counts (dict): Interaction name -> times performed.
+            top_sites (list): tracemalloc.StatisticDiff entries since the end of warmup, largest first.
+        """
+        self.iterations = iterations
+        self.warmup = warmup
+        self.samples = samples
+        self.action_counts = action_counts
+        self.top_sites = top_sites
+
+    def measured(self):
+        """
+        Get the samples taken after warmup.
+        """
+        return [s for s in self.samples if s[0] >= self.warmup]
+
+    def memory_slope(self):
+        """
+        Get retained Python memory growth after warmup, in bytes per iteration.
+        """
+        return slope([(s[0], s[1]) for s in self.measured()])
+
+    def object_growth(self):
+        """
+        Get live Qt object growth between the first and last samples after warmup.
+        Returns:
+            tuple: (app widgets, window QObjects) added.
+        """
+        measured = self.measured()
+        if len(measured) < 2:
+            return 0, 0
+        return measured[-1][2] - measured[0][2], measured[-1][3] - measured[0][3]
+
+    def leaks(self, max_bytes_per_iteration=16.0):
+        """
+        Describe signs of a leak.
+        Args:
+            max_bytes_per_iteration (float, optional): Allowed memory slope. Defaults to 16.
+        Returns:
+            list: Problem descriptions; empty if memory and Qt objects stay flat.
+        """
+        problems = []
+        rate = self.memory_slope()
+        if rate > max_bytes_per_iteration:
+            problems.append(f"retained memory grows {rate:.1f} bytes/iteration")
+        widgets, objects = self.object_growth()
+        if widgets > 0:
+            problems.append(f"{widgets} QWidgets created and never destroyed")
+        if objects > 0:
+            problems.append(f"{objects} QObjects under the window never destroyed")
+        return problems
+
+    def format(self, limit=10):
+        """
+        Render the report as text.
+        Args:
+            limit (int, optional): Number of allocation sites shown. Defaults to 10.
+        Returns:
+            str: Samples, verdict and top allocation sites.
+        """
+        lines = [f"{self.iterations} iterations, warmup {self.warmup}, actions {self.action_counts}"]
+        lines.append(f"{'iteration':>10} {'traced KiB':>11} {'widgets':>8} {'qobjects':>9}")
+        for iteration, traced, widgets, objects in self.samples:
+            lines.append(f"{iteration:>10} {traced / 1024:>11.1f} {widgets:>8} {objects:>9}")
+        lines.append(f"memory slope after warmup: {self.memory_slope():.2f} bytes/iteration")
+        lines.extend(f"LEAK: {problem}" for problem in self.leaks())
+        lines.append("top allocation sites since warmup:")
+        for stat in self.top_sites[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+def run_soak(window, iterations=2000, seed=0, sample_every=100, warmup=None, actions=None):
+    """
+    Drive a window through randomized interactions while sampling memory.
+    Args:
+        window (MainWindow): Window under test.
+        iterations (int, optional): Interactions to perform. Defaults to 2000.
+        seed (int, optional): Random seed, so failures can be replayed. Defaults to 0.
+        sample_every (int, optional): Iterations between samples. Defaults to 100.
+        warmup (int, optional): Iterations before growth is measured. Defaults to a quarter of the run.
+        actions (dict, optional): Interactions to use (see ACTIONS). Defaults to ACTIONS.
+    Returns:
+        SoakReport: Samples and top allocation sites.
+    """
+    actions = ACTIONS if actions is None else actions
+    warmup = iterations // 4 if warmup is None else warmup
+    rng = random.Random(seed)
+    names = list(actions)
+    weights = [actions[name][1] for name in names]
+    counts = dict.fromkeys(names, 0)
+    samples = []
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(10)
+    baseline = None
+    try:
+        for iteration in range(iterations + 1):
+            if iteration % sample_every == 0 or iteration == iterations:
+                settle()
+                samples.append((iteration, tracemalloc.get_traced_memory()[0], *qt_object_counts(window)))
+                if baseline is None and iteration >= warmup:
+                    baseline = tracemalloc.take_snapshot()
+            if iteration == iterations:
+                break
+            name = rng.choices(names, weights)[0]
+            actions[name][0](window, rng)
+            counts[name] += 1
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    top_sites = [
+        stat for stat in snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), "lineno")
+        if stat.size_diff > 0
+    ]
+    return SoakReport(iterations, warmup, samples, counts, top_sites)
+
+def main(argv=None):
+    """
+    Run a soak session and print the report.
+    Returns:
+        int: 1 if a leak was detected, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description="Soak MainWindow with randomized interactions.")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-every", type=int, default=250)
+    args = parser.parse_args(argv)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("WOTR_PLANNER_PACKS", "")
+    from wotr_planner.ui.main_window import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow(autosave=False)
+    report = run_soak(window, args.iterations, args.seed, args.sample_every)
+    print(report.format())
+    window.close()
+    app.processEvents()
+    return 1 if report.leaks() else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import pytest
+from PyQt6.QtWidgets import QLabel
+from harness import ACTIONS, run_soak, slope
+from wotr_planner.ui.main_window import MainWindow
+
+# Interactions per soak run, overridable with WOTR_SOAK_ITERATIONS
+ITERATIONS = int(os.environ.get("WOTR_SOAK_ITERATIONS", 2000))
+
+@pytest.fixture
+def window(qtbot, monkeypatch):
+    """
+    Fixture to create a MainWindow over the bundled data, without autosave.
+    Args:
+        qtbot: pytest-qt fixture for handling Qt widgets.
+        monkeypatch: pytest fixture to hide installed data packs.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    window = MainWindow(autosave=False)
+    qtbot.addWidget(window)
+    return window
+
+def test_slope():
+    """
+    Test the least-squares slope used for the growth check.
+    """
+    assert slope([(0, 5), (10, 25), (20, 45)]) == 2
+    assert slope([(0, 5)]) == 0.0
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_long_session_does_not_leak(window, seed):
+    """
+    Test that randomized interactions do not retain memory or Qt objects.
+    """
+    report = run_soak(window, ITERATIONS, seed=seed, sample_every=max(1, ITERATIONS // 20))
+    assert all(report.action_counts.values())
+    assert not report.leaks(), report.format()
+
+def test_injected_leaks_are_detected(window):
+    """
+    Test that the harness reports a Python leak and a widget leak, with the leaking line.
+    """
+    retained = []
+
+    def leak_memory(window, rng):
+        retained.append(bytearray(256))
+
+    def leak_widget(window, rng):
+        QLabel("leak", window.tabs)
+
+    actions = {**ACTIONS, "leak_memory": (leak_memory, 3), "leak_widget": (leak_widget, 1)}
+    report = run_soak(window, 400, sample_every=50, actions=actions)
+    problems = report.leaks()
+    assert any("bytes/iteration" in p for p in problems)
+    assert any("QWidgets" in p for p in problems)
+    assert any(stat.traceback[0].lineno == leak_memory.__code__.co_firstlineno + 1 for stat in report.top_sites[:3])
@@ -0,0 +1,121 @@
+import sys
+import threading
+import pytest
+from wotr_planner.db import autosave
+from wotr_planner.db.autosave import AutosaveWorker, recover
+from wotr_planner.db.database import connect
+from wotr_planner.ui.main_window import MainWindow
+
+def test_worker_writes_latest_snapshot(tmp_path):
+    """
+    Test that the worker persists the latest snapshot and recover reads it back.
+    """
+    path = tmp_path / "autosave.db"
+    worker = AutosaveWorker(path)
+    for level in range(1, 6):
+        worker.submit({"name": "Seelah", "level": level})
+    worker.close()
+
+    assert recover(path) == {"name": "Seelah", "level": 5}
+    assert recover(path, slot="other") is None
+    assert worker.error is None
+
+def test_worker_merges_bursts(tmp_path, monkeypatch):
+    """
+    Test that snapshots queued while a write is in progress are merged into one transaction.
+    - The first write is held open so the following submits pile up behind it.
+    """
+    entered = threading.Event()
+    gate = threading.Event()
+
+    class GatedConnection:
+        """
+        Connection whose transactions wait for the gate, after signalling that one started.
+        """
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self.conn, name)
+
+        def __enter__(self):
+            entered.set()
+            gate.wait(timeout=5)
+            return self.conn.__enter__()
+
+        def __exit__(self, *exc_info):
+            return self.conn.__exit__(*exc_info)
+
+    monkeypatch.setattr(autosave, "connect", lambda path: GatedConnection(connect(path)))
+    path = tmp_path / "autosave.db"
+    worker = AutosaveWorker(path)
+    worker.submit({"level": 1})
+    assert entered.wait(timeout=5)
+    for level in range(2, 21):
+        worker.submit({"level": level})
+    gate.set()
+    worker.flush()
+    worker.close()
+
+    assert worker.writes == 2
+    assert recover(path) == {"level": 20}
+
+def test_excepthook_flushes_without_stopping(tmp_path, monkeypatch):
+    """
+    Test that an unhandled exception flushes pending snapshots and leaves autosave running.
+    """
+    path = tmp_path / "autosave.db"
+    worker = AutosaveWorker(path)
+    reported = []
+    monkeypatch.setattr(autosave, "_previous_excepthook", lambda *exc_info: reported.append(exc_info[0]))
+    worker.submit({"level": 1})
+    try:
+        raise RuntimeError("error in a slot")
+    except RuntimeError:
+        autosave._excepthook(*sys.exc_info())
+    assert reported == [RuntimeError]
+    assert recover(path) == {"level": 1}
+    assert worker.thread.is_alive()
+    worker.submit({"level": 2})
+    worker.flush()
+    assert recover(path) == {"level": 2}
+    worker.close()
+
+def test_submit_never_blocks_when_full(tmp_path):
+    """
+    Test that a full queue drops the oldest snapshot instead of blocking.
+    """
+    worker = AutosaveWorker(tmp_path / "autosave.db", max_pending=2)
+    for level in range(1, 101):
+        worker.submit({"level": level})
+    worker.close()
+    assert recover(tmp_path / "autosave.db") == {"level": 100}
+
+def test_main_window_autosaves_and_restores(qtbot, tmp_path, monkeypatch):
+    """
+    Test that MainWindow autosaves changes and restores them in a new window.
+    Args:
+        qtbot: pytest-qt fixture for testing Qt widgets.
+        tmp_path: pytest fixture to create a temporary directory.
+        monkeypatch: pytest fixture to modify behavior for testing.
+    """
+    # Keep the developer's own packs and session out of the test
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    monkeypatch.setenv("WOTR_PLANNER_DB", str(tmp_path / "session.db"))
+    window = MainWindow()
+    qtbot.addWidget(window)
+    names = [window.races_tab.race_combo.itemText(i) for i in range(window.races_tab.race_combo.count())]
+    window.races_tab.race_combo.setCurrentIndex(names.index("Elf"))
+    window.skills_tab.skill_widgets["Athletics"].setValue(1)
+    window.close()
+
+    assert recover()["race"] == "Elf"
+    assert recover()["skill_ranks"]["Athletics"] == 1
+
+    restored = MainWindow()
+    qtbot.addWidget(restored)
+    assert restored.character.race["name"] == "Elf"
+    assert restored.races_tab.race_combo.currentText() == "Elf"
+    assert restored.character.stats["Dex"] == 12
+    restored.close()
@@ -0,0 +1,133 @@
+import threading
+import pytest
+from wotr_planner.models.build_finder import BuildSearch, find_builds
+from wotr_planner.models.catalog import Catalog, default_catalog
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+def brute_force(catalog, feats, level, min_stats):
+    """
+    Check every race/heritage/class combination without pruning.
+    Args:
+        catalog: Game data.
+        feats: Required feat names.
+        level: Character level.
+        min_stats: Lowest final stats.
+    """
+    search = BuildSearch(catalog, feats, level, min_stats)
+    found = set()
+    for race in catalog.records("races"):
+        lineages = [h for h in catalog.records("heritages") if h["race"] == race["name"]] or [None]
+        for heritage in lineages:
+            point_buy = search._point_buy(race, heritage, search.required)
+            if point_buy is None:
+                continue
+            for char_class in catalog.records("classes"):
+                if search._match(race, heritage, char_class, point_buy, catalog.trait_registry()):
+                    found.add((race["name"], heritage["name"] if heritage else None, char_class["name"]))
+    return found
+
+def test_finds_same_builds_as_brute_force(catalog):
+    """
+    Test that pruned search results match checking every combination.
+    """
+    search = find_builds(catalog, ["Power Attack", "Cleave", "Dodge"], level=3, min_stats={"Int": 12})
+    matches = list(search)
+    found = {(m.race["name"], m.heritage["name"] if m.heritage else None, m.char_class["name"]) for m in matches}
+    assert found == brute_force(catalog, ["Power Attack", "Cleave", "Dodge"], 3, {"Int": 12})
+    assert ("Human", None, "Fighter") in found and ("Human", None, "Rogue") in found
+    # Three feats by level 3 need a class or race bonus feat
+    assert not any(cls == "Wizard" and race != "Human" for race, _, cls in found)
+    assert search.status == "complete"
+    assert search.counts["matches"] == len(matches)
+
+def test_matches_are_valid_characters(catalog):
+    """
+    Test that each match builds a character that keeps its feats and meets the stats.
+    """
+    for match in find_builds(catalog, ["Cleave"], level=1, min_stats={"Int": 12}, classes=["Fighter"]):
+        character = match.character()
+        assert [f["name"] for f in character.feats] == ["Power Attack", "Cleave"]
+        assert character.stats["Int"] >= 12 and character.stats["Str"] >= 13
+        assert match.to_dict()["class"] == "Fighter"
+
+def test_unreachable_stats_prune_races_and_heritages(catalog):
+    """
+    Test that stat bounds prune whole races before classes are checked.
+    """
+    search = find_builds(catalog, min_stats={"Str": 20, "Dex": 16})
+    found = list(search)
+    assert found and all(m.race["name"] not in ("Human", "Elf", "Halfling", "Kitsune") for m in found)
+    assert search.counts["races_pruned"] >= 4
+    assert search.counts["classes"] < len(catalog.records("classes")) * len(catalog.records("heritages"))
+    assert list(find_builds(catalog, ["LvlDummy"], level=10)) == []
+
+def test_invalid_constraints_raise(catalog):
+    """
+    Test that unknown feats, stats, classes and levels are rejected up front.
+    """
+    with pytest.raises(ValueError):
+        find_builds(catalog, ["Whirlwind Attack"])
+    with pytest.raises(ValueError):
+        find_builds(catalog, min_stats={"Luck": 12})
+    with pytest.raises(ValueError):
+        find_builds(catalog, classes=["Bard"])
+    with pytest.raises(ValueError):
+        find_builds(catalog, level=21)
+
+def large_catalog(count):
+    """
+    Build a catalog with many races that all match.
+    Args:
+        count: Number of races.
+    """
+    return Catalog({
+        "races": [{"name": f"Race {i}"} for i in range(count)],
+        "classes": [{"name": "Fighter", "bonus_feat_interval": 1}],
+        "feats": [{"name": "Dodge"}],
+    })
+
+def test_cancel_and_time_budget_stop_the_stream():
+    """
+    Test that cancelling from another thread or exhausting the budget ends the stream early.
+    """
+    catalog = large_catalog(200)
+    search = find_builds(catalog, ["Dodge"])
+    stream = iter(search)
+    next(stream)
+    thread = threading.Thread(target=search.cancel)
+    thread.start()
+    thread.join()
+    assert list(stream) == []
+    assert search.status == "cancelled" and search.counts["matches"] == 1
+
+    search = find_builds(catalog, ["Dodge"], time_budget=0)
+    assert list(search) == [] and search.status == "timeout"
+
+    search = find_builds(catalog, ["Dodge"])
+    stream = iter(search)
+    next(stream)
+    stream.close() # The consumer stops iterating early
+    assert search.status == "cancelled"
+
+def test_innate_feats_satisfy_prerequisites():
+    """
+    Test that a feat granted by a trait counts as a prerequisite for the planner and the rules.
+    """
+    catalog = Catalog({
+        "races": [{"name": "Orc", "traits": ["Ferocity"]}, {"name": "Human"}],
+        "classes": [{"name": "Fighter"}],
+        "feats": [{"name": "Diehard"}, {"name": "Endurance", "prerequisite_feats": ["Diehard"]}],
+        "traits": [{"name": "Ferocity", "innate_feats": ["Diehard"]}],
+    })
+    matches = list(find_builds(catalog, ["Endurance"], level=1))
+    assert [(m.race["name"], [f["name"] for f in m.character().feats]) for m in matches] == [("Orc", ["Endurance"])]
+    orc = matches[0].character()
+    orc.recalculate_traits(catalog.trait_registry())
+    # The rules keep a chosen feat whose prerequisite is innate
+    assert orc.validate_feats(catalog.records("feats")) == set() and "Endurance" in orc.feats
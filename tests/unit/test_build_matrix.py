@@ -0,0 +1,207 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from PyQt6.QtCore import Qt
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.models.build_matrix import BuildMatrix, BuildTables
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.character import Character, SKILLS, STATS
+from wotr_planner.models.combat import COMBAT_STATS, combat_sheet
+from PyQt6.QtCore import QItemSelectionModel
+from wotr_planner.ui import compare_view
+from wotr_planner.ui.compare_view import BUILD_ID_ROLE, BuildComparisonModel, CompareBuildsDialog
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide a catalog with modifiers, bonus feats and trait bonuses.
+    """
+    return Catalog({
+        "classes": [
+            {"name": "Fighter", "bonus_feat_interval": 2, "bonus_feats": [1]},
+            {"name": "Wizard"},
+        ],
+        "races": [
+            {"name": "Human", "bonus_feats": [1], "traits": ["Skilled"]},
+            {"name": "Elf", "modifiers": {"Dex": 2, "Con": -2}, "traits": ["Keen Senses"]},
+        ],
+        "heritages": [
+            {"name": "Basic", "race": "Elf"},
+            {"name": "Sylvan", "race": "Elf", "modifiers": {"Cha": 2}, "traits_removed": ["Keen Senses"]},
+        ],
+        "backgrounds": [{"name": "Scholar", "skill_modifiers": {"Knowledge(Arcana)": 1}}],
+        "feats": [
+            {"name": "Power Attack"},
+            {"name": "Skill Focus", "skill_modifiers": {"Stealth": 3}},
+            {"name": "Toughness", "modifiers": {"Con": 1}},
+        ],
+        "traits": [
+            {"name": "Keen Senses", "skill_bonuses": {"Perception": 2}, "save_bonuses": {"Will": 1}},
+            {"name": "Skilled"},
+        ],
+    })
+
+@pytest.fixture
+def characters(catalog):
+    """
+    Fixture to provide varied builds over the catalog.
+    Args:
+        catalog: fixture providing catalog data.
+    """
+    builds = []
+    for i, (race, heritage, cls, background, level, feats) in enumerate([
+        ("Human", None, "Fighter", None, 1, ["Power Attack"]),
+        ("Elf", "Basic", "Wizard", "Scholar", 5, ["Skill Focus", "Toughness"]),
+        ("Elf", "Sylvan", "Fighter", None, 10, ["Toughness"]),
+        ("Elf", None, "Wizard", "Scholar", 20, []),
+    ]):
+        c = Character(char_class=catalog.get("classes", cls), race=catalog.get("races", race))
+        c.name = f"Build {race} {i}"
+        c.level = level
+        if heritage:
+            c.heritage = catalog.heritage(race, heritage)
+        if background:
+            c.background = catalog.get("backgrounds", background)
+        c.feats = [catalog.get("feats", f) for f in feats]
+        c.point_buy_stats = {stat: 8 + i + j for j, stat in enumerate(STATS)}
+        c.skill_ranks = {skill: (i + j) % 4 for j, skill in enumerate(SKILLS)}
+        builds.append(c)
+    return builds
+
+def scalar_values(character, catalog):
+    """
+    Compute derived values through the Character code path.
+    Args:
+        character: Character to evaluate.
+        catalog: Catalog providing traits.
+    """
+    character.recalculate_traits(catalog.trait_registry())
+    character.recalculate_stats()
+    character.recalculate_skills()
+    return (
+        [character.stats[s] for s in STATS],
+        [character.skills[s] for s in SKILLS],
+        character.total_feat_slots(),
+    )
+
+def test_matrix_matches_character_calculations(catalog, characters):
+    """
+    Test that vectorized stats, skills and feat slots match the per-character calculations.
+    """
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    for row, character in enumerate(characters):
+        stats, skills, slots = scalar_values(character, catalog)
+        assert matrix.values("final_stats")[row].tolist() == stats
+        assert matrix.values("effective_skills")[row].tolist() == skills
+        assert matrix.values("feat_slots")[row, 0] == slots
+
+def test_combat_matches_character_calculations(catalog, characters):
+    """
+    Test that the vectorized combat group matches combat_sheet for every build.
+    """
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    assert matrix.columns("combat") == list(COMBAT_STATS)
+    for row, character in enumerate(characters):
+        scalar_values(character, catalog)
+        sheet = combat_sheet(character)
+        assert matrix.values("combat")[row].tolist() == [sheet[name] for name in COMBAT_STATS]
+
+def test_multiclass_builds_use_their_class_levels(tmp_path, catalog, characters):
+    """
+    Test that multiclass rows take feat slots and combat from their per-level classes.
+    """
+    single_class_slots = characters[2].total_feat_slots()
+    characters[2].set_level_class(3, catalog.get("classes", "Wizard"))
+    characters[2].set_level_class(4, catalog.get("classes", "Wizard"))
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        loaded = BuildMatrix.from_repository(repo, repo.save_many(characters))
+    for matrix in (BuildMatrix.from_characters(characters, catalog), loaded):
+        for row, character in enumerate(characters):
+            _, _, slots = scalar_values(character, catalog)
+            sheet = combat_sheet(character)
+            assert matrix.values("feat_slots")[row, 0] == slots
+            assert matrix.values("combat")[row].tolist() == [sheet[name] for name in COMBAT_STATS]
+    assert loaded.values("feat_slots")[2, 0] < single_class_slots
+
+def test_trait_bonuses_follow_heritage(catalog, characters):
+    """
+    Test that trait bonus columns come from race traits minus heritage removals.
+    """
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    will = matrix.columns("trait_bonuses").index("Save (Will)")
+    assert matrix.values("trait_bonuses")[:, will].tolist() == [0, 1, 0, 1]
+
+def test_groups_are_computed_lazily(catalog, characters):
+    """
+    Test that a group is computed on first use and then served from the cache.
+    """
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    assert matrix.cache == {}
+    first = matrix.values("final_stats")
+    assert list(matrix.cache) == ["final_stats"]
+    assert matrix.values("final_stats") is first
+    with pytest.raises(ValueError):
+        matrix.values("hit_points")
+
+def test_differences_against_reference(catalog, characters):
+    """
+    Test that differences subtract the reference build's values.
+    """
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    diff = matrix.differences("final_stats", reference=1)
+    assert not diff[1].any()
+    assert (diff[0] == matrix.values("final_stats")[0] - matrix.values("final_stats")[1]).all()
+
+def test_from_repository_matches_from_characters(tmp_path, catalog, characters):
+    """
+    Test that reading saved rows in bulk gives the same matrix as the characters.
+    """
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        ids = repo.save_many(characters)
+        tables = BuildTables(catalog)
+        loaded = BuildMatrix.from_repository(repo, [ids[2], ids[0], 999], tables)
+        expected = BuildMatrix.from_characters([characters[2], characters[0]], catalog, tables)
+    assert loaded.labels == [characters[2].name, characters[0].name]
+    for group in ("final_stats", "effective_skills", "feat_slots", "trait_bonuses", "combat"):
+        assert (loaded.values(group) == expected.values(group)).all()
+
+def test_comparison_model_shows_values_and_differences(qtbot, catalog, characters):
+    """
+    Test that the table model shows absolute values, then signed differences from a reference.
+    """
+    model = BuildComparisonModel(BuildMatrix.from_characters(characters, catalog))
+    assert model.rowCount() == 4
+    assert model.headerData(0, Qt.Orientation.Horizontal) == "Str"
+    assert model.headerData(1, Qt.Orientation.Vertical) == characters[1].name
+    assert model.data(model.index(0, 0)) == "8"
+    model.set_reference(0)
+    assert model.data(model.index(0, 0)) == "8"
+    assert model.data(model.index(3, 0)) == "+3"
+    assert model.data(model.index(3, 0), Qt.ItemDataRole.ToolTipRole) == "11"
+
+def test_compare_dialog_uses_selected_builds(qtbot, tmp_path, catalog, characters, monkeypatch):
+    """
+    Test that the dialog pages in saved builds and compares the selection once it settles.
+    """
+    monkeypatch.setattr(compare_view, "PAGE_SIZE", 3)
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        repo.save_many(characters)
+        dialog = CompareBuildsDialog(repo)
+        qtbot.addWidget(dialog)
+        builds = dialog.builds
+        assert builds.rowCount() == 3 and builds.canFetchMore()
+        builds.fetchMore()
+        assert builds.rowCount() == 4 and not builds.canFetchMore()
+
+        compared = []
+        dialog.compare_timer.timeout.connect(lambda: compared.append(len(dialog.model.matrix)))
+        selection = dialog.build_list.selectionModel()
+        for row in (1, 3):
+            selection.select(builds.index(row), QItemSelectionModel.SelectionFlag.Select)
+        assert [builds.index(r).data(BUILD_ID_ROLE) for r in (1, 3)] == [2, 4]
+        qtbot.waitUntil(lambda: bool(compared))
+        assert compared == [2] # One comparison for both changes
+        assert dialog.model.matrix.labels == [characters[1].name, characters[3].name]
+        dialog.reference_combo.setCurrentIndex(1)
+        assert dialog.model.reference == 0
@@ -0,0 +1,121 @@
+import itertools
+import json
+import pytest
+from wotr_planner.models.build_ranking import BuildRanking, Score, best_point_buy, rank_builds
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import STATS
+from wotr_planner.models.point_buy import POINT_BUY_BUDGET, points_spent
+
+SCORE = "Str mod + Con mod + AC + skill points"
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+def summary(ranked):
+    """
+    Reduce ranked builds to comparable tuples.
+    Args:
+        ranked: RankedBuild objects.
+    """
+    return [(r.score, r.match.race["name"], r.match.heritage and r.match.heritage["name"], r.match.char_class["name"]) for r in ranked]
+
+def test_parse_scores():
+    """
+    Test parsing weights, constants and hyphenated term names, and rejecting bad input.
+    """
+    score = Score.parse("2 * Flat-Footed AC - 0.5*hp + str mod + 3")
+    assert score.weights == {"Flat-Footed AC": 2, "HP": -0.5, "Str mod": 1}
+    assert score.constant == 3
+    assert str(score) == "2 * Flat-Footed AC - 0.5 * HP + Str mod + 3"
+    values = {"Flat-Footed AC": 12, "HP": 20, "Str mod": 2}
+    assert score(values) == 24 - 10 + 2 + 3
+    assert score.breakdown(values)["HP"] == {"value": 20, "weight": -0.5, "points": -10}
+    for text in ("Luck", "AC +", "AC * HP", "", "2"):
+        with pytest.raises(ValueError):
+            Score.parse(text)
+
+def test_best_point_buy_matches_brute_force():
+    """
+    Test that the knapsack finds the best buy that a full enumeration finds.
+    """
+    gains = {
+        "Str": {score: (score - 10) // 2 * 3 for score in range(7, 19)},
+        "Dex": {score: (score - 10) // 2 * 2 for score in range(7, 19)},
+        "Int": {score: score - 10 for score in range(7, 19)},
+    }
+    minimums = {"Con": 12, "Wis": 10, "Cha": 10}
+    gain, buy = best_point_buy(gains, minimums)
+    assert points_spent(buy) <= POINT_BUY_BUDGET and buy["Con"] >= 12
+    best = max(
+        sum(gains[stat][score] for stat, score in zip(("Str", "Dex", "Int"), scores))
+        for scores in itertools.product(range(7, 19), repeat=3)
+        if points_spent(dict(zip(("Str", "Dex", "Int"), scores))) + 2 <= POINT_BUY_BUDGET
+    )
+    assert gain == best
+    assert best_point_buy({}, {stat: 15 for stat in STATS}) is None
+
+@pytest.mark.parametrize("score, k, races", [
+    (SCORE, 5, None),
+    # Negative weights on stats some lineages lower (Oread Ironsoul has Dex -2)
+    ("- 2*Dex + Str + Int", 1, ["Human", "Oread"]),
+    ("- Dex + skill points", 5, None),
+])
+def test_pruned_ranking_matches_exhaustive(catalog, score, k, races):
+    """
+    Test that bound pruning skips branches without changing the top K.
+    """
+    ranking = BuildRanking(catalog, score, k=k, level=5, races=races)
+    ranked = ranking.run()
+    assert ranking.counts["pruned"] > 0
+    assert ranking.counts["solved"] + ranking.counts["pruned"] == ranking.counts["branches"]
+
+    exhaustive = BuildRanking(catalog, score, k=k, level=5, races=races)
+    branches = [(float("inf"),) + branch[1:] for branch in exhaustive.branches()]
+    found = sorted(exhaustive._solve(branches), key=lambda entry: (-entry[0], entry[1]))
+    assert [entry[0] for entry in found] == [r.score for r in ranked]
+    assert exhaustive.counts["pruned"] == 0
+    # Every branch's bound is at least its best score
+    for branch in ranking.branches():
+        solved = exhaustive._solve([(float("inf"),) + branch[1:]])
+        assert not solved or solved[0][0] <= branch[0]
+
+def test_ranked_builds_carry_sheet_and_breakdown(catalog):
+    """
+    Test that results are ordered, evaluated and broken down per term.
+    """
+    ranked = rank_builds(catalog, SCORE, k=3, level=5)
+    assert [r.score for r in ranked] == sorted((r.score for r in ranked), reverse=True)
+    top = ranked[0]
+    assert top.match.char_class["name"] == "Rogue" and top.match.point_buy["Int"] == 18
+    assert sum(share["points"] for share in top.breakdown.values()) == top.score
+    assert top.breakdown["AC"]["value"] == top.sheet["combat"]["AC"]
+    assert top.breakdown["skill points"]["value"] == top.sheet["unspent_skill_points"]
+    data = json.loads(json.dumps(top.to_dict()))
+    assert data["build"]["point_buy"] == top.match.point_buy and data["score"] == top.score
+
+def test_constraints_and_weights(catalog):
+    """
+    Test that feat and stat constraints limit the ranking and weights change the winner.
+    """
+    ranked = rank_builds(catalog, {"Will": 1}, k=4, feats=["Power Attack"], min_stats={"Dex": 14}, classes=["Fighter", "Wizard"])
+    assert ranked and all(r.match.char_class["name"] == "Wizard" for r in ranked)
+    for r in ranked:
+        assert [feat["name"] for feat in r.match.feats] == ["Power Attack"]
+        assert r.sheet["stats"]["Str"] >= 13 and r.sheet["stats"]["Dex"] >= 14
+        assert not r.sheet["errors"]
+    assert rank_builds(catalog, "HP", k=1, level=10)[0].match.char_class["name"] == "Fighter"
+    with pytest.raises(ValueError):
+        rank_builds(catalog, SCORE, k=0)
+
+def test_workers_give_same_ranking(catalog):
+    """
+    Test that solving across worker processes returns the single-process ranking.
+    """
+    single = rank_builds(catalog, SCORE, k=4, level=3)
+    ranking = BuildRanking(catalog, SCORE, k=4, level=3, workers=2)
+    assert summary(ranking.run()) == summary(single)
+    assert ranking.counts["solved"] + ranking.counts["pruned"] == ranking.counts["branches"]
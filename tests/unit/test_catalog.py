@@ -0,0 +1,37 @@
+import pytest
+from wotr_planner.models.catalog import Catalog, default_catalog
+
+def test_catalog_indexes_by_name_and_id():
+    """
+    Test that catalog records can be looked up by name and by integer ID.
+    - Heritages are keyed by (race, name) since names repeat across races.
+    """
+    catalog = Catalog({
+        "feats": [{"name": "Power Attack"}, {"name": "Dodge"}],
+        "heritages": [{"name": "Basic", "race": "Elf"}, {"name": "Basic", "race": "Dwarf"}],
+    })
+
+    assert catalog.id_of("feats", "Dodge") == 1
+    assert catalog.by_id("feats", 0)["name"] == "Power Attack"
+    assert catalog.get("feats", "Missing") is None
+    assert catalog.heritage("Dwarf", "Basic") is catalog.by_id("heritages", 1)
+    assert catalog.records("races") == []
+
+def test_set_records_rebuilds_one_index():
+    """
+    Test that replacing one kind's records rebuilds only that index.
+    """
+    catalog = Catalog({"feats": [{"name": "Dodge"}], "races": [{"name": "Elf"}]})
+    races_index = catalog.indexes["races"]
+    catalog.set_records("feats", [{"name": "Cleave"}, {"name": "Dodge"}])
+
+    assert catalog.id_of("feats", "Dodge") == 1
+    assert catalog.indexes["races"] is races_index
+
+def test_default_catalog_loads_bundled_data():
+    """
+    Test that the shared catalog loads the bundled JSON files once.
+    """
+    catalog = default_catalog()
+    assert catalog.get("classes", "Fighter") is not None
+    assert default_catalog() is catalog
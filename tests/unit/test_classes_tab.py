@@ -1,14 +1,13 @@
 import pytest
 from PyQt6.QtWidgets import QTreeWidgetItem
-from wotr_planner.ui.classes_tab import ClassTab
+from wotr_planner.ui.classes_tab import ClassTab, CLASS_ID_ROLE, ARCHETYPE_ID_ROLE
+from wotr_planner.models.catalog import Catalog
 from wotr_planner.models.character import Character
 
 @pytest.fixture
-def dummy_classes(monkeypatch):
+def dummy_classes():
     """
     Fixture to provide dummy class data for testing.
-    Args:
-        monkeypatch: pytest fixture to modify behavior for testing.
     """
     test_data = [
         {
@@ -19,8 +18,6 @@ def dummy_classes(monkeypatch):
             ]
         }
     ]
-    # Override the load_classes function to return test data
-    monkeypatch.setattr("wotr_planner.ui.classes_tab.load_classes", lambda: test_data)
     return test_data
 
 def test_initialization(qtbot, dummy_classes):
@@ -31,7 +28,7 @@ def test_initialization(qtbot, dummy_classes):
         dummy_classes: fixture providing dummy class data.
     """
     char = Character(char_class={}, race={})
-    tab = ClassTab(char)
+    tab = ClassTab(char, Catalog({"classes": dummy_classes}))
     qtbot.addWidget(tab)
 
     assert tab.class_tree is not None
@@ -48,7 +45,7 @@ def test_select_class_updates_character(qtbot, dummy_classes):
         dummy_classes: fixture providing dummy class data.
     """
     char = Character(char_class={}, race={})
-    tab = ClassTab(char)
+    tab = ClassTab(char, Catalog({"classes": dummy_classes}))
     qtbot.addWidget(tab)
 
     fighter_item = tab.class_tree.topLevelItem(0)
@@ -68,10 +65,11 @@ def test_select_archetype_updates_character(qtbot, dummy_classes):
         dummy_classes: fixture providing dummy class data.
     """
     char = Character(char_class={}, race={})
-    tab = ClassTab(char)
+    tab = ClassTab(char, Catalog({"classes": dummy_classes}))
     qtbot.addWidget(tab)
 
     fighter_item = tab.class_tree.topLevelItem(0)
+    fighter_item.setExpanded(True) # Archetypes are created on first expansion
     archetype_item = fighter_item.child(0)
 
     with qtbot.waitSignal(tab.class_changed):
@@ -81,12 +79,36 @@ def test_select_archetype_updates_character(qtbot, dummy_classes):
     assert char.archetype ==  "Armiger"
     assert "master" in tab.description_box.toPlainText()
 
-def test_select_class_without_description(qtbot, monkeypatch):
+def test_archetypes_created_on_expand(qtbot, dummy_classes):
+    """
+    Test that archetype items are only created when their class is expanded.
+    - Items store integer IDs rather than the class/archetype dicts.
+    Args:
+        qtbot: pytest-qt fixture for testing Qt widgets.
+        dummy_classes: fixture providing dummy class data.
+    """
+    char = Character(char_class={}, race={})
+    tab = ClassTab(char, Catalog({"classes": dummy_classes}))
+    qtbot.addWidget(tab)
+
+    fighter_item = tab.class_tree.topLevelItem(0)
+    assert fighter_item.childCount() == 0
+    assert fighter_item.data(0, CLASS_ID_ROLE) == 0
+
+    fighter_item.setExpanded(True)
+    assert fighter_item.childCount() == 1
+    assert fighter_item.child(0).data(0, ARCHETYPE_ID_ROLE) == 0
+
+    # Expanding again does not duplicate children
+    fighter_item.setExpanded(False)
+    fighter_item.setExpanded(True)
+    assert fighter_item.childCount() == 1
+
+def test_select_class_without_description(qtbot):
     """
     Test selecting a class without a description.
     Args:
         qtbot: pytest-qt fixture for testing Qt widgets.
-        monkeypatch: pytest fixture to modify behavior for testing.
     """
     test_data = [
         {
@@ -94,11 +116,8 @@ def test_select_class_without_description(qtbot, monkeypatch):
             "archetypes": []
         }
     ]
-    # Override the load_classes function to return test data
-    monkeypatch.setattr("wotr_planner.ui.classes_tab.load_classes", lambda: test_data)
-
     char = Character(char_class={}, race={})
-    tab = ClassTab(char)
+    tab = ClassTab(char, Catalog({"classes": test_data}))
     qtbot.addWidget(tab)
 
     unkown_item = tab.class_tree.topLevelItem(0)
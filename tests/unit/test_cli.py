@@ -0,0 +1,139 @@
+import io
+import json
+import subprocess
+import sys
+import pytest
+from wotr_planner.cli import main
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.evaluator import evaluate_build
+from wotr_planner.models.serialization import character_to_dict
+from wotr_planner.models.share_code import encode_build
+
+@pytest.fixture
+def character():
+    """
+    Fixture to create a level 3 Elf Fighter with Power Attack and Cleave.
+    """
+    catalog = default_catalog()
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Elf"))
+    character.level = 3
+    character.point_buy_stats["Str"] = 14
+    character.feats = [catalog.get("feats", "Power Attack"), catalog.get("feats", "Cleave")]
+    character.recalculate_stats()
+    return character
+
+def run(argv, stdin=None):
+    """
+    Run the command-line tool with the bundled data only.
+    Returns:
+        tuple: (exit status, list of printed sheets).
+    """
+    out = io.StringIO()
+    status = main(["--no-packs", *argv], stdout=out, stdin=stdin)
+    return status, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_evaluate_build_sheet(character):
+    """
+    Test that the sheet holds every derived value.
+    """
+    sheet = evaluate_build(character, default_catalog())
+    assert sheet["stats"]["Str"] == 14 and sheet["stats"]["Dex"] == 12
+    assert sheet["feat_slots"] == character.total_feat_slots()
+    assert "Weapon Focus" in sheet["available_feats"]
+    assert set(sheet["effective_skills"]) == set(character.skill_ranks)
+    assert sheet["unspent_skill_points"] == 6
+    assert sheet["trait_bonuses"]["skills"] == {}
+    assert sheet["errors"] == []
+    json.dumps(sheet)
+
+def test_evaluate_build_reports_corrections(character):
+    """
+    Test that feats missing prerequisites and skill ranks over budget are reported.
+    """
+    character.point_buy_stats["Str"] = 10
+    character.recalculate_stats()
+    character.skill_ranks["Athletics"] = 20
+    sheet = evaluate_build(character, default_catalog())
+    assert sheet["build"]["feats"] == []
+    assert sheet["errors"] == [
+        "Feat removed: Power Attack (prerequisites or feat slots not met)",
+        "Feat removed: Cleave (prerequisites or feat slots not met)",
+        "Skill ranks over cap: Athletics has 20, at most 3 allowed",
+        "Skill ranks trimmed: 20 spent of 6 available",
+    ]
+
+def test_evaluate_build_reports_rule_violations(character):
+    """
+    Test that an overspent point buy and ranks over the level cap are reported.
+    """
+    character.level = 20
+    character.point_buy_stats.update({stat: 18 for stat in character.point_buy_stats})
+    character.skill_ranks["Athletics"] = 30
+    character.recalculate_stats()
+    sheet = evaluate_build(character, default_catalog())
+    assert sheet["errors"][0] == "Point buy overspent: 102 spent of 25 available"
+    assert "Skill ranks over cap: Athletics has 30, at most 20 allowed" in sheet["errors"]
+
+def test_many_builds_per_invocation(character, tmp_path):
+    """
+    Test that share codes, JSON files, JSON lists and JSONL files are all evaluated in one run.
+    """
+    build = character_to_dict(character)
+    (tmp_path / "one.json").write_text(json.dumps(build), encoding="utf-8")
+    (tmp_path / "list.json").write_text(json.dumps([build, build]), encoding="utf-8")
+    (tmp_path / "lib.jsonl").write_text(json.dumps(build) + "\n\n" + json.dumps(build) + "\n", encoding="utf-8")
+    code = encode_build(character, default_catalog())
+    status, sheets = run([code, str(tmp_path / "one.json"), str(tmp_path / "list.json"), str(tmp_path / "lib.jsonl")])
+    assert status == 0
+    assert [s["source"] for s in sheets] == [
+        code,
+        str(tmp_path / "one.json"),
+        f"{tmp_path / 'list.json'}[0]",
+        f"{tmp_path / 'list.json'}[1]",
+        f"{tmp_path / 'lib.jsonl'}:1",
+        f"{tmp_path / 'lib.jsonl'}:3",
+    ]
+    assert all(s["stats"] == sheets[0]["stats"] for s in sheets)
+
+def test_bad_builds_do_not_stop_the_run(character):
+    """
+    Test that unloadable builds are reported inline and set the exit status.
+    """
+    malformed = json.dumps({**character_to_dict(character), "heritage": ["x"]})
+    stdin = io.StringIO('{"race": "Elf", "class": "Bard"}\nnot-a-code\n' + malformed + "\n" + encode_build(character, default_catalog()))
+    status, sheets = run(["-"], stdin=stdin)
+    assert status == 1
+    assert sheets[0] == {"source": "<stdin>:1", "error": "Unknown class: Bard"}
+    assert sheets[1]["source"] == "<stdin>:2" and "error" in sheets[1]
+    assert sheets[2] == {"source": "<stdin>:3", "error": "Invalid heritage: expected a string"}
+    assert sheets[3]["build"]["feats"] == ["Power Attack", "Cleave"]
+
+def test_missing_files_are_not_share_codes(tmp_path):
+    """
+    Test that a path-like argument naming no file is reported as a missing file.
+    """
+    missing = str(tmp_path / "nope")
+    status, sheets = run([missing, "typo.json", "lib.jsonl"])
+    assert status == 1
+    assert sheets == [
+        {"source": missing, "error": f"No such file: {missing}"},
+        {"source": "typo.json", "error": "No such file: typo.json"},
+        {"source": "lib.jsonl", "error": "No such file: lib.jsonl"},
+    ]
+
+def test_does_not_import_qt(character):
+    """
+    Test that the evaluator runs without importing PyQt6.
+    """
+    code = encode_build(character, default_catalog())
+    script = (
+        "import sys\n"
+        "from wotr_planner.cli import main\n"
+        f"status = main(['--no-packs', {code!r}])\n"
+        "assert not any(m.startswith('PyQt6') for m in sys.modules), 'PyQt6 imported'\n"
+        "sys.exit(status)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["feat_slots"] == 4
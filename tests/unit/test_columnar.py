@@ -0,0 +1,134 @@
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wotr_planner.db.columnar import ColumnStore, ColumnStoreError
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.models.build_matrix import BuildMatrix
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.character import Character
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide a catalog with more than eight feats, so bitsets span bytes.
+    """
+    return Catalog({
+        "classes": [{"name": "Fighter", "bonus_feats": [1]}, {"name": "Wizard"}],
+        "races": [{"name": "Human"}, {"name": "Elf", "modifiers": {"Dex": 2, "Con": -2}}],
+        "heritages": [{"name": "Sylvan", "race": "Elf", "modifiers": {"Cha": 2}}],
+        "backgrounds": [{"name": "Scholar"}],
+        "feats": [{"name": f"Feat {i}"} for i in range(9)] + [{"name": "Toughness", "modifiers": {"Con": 1}}],
+    })
+
+@pytest.fixture
+def characters(catalog):
+    """
+    Fixture to provide a few builds over the catalog.
+    Args:
+        catalog: fixture providing catalog data.
+    """
+    builds = []
+    for i in range(6):
+        c = Character(char_class=catalog.by_id("classes", i % 2), race=catalog.by_id("races", i % 3 // 2))
+        c.name = f"Build {i}"
+        c.level = 1 + i * 3
+        if c.race["name"] == "Elf":
+            c.heritage = catalog.by_id("heritages", 0)
+        c.point_buy_stats["Str"] = 8 + i
+        c.skill_ranks["Stealth"] = i
+        c.feats = [catalog.get("feats", "Feat 8")] if i % 2 else [catalog.get("feats", "Toughness")]
+        builds.append(c)
+    return builds
+
+def test_append_and_read_columns(tmp_path, catalog, characters):
+    """
+    Test that appended builds read back as memory-mapped columns with the same derived values.
+    """
+    characters[3].set_level_class(2, catalog.get("classes", "Fighter"))
+    store = ColumnStore(tmp_path / "store", catalog)
+    matrix = BuildMatrix.from_characters(characters, catalog)
+    assert store.append(matrix) == 6
+    reopened = ColumnStore(tmp_path / "store", catalog)
+    assert len(reopened) == 6
+    assert isinstance(reopened.column("level"), np.memmap)
+    assert reopened.column("level").tolist() == [1, 4, 7, 10, 13, 16]
+    loaded = reopened.matrix()
+    for group in ("final_stats", "effective_skills", "feat_slots", "combat"):
+        assert (loaded.values(group) == matrix.values(group)).all()
+    assert loaded.class_levels[3, :10].tolist() == [1, 0, 1, 1, 1, 1, 1, 1, 1, 1]
+
+def test_select_filters_columns(tmp_path, catalog, characters):
+    """
+    Test filtering by race, class, level and feat bits.
+    """
+    store = ColumnStore(tmp_path / "store", catalog)
+    store.append(BuildMatrix.from_characters(characters, catalog))
+    assert store.select(race="Elf").tolist() == [2, 5]
+    assert store.select(race="Elf", heritage="Sylvan", char_class="Wizard").tolist() == [5]
+    assert store.select(min_level=7, max_level=13).tolist() == [2, 3, 4]
+    assert store.select(feats=["Feat 8"]).tolist() == [1, 3, 5]
+    assert store.select(feats=["Toughness"], char_class="Fighter").tolist() == [0, 2, 4]
+    with pytest.raises(ColumnStoreError):
+        store.select(char_class="Bard")
+
+def test_matrix_of_selected_rows(tmp_path, catalog, characters):
+    """
+    Test that a selection becomes a BuildMatrix labelled by source ID.
+    """
+    store = ColumnStore(tmp_path / "store", catalog)
+    store.append(BuildMatrix.from_characters(characters, catalog), source_ids=[10, 11, 12, 13, 14, 15])
+    matrix = store.matrix(store.select(race="Elf"))
+    assert matrix.labels == ["#12", "#15"]
+    assert matrix.values("final_stats")[:, 5].tolist() == [12, 12]
+
+def test_append_repository_in_batches(tmp_path, catalog, characters):
+    """
+    Test copying a SQLite library into the store in several batches.
+    """
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        ids = repo.save_many(characters)
+        store = ColumnStore(tmp_path / "store", catalog)
+        assert store.append_repository(repo, batch_size=4) == 6
+    assert store.column("source_id").tolist() == ids
+    expected = BuildMatrix.from_characters(characters, catalog)
+    assert (store.matrix().values("final_stats") == expected.values("final_stats")).all()
+
+def test_unfinished_append_is_ignored(tmp_path, catalog, characters):
+    """
+    Test that bytes written past the committed row count are dropped by the next append.
+    """
+    store = ColumnStore(tmp_path / "store", catalog)
+    store.append(BuildMatrix.from_characters(characters[:2], catalog))
+    with open(tmp_path / "store" / "level.bin", "ab") as f:
+        f.write(b"\x63\x63\x63") # Simulate a crash after writing one column
+    assert ColumnStore(tmp_path / "store", catalog).column("level").tolist() == [1, 4]
+    store.append(BuildMatrix.from_characters(characters[2:3], catalog))
+    assert store.column("level").tolist() == [1, 4, 7]
+
+def test_rejects_other_feat_list(tmp_path, catalog):
+    """
+    Test that a store cannot be opened with a catalog that has a different feat count.
+    """
+    ColumnStore(tmp_path / "store", catalog)
+    other = Catalog({"feats": [{"name": "Dodge"}]})
+    with pytest.raises(ColumnStoreError):
+        ColumnStore(tmp_path / "store", other)
+    meta = json.loads((tmp_path / "store" / "meta.json").read_text())
+    assert meta["rows"] == 0
+
+def test_rejects_moved_records(tmp_path, catalog):
+    """
+    Test that a store cannot be opened once records it refers to by ID are reordered or renamed.
+    """
+    ColumnStore(tmp_path / "store", catalog)
+    reordered = Catalog({kind: list(records) for kind, records in catalog.data.items()})
+    reordered.set_records("races", list(reversed(catalog.records("races"))))
+    with pytest.raises(ColumnStoreError, match="races"):
+        ColumnStore(tmp_path / "store", reordered)
+    renamed = Catalog({kind: list(records) for kind, records in catalog.data.items()})
+    renamed.set_records("feats", catalog.records("feats")[:-1] + [{"name": "Great Fortitude"}])
+    with pytest.raises(ColumnStoreError, match="feats"):
+        ColumnStore(tmp_path / "store", renamed)
+    assert len(ColumnStore(tmp_path / "store", catalog)) == 0
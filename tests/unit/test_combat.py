@@ -0,0 +1,83 @@
+import pytest
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.combat import COMBAT_STATS, combat_sheet, level_progression
+from wotr_planner.models.progression import class_progression
+from wotr_planner.models.derived_graph import build_character_graph
+from wotr_planner.models.evaluator import evaluate_build
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+def test_class_progressions(catalog):
+    """
+    Test BAB, save and hit point tables of the bundled classes.
+    """
+    fighter = class_progression(catalog.get("classes", "Fighter"))
+    assert (fighter.bab[1], fighter.bab[20]) == (1, 20)
+    assert (fighter.saves["Fortitude"][1], fighter.saves["Reflex"][1]) == (2, 0)
+    assert (fighter.saves["Fortitude"][20], fighter.saves["Will"][20]) == (12, 6)
+    assert fighter.hp[:3] == [0, 10, 16]
+    rogue = class_progression(catalog.get("classes", "Rogue"))
+    assert [rogue.bab[level] for level in (1, 4, 20)] == [0, 3, 15]
+    wizard = class_progression(catalog.get("classes", "Wizard"))
+    assert wizard.bab[20] == 10
+    # Tables are built once per class
+    assert class_progression(catalog.get("classes", "Fighter")) is fighter
+
+def test_unknown_progression_is_rejected():
+    """
+    Test that a misspelled progression name raises ValueError.
+    """
+    with pytest.raises(ValueError, match="base attack bonus"):
+        class_progression({"name": "Oddball", "base_attack_bonus": "Full"})
+
+def test_combat_sheet_uses_modifiers_and_traits(catalog):
+    """
+    Test that ability modifiers and trait bonuses are added to the class values.
+    """
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Tiefling"))
+    character.heritage = catalog.heritage("Tiefling", "Hungerseed (Oni-Spawn)")
+    character.level = 5
+    character.point_buy_stats.update(Str=16, Dex=14, Con=14)
+    character.recalculate_stats()
+    character.trait_bonuses.update(cmb=2, cmd=2, natural_ac=1, saves={"will": 2, "Fear": -2})
+    sheet = combat_sheet(character)
+    # Str 18 (+4), Dex 14 (+2), Con 14 (+2), Wis 12 (+1)
+    assert sheet["BAB"] == 5
+    assert (sheet["Fortitude"], sheet["Reflex"], sheet["Will"]) == (6, 3, 4)
+    assert sheet["HP"] == 10 + 4 * 6 + 5 * 2
+    assert (sheet["AC"], sheet["Touch AC"], sheet["Flat-Footed AC"]) == (13, 12, 11)
+    assert (sheet["CMB"], sheet["CMD"]) == (11, 23)
+    assert sheet["conditional"]["saves"] == {"Fear": -2}
+
+def test_level_progression_and_minimum_hit_points(catalog):
+    """
+    Test per-level sheets and that low Constitution leaves at least 1 hit point per level.
+    """
+    character = Character(char_class=catalog.get("classes", "Wizard"), race=catalog.get("races", "Human"))
+    character.point_buy_stats["Con"] = 1
+    character.recalculate_stats()
+    sheets = level_progression(character)
+    assert len(sheets) == 20 and set(sheets[0]) == set(COMBAT_STATS)
+    assert [sheet["BAB"] for sheet in sheets[:4]] == [0, 1, 1, 2]
+    assert sheets[0]["HP"] == 1 and sheets[19]["HP"] == 20
+    character.level = 25
+    assert combat_sheet(character)["BAB"] == 10
+
+def test_graph_and_evaluator_include_combat(catalog):
+    """
+    Test that the combat node follows stat changes and the evaluator reports it.
+    """
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Human"))
+    graph = build_character_graph(character, catalog.records("feats"), catalog.trait_registry())
+    graph.evaluate()
+    assert graph.value("combat")["CMB"] == 1
+    character.point_buy_stats["Str"] = 14
+    assert "combat" in graph.update("point_buy")
+    assert graph.value("combat")["CMB"] == 3
+    assert evaluate_build(character, catalog)["combat"]["BAB"] == 1
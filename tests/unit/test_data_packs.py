@@ -0,0 +1,147 @@
+import json
+import os
+import pytest
+from wotr_planner.models.data_packs import DataPacks, default_pack_dirs, merge_layers
+from wotr_planner.models.data_schemas import DataValidationError
+from wotr_planner.ui.main_window import MainWindow
+
+def feat(name, **fields):
+    """
+    Build a valid feat record.
+    Args:
+        name: Feat name.
+        **fields: Fields overriding the defaults.
+    """
+    return {"name": name, "description": "", "prerequisite_stats": {}, "prerequisite_feats": [],
+            "prerequisite_level": 1, **fields}
+
+def write(path, records):
+    """
+    Write records to a JSON data file, creating its directory.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+@pytest.fixture
+def layers(tmp_path):
+    """
+    Fixture to create a base data directory and two packs.
+    Args:
+        tmp_path: pytest fixture to create a temporary directory.
+    """
+    base, core, homebrew = tmp_path / "base", tmp_path / "core", tmp_path / "homebrew"
+    write(base / "feats.json", [feat("Power Attack"), feat("Dodge"), feat("Cleave")])
+    write(base / "races.json", [{"name": "Human"}, {"name": "Elf"}])
+    write(base / "heritages.json", [{"name": "Basic", "race": "Elf"}])
+    write(core / "feats.json", [
+        feat("Dodge", prerequisite_level=3),
+        {"name": "Cleave", "_remove": True},
+    ])
+    write(homebrew / "feats.json", [
+        {"name": "Dodge", "_merge": True, "description": "Homebrew dodge"},
+        feat("Shield Wall"),
+    ])
+    write(homebrew / "heritages.json", [{"name": "Basic", "race": "Human"}])
+    return base, core, homebrew
+
+def test_layers_override_merge_and_remove(layers):
+    """
+    Test that later layers replace, patch, remove and append records by name.
+    """
+    base, core, homebrew = layers
+    feats = DataPacks([core, homebrew], base_dir=base).merged("feats")
+    assert [f["name"] for f in feats] == ["Power Attack", "Dodge", "Shield Wall"]
+    assert feats[1]["prerequisite_level"] == 3
+    assert feats[1]["description"] == "Homebrew dodge"
+    assert "_merge" not in feats[1]
+
+def test_heritages_are_keyed_by_race(layers):
+    """
+    Test that a heritage with the same name for another race is added, not replaced.
+    """
+    base, core, homebrew = layers
+    heritages = DataPacks([core, homebrew], base_dir=base).merged("heritages")
+    assert [(h["race"], h["name"]) for h in heritages] == [("Elf", "Basic"), ("Human", "Basic")]
+
+def test_merge_errors_name_the_pack_file():
+    """
+    Test that invalid pack records and dangling control records are reported with their source.
+    """
+    records, errors = merge_layers("feats", [
+        ("base/feats.json", [feat("Dodge")]),
+        ("pack/feats.json", [
+            {"name": "Cleave", "_remove": True},
+            {"name": "Toughness", "_merge": True},
+            {"name": "Dodge", "_merge": True, "prerequisite_level": "high"},
+        ]),
+    ])
+    assert records == [feat("Dodge")]
+    assert [str(e) for e in errors] == [
+        "pack/feats.json[0]: cannot remove unknown record 'Cleave'",
+        "pack/feats.json[1]: cannot merge into unknown record 'Toughness'",
+        "pack/feats.json[2].prerequisite_level: expected number, got str",
+    ]
+
+def test_reload_only_touches_changed_kind(layers):
+    """
+    Test that editing one pack file re-merges and re-indexes only its kind.
+    """
+    base, core, homebrew = layers
+    packs = DataPacks([core, homebrew], base_dir=base)
+    catalog = packs.catalog()
+    race_index = catalog.indexes["races"]
+    assert packs.reload(catalog) == []
+
+    write(homebrew / "feats.json", [feat("Shield Wall"), feat("Shield Slam")])
+    assert packs.changed_files() == [homebrew / "feats.json"]
+    assert packs.reload(catalog) == ["feats"]
+    assert catalog.get("feats", "Shield Slam") is not None
+    assert catalog.indexes["races"] is race_index
+
+def test_invalid_edit_keeps_previous_data(layers):
+    """
+    Test that a broken edit raises and leaves the catalog unchanged.
+    """
+    base, core, homebrew = layers
+    packs = DataPacks([core, homebrew], base_dir=base)
+    catalog = packs.catalog()
+    before = catalog.records("feats")
+    (homebrew / "feats.json").write_text("[{", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        packs.reload(catalog)
+    write(homebrew / "feats.json", [{"name": "Shield Wall"}])
+    with pytest.raises(DataValidationError):
+        packs.reload(catalog)
+    assert catalog.records("feats") is before
+
+def test_default_pack_dirs_from_environment(monkeypatch, tmp_path):
+    """
+    Test that WOTR_PLANNER_PACKS lists pack directories in priority order.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", os.pathsep.join([str(tmp_path / "a"), str(tmp_path / "b")]))
+    assert default_pack_dirs() == [tmp_path / "a", tmp_path / "b"]
+
+def test_main_window_reloads_edited_pack(qtbot, monkeypatch, tmp_path):
+    """
+    Test that editing a pack file updates the open window and re-validates the character's feats.
+    Args:
+        qtbot: pytest-qt fixture for testing Qt widgets.
+        monkeypatch: pytest fixture to modify behavior for testing.
+        tmp_path: pytest fixture to create a temporary directory.
+    """
+    pack = tmp_path / "homebrew"
+    write(pack / "feats.json", [feat("Shield Wall")])
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", str(pack))
+    window = MainWindow(autosave=False)
+    qtbot.addWidget(window)
+    assert window.catalog.get("feats", "Shield Wall") is not None
+    assert "Shield Wall" in [f["name"] for f in window.feats_tab.feats]
+
+    window.character.feats = [window.catalog.get("feats", "Weapon Focus"), window.catalog.get("feats", "Shield Wall")]
+    window.refresh_derived("feats")
+    write(pack / "feats.json", [feat("Shield Wall", prerequisite_level=5)])
+    assert window.reload_data() == ["feats"]
+    assert [f["name"] for f in window.character.feats] == ["Weapon Focus"]
+    # Only attributes downstream of feats were recomputed
+    assert "feat_availability" in window.derived.last_update
+    assert "feat_slots" not in window.derived.last_update
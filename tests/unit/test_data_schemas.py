@@ -0,0 +1,106 @@
+import pytest
+from jsonschema import Draft7Validator
+from wotr_planner.models.catalog import Catalog, LOADERS
+from wotr_planner.models.data_schemas import (
+    SCHEMAS, DataValidationError, compile_schema, validate_data, validation_errors
+)
+
+# Records that must be accepted or rejected exactly as jsonschema does
+SAMPLES = [
+    ("feats", {"name": "Dodge", "description": "", "prerequisite_stats": {"Dex": 13},
+               "prerequisite_feats": [], "prerequisite_level": 1}),
+    ("feats", {"name": "Dodge", "description": "", "prerequisite_stats": {"Dex": "13"},
+               "prerequisite_feats": [], "prerequisite_level": 1}),
+    ("feats", {"name": "Dodge", "description": "", "prerequisite_stats": {"Dex 2": 13},
+               "prerequisite_feats": [], "prerequisite_level": 1}),
+    ("feats", {"name": "Dodge", "prerequisite_stats": {}, "prerequisite_feats": [], "prerequisite_level": 1}),
+    ("feats", {"name": "Dodge", "description": "", "prerequisite_stats": {},
+               "prerequisite_feats": [1], "prerequisite_level": True}),
+    ("classes", {"name": "Fighter", "base_hp": 10, "skill_points": 2, "base_attack_bonus": "High"}),
+    ("classes", {"name": "Fighter", "base_hp": 0, "skill_points": 2, "base_attack_bonus": "Huge"}),
+    ("classes", {"name": "Fighter", "base_hp": 10, "skill_points": 2, "archetypes": [{"description": ""}]}),
+    ("classes", {"name": "Fighter", "base_hp": 10.0, "skill_points": 2, "bonus_feats": [1.0, 2]}),
+    ("classes", {"name": "Fighter", "base_hp": 10.5, "skill_points": 2, "bonus_feats": [1.5]}),
+    ("races", {"name": "Elf", "modifiers": {"Dex": 2, "Con": -2}, "traits": ["Keen Senses"]}),
+    ("races", {"name": "Elf", "modifiers": {"Dex": 2.0, "Con": -2.0}}),
+    ("races", {"name": "Elf", "modifiers": {"Luck": 2}, "traits": "Keen Senses"}),
+    ("heritages", {"name": "Basic", "race": "Elf", "skill_bonuses": {"Perception": 2.5}}),
+    ("heritages", {"name": "Basic", "skill_bonuses": {"Perception": "2"}}),
+    ("skills", {"name": "Athletics", "key_ability": "Str"}),
+    ("skills", {"name": "Athletics", "key_ability": "Strength"}),
+    ("feats", "not a record"),
+]
+
+@pytest.mark.parametrize("kind, record", SAMPLES)
+def test_compiled_validator_agrees_with_jsonschema(kind, record):
+    """
+    Test that compiled validators accept and reject the same records as jsonschema.
+    """
+    expected_valid = Draft7Validator(SCHEMAS[kind]).is_valid(record)
+    assert (compile_schema(SCHEMAS[kind])(record) is None) == expected_valid
+
+def test_whole_floats_are_converted_to_integers():
+    """
+    Test that validation replaces whole floats in integer fields with ints and leaves numbers alone.
+    """
+    data = {
+        "classes": [{"name": "Fighter", "base_hp": 10.0, "skill_points": 2.0, "bonus_feat_interval": 2.0, "bonus_feats": [1.0, 2]}],
+        "races": [{"name": "Elf", "modifiers": {"Dex": 2.0, "Con": -2.0}}],
+        "heritages": [{"name": "Basic", "race": "Elf", "skill_bonuses": {"Perception": 2.0}}],
+    }
+    validate_data(data)
+    fighter, elf = data["classes"][0], data["races"][0]
+    assert [type(fighter[key]) for key in ("base_hp", "skill_points", "bonus_feat_interval")] == [int, int, int]
+    assert [type(value) for value in fighter["bonus_feats"] + list(elf["modifiers"].values())] == [int, int, int, int]
+    # "number" fields keep the value as written
+    assert type(data["heritages"][0]["skill_bonuses"]["Perception"]) is float
+
+def test_errors_report_file_index_and_path():
+    """
+    Test that every violation names the file, the record index and the path to the field.
+    """
+    feats = [
+        {"name": "Dodge", "description": "", "prerequisite_stats": {}, "prerequisite_feats": [], "prerequisite_level": 1},
+        {"name": "Cleave", "description": "", "prerequisite_stats": {"Str": "13"},
+         "prerequisite_feats": ["Power Attack", 7], "prerequisite_level": 1},
+    ]
+    errors = validation_errors("feats", feats, source="homebrew/feats.json")
+    assert [str(e) for e in errors] == [
+        "homebrew/feats.json[1].prerequisite_stats.Str: expected number, got str",
+        "homebrew/feats.json[1].prerequisite_feats[1]: expected string, got int",
+    ]
+    assert (errors[1].index, errors[1].path) == (1, ("prerequisite_feats", 1))
+
+def test_validate_data_collects_all_errors():
+    """
+    Test that validate_data raises once with the errors of every kind.
+    """
+    with pytest.raises(DataValidationError) as info:
+        validate_data({"races": [{"traits": []}], "skills": {"name": "Athletics"}})
+    assert [str(e) for e in info.value.errors] == [
+        "races.json[0]: missing required field 'name'",
+        "skills.json[0]: expected a list of records, got dict",
+    ]
+
+def test_unsupported_keywords_are_rejected():
+    """
+    Test that schemas using keywords the compiler does not implement fail to compile.
+    """
+    with pytest.raises(ValueError):
+        compile_schema({"type": "string", "pattern": "^[A-Z]"})
+
+def test_bundled_data_is_valid():
+    """
+    Test that every bundled data file passes validation.
+    """
+    for kind, loader in LOADERS.items():
+        assert validation_errors(kind, loader()) == []
+
+def test_catalog_load_validates(monkeypatch):
+    """
+    Test that loading the catalog raises on invalid data unless validation is turned off.
+    """
+    monkeypatch.setitem(LOADERS, "feats", lambda: [{"name": "Broken"}])
+    with pytest.raises(DataValidationError):
+        Catalog.load()
+    assert Catalog.load(validate=False).get("feats", "Broken") == {"name": "Broken"}
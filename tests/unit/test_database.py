@@ -0,0 +1,167 @@
+import sqlite3
+import pytest
+from wotr_planner.db.database import CharacterRepository, connect
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.character import Character
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide a small catalog for testing.
+    """
+    return Catalog({
+        "classes": [{"name": "Fighter", "skill_points": 2}, {"name": "Wizard", "skill_points": 2}],
+        "races": [{"name": "Human"}, {"name": "Aasimar", "modifiers": {"Wis": 2}}],
+        "heritages": [
+            {"name": "Basic", "race": "Human"},
+            {"name": "Basic", "race": "Aasimar", "modifiers": {"Cha": 2}},
+        ],
+        "backgrounds": [{"name": "Scholar"}],
+        "feats": [{"name": "Power Attack"}, {"name": "Cleave", "prerequisite_feats": ["Power Attack"]}],
+    })
+
+@pytest.fixture
+def repo(tmp_path, catalog):
+    """
+    Fixture to create a repository backed by a temporary database file.
+    Args:
+        tmp_path: pytest fixture to create a temporary directory.
+        catalog: fixture providing catalog data.
+    """
+    with CharacterRepository(tmp_path / "characters.db", catalog=catalog) as repository:
+        yield repository
+
+def make_character(catalog, name="Seelah"):
+    """
+    Create a fully specified character from catalog records.
+    Args:
+        catalog: Catalog to take records from.
+        name: Character name.
+    """
+    c = Character(char_class=catalog.get("classes", "Wizard"), race=catalog.get("races", "Aasimar"))
+    c.name = name
+    c.level = 4
+    c.heritage = catalog.heritage("Aasimar", "Basic")
+    c.background = catalog.get("backgrounds", "Scholar")
+    c.archetype = "Scroll Savant"
+    c.point_buy_stats["Int"] = 17
+    c.feats = [catalog.get("feats", "Power Attack"), catalog.get("feats", "Cleave")]
+    c.skill_ranks["Knowledge(Arcana)"] = 4
+    return c
+
+def test_connection_uses_wal(tmp_path):
+    """
+    Test that connections are opened in WAL journal mode.
+    """
+    conn = connect(tmp_path / "wal.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+def test_save_and_load_round_trip(repo, catalog):
+    """
+    Test that a saved character loads back with the same choices.
+    - Records are resolved through the catalog, heritage by (race, name).
+    """
+    char_id = repo.save(make_character(catalog))
+    loaded = repo.load(char_id)
+
+    assert loaded.name == "Seelah"
+    assert loaded.char_class is catalog.get("classes", "Wizard")
+    assert loaded.heritage is catalog.heritage("Aasimar", "Basic")
+    assert loaded.background["name"] == "Scholar"
+    assert loaded.archetype == "Scroll Savant"
+    assert loaded.level == 4
+    assert loaded.point_buy_stats["Int"] == 17
+    assert loaded.stats["Cha"] == 12 # Heritage modifier applied on load
+    assert [f["name"] for f in loaded.feats] == ["Power Attack", "Cleave"]
+    assert loaded.skill_ranks["Knowledge(Arcana)"] == 4
+    assert loaded.skill_ranks["Athletics"] == 0
+    assert repo.load(char_id + 1) is None
+
+def test_save_many_and_stream(repo, catalog):
+    """
+    Test that bulk saves assign sequential IDs and stream back in order.
+    """
+    ids = repo.save_many(make_character(catalog, f"Build {i}") for i in range(50))
+    assert ids == list(range(1, 51))
+    assert repo.count() == 50
+
+    streamed = list(repo.iter_characters(10, 12))
+    assert [char_id for char_id, _ in streamed] == [10, 11, 12]
+    assert all(len(c.feats) == 2 for _, c in streamed)
+    assert [c.name for _, c in streamed] == ["Build 9", "Build 10", "Build 11"]
+
+    # After a gap in the IDs, each new row still gets its own feats
+    repo.delete(50)
+    more = [make_character(catalog, "Extra")]
+    more[0].feats = more[0].feats[:1]
+    assert repo.save_many(more + [make_character(catalog, "Last")]) == [51, 52]
+    assert len(repo.load(51).feats) == 1 and repo.load(52).name == "Last"
+
+def test_delete_cascades(repo, catalog):
+    """
+    Test that deleting a character removes its feats and skills.
+    """
+    char_id = repo.save(make_character(catalog))
+    repo.delete(char_id)
+
+    assert repo.count() == 0
+    assert repo.conn.execute("SELECT COUNT(*) FROM character_feats").fetchone()[0] == 0
+
+def test_ids_are_never_reused(tmp_path, repo, catalog):
+    """
+    Test that deleted IDs are not reused and a second connection's saves do not collide.
+    """
+    first, last = repo.save_many([make_character(catalog), make_character(catalog)])
+    repo.delete(last)
+    with CharacterRepository(tmp_path / "characters.db", catalog=catalog) as other:
+        assert other.save(make_character(catalog)) == last + 1
+    assert repo.save(make_character(catalog)) == last + 2
+    assert repo.count() == 3
+
+def test_unknown_records_load_as_stubs(repo, catalog):
+    """
+    Test that names missing from the catalog are kept rather than dropped.
+    """
+    c = make_character(catalog)
+    c.feats.append({"name": "Homebrew Feat"})
+    loaded = repo.load(repo.save(c))
+
+    assert loaded.feats[-1] == {"name": "Homebrew Feat"}
+
+def test_multiclass_round_trip_and_dedupe(repo, catalog):
+    """
+    Test that per-level classes are saved and keep a multiclass build apart from its main class.
+    """
+    fighter, wizard = catalog.get("classes", "Fighter"), catalog.get("classes", "Wizard")
+    multiclass = Character(char_class=fighter, race=catalog.get("races", "Human"))
+    multiclass.level = 4
+    for level in (2, 3):
+        multiclass.set_level_class(level, wizard)
+    plain = Character(char_class=fighter, race=catalog.get("races", "Human"))
+    plain.level = 4
+
+    ids = repo.save_many([multiclass, plain], dedupe=True)
+    assert ids[0] != ids[1]
+    loaded = repo.load(ids[0])
+    assert [c["name"] for c in loaded.class_levels.classes] == ["Fighter", "Wizard", "Wizard", "Fighter"]
+    assert loaded.class_levels.classes[1] is wizard
+    assert repo.load(ids[1]).class_levels is None
+
+def test_migrates_legacy_table(tmp_path, catalog):
+    """
+    Test that a database created by the original init_db gains the new columns.
+    """
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        "CREATE TABLE characters (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, race TEXT, class TEXT, level INTEGER)"
+    )
+    legacy.execute("INSERT INTO characters (name, race, class, level) VALUES ('Old', 'Human', 'Fighter', 2)")
+    legacy.commit()
+    legacy.close()
+
+    with CharacterRepository(path, catalog=catalog) as repository:
+        loaded = repository.load(1)
+    assert loaded.name == "Old"
+    assert loaded.point_buy_stats["Str"] == 10
@@ -0,0 +1,130 @@
+import pytest
+from wotr_planner.models.character import Character
+from wotr_planner.models.derived_graph import DerivedGraph, build_character_graph
+
+def make_diamond(calls):
+    """
+    Build a diamond-shaped graph: a -> (b, c) -> d, plus an unrelated node e.
+    Args:
+        calls: List that records node names as they are computed.
+    Returns:
+        DerivedGraph: The graph.
+    """
+    graph = DerivedGraph(["a", "x"])
+    graph.add_node("b", ["a"], lambda: calls.append("b"))
+    graph.add_node("c", ["a"], lambda: calls.append("c"))
+    graph.add_node("d", ["b", "c"], lambda: calls.append("d"))
+    graph.add_node("e", ["x"], lambda: calls.append("e"))
+    return graph
+
+def test_update_recomputes_downstream_once_in_order():
+    """
+    Test that a change recomputes each downstream node exactly once, after its inputs.
+    - Unrelated nodes are not recomputed.
+    """
+    calls = []
+    graph = make_diamond(calls)
+    recomputed = graph.update("a")
+
+    assert recomputed == ["b", "c", "d"]
+    assert calls == ["b", "c", "d"]
+    assert graph.last_passes == 1 and set(graph.compute_counts.values()) == {1}
+
+def test_explain_traces_back_to_inputs():
+    """
+    Test that explain reports the chains of changes that triggered a node.
+    """
+    graph = make_diamond([])
+    graph.update("a")
+
+    assert graph.last_update["d"] == ["b", "c"]
+    assert graph.explain("d") == [["a", "b", "d"], ["a", "c", "d"]]
+    assert graph.explain("e") == []
+
+def test_add_node_rejects_unknown_input():
+    """
+    Test that nodes cannot depend on unregistered names, keeping the graph acyclic.
+    """
+    graph = DerivedGraph(["a"])
+    with pytest.raises(ValueError):
+        graph.add_node("b", ["missing"], lambda: None)
+    with pytest.raises(ValueError):
+        graph.update("missing")
+
+def test_character_graph_skill_pool_follows_int():
+    """
+    Test that lowering Int recomputes the skill pool and trims ranks.
+    - Level 2 Fighter with Int 14 has (2 + 2) * 2 = 8 ranks; Int 10 leaves 4.
+    """
+    c = Character(char_class={"name": "Fighter", "skill_points": 2}, race={"name": "Human"})
+    c.level = 2
+    c.point_buy_stats["Int"] = 14
+    graph = build_character_graph(c, [], {})
+    graph.evaluate()
+    c.skill_ranks["Athletics"] = 2
+    c.skill_ranks["Perception"] = 2
+    c.skill_ranks["Stealth"] = 2
+    graph.update("skill_ranks")
+    assert graph.value("skill_pool") == 2
+
+    c.point_buy_stats["Int"] = 10
+    recomputed = graph.update("point_buy")
+
+    assert "trait_bonuses" not in recomputed
+    assert "feat_slots" not in recomputed
+    assert graph.value("skill_pool") == 0
+    assert sum(c.skill_ranks.values()) == 4
+    assert c.skills["Perception"] == 0 # Trimmed first: last in skill order
+
+def test_character_graph_feat_availability_follows_stats():
+    """
+    Test that feat availability is revalidated when final stats change.
+    """
+    all_feats = [{"name": "Power Attack", "prerequisite_stats": {"Str": 13}}]
+    c = Character(char_class={"name": "Fighter"}, race={"name": "Human"})
+    c.point_buy_stats["Str"] = 14
+    c.feats = [{"name": "Power Attack"}]
+    graph = build_character_graph(c, all_feats, {})
+    graph.evaluate()
+    assert graph.value("final_stats")["Str"] == 14
+
+    c.point_buy_stats["Str"] = 10
+    graph.update("point_buy")
+
+    assert graph.value("feat_availability")["removed"] == {"Power Attack"}
+    assert c.feats == []
+
+def test_character_graph_removed_feat_modifiers_leave_final_stats():
+    """
+    Test that final stats drop a removed feat's modifiers within the same update.
+    """
+    all_feats = [{"name": "Bull Strength", "prerequisite_stats": {"Dex": 13}, "modifiers": {"Str": 2}}]
+    c = Character(char_class={"name": "Fighter"}, race={"name": "Human"})
+    c.point_buy_stats["Dex"] = 14
+    c.feats = list(all_feats)
+    graph = build_character_graph(c, all_feats, {})
+    graph.evaluate()
+    assert graph.value("final_stats")["Str"] == 12
+
+    c.point_buy_stats["Dex"] = 10
+    recomputed = graph.update("point_buy")
+
+    assert graph.value("feat_prerequisites") == {"Bull Strength"}
+    assert graph.value("final_stats")["Str"] == 10
+    assert "final_stats" in recomputed and "feats" in graph.last_update["final_stats"]
+    # The removal took a second pass; both passes' triggers are kept
+    assert graph.last_passes == 2 and graph.compute_counts["final_stats"] == 2
+    assert graph.last_update["final_stats"] == ["point_buy", "feats"]
+    assert graph.explain("final_stats") == [["point_buy", "final_stats"], ["feats", "final_stats"]]
+
+def test_constraints_only_change_raw_inputs():
+    """
+    Test that constraints must write raw inputs and stop with an error if they never settle.
+    """
+    graph = DerivedGraph(("a",))
+    graph.add_node("double", ("a",), lambda: 2)
+    with pytest.raises(ValueError):
+        graph.add_constraint("bad", ("a",), ("double",), set)
+    graph.add_constraint("restless", ("double",), ("a",), lambda: {"a"})
+    with pytest.raises(RuntimeError):
+        graph.update("a")
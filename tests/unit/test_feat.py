@@ -0,0 +1,70 @@
+import pickle
+from wotr_planner.models.character import Character
+from wotr_planner.models.feat import FeatSet, feat_id, feat_name, required_mask
+
+POWER_ATTACK = {"name": "Power Attack"}
+CLEAVE = {"name": "Cleave", "prerequisite_feats": ["Power Attack"]}
+DODGE = {"name": "Dodge"}
+
+def test_interned_ids_are_stable():
+    """
+    Test that a name keeps its ID and prerequisite masks set the prerequisites' bits.
+    """
+    assert feat_id("Power Attack") == feat_id("Power Attack")
+    assert feat_name(feat_id("Cleave")) == "Cleave"
+    assert feat_id("Power Attack") != feat_id("Cleave")
+    assert required_mask(CLEAVE) == 1 << feat_id("Power Attack")
+    assert required_mask(DODGE) == 0
+
+def test_feat_set_is_an_ordered_set_of_definitions():
+    """
+    Test insertion order, duplicate names, membership by name or dict, and removal.
+    """
+    feats = FeatSet([DODGE, POWER_ATTACK, {"name": "Dodge", "description": "again"}])
+    assert feats.names() == ["Dodge", "Power Attack"]
+    assert feats[0] is DODGE and feats[-1] is POWER_ATTACK and feats[:1] == [DODGE]
+    assert "Power Attack" in feats and POWER_ATTACK in feats and "Cleave" not in feats
+    assert "Never Interned Feat" not in feats and 42 not in feats
+    feats.insert(0, CLEAVE)
+    assert feats.ids() == (feat_id("Cleave"), feat_id("Dodge"), feat_id("Power Attack"))
+    assert feats.discard("Dodge") and not feats.discard("Dodge")
+    assert feats.bits == 1 << feat_id("Cleave") | 1 << feat_id("Power Attack")
+    del feats[0]
+    assert feats == [POWER_ATTACK]
+    feats.reverse()
+    assert list(feats) == [POWER_ATTACK]
+
+def test_prerequisite_checks_and_lookup():
+    """
+    Test bitset prerequisite checks and finding the chosen feats' definitions.
+    """
+    feats = FeatSet([POWER_ATTACK])
+    assert feats.meets(CLEAVE) and feats.meets(DODGE)
+    assert not FeatSet([DODGE]).meets(CLEAVE)
+    catalog = [DODGE, CLEAVE, {"name": "Power Attack", "prerequisite_stats": {"Str": 13}}]
+    assert feats.definitions(catalog) == {"Power Attack": catalog[2]}
+    assert FeatSet().definitions(catalog) == {}
+
+def test_comparison_and_pickling():
+    """
+    Test comparison by names in order and pickling by definition.
+    """
+    a = FeatSet([POWER_ATTACK, CLEAVE])
+    b = FeatSet([{"name": "Power Attack"}, {"name": "Cleave"}])
+    assert a == b and a != FeatSet([CLEAVE, POWER_ATTACK])
+    assert a == [POWER_ATTACK, CLEAVE] and a != [POWER_ATTACK]
+    copy = pickle.loads(pickle.dumps(a))
+    assert isinstance(copy, FeatSet) and copy == a and copy[1] == CLEAVE
+
+def test_character_feats_assignment_converts():
+    """
+    Test that assigning a list to Character.feats stores a FeatSet and removal uses it.
+    """
+    character = Character()
+    character.feats = [POWER_ATTACK, CLEAVE, POWER_ATTACK]
+    assert isinstance(character.feats, FeatSet) and len(character.feats) == 2
+    character.stats["Str"] = 13
+    # Removing Power Attack cascades to Cleave through the bitset prerequisite check
+    assert character.remove_feat("Power Attack")
+    assert character.validate_feats([POWER_ATTACK, CLEAVE]) == {"Cleave"}
+    assert character.feats == []
@@ -0,0 +1,156 @@
+import gc
+import itertools
+import random
+import pytest
+from wotr_planner.models import feat_planner
+from wotr_planner.models.catalog import Catalog, default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.feat_planner import FeatPlanner, plan_feats, planner_for
+from wotr_planner.models.point_buy import POINT_BUY_BUDGET, cheapest_point_buy, point_cost, points_spent
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+def test_point_buy_costs_and_cheapest_buy():
+    """
+    Test point costs and the cheapest buy, dumping unrequired stats only when needed.
+    """
+    assert [point_cost(v) for v in (7, 10, 14, 18)] == [-4, 0, 5, 17]
+    assert cheapest_point_buy({"Str": 13}) == {"Str": 13, "Dex": 10, "Con": 10, "Int": 10, "Wis": 10, "Cha": 10}
+    buy = cheapest_point_buy({"Str": 18, "Dex": 14, "Con": 14})
+    assert points_spent(buy) == POINT_BUY_BUDGET and (buy["Wis"], buy["Cha"]) == (10, 8)
+    assert cheapest_point_buy({"Str": 19}) is None
+    assert cheapest_point_buy({"Str": 18, "Dex": 18})["Cha"] == 7
+    assert cheapest_point_buy({"Str": 18, "Dex": 18, "Con": 18}) is None
+
+def test_human_fighter_takes_chain_at_level_1(catalog):
+    """
+    Test that a Human Fighter's three level 1 slots fit Power Attack and Cleave.
+    """
+    planner = FeatPlanner(catalog, catalog.get("races", "Human"), char_class=catalog.get("classes", "Fighter"))
+    plan = planner.plan("Cleave")
+    assert plan.feasible and plan.level == 1
+    assert plan.steps == [(1, "Power Attack"), (1, "Cleave")]
+    assert plan.point_buy["Str"] == 13
+    assert plan.to_dict()["points_spent"] == 3
+
+def test_slots_and_race_modifiers_delay_and_cost(catalog):
+    """
+    Test that a single-slot class waits for the next feat level and racial penalties raise the buy.
+    """
+    planner = FeatPlanner(catalog, catalog.get("races", "Gnome"), char_class=catalog.get("classes", "Wizard"))
+    plan = planner.plan(["Cleave", "Dodge"])
+    assert plan.level == 5 and plan.slots_used == 3
+    assert plan.steps[0] == (1, "Power Attack") and plan.steps[-1][0] == 5
+    # Gnomes have -2 Str
+    assert plan.point_buy["Str"] == 15 and plan.point_buy["Dex"] == 13
+
+def test_owned_and_unreachable_feats(catalog):
+    """
+    Test that owned feats are skipped but keep their slots, and impossible plans give a reason.
+    """
+    planner = FeatPlanner(catalog, catalog.get("races", "Elf"), char_class=catalog.get("classes", "Wizard"))
+    plan = planner.plan("Cleave", owned=["Power Attack"])
+    assert plan.steps == [(3, "Cleave")]
+    assert not planner.plan("LvlDummy", max_level=10).feasible
+    assert planner.plan("LvlDummy").level == 20
+    assert "Unknown feat" in planner.plan("Whirlwind Attack").reason
+
+def test_prerequisite_cycles_and_memoized_plans():
+    """
+    Test that prerequisite cycles are reported and repeated queries reuse the plan.
+    """
+    catalog = Catalog({
+        "races": [{"name": "Human"}],
+        "classes": [{"name": "Fighter", "bonus_feat_interval": 1}],
+        "feats": [
+            {"name": "A", "prerequisite_feats": ["B"]},
+            {"name": "B", "prerequisite_feats": ["A"]},
+            {"name": "C", "prerequisite_feats": ["D", "E"]},
+            {"name": "D", "prerequisite_feats": ["E"]},
+            {"name": "E"},
+        ],
+    })
+    planner = planner_for(catalog, catalog.get("races", "Human"), char_class=catalog.get("classes", "Fighter"))
+    assert "cycle" in planner.plan("A").reason
+    plan = planner.plan("C")
+    assert [name for _, name in plan.steps] == ["E", "D", "C"]
+    assert planner.plan(["C"]) is plan
+    assert planner_for(catalog, catalog.get("races", "Human"), char_class=catalog.get("classes", "Fighter")) is planner
+
+def earliest_level(planner, needed, used, max_level):
+    """
+    Find the earliest level by exhaustive search: try levels in increasing order, and every
+    assignment of levels to the needed feats that respects prerequisites and feat slots.
+    Args:
+        planner: FeatPlanner providing feats and slots.
+        needed: Feat names to take.
+        used: Slots already taken by owned feats.
+        max_level: Highest level tried.
+    """
+    feats = sorted(needed)
+    for last in range(1, max_level + 1):
+        for levels in itertools.product(range(1, last + 1), repeat=len(feats)):
+            taken = dict(zip(feats, levels))
+            if all(
+                taken[f] >= planner.feats[f].get("prerequisite_level", 1)
+                and all(taken.get(req, 0) <= taken[f] for req in planner.feats[f].get("prerequisite_feats", []))
+                for f in feats
+            ) and all(used + sum(level <= c for level in levels) <= planner.slots[c] for c in range(1, last + 1)):
+                return last
+    return None
+
+def test_plan_level_is_the_earliest():
+    """
+    Test that planned levels match an exhaustive search when branches compete for slots.
+    """
+    rng = random.Random(7)
+    for _ in range(150):
+        names = [f"F{i}" for i in range(rng.randint(3, 6))]
+        feats = [
+            {"name": name, "prerequisite_level": rng.choice([1, 1, 2, 3, 5]),
+             "prerequisite_feats": [req for req in names[:i] if rng.random() < 0.4]}
+            for i, name in enumerate(names)
+        ]
+        catalog = Catalog({
+            "races": [{"name": "Human"}],
+            "classes": [{"name": "Fighter", "bonus_feat_interval": rng.choice([1, 2, 3])}],
+            "feats": feats,
+        })
+        planner = FeatPlanner(catalog, catalog.get("races", "Human"), char_class=catalog.get("classes", "Fighter"))
+        owned = {names[0]} if rng.random() < 0.3 else set()
+        # Two targets, so separate branches compete for the slots
+        targets = rng.sample(names[1:], 2)
+        needed = (planner.closure(targets[0]) | planner.closure(targets[1])) - owned
+        plan = planner.plan(targets, owned, max_level=5)
+        expected = earliest_level(planner, needed, len(owned), 5)
+        if expected is None:
+            assert not plan.feasible
+        else:
+            assert plan.level == max([expected] + [planner.requirements[t][0] for t in targets])
+
+def test_planners_are_dropped_with_their_catalog():
+    """
+    Test that the shared planners do not keep a discarded catalog alive.
+    """
+    catalog = Catalog({"races": [{"name": "Human"}], "feats": [{"name": "Dodge"}]})
+    planner_for(catalog, catalog.get("races", "Human"))
+    assert catalog in feat_planner._planners
+    count = len(feat_planner._planners)
+    del catalog
+    gc.collect()
+    assert len(feat_planner._planners) == count - 1
+
+def test_plan_feats_for_character(catalog):
+    """
+    Test planning from a character's race, class and current feats.
+    """
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Human"))
+    character.feats = [catalog.get("feats", "Dodge")]
+    plan = plan_feats(character, "Cleave", catalog)
+    assert plan.level == 1 and plan.slots_used == 2
+    assert plan.point_buy["Dex"] == 13
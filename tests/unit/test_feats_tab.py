@@ -1,6 +1,7 @@
 import pytest
 from PyQt6.QtCore import Qt
 from jsonschema import validate
+from wotr_planner.models.catalog import Catalog
 from wotr_planner.models.character import Character
 from wotr_planner.models.feat_schema import feat_schema
 from wotr_planner.ui.feats_tab import FeatsTab
@@ -39,40 +40,31 @@ def sample_feats():
     return feats
 
 @pytest.fixture
-def feats_tab(qtbot, monkeypatch, sample_feats):
+def feats_tab(qtbot, sample_feats):
     """
     Fixture to create a FeatsTab with sample feats for testing.
     Args:
         qtbot: QtBot instance
-        monkeypatch: MonkeyPatch instance
         sample_feats: List of sample feats
     """
-    from wotr_planner.ui import feats_tab as feats_tab_module
-    # Patch the load_feats function to return the sample feats
-    monkeypatch.setattr(feats_tab_module, "load_feats", lambda: sample_feats)
     c = Character()
     c.level = 1
     c.stats["Str"] = 13
     c.stats["Dex"] = 13
-    tab = FeatsTab(c)
+    tab = FeatsTab(c, Catalog({"feats": sample_feats}))
     qtbot.addWidget(tab)
     return tab
 
-def test_update_feats_no_available_feats(qtbot, monkeypatch):
+def test_update_feats_no_available_feats(qtbot):
     """
     Test that the FeatsTab correctly handles the case where no feats are available due to stat prerequisites.
     Args:
         qtbot: QtBot instance
-        monkeypatch: MonkeyPatch instance
     """
-    from wotr_planner.ui import feats_tab as feats_tab_module
-    # Patch the load_feats function to return a feat with high stat prerequisite
-    monkeypatch.setattr(feats_tab_module, "load_feats", lambda: [
-        {"name": "HighDexFeatDummy", "prerequisite_stats": {"Dex": 18}}
-    ])
     c = Character()
     c.stats["Dex"] = 10
-    tab = FeatsTab(c)
+    # A single feat with a high stat prerequisite
+    tab = FeatsTab(c, Catalog({"feats": [{"name": "HighDexFeatDummy", "prerequisite_stats": {"Dex": 18}}]}))
     qtbot.addWidget(tab)
     assert tab.feat_combo.count() == 1
     assert tab.feat_combo.itemText(0) == "No feats available placeholder text"
@@ -0,0 +1,110 @@
+import json
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.integrity import check_integrity, feat_cycles, main
+
+def feat(name, *prerequisites):
+    """
+    Build a feat record with the given prerequisite feats.
+    """
+    return {"name": name, "description": "", "prerequisite_stats": {},
+            "prerequisite_feats": list(prerequisites), "prerequisite_level": 1}
+
+def consistent_data():
+    """
+    Build game data in which every reference resolves.
+    """
+    return {
+        "feats": [feat("Power Attack"), feat("Cleave", "Power Attack")],
+        "races": [{"name": "Elf", "traits": ["Keen Senses"]}],
+        "heritages": [{"name": "Basic", "race": "Elf", "traits": ["Elven Magic"], "traits_removed": ["Keen Senses"]}],
+        "traits": [{"name": "Keen Senses"}, {"name": "Elven Magic"}],
+        "skills": [{"name": "Athletics", "key_ability": "Str"}],
+        "classes": [{
+            "name": "Fighter", "base_hp": 10, "skill_points": 2,
+            "class_feats": [{}, {"Power Attack": 2}], "class_skills": ["Athletics"],
+        }],
+    }
+
+def test_consistent_data_has_no_issues():
+    """
+    Test that data whose references all resolve reports nothing.
+    """
+    assert check_integrity(consistent_data()) == []
+
+def test_dangling_references_are_reported():
+    """
+    Test that every kind of unresolved reference is reported with its record and field.
+    """
+    data = consistent_data()
+    data["feats"][1]["prerequisite_feats"].append("Weapon Focus")
+    data["heritages"][0]["race"] = "Elff"
+    data["heritages"][0]["traits_removed"] = ["Keen Sense"]
+    data["races"][0]["traits"].append("Darkvision")
+    data["classes"][0]["class_feats"].append({"Cleave": 3, "Bravery": 3})
+    data["classes"][0]["class_skills"].append("Mobility")
+    issues = [str(issue) for issue in check_integrity(data)]
+    assert issues == [
+        "classes[0] 'Fighter' class_feats: unknown feat 'Bravery'",
+        "classes[0] 'Fighter' class_skills: unknown skill 'Mobility'",
+        "races[0] 'Elf' traits: unknown trait 'Darkvision'",
+        "heritages[0] 'Basic' race: unknown race 'Elff'",
+        "heritages[0] 'Basic' traits_removed: unknown trait 'Keen Sense'",
+        "feats[1] 'Cleave' prerequisite_feats: unknown feat 'Weapon Focus'",
+    ]
+
+def test_duplicate_names_are_reported():
+    """
+    Test that repeated names are reported, with heritages only clashing within a race.
+    """
+    data = consistent_data()
+    data["feats"].append(feat("Cleave"))
+    data["races"].append({"name": "Human"})
+    data["heritages"].append({"name": "Basic", "race": "Human"})
+    data["heritages"].append({"name": "Basic", "race": "Elf"})
+    issues = [str(issue) for issue in check_integrity(data)]
+    assert issues == [
+        "heritages[2] 'Basic' name: duplicate name for race",
+        "feats[2] 'Cleave' name: duplicate name",
+    ]
+
+def test_prerequisite_cycles():
+    """
+    Test that each prerequisite cycle is found once, including self-references.
+    """
+    feats = [
+        feat("A", "B"), feat("B", "C"), feat("C", "A", "D"), feat("D"),
+        feat("E", "E"), feat("F", "D", "Missing"),
+    ]
+    assert feat_cycles(feats) == [["A", "B", "C", "A"], ["E", "E"]]
+    assert feat_cycles([feat("A"), feat("B", "A"), feat("C", "A", "B")]) == []
+
+def test_long_prerequisite_chain_does_not_recurse():
+    """
+    Test that a very deep prerequisite chain is checked without hitting the recursion limit.
+    """
+    feats = [feat("F0")] + [feat(f"F{i}", f"F{i - 1}") for i in range(1, 20000)]
+    feats[0]["prerequisite_feats"] = ["F19999"]
+    cycles = feat_cycles(feats)
+    assert len(cycles) == 1 and len(cycles[0]) == 20001
+
+def test_catalog_is_accepted():
+    """
+    Test that a Catalog can be checked directly.
+    """
+    assert check_integrity(Catalog(consistent_data())) == []
+
+def test_command_line(tmp_path, capsys):
+    """
+    Test that the command-line tool checks a data directory and sets the exit status.
+    """
+    for kind, records in consistent_data().items():
+        (tmp_path / f"{kind}.json").write_text(json.dumps(records), encoding="utf-8")
+    assert main(["--base", str(tmp_path)]) == 0
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "heritages.json").write_text(json.dumps([{"name": "Dark", "race": "Drow"}]), encoding="utf-8")
+    assert main(["--base", str(tmp_path), "--json", str(pack)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert json.loads(lines[-1]) == {
+        "kind": "heritages", "index": 1, "name": "Dark", "field": "race", "message": "unknown race 'Drow'",
+    }
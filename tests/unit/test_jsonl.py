@@ -0,0 +1,133 @@
+import io
+import json
+import pytest
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.db.jsonl import export_jsonl, import_jsonl, iter_jsonl
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.serialization import BuildValidationError, character_from_dict, character_to_dict
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide a small catalog for testing.
+    """
+    return Catalog({
+        "classes": [{"name": "Fighter", "skill_points": 2}],
+        "races": [{"name": "Human"}, {"name": "Elf", "modifiers": {"Dex": 2, "Con": -2}}],
+        "heritages": [{"name": "Basic", "race": "Elf"}],
+        "backgrounds": [],
+        "feats": [{"name": "Power Attack"}, {"name": "Dodge"}],
+        "skills": [{"name": "Athletics"}, {"name": "Mobility"}],
+    })
+
+def make_build(catalog, name):
+    """
+    Create an Elf Fighter with one feat and one skill rank.
+    Args:
+        catalog: Catalog to take records from.
+        name: Character name.
+    """
+    c = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Elf"))
+    c.name = name
+    c.heritage = catalog.heritage("Elf", "Basic")
+    c.level = 3
+    c.point_buy_stats["Dex"] = 16
+    c.feats = [catalog.get("feats", "Dodge")]
+    c.skill_ranks["Mobility"] = 3
+    return c
+
+def test_character_dict_round_trip(catalog):
+    """
+    Test that a serialized character rebuilds with the same choices.
+    """
+    data = character_to_dict(make_build(catalog, "Kanerah"))
+    assert data["feats"] == ["Dodge"]
+    assert data["skill_ranks"] == {"Mobility": 3}
+
+    rebuilt = character_from_dict(json.loads(json.dumps(data)), catalog)
+    assert character_to_dict(rebuilt) == data
+    assert rebuilt.stats["Dex"] == 18
+
+@pytest.mark.parametrize("field, value", [
+    ("race", "Goblin"),
+    ("heritage", "Missing"),
+    ("feats", ["Whirlwind"]),
+    ("skill_ranks", {"Flying": 1}),
+    ("level", 0),
+    ("point_buy", [10, 10]),
+    ("heritage", ["Basic"]),
+    ("name", ["x"]),
+    ("feats", [["Dodge"]]),
+    ("level", True),
+    ("level", 21),
+    ("point_buy", {"Str": 99}),
+    ("point_buy", {"Str": 6}),
+    ("skill_ranks", {"Mobility": -50}),
+    ("skill_ranks", {"Mobility": 4}),
+])
+def test_character_from_dict_rejects_unknown_references(catalog, field, value):
+    """
+    Test that builds naming unknown or malformed data are rejected.
+    """
+    data = character_to_dict(make_build(catalog, "Bad"))
+    data[field] = value
+    with pytest.raises(BuildValidationError):
+        character_from_dict(data, catalog)
+
+def test_export_and_import_stream(tmp_path, catalog):
+    """
+    Test exporting builds to JSONL and importing them in batches with progress.
+    """
+    path = tmp_path / "builds.jsonl"
+    written = export_jsonl((make_build(catalog, f"Build {i}") for i in range(25)), path)
+    assert written == 25
+
+    calls = []
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        result = import_jsonl(path, repo, batch_size=10, progress=lambda *args: calls.append(args))
+        assert result.imported == 25
+        assert result.error_count == 0
+        assert repo.count() == 25
+        assert repo.load(25).name == "Build 24"
+
+    # Two full batches, the final partial batch and a final report
+    assert [imported for _, _, imported in calls] == [10, 20, 25]
+    assert calls[-1][0] == calls[-1][1] == path.stat().st_size
+
+def test_import_skips_invalid_lines(tmp_path, catalog):
+    """
+    Test that invalid lines are reported with their line numbers and skipped.
+    """
+    good = json.dumps(character_to_dict(make_build(catalog, "Good")))
+    path = tmp_path / "mixed.jsonl"
+    path.write_text("\n".join([good, "{not json", "", json.dumps({"race": "Orc"}), good]) + "\n", encoding="utf-8")
+
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        result = import_jsonl(path, repo)
+    assert result.imported == 2
+    assert result.error_count == 2
+    assert result.errors[0].startswith("line 2:")
+    assert result.errors[1] == "line 4: Unknown race: Orc"
+
+def test_import_skips_malformed_values(tmp_path, catalog):
+    """
+    Test that a line with wrongly typed or out-of-range values is reported while the rest import.
+    """
+    good = character_to_dict(make_build(catalog, "Good"))
+    bad = [dict(good, heritage=["x"]), dict(good, name=["x"]), dict(good, level=True), dict(good, skill_ranks={"Mobility": -50})]
+    path = tmp_path / "malformed.jsonl"
+    path.write_text("\n".join(json.dumps(build) for build in [good, *bad, good]) + "\n", encoding="utf-8")
+
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        result = import_jsonl(path, repo)
+        assert repo.count() == 2
+    assert result.imported == 2 and result.error_count == 4
+    assert [error.split(":")[0] for error in result.errors] == ["line 2", "line 3", "line 4", "line 5"]
+
+def test_iter_jsonl_raises_without_result(catalog):
+    """
+    Test that iter_jsonl raises on the first invalid line when not collecting errors.
+    """
+    with pytest.raises(BuildValidationError, match="line 1"):
+        list(iter_jsonl(io.StringIO('{"race": "Orc"}\n'), catalog))
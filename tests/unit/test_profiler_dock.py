@@ -0,0 +1,111 @@
+import csv
+import tracemalloc
+import pytest
+from PyQt6.QtWidgets import QLabel, QWidget
+from wotr_planner.ui.main_window import PROFILED_HANDLERS, MainWindow
+from wotr_planner.ui.profiler_dock import COLUMNS, HandlerProfiler, ProfileTableModel
+
+@pytest.fixture
+def window(qtbot, monkeypatch):
+    """
+    Fixture to create a MainWindow in developer mode over the bundled data.
+    Args:
+        qtbot: pytest-qt fixture for handling Qt widgets.
+        monkeypatch: pytest fixture to hide installed data packs.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    window = MainWindow(autosave=False, developer=True)
+    qtbot.addWidget(window)
+    return window
+
+def test_profiler_records_widget_churn(qtbot):
+    """
+    Test that a record counts widgets created and destroyed, including deleteLater.
+    """
+    host = QWidget()
+    qtbot.addWidget(host)
+    old = QLabel("old", host)
+    profiler = HandlerProfiler()
+
+    def handler():
+        QLabel("a", host)
+        QLabel("b", host)
+        old.deleteLater()
+        return "done"
+
+    assert profiler.wrap("handler", handler)() == "done"
+    [record] = profiler.records
+    assert record["handler"] == "handler" and record["depth"] == 0
+    assert (record["widgets_created"], record["widgets_destroyed"]) == (2, 1)
+    assert record["wall_ms"] >= 0 and record["cpu_ms"] >= 0
+    profiler.close()
+
+def test_nested_handlers_and_rolling_window(qtbot):
+    """
+    Test that nested calls record their depth and the table keeps only the newest records.
+    """
+    profiler = HandlerProfiler(max_records=3)
+    model = ProfileTableModel(profiler)
+    inner = profiler.wrap("inner", lambda: None)
+    outer = profiler.wrap("outer", inner)
+    outer()
+    assert [(r["handler"], r["depth"]) for r in profiler.records] == [("inner", 1), ("outer", 0)]
+    outer()
+    assert model.rowCount() == 3
+    assert [model.index(row, 0).data() for row in range(3)] == ["outer", "inner", "outer"]
+    profiler.close()
+
+def test_deletes_are_flushed_by_the_outermost_call(qtbot):
+    """
+    Test that a nested call does not flush deletes the outer handler's widgets depend on.
+    """
+    host = QWidget()
+    qtbot.addWidget(host)
+    profiler = HandlerProfiler()
+    doomed = QLabel("doomed", host)
+    inner = profiler.wrap("inner", doomed.deleteLater)
+
+    def outer():
+        inner()
+        # Still alive until the outermost call ends
+        return doomed.text()
+
+    assert profiler.wrap("outer", outer)() == "doomed"
+    assert [(r["handler"], r["widgets_destroyed"]) for r in profiler.records] == [("inner", 0), ("outer", 1)]
+    profiler.close()
+
+def test_main_window_handlers_are_profiled(window):
+    """
+    Test that developer mode records signal-driven handler calls and exports them as CSV.
+    """
+    window.races_tab.race_combo.setCurrentIndex(3)
+    window.stats_tab.stat_widgets["Str"].setValue(window.stats_tab.stat_widgets["Str"].value() + 1)
+    handlers = [r["handler"] for r in window.profiler.records]
+    assert "on_race_changed" in handlers and "on_stats_changed" in handlers
+    assert set(handlers) <= set(PROFILED_HANDLERS)
+    assert window.profiler_dock.model.rowCount() == len(window.profiler.records)
+    window.close()
+    assert not tracemalloc.is_tracing()
+
+def test_export_csv(window, tmp_path):
+    """
+    Test that records are exported with one column per table column.
+    """
+    window.on_class_changed()
+    path = tmp_path / "profile.csv"
+    window.profiler.export_csv(path)
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == [field for _, field in COLUMNS]
+    assert rows[-1][0] == "on_class_changed"
+
+def test_developer_mode_is_off_by_default(qtbot, monkeypatch):
+    """
+    Test that handlers are not wrapped unless developer mode is enabled.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    monkeypatch.delenv("WOTR_PLANNER_DEV", raising=False)
+    window = MainWindow(autosave=False)
+    qtbot.addWidget(window)
+    assert window.profiler is None
+    assert "on_race_changed" not in vars(window)
@@ -0,0 +1,121 @@
+import pytest
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.combat import combat_sheet
+from wotr_planner.models.progression import ClassLevels, class_progression
+from wotr_planner.models.serialization import BuildValidationError, character_from_dict, character_to_dict
+from wotr_planner.models.skill_allocation import skill_point_budget
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+@pytest.fixture
+def classes(catalog):
+    """
+    Fixture to provide the bundled classes by name.
+    Args:
+        catalog: fixture providing catalog data.
+    """
+    return {c["name"]: c for c in catalog.records("classes")}
+
+def brute_force(classes, level, field):
+    """
+    Sum a field from each class's table at the class levels reached, without prefix sums.
+    Args:
+        classes: Class taken at each character level.
+        level: Character level.
+        field: Total name.
+    """
+    counts = {}
+    for char_class in classes[:level]:
+        counts[char_class["name"]] = counts.get(char_class["name"], 0) + 1
+    by_name = {c["name"]: c for c in classes}
+    return sum(class_progression(by_name[name]).total(field, lvl) for name, lvl in counts.items())
+
+def test_single_class_levels_match_class_tables(classes):
+    """
+    Test that one class at every level gives that class's own tables.
+    """
+    fighter = classes["Fighter"]
+    levels = ClassLevels([fighter] * 20)
+    table = class_progression(fighter)
+    for field in ("bab", "bonus_feats", "skill_points", "hp", "Fortitude", "Will"):
+        assert [levels.total(field, lvl) for lvl in range(21)] == [table.total(field, lvl) for lvl in range(21)]
+
+def test_multiclass_totals_stack_class_levels(classes):
+    """
+    Test that totals add each class's values at the class level reached.
+    """
+    order = [classes[name] for name in ["Fighter", "Wizard", "Fighter", "Rogue", "Fighter", "Wizard"] * 3]
+    levels = ClassLevels(order)
+    for lvl in range(len(order) + 1):
+        for field in ("bab", "bonus_feats", "skill_points", "Fortitude", "Reflex", "Will"):
+            assert levels.total(field, lvl) == brute_force(order, lvl, field), (field, lvl)
+    assert levels.class_names(6) == {"Fighter": 3, "Wizard": 2, "Rogue": 1}
+    # Base hit points at level 1 only; a class taken later gains its per-level hit points
+    assert levels.total("hp", 2) == classes["Fighter"]["base_hp"] + classes["Wizard"]["hp_per_level"]
+    assert levels.class_skills[4] >= set(classes["Rogue"]["class_skills"]) - {""}
+
+def test_set_class_recomputes_only_later_levels(classes):
+    """
+    Test that changing one level's class keeps earlier totals and matches a fresh build.
+    """
+    order = [classes["Fighter"]] * 20
+    levels = ClassLevels(order)
+    kept = levels.bab[:15]
+    assert levels.set_class(15, classes["Wizard"]) == 6
+    assert levels.bab[:15] == kept
+    order = order[:14] + [classes["Wizard"]] + order[15:]
+    fresh = ClassLevels(order)
+    assert levels.bab == fresh.bab and levels.saves == fresh.saves and levels.hp == fresh.hp
+    assert levels.class_level(20) == 19 and levels.class_level(15) == 1
+    with pytest.raises(IndexError):
+        levels.set_class(21, classes["Wizard"])
+
+def test_skill_budget_applies_minimum_per_level(classes):
+    """
+    Test that each level gains at least 1 skill point when the modifier is negative.
+    """
+    levels = ClassLevels([classes["Fighter"], classes["Rogue"]])
+    fighter, rogue = classes["Fighter"]["skill_points"], classes["Rogue"]["skill_points"]
+    assert levels.skill_budget(2, 0) == fighter + rogue
+    assert levels.skill_budget(2, -fighter) == 1 + rogue - fighter
+
+def test_character_multiclass(catalog, classes):
+    """
+    Test feat slots, skill points, class skills and combat for a multiclass character.
+    """
+    character = Character(char_class=classes["Fighter"], race=catalog.get("races", "Elf"))
+    character.level = 4
+    single = (character.total_feat_slots(), skill_point_budget(character), combat_sheet(character)["BAB"])
+    assert character.class_levels is None
+    character.set_level_class(3, classes["Wizard"])
+    assert [c["name"] for c in character.class_levels.classes] == ["Fighter", "Fighter", "Wizard", "Fighter"]
+    # Fighter 3 / Wizard 1: bonus feats at Fighter 1 and 2, BAB 3 + 0
+    assert character.total_feat_slots() == single[0] - 1
+    assert combat_sheet(character)["BAB"] == 3 and single[2] == 4
+    assert skill_point_budget(character) == single[1] - classes["Fighter"]["skill_points"] + classes["Wizard"]["skill_points"]
+    assert "Knowledge(Arcana)" in character.class_skills()
+    character.level_up(classes["Rogue"])
+    assert character.class_levels.class_level(5) == 1
+
+def test_multiclass_round_trip(catalog, classes):
+    """
+    Test that per-level classes survive serialization and bad lists are rejected.
+    """
+    character = Character(char_class=classes["Fighter"], race=catalog.get("races", "Human"))
+    character.level = 3
+    assert "class_levels" not in character_to_dict(character)
+    character.set_level_class(2, classes["Cleric"])
+    data = character_to_dict(character)
+    assert data["class_levels"] == ["Fighter", "Cleric", "Fighter"]
+    loaded = character_from_dict(data, catalog)
+    assert loaded.total_feat_slots() == character.total_feat_slots()
+    with pytest.raises(BuildValidationError):
+        character_from_dict(dict(data, class_levels=["Fighter"]), catalog)
+    with pytest.raises(BuildValidationError):
+        character_from_dict(dict(data, class_levels=["Fighter", "Bard", "Fighter"]), catalog)
@@ -0,0 +1,111 @@
+import pytest
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.db import queries
+from wotr_planner.db.queries import BuildQuery
+from wotr_planner.models.catalog import Catalog
+from wotr_planner.models.character import Character
+
+@pytest.fixture
+def repo(tmp_path):
+    """
+    Fixture to create a repository with a handful of saved builds.
+    Args:
+        tmp_path: pytest fixture to create a temporary directory.
+    """
+    catalog = Catalog({
+        "classes": [{"name": "Wizard"}, {"name": "Fighter"}],
+        "races": [{"name": "Aasimar"}, {"name": "Human"}],
+        "heritages": [{"name": "Emberkin (Peri-Blooded)", "race": "Aasimar"}],
+        "feats": [{"name": "Spell Focus"}, {"name": "Power Attack"}],
+    })
+    builds = [
+        # name, race, class, level, feats, notes
+        ("Ember Blaster", "Aasimar", "Wizard", 8, ["Spell Focus"], "fire evoker"),
+        ("Low Ember", "Aasimar", "Wizard", 4, ["Spell Focus"], ""),
+        ("No Focus", "Aasimar", "Wizard", 12, [], "fire but unfocused"),
+        ("Human Mage", "Human", "Wizard", 10, ["Spell Focus"], ""),
+        ("Brute", "Human", "Fighter", 10, ["Power Attack"], "two-handed sword"),
+    ]
+    characters = []
+    for name, race, cls, level, feats, notes in builds:
+        c = Character(char_class=catalog.get("classes", cls), race=catalog.get("races", race))
+        c.name, c.level, c.notes = name, level, notes
+        if race == "Aasimar":
+            c.heritage = catalog.by_id("heritages", 0)
+        c.feats = [catalog.get("feats", f) for f in feats]
+        characters.append(c)
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repository:
+        repository.save_many(characters)
+        yield repository
+
+def test_combined_filters(repo):
+    """
+    Test filtering by race, class, minimum level and feat together.
+    """
+    query = BuildQuery(repo.conn).race("Aasimar").char_class("Wizard").min_level(8).with_feats("Spell Focus")
+    assert [row[1] for row in query.rows()] == ["Ember Blaster"]
+    assert query.count() == 1
+
+def test_filters_use_indexes(repo):
+    """
+    Test that EXPLAIN QUERY PLAN shows index searches rather than table scans.
+    """
+    query = BuildQuery(repo.conn).race("Aasimar").char_class("Wizard").min_level(8).with_feats("Spell Focus")
+    plan = " | ".join(query.explain())
+    assert "USING INDEX idx_characters_race_class_level" in plan
+    assert "idx_character_feats_feat" in plan
+    assert "SCAN characters" not in plan
+
+    plan = " | ".join(BuildQuery(repo.conn).heritage("Emberkin (Peri-Blooded)").explain())
+    assert "idx_characters_heritage" in plan
+
+def test_full_text_search(repo):
+    """
+    Test FTS5 queries over names and notes.
+    """
+    names = [row[1] for row in BuildQuery(repo.conn).text("fire").rows()]
+    assert names == ["Ember Blaster", "No Focus"]
+
+    names = [row[1] for row in BuildQuery(repo.conn).text("ember*").order_by("level", descending=True).rows()]
+    assert names == ["Ember Blaster", "Low Ember"]
+
+def test_full_text_index_tracks_updates_and_deletes(repo):
+    """
+    Test that the FTS index follows renamed and deleted builds.
+    """
+    with repo.conn:
+        repo.conn.execute("UPDATE characters SET name = 'Cinder' WHERE id = 1")
+    assert [row[0] for row in BuildQuery(repo.conn).text("cinder").rows()] == [1]
+
+    repo.delete(1)
+    assert list(BuildQuery(repo.conn).text("cinder").ids()) == []
+
+def test_limit_and_characters(repo):
+    """
+    Test limiting results and streaming them as Character objects.
+    """
+    query = BuildQuery(repo.conn).char_class("Wizard").order_by("level").limit(2)
+    loaded = [c for _, c in query.characters(repo)]
+    assert [c.name for c in loaded] == ["Low Ember", "Ember Blaster"]
+    assert query.count() == 4 # Count ignores the limit
+
+def test_characters_are_loaded_in_batches(repo, monkeypatch):
+    """
+    Test that streaming characters runs a fixed number of queries per batch, not per build.
+    """
+    monkeypatch.setattr(queries, "LOAD_BATCH", 2)
+    statements = []
+    repo.conn.set_trace_callback(statements.append)
+    loaded = list(BuildQuery(repo.conn).order_by("name").characters(repo))
+    repo.conn.set_trace_callback(None)
+    assert [c.name for _, c in loaded] == ["Brute", "Ember Blaster", "Human Mage", "Low Ember", "No Focus"]
+    assert [f["name"] for f in loaded[0][1].feats] == ["Power Attack"]
+    assert loaded[2][1].heritage is None and loaded[1][1].heritage["race"] == "Aasimar"
+    assert len(statements) == 1 + 3 * 3 # The ID query, then three per batch of two
+
+def test_order_by_rejects_unknown_column(repo):
+    """
+    Test that ordering is restricted to summary columns.
+    """
+    with pytest.raises(ValueError):
+        BuildQuery(repo.conn).order_by("name; DROP TABLE characters")
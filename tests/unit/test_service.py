@@ -0,0 +1,158 @@
+import asyncio
+import json
+import pytest
+from wotr_planner import service
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.models.catalog import default_catalog
+from wotr_planner.models.character import Character
+from wotr_planner.models.evaluator import load_character
+from wotr_planner.models.serialization import character_to_dict
+from wotr_planner.service import EvaluationService
+
+@pytest.fixture
+def build():
+    """
+    Fixture to create a serialized level 3 Elf Fighter with Power Attack.
+    """
+    catalog = default_catalog()
+    character = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Elf"))
+    character.name = "Blade"
+    character.level = 3
+    character.point_buy_stats["Str"] = 14
+    character.feats = [catalog.get("feats", "Power Attack")]
+    return character_to_dict(character)
+
+@pytest.fixture
+def svc(tmp_path, build):
+    """
+    Fixture to create a service over the bundled data and a library with one saved build.
+    Args:
+        tmp_path: pytest fixture to create a temporary directory.
+    """
+    with CharacterRepository(tmp_path / "library.db") as repository:
+        repository.save_many([load_character(build, repository.catalog)])
+    return EvaluationService(pack_dirs=[], db_path=tmp_path / "library.db", workers=2)
+
+def request(request_id, method, params=None):
+    """
+    Encode a JSON-RPC request line.
+    """
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+async def exchange(svc, lines, expected):
+    """
+    Start the service, pipeline request lines on one connection and collect responses.
+    Args:
+        svc (EvaluationService): Service under test.
+        lines (list): Request lines, all written before any response is read.
+        expected (int): Number of response lines to read.
+    Returns:
+        list: Decoded responses in arrival order.
+    """
+    await svc.start("127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", svc.port())
+        writer.write(b"".join(lines))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(expected)]
+        writer.close()
+        return responses
+    finally:
+        await svc.close()
+
+def test_pipelined_requests(svc, build):
+    """
+    Test that several requests sent back to back are all answered, matched by id.
+    """
+    lines = [
+        request(1, "evaluate", {"build": build}),
+        request(2, "validate", [build]),
+        request(3, "available_feats", {"build": build}),
+        request(4, "search", {"race": "Elf", "feats": ["Power Attack"]}),
+        request(5, "stats"),
+    ]
+    responses = {r["id"]: r for r in asyncio.run(exchange(svc, lines, 5))}
+    assert responses[1]["result"]["stats"]["Str"] == 14
+    assert responses[2]["result"] == {"valid": True, "errors": []}
+    assert "Cleave" in responses[3]["result"]
+    assert [r["name"] for r in responses[4]["result"]] == ["Blade"]
+    assert set(responses[5]["result"]) <= {"evaluate", "validate", "available_feats", "search"}
+
+def test_errors(svc, build):
+    """
+    Test that bad input yields JSON-RPC errors without closing the connection.
+    """
+    lines = [
+        b"{not json\n",
+        request(1, "nope"),
+        request(2, "evaluate", {"bulid": build}),
+        request(3, "evaluate", {"build": {**build, "class": "Bard"}}),
+        request(4, "validate", {"build": {**build, "class": "Bard"}}),
+        json.dumps({"jsonrpc": "2.0", "method": "evaluate", "params": [build]}).encode() + b"\n",
+        request(5, "search", {"text": "\"unterminated"}),
+        request(6, "validate", {"build": {**build, "point_buy": {**build["point_buy"], "Str": 18, "Dex": 18}}}),
+    ]
+    responses = asyncio.run(exchange(svc, lines, 7))
+    by_id = {r["id"]: r for r in responses}
+    assert by_id[None]["error"]["code"] == service.PARSE_ERROR
+    assert by_id[1]["error"]["code"] == service.METHOD_NOT_FOUND
+    assert by_id[2]["error"]["code"] == service.INVALID_PARAMS
+    assert by_id[3]["error"] == {"code": service.INVALID_BUILD, "message": "Unknown class: Bard"}
+    assert by_id[4]["result"] == {"valid": False, "errors": ["Unknown class: Bard"]}
+    assert by_id[5]["error"]["code"] == service.INVALID_PARAMS
+    assert by_id[6]["result"] == {"valid": False, "errors": ["Point buy overspent: 34 spent of 25 available"]}
+
+def test_json_rpc_batch(svc, build):
+    """
+    Test that a JSON-RPC batch array is answered with one array, leaving out notifications.
+    """
+    line = json.dumps([
+        {"jsonrpc": "2.0", "id": "a", "method": "available_feats", "params": [build]},
+        {"jsonrpc": "2.0", "method": "stats"},
+        {"jsonrpc": "2.0", "id": "b", "method": "validate", "params": [build]},
+    ]).encode() + b"\n"
+    [responses] = asyncio.run(exchange(svc, [line], 1))
+    assert [r["id"] for r in responses] == ["a", "b"]
+
+def test_large_batch_uses_process_pool(svc, build, monkeypatch):
+    """
+    Test that a batch above the inline size is evaluated by pool workers in order.
+    """
+    monkeypatch.setattr(service, "BATCH_INLINE", 2)
+    builds = [dict(build, level=level) for level in (1, 2, 3, 4, 5)] + ["not-a-code"]
+    [response] = asyncio.run(exchange(svc, [request(1, "evaluate_batch", [builds])], 1))
+    results = response["result"]
+    assert [r["build"]["level"] for r in results[:5]] == [1, 2, 3, 4, 5]
+    assert "error" in results[5]
+    assert svc.pool is None # Shut down with the service
+
+def test_slow_work_does_not_block_the_event_loop(svc, build):
+    """
+    Test that a request answered on the event loop is not held up by evaluations and searches.
+    - The first evaluation also has to start the pool, so it cannot finish first.
+    """
+    lines = [request(1, "evaluate", [build]), request(2, "search", {"race": "Elf"}), request(3, "stats")]
+    responses = asyncio.run(exchange(svc, lines, 3))
+    assert responses[0]["id"] == 3
+    assert {r["id"] for r in responses[1:]} == {1, 2}
+    assert svc.search_conn is None # Closed with the service
+
+def test_latency_is_reported(svc, build):
+    """
+    Test that per-method latency is counted, including failed calls.
+    """
+    lines = [request(i, "evaluate", [build]) for i in range(3)] + [request(9, "evaluate", ["bad"])]
+    asyncio.run(exchange(svc, lines, 4))
+    stats = asyncio.run(svc.stats())["evaluate"]
+    assert stats["count"] == 4 and stats["errors"] == 1
+    assert 0 < stats["p50_ms"] <= stats["max_ms"]
+
+def test_refuses_non_loopback(svc):
+    """
+    Test that the service only binds loopback addresses.
+    """
+    with pytest.raises(ValueError):
+        asyncio.run(svc.start("0.0.0.0", 0))
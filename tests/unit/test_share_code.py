@@ -0,0 +1,173 @@
+import base64
+import pytest
+from wotr_planner.db.database import CharacterRepository
+from wotr_planner.models.catalog import Catalog, default_catalog
+from wotr_planner.models.character import SKILLS, STATS, Character
+from wotr_planner.models.serialization import character_to_dict
+from wotr_planner.models.share_code import (
+    VERSION, ShareCodeError, _BitWriter, catalog_fingerprint, decode_build, encode_build
+)
+
+@pytest.fixture
+def catalog():
+    """
+    Fixture to provide the bundled game data.
+    """
+    return default_catalog()
+
+def make_wizard(catalog):
+    """
+    Create a level 12 Aasimar Scroll Savant wizard.
+    Args:
+        catalog: Catalog to take records from.
+    """
+    c = Character(char_class=catalog.get("classes", "Wizard"), race=catalog.get("races", "Aasimar"))
+    c.heritage = catalog.heritage("Aasimar", "Emberkin (Peri-Blooded)")
+    c.archetype = "Scroll Savant"
+    c.level = 12
+    c.point_buy_stats.update(Str=7, Int=18)
+    c.skill_ranks["Knowledge(Arcana)"] = 12
+    c.feats = [catalog.get("feats", "Dodge"), catalog.get("feats", "Weapon Focus")]
+    return c
+
+def test_round_trip(catalog):
+    """
+    Test that decoding an encoded build gives back the same build.
+    """
+    original = make_wizard(catalog)
+    code = encode_build(original, catalog)
+    decoded = decode_build(code, catalog)
+
+    assert len(code) < 40
+    assert character_to_dict(decoded) == character_to_dict(original)
+    assert decoded.stats["Int"] == 20 # Heritage modifier applied
+
+def test_default_character_round_trip(catalog):
+    """
+    Test round-tripping a build with no heritage, archetype, background or feats.
+    """
+    original = Character(char_class=catalog.get("classes", "Fighter"), race=catalog.get("races", "Human"))
+    assert character_to_dict(decode_build(encode_build(original, catalog), catalog)) == character_to_dict(original)
+
+def test_code_is_canonical(catalog):
+    """
+    Test that feat order and name do not change the code, so it works as a dedup key.
+    """
+    a = make_wizard(catalog)
+    b = make_wizard(catalog)
+    b.name = "Other name"
+    b.feats.reverse()
+    assert encode_build(a, catalog) == encode_build(b, catalog)
+
+def test_multiclass_round_trip(catalog):
+    """
+    Test that per-level classes are encoded, and only when some level differs from the class.
+    """
+    multiclass = make_wizard(catalog)
+    plain_code = encode_build(make_wizard(catalog), catalog)
+    multiclass.set_level_class(12, catalog.get("classes", "Wizard"))
+    assert encode_build(multiclass, catalog) == plain_code
+    multiclass.set_level_class(2, catalog.get("classes", "Rogue"))
+    code = encode_build(multiclass, catalog)
+    assert code != plain_code
+    decoded = decode_build(code, catalog)
+    assert character_to_dict(decoded) == character_to_dict(multiclass)
+    assert decoded.total_feat_slots() == multiclass.total_feat_slots()
+
+@pytest.mark.parametrize("change", [
+    lambda c: c.feats.append({"name": "Homebrew"}),
+    lambda c: setattr(c, "archetype", "Unknown Archetype"),
+    lambda c: c.point_buy_stats.update(Str=19),
+    lambda c: c.skill_ranks.update(Mobility=13),
+])
+def test_encode_rejects_unencodable_builds(catalog, change):
+    """
+    Test that builds outside the catalog or value ranges raise ShareCodeError.
+    """
+    c = make_wizard(catalog)
+    change(c)
+    with pytest.raises(ShareCodeError):
+        encode_build(c, catalog)
+
+@pytest.mark.parametrize("code", ["", "AQ", "Bw" + "A" * 30, "!!!"])
+def test_decode_rejects_bad_codes(catalog, code):
+    """
+    Test that truncated, wrong-version and malformed codes raise ShareCodeError.
+    """
+    with pytest.raises(ShareCodeError):
+        decode_build(code, catalog)
+
+def craft(catalog, level, score, ranks):
+    """
+    Write a code for a Human Fighter field by field, bypassing encode_build's checks.
+    Args:
+        catalog: Catalog the code claims to come from.
+        level: Level, 1 to 32.
+        score: Point buy score of every stat, 7 to 22.
+        ranks: Ranks of every skill, 0 to 31.
+    """
+    writer = _BitWriter()
+    writer.write(VERSION, 8, "version")
+    writer.write(catalog_fingerprint(catalog), 32, "fingerprint")
+    writer.write(catalog.id_of("races", "Human"), 8, "race")
+    writer.write(0, 8, "heritage")
+    writer.write(catalog.id_of("classes", "Fighter"), 8, "class")
+    writer.write(0, 6, "archetype")
+    writer.write(0, 8, "background")
+    writer.write(level - 1, 5, "level")
+    writer.write(0, 1, "multiclass")
+    for stat in STATS:
+        writer.write(score - 7, 4, stat)
+    for skill in SKILLS:
+        writer.write(ranks, 5, skill)
+    feat_count = len(catalog.records("feats"))
+    writer.write(feat_count, 10, "feat count")
+    writer.write(0, feat_count, "feats")
+    return base64.urlsafe_b64encode(writer.to_bytes()).rstrip(b"=").decode("ascii")
+
+def test_decode_rejects_out_of_range_values(catalog):
+    """
+    Test that a crafted code is held to the same ranges encode_build enforces.
+    """
+    assert decode_build(craft(catalog, 20, 18, 20), catalog).level == 20
+    for level, score, ranks, message in ((32, 10, 0, "Level 32"), (5, 22, 0, "Point buy"), (5, 10, 31, "ranks")):
+        with pytest.raises(ShareCodeError, match=message):
+            decode_build(craft(catalog, level, score, ranks), catalog)
+
+def test_catalog_size_limits(catalog):
+    """
+    Test that game data too large for the ID fields is rejected with a clear error.
+    """
+    big = Catalog({kind: list(records) for kind, records in catalog.data.items()})
+    big.set_records("feats", [{"name": f"Feat {i}"} for i in range(1024)])
+    c = Character(char_class=big.get("classes", "Fighter"), race=big.get("races", "Human"))
+    with pytest.raises(ShareCodeError, match="at most 1023 feats"):
+        encode_build(c, big)
+    with pytest.raises(ShareCodeError, match="at most 1023 feats"):
+        decode_build(encode_build(c, catalog), big)
+
+def test_decode_rejects_other_game_data(catalog):
+    """
+    Test that a code is rejected by a catalog whose IDs differ, even with the same sizes.
+    """
+    code = encode_build(make_wizard(catalog), catalog)
+    reordered = Catalog({kind: list(records) for kind, records in catalog.data.items()})
+    reordered.set_records("feats", list(reversed(catalog.records("feats"))))
+    assert len(reordered.records("feats")) == len(catalog.records("feats"))
+    with pytest.raises(ShareCodeError, match="different game data"):
+        decode_build(code, reordered)
+    reordered.set_records("feats", catalog.records("feats"))
+    assert character_to_dict(decode_build(code, reordered)) == character_to_dict(make_wizard(catalog))
+
+def test_repository_dedupes_by_code(tmp_path, catalog):
+    """
+    Test that saving with dedupe reuses the ID of an identical saved build.
+    """
+    with CharacterRepository(tmp_path / "library.db", catalog=catalog) as repo:
+        first = repo.save(make_wizard(catalog))
+        ids = repo.save_many([make_wizard(catalog), Character(), Character()], dedupe=True)
+
+        assert ids[0] == first
+        assert ids[1] == ids[2] != first
+        assert repo.count() == 2
+        assert repo.find_by_code(encode_build(make_wizard(catalog), catalog)) == first
@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from wotr_planner import service
+from wotr_planner.models.catalog import Catalog, default_catalog, record_key
+from wotr_planner.models.character import Character
+from wotr_planner.models.serialization import character_to_dict
+from wotr_planner.models.shared_catalog import SharedCatalog
+
+@pytest.fixture
+def shared():
+    """
+    Fixture to provide the bundled game data in shared memory.
+    """
+    catalog = SharedCatalog.create(default_catalog())
+    yield catalog
+    catalog.close()
+    catalog.unlink()
+
+def test_lookups_match_catalog(shared):
+    """
+    Test that every record, ID and key lookup matches the source catalog.
+    """
+    catalog = default_catalog()
+    for kind in catalog.data:
+        assert list(shared.records(kind)) == catalog.records(kind)
+        for record_id, record in enumerate(catalog.records(kind)):
+            assert shared.id_of(kind, record_key(kind, record)) == record_id
+    assert shared.heritage("Elf", "Basic") == catalog.heritage("Elf", "Basic")
+    assert shared.by_id("feats", 1) == catalog.by_id("feats", 1)
+    assert shared.get("feats", "Whirlwind Attack") is None and shared.id_of("races", ("Elf",)) is None
+    assert shared.records("feats")[-1] == catalog.records("feats")[-1]
+    assert "Athletics" in shared.indexes["skills"] and "Bogus" not in shared.indexes["skills"]
+    assert shared.trait_registry() == catalog.trait_registry()
+    with pytest.raises(TypeError):
+        shared.set_records("feats", [])
+
+def test_attach_is_lazy_and_pickles_by_name(shared):
+    """
+    Test that an attached copy decodes records only when used and pickles as the block name.
+    """
+    attached = pickle.loads(pickle.dumps(shared))
+    assert attached.name == shared.name
+    assert not attached.data["feats"]._cache
+    feat = attached.get("feats", "Cleave")
+    assert attached.get("feats", "Cleave") is feat
+    assert len(attached.data["feats"]._cache) == 1
+    attached.close()
+
+    big = Catalog({"feats": [{"name": f"Feat {i}"} for i in range(5000)]})
+    big_shared = SharedCatalog.create(big)
+    try:
+        assert len(pickle.dumps(big_shared)) == len(pickle.dumps(shared)) - len(shared.name) + len(big_shared.name)
+        assert big_shared.get("feats", "Feat 4321") == {"name": "Feat 4321"}
+    finally:
+        big_shared.close()
+        big_shared.unlink()
+    with pytest.raises(FileNotFoundError):
+        SharedCatalog(big_shared.name)
+
+def test_pool_workers_evaluate_from_shared_memory(shared):
+    """
+    Test that spawned workers attach to the block and evaluate builds like the parent.
+    """
+    catalog = default_catalog()
+    build = character_to_dict(Character(catalog.get("classes", "Wizard"), catalog.get("races", "Elf")))
+    with ProcessPoolExecutor(
+        1, mp_context=multiprocessing.get_context("spawn"),
+        initializer=service._init_worker, initargs=(shared,),
+    ) as pool:
+        result = pool.submit(service._evaluate_chunk, [build, {"race": "Nobody"}]).result()
+    assert result[0]["stats"] == service.evaluate_many([build], catalog, catalog.trait_registry())[0]["stats"]
+    assert "error" in result[1]
+
+def test_evaluation_decodes_only_what_it_uses():
+    """
+    Test that availability comes from the prerequisite table and traits are decoded on use.
+    """
+    data = {kind: list(records) for kind, records in default_catalog().data.items()}
+    data["feats"] = data["feats"] + [
+        {"name": f"Feat {i}", "prerequisite_level": 1 + i % 20, "prerequisite_stats": {"Str": 10 + i % 10},
+         "prerequisite_feats": [f"Feat {i - 1}"] if i % 3 else []}
+        for i in range(2000)
+    ]
+    data["traits"] = [{"name": f"Trait {i}", "save_bonuses": {"Will": 1}} for i in range(500)]
+    catalog = Catalog(data)
+    big_shared = SharedCatalog.create(catalog)
+    attached = pickle.loads(pickle.dumps(big_shared))
+    try:
+        for level, feats in ((1, []), (5, ["Feat 3", "Feat 4"])):
+            character = Character(catalog.get("classes", "Fighter"), catalog.get("races", "Elf"))
+            character.level = level
+            character.point_buy_stats["Str"] = 16
+            character.recalculate_stats()
+            character.feats = [catalog.get("feats", name) for name in feats]
+            shared_character = Character(attached.get("classes", "Fighter"), attached.get("races", "Elf"))
+            shared_character.level = level
+            shared_character.point_buy_stats["Str"] = 16
+            shared_character.recalculate_stats()
+            shared_character.feats = [attached.get("feats", name) for name in feats]
+            expected = character.available_feats(catalog.records("feats"))
+            assert shared_character.available_feats(attached.records("feats")) == expected
+        assert len(attached.data["feats"]._cache) < len(catalog.records("feats")) // 4
+        registry = attached.trait_registry()
+        assert registry.get("Trait 7") == {"name": "Trait 7", "save_bonuses": {"Will": 1}}
+        assert len(attached.data["traits"]._cache) == 1
+        assert registry.get("Nope") is None and "Nope" not in registry
+    finally:
+        attached.close()
+        big_shared.close()
+        big_shared.unlink()
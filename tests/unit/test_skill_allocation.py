@@ -0,0 +1,62 @@
+import pytest
+from wotr_planner.models.character import Character
+from wotr_planner.models.skill_allocation import (
+    allocate_skill_ranks,
+    reduce_overflow,
+    solve_skill_ranks,
+)
+
+def test_reduce_overflow_trims_lowest_priority_first():
+    """
+    Test that reduce_overflow removes excess ranks from the end of the order.
+    - Higher priority skills keep their ranks.
+    """
+    ranks = {"Athletics": 5, "Mobility": 5, "Perception": 5}
+    order = ["Athletics", "Mobility", "Perception"]
+    result = reduce_overflow(ranks, order, allowed=8)
+
+    assert result == {"Athletics": 5, "Mobility": 3, "Perception": 0}
+    assert ranks["Perception"] == 5 # Input is not modified
+
+def test_reduce_overflow_within_limit_is_unchanged():
+    """
+    Test that reduce_overflow leaves ranks alone when within budget.
+    """
+    ranks = {"Athletics": 2, "Mobility": 1}
+    assert reduce_overflow(ranks, list(ranks), allowed=10) == ranks
+
+def test_allocate_skill_ranks_respects_cap_and_pool():
+    """
+    Test that allocate_skill_ranks maxes skills in priority order.
+    - Each skill is capped at max_rank.
+    - Allocation stops once the pool is spent.
+    """
+    skills = ["Athletics", "Mobility", "Perception", "Stealth"]
+    result = allocate_skill_ranks(["Perception", "Athletics", "Mobility"], skills, pool=7, max_rank=3)
+
+    assert result == {"Athletics": 3, "Mobility": 1, "Perception": 3, "Stealth": 0}
+
+def test_allocate_skill_ranks_rejects_bad_priorities():
+    """
+    Test that unknown or duplicated skills in the priority list raise ValueError.
+    """
+    skills = ["Athletics", "Mobility"]
+    with pytest.raises(ValueError):
+        allocate_skill_ranks(["Flying"], skills, pool=4, max_rank=2)
+    with pytest.raises(ValueError):
+        allocate_skill_ranks(["Athletics", "Athletics"], skills, pool=4, max_rank=2)
+
+def test_solve_skill_ranks_headless():
+    """
+    Test that solve_skill_ranks uses the character's pool and level cap.
+    - Level 4 Fighter with Int 10 gets 2 + 1 (race) = 3 points per level, 12 total.
+    """
+    c = Character(char_class={"name": "Fighter", "skill_points": 2}, race={"name": "Human", "skill_points_bonus": 1})
+    c.level = 4
+    ranks = solve_skill_ranks(c, ["Athletics", "Perception", "Mobility", "Stealth"])
+
+    assert ranks["Athletics"] == 4
+    assert ranks["Perception"] == 4
+    assert ranks["Mobility"] == 4
+    assert ranks["Stealth"] == 0
+    assert c.skill_ranks is ranks
@@ -0,0 +1,60 @@
+import pytest
+from wotr_planner.models.character import Character
+from wotr_planner.ui.main_window import MainWindow
+from wotr_planner.ui.skills_tab import SkillsTab
+
+@pytest.fixture
+def skills_tab(qtbot):
+    """
+    Fixture to create a SkillsTab for a level 5 Human Fighter.
+    Args:
+        qtbot: pytest-qt fixture for testing Qt widgets.
+    """
+    c = Character(char_class={"name": "Fighter", "skill_points": 2}, race={"name": "Human"})
+    c.level = 5
+    tab = SkillsTab(c)
+    qtbot.addWidget(tab)
+    tab.apply_level_up(5)
+    return tab
+
+def test_enforce_skill_point_limit_updates_widgets(skills_tab):
+    """
+    Test that enforce_skill_point_limit trims ranks and refreshes spin boxes.
+    - 10 ranks are allowed (5 levels x 2 points); 15 are spent.
+    """
+    c = skills_tab.character
+    c.skill_ranks.update({"Athletics": 5, "Perception": 5, "Use Magic Device": 5})
+    skills_tab.enforce_skill_point_limit()
+
+    assert c.skill_ranks["Athletics"] == 5
+    assert c.skill_ranks["Perception"] == 5
+    assert c.skill_ranks["Use Magic Device"] == 0
+    assert skills_tab.skill_widgets["Use Magic Device"].value() == 0
+    assert skills_tab.skill_points_pool() == 0
+
+def test_apply_skill_priorities_emits_signal(skills_tab, qtbot):
+    """
+    Test that apply_skill_priorities redistributes ranks and emits skills_changed.
+    """
+    with qtbot.waitSignal(skills_tab.skills_changed, timeout=500):
+        skills_tab.apply_skill_priorities(["Stealth", "Mobility", "Trickery"])
+
+    c = skills_tab.character
+    assert c.skill_ranks["Stealth"] == 5
+    assert c.skill_ranks["Mobility"] == 5
+    assert c.skill_ranks["Trickery"] == 0
+    assert skills_tab.skill_widgets["Stealth"].value() == 5
+
+def test_rank_edits_refresh_derived_skills(qtbot, monkeypatch):
+    """
+    Test that editing a rank in the main window updates the skill pool and effective skills.
+    """
+    monkeypatch.setenv("WOTR_PLANNER_PACKS", "")
+    window = MainWindow(autosave=False)
+    qtbot.addWidget(window)
+    pool = window.derived.value("skill_pool")
+    effective = window.derived.value("effective_skills")["Athletics"]
+    window.skills_tab.skill_widgets["Athletics"].setValue(1)
+    assert window.derived.value("skill_pool") == pool - 1
+    assert window.derived.value("effective_skills")["Athletics"] == effective + 1
+    assert "skill_ranks" in window.derived.last_update["skill_pool"]